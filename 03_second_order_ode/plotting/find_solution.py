@@ -1,8 +1,10 @@
 # Finds solution of x''(t) + x(t) = 0, x(0)=1, x'(0)=0 problem
+import os
 import subprocess
+import numpy as np
 
 
-def find_solution(t_end, delta_t, print_last):
+def find_solution(t_end, delta_t):
     """
     Runs Fortran program that returns solution of
 
@@ -16,22 +18,14 @@ def find_solution(t_end, delta_t, print_last):
     delta_t : float
         The time step.
 
-    print_last : bool
-        If true, returns only the solution for the final value of t.
-
     Returns
     -------
         str
             the solution in CSV format, or None if error occured.
     """
 
-    print_last_text = ""
-
-    if (print_last):
-        print_last_text = "--print_last"
-
     parameters = [
-        f'../build/main --delta_t={delta_t} --t_end={t_end} {print_last_text}'
+        f'../build/main --delta_t={delta_t} --t_end={t_end}'
     ]
 
     child = subprocess.Popen(parameters,
@@ -47,4 +41,62 @@ def find_solution(t_end, delta_t, print_last):
         print(message)
         return None
 
-    return message
\ No newline at end of file
+    return message
+
+
+def find_last_solutions(t_end, delta_ts, threads=None):
+    """
+    Runs Fortran program once to find the solutions of
+
+        x''(t) + x(t) = 0, x(0)=1, x'(0)=0
+
+    at the final value of t for several time steps.
+    The program keeps only the current solution in memory,
+    so very small time steps can be used.
+
+    Parameters
+    ----------
+    t_end : float
+        The end interval for t.
+
+    delta_ts : list of float
+        The time steps.
+
+    threads : int
+        Number of threads used to solve the ODE for different time steps.
+        If None, uses the number of CPUs.
+
+    Returns
+    -------
+        numpy.ndarray
+            2D array with one row for each time step from `delta_ts`,
+            with columns delta_t, t, x, exact and abs_error,
+            or None if error occured.
+    """
+
+    if threads is None:
+        threads = os.cpu_count() or 1
+
+    delta_t_text = ",".join(repr(float(delta_t)) for delta_t in delta_ts)
+
+    parameters = [
+        '../build/main', f'--delta_t={delta_t_text}', f'--t_end={t_end}',
+        '--print_last', f'--threads={threads}'
+    ]
+
+    # The errors are read separately, so that warnings printed to stderr
+    # do not mix with the binary output
+    child = subprocess.Popen(parameters,
+                             stdout=subprocess.PIPE,
+                             stderr=subprocess.PIPE)
+
+    output, errors = child.communicate()
+    success = child.returncode == 0
+
+    if not success:
+        # Settings errors are printed to stdout and solver errors to stderr,
+        # so both streams are printed
+        print((output + errors).decode('utf-8', errors='replace'))
+        return None
+
+    return np.frombuffer(output, dtype=np.float64).reshape(-1, 5)
@@ -2,10 +2,8 @@
 # for approximation of solutions of
 # of x''(t) + x(t) = 0, x(0)=1, x'(0)=0 problem.
 import os
-from io import StringIO
 import matplotlib.pyplot as plt
-import pandas as pd
-from find_solution import find_solution
+from find_solution import find_last_solutions
 from plot_utils import create_dir
 import numpy as np
 from scipy.stats import linregress
@@ -31,25 +29,18 @@ def find_abs_errors_at_t(at_t, delta_ts):
 
     """
 
-    errors = []
+    solutions = find_last_solutions(t_end=at_t, delta_ts=delta_ts)
 
-    for delta_t in delta_ts:
-        data = find_solution(t_end=at_t, delta_t=delta_t, print_last=True)
+    if solutions is None:
+        return None
 
-        if data is None:
-            return
+    t = solutions[:, 1]
 
-        df = pd.read_csv(StringIO(data), skipinitialspace=True)
-        t = df['t'].iloc[-1]
+    if np.any(np.abs(t - at_t) > 0.001):
+        print("Can not locate the error")
+        return None
 
-        if (abs(t - at_t) > 0.001):
-            print("Can not locate the error")
-            return None
-
-        abs_error = df['abs_error'].iloc[-1]
-        errors.append(abs_error)
-
-    return errors
+    return list(solutions[:, 4])
 
 
 def calculate_linear_fit_equation(delta_ts, errors):
@@ -373,14 +373,14 @@ subroutine extract_value_from_arguments(arguments, start_index, value, advance_i
             ! Separator is found
 
             if (i > start_index) then ! This is the second argument
-                ! Separator is in the next argument - advance the index
-                advance_index = advance_index + 1
-
                 if (value_separator_index /= 1) then
                     ! The separator is not the first text in the second argument
                     ! This is not a well-formed name=value pair - exit
                     exit argument_loop
                 end if
+
+                ! Separator is in the next argument - advance the index
+                advance_index = advance_index + 1
             end if
 
             ! Try extracting the value after the separator
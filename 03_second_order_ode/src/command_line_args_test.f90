@@ -109,6 +109,25 @@ subroutine parse_command_line_arguments_test__named_arguments(failures)
     call assert_equal(parsed%named_value(5), "", __FILE__, __LINE__, failures)
 end
 
+subroutine parse_command_line_arguments_test__flag_before_named(failures)
+    integer, intent(inout) :: failures
+    character(len=1024) :: str(2)
+    type(parsed_args) :: parsed
+
+    str(1) = "--print_last"
+    str(2) = "--delta_t=0.1,0.01"
+
+    call parse_command_line_arguments(str, parsed)
+
+    call assert_equal(parsed%named_count, 2, __FILE__, __LINE__, failures)
+
+    call assert_equal(parsed%named_name(1), "print_last", __FILE__, __LINE__, failures)
+    call assert_equal(parsed%named_value(1), "", __FILE__, __LINE__, failures)
+
+    call assert_equal(parsed%named_name(2), "delta_t", __FILE__, __LINE__, failures)
+    call assert_equal(parsed%named_value(2), "0.1,0.01", __FILE__, __LINE__, failures)
+end
+
 
 ! get_positional
 ! ---------------
@@ -454,6 +473,7 @@ subroutine command_line_args_test_all(failures)
     call parse_command_line_arguments_test(failures)
     call parse_command_line_arguments_test__no_arguments(failures)
     call parse_command_line_arguments_test__named_arguments(failures)
+    call parse_command_line_arguments_test__flag_before_named(failures)
 
     call get_positional_test__real_dp(failures)
     call get_positional_test__integer(failures)
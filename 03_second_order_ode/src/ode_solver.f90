@@ -7,10 +7,11 @@ module OdeSolver
 use Types, only: dp
 use FloatUtils, only: can_convert_real_to_int
 use Settings, only: program_settings, read_from_command_line
+!$ use omp_lib, only: omp_set_num_threads
 implicit none
 private
-public :: solve_ode, print_solution, solve_and_print, &
-            read_settings_solve_and_print
+public :: solve_ode, solve_ode_last, solve_ode_last_table, print_solution, &
+            print_last_table, solve_and_print, read_settings_solve_and_print
 
 !
 ! Data for the ODE solution
@@ -104,6 +105,131 @@ subroutine solve_ode(options, solution, success, error_message)
 end subroutine
 
 
+!
+! Solves the ODE
+!
+!   x''(t) + x(t) = 0
+!
+! with the same method as `solve_ode`, but keeps only the last two
+! values of x in memory and returns the solution for the final value of t.
+! This allows to use very small timesteps.
+!
+! Inputs:
+! -------
+!
+! t_end : the end value for t
+!
+! delta_t : size of the timestep
+!
+!
+! Outputs:
+! -------
+!
+! last : the solution at the final t: t, x, exact value of x
+!        and the absolute error of x
+!
+! success : .true. if the ODE was solved successfully
+!
+! error_message : contains the error message, if any errors occurred
+!
+subroutine solve_ode_last(t_end, delta_t, last, success, error_message)
+    real(dp), intent(in) :: t_end, delta_t
+    real(dp), intent(out) :: last(4)
+    logical, intent(out) :: success
+    character(len=*), intent(out) :: error_message
+    real(dp) :: size_real, t_start, t, x, x_previous, x_next
+    integer :: i, size
+
+    t_start = 0._dp
+
+    if (.not. (abs(delta_t) > .0_dp )) then
+        success = .false.
+        error_message = "can not divide by zero"
+        return
+    end if
+
+    size_real = (t_end - t_start) / delta_t
+
+    call can_convert_real_to_int(float=size_real, &
+        success=success, error_message=error_message)
+
+    if (.not. success) return
+    size = ceiling(size_real)
+
+    x_previous = 1._dp
+    x = 1._dp - 0.5_dp * delta_t**2
+
+    do i = 3, size
+        x_next = -x_previous + x * (2 - delta_t**2)
+        x_previous = x
+        x = x_next
+    end do
+
+    if (size < 2) x = 1._dp
+    t = t_start + delta_t * (size - 1)
+
+    last = [t, x, cos(t), abs(x - cos(t))]
+end subroutine
+
+
+!
+! Solves the ODE for several timesteps and returns the solutions for
+! the final value of t. The timesteps are divided between the threads.
+!
+! Inputs:
+! -------
+!
+! options : program options
+!
+!
+! Outputs:
+! -------
+!
+! table : 2D array, the second index corresponds to the timestep, and
+!         the first index to the values: timestep, t, x, exact value of x
+!         and the absolute error of x.
+!
+! success : .true. if the ODE was solved successfully for all timesteps
+!
+! error_message : contains the error message, if any errors occurred
+!
+subroutine solve_ode_last_table(options, table, success, error_message)
+    type(program_settings), intent(in) :: options
+    real(dp), allocatable, intent(out) :: table(:, :)
+    logical, intent(out) :: success
+    character(len=*), intent(out) :: error_message
+    logical, allocatable :: succeeded(:)
+    character(len=1024), allocatable :: messages(:)
+    integer :: i, n
+
+    n = size(options%delta_ts)
+    allocate(table(5, n))
+    allocate(succeeded(n))
+    allocate(messages(n))
+
+    !$ call omp_set_num_threads(options%threads)
+
+    ! Smaller timesteps take longer, the dynamic schedule
+    ! gives the next timestep to the first free thread
+    !$omp parallel do schedule(dynamic, 1)
+    do i = 1, n
+        table(1, i) = options%delta_ts(i)
+
+        call solve_ode_last(t_end=options%t_end, delta_t=options%delta_ts(i), &
+                            last=table(2:5, i), success=succeeded(i), &
+                            error_message=messages(i))
+    end do
+    !$omp end parallel do
+
+    success = all(succeeded)
+    error_message = ""
+
+    if (.not. success) then
+        error_message = messages(findloc(succeeded, .false., dim=1))
+    end if
+end subroutine
+
+
 !
 ! Prints ODE solution to string
 !
@@ -159,6 +285,27 @@ subroutine print_solution(solution, print_last, output)
 end subroutine
 
 
+!
+! Prints the solutions for the final value of t to the standard output
+! as a binary table. See README.md for description of the format.
+!
+! Inputs:
+! -------
+!
+! table : the solutions, see `solve_ode_last_table`
+!
+subroutine print_last_table(table)
+    real(dp), intent(in) :: table(:, :)
+    integer :: out_unit
+
+    open(newunit=out_unit, file="/dev/stdout", access="stream", &
+        form="unformatted", action="write", status="old")
+
+    write(out_unit) table
+    close(unit=out_unit)
+end subroutine
+
+
 !
 ! Solves the ODE and prints result to output
 !
@@ -176,6 +323,23 @@ subroutine solve_and_print(options, silent)
     logical :: success
     character(len=1024) :: error_message
     character(len=:), allocatable :: output
+    real(dp), allocatable :: table(:, :)
+
+    if (options%print_last) then
+        call solve_ode_last_table(options=options, table=table, &
+                                  success=success, error_message=error_message)
+
+        if (.not. success) then
+            if (.not. silent) then
+                write (0, *) trim(error_message)
+                call exit(40)
+            end if
+            return
+        end if
+
+        if (.not. silent) call print_last_table(table)
+        return
+    end if
 
     call solve_ode(options=options, &
                    solution=solution, success=success, &
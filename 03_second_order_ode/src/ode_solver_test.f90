@@ -4,7 +4,8 @@ use Constants, only: pi
 use Settings, only: program_settings
 
 use OdeSolver, only: solve_ode, ode_solution, print_solution, solve_and_print, &
-                        read_settings_solve_and_print
+                        read_settings_solve_and_print, solve_ode_last, &
+                        solve_ode_last_table
 
 use AssertsTest, only: assert_true, assert_equal, assert_approx, &
                         assert_string_starts_with
@@ -102,6 +103,108 @@ subroutine print_solution_test__print_last(failures)
     call assert_true(index(output, "6.2000000") > 0, __FILE__, __LINE__, failures)
 end
 
+subroutine solve_ode_last_test(failures)
+    integer, intent(inout) :: failures
+    type(ode_solution) :: solution
+    type(program_settings) :: options
+    logical :: success
+    character(len=1024) :: error_message
+    real(dp) :: last(4), delta_ts(3)
+    integer :: i
+
+    delta_ts = [0.1_dp, 0.7_dp, 0.003_dp]
+
+    do i = 1, 3
+        options%t_end = 2 * pi
+        options%delta_t = delta_ts(i)
+
+        call solve_ode(options=options, &
+                       solution=solution, success=success, &
+                       error_message=error_message)
+
+        call solve_ode_last(t_end=options%t_end, delta_t=delta_ts(i), &
+                            last=last, success=success, &
+                            error_message=error_message)
+
+        call assert_true(success, __FILE__, __LINE__, failures)
+
+        ! Same as the last values of the full solution
+        call assert_true(abs(last(1) - solution%t_values(solution%size)) &
+                         < tiny(1._dp), __FILE__, __LINE__, failures)
+
+        call assert_true(abs(last(2) - solution%x_values(solution%size)) &
+                         < tiny(1._dp), __FILE__, __LINE__, failures)
+
+        call assert_true(abs(last(3) - solution%x_values_exact(solution%size)) &
+                         < tiny(1._dp), __FILE__, __LINE__, failures)
+
+        call assert_true(abs(last(4) - solution%abs_errors(solution%size)) &
+                         < tiny(1._dp), __FILE__, __LINE__, failures)
+    end do
+
+    ! Zero timestep
+    call solve_ode_last(t_end=1._dp, delta_t=0._dp, &
+                        last=last, success=success, &
+                        error_message=error_message)
+
+    call assert_true(.not. success, __FILE__, __LINE__, failures)
+    call assert_equal(error_message, "can not divide by zero", &
+                      __FILE__, __LINE__, failures)
+end
+
+subroutine solve_ode_last_table_test(failures)
+    integer, intent(inout) :: failures
+    type(program_settings) :: options
+    logical :: success
+    character(len=1024) :: error_message
+    real(dp), allocatable :: table(:, :), table_threads(:, :)
+    real(dp) :: last(4)
+
+    options%t_end = 11.000001_dp
+    options%delta_ts = [1._dp, 0.1_dp, 0.01_dp, 1e-4_dp, 0.5_dp]
+
+    call solve_ode_last_table(options=options, table=table, &
+                              success=success, error_message=error_message)
+
+    call assert_true(success, __FILE__, __LINE__, failures)
+    call assert_equal(size(table, 1), 5, __FILE__, __LINE__, failures)
+    call assert_equal(size(table, 2), 5, __FILE__, __LINE__, failures)
+
+    call assert_approx(table(1, 3), 0.01_dp, 1e-15_dp, __FILE__, __LINE__, failures)
+
+    call solve_ode_last(t_end=options%t_end, delta_t=0.01_dp, &
+                        last=last, success=success, &
+                        error_message=error_message)
+
+    call assert_true(all(abs(table(2:5, 3) - last) < tiny(1._dp)), &
+                     __FILE__, __LINE__, failures)
+
+    ! The errors decrease as the square of the timestep
+    call assert_approx(table(5, 2) / table(5, 3), 100._dp, 1._dp, &
+                       __FILE__, __LINE__, failures)
+
+    ! The results do not depend on the number of threads
+    options%threads = 3
+
+    call solve_ode_last_table(options=options, table=table_threads, &
+                              success=success, error_message=error_message)
+
+    call assert_true(success, __FILE__, __LINE__, failures)
+
+    call assert_true(maxval(abs(table - table_threads)) < tiny(1._dp), &
+                     __FILE__, __LINE__, failures)
+
+    ! Zero timestep
+    options%delta_ts = [0.1_dp, 0._dp]
+
+    call solve_ode_last_table(options=options, table=table, &
+                              success=success, error_message=error_message)
+
+    call assert_true(.not. success, __FILE__, __LINE__, failures)
+    call assert_equal(error_message, "can not divide by zero", &
+                      __FILE__, __LINE__, failures)
+end
+
 subroutine solve_and_print_test(failures)
     integer, intent(inout) :: failures
     type(program_settings) :: options
@@ -129,6 +232,8 @@ subroutine ode_solver_test_all(failures)
     call print_solution_test(failures)
     call solve_and_print_test(failures)
     call print_solution_test__print_last(failures)
+    call solve_ode_last_test(failures)
+    call solve_ode_last_table_test(failures)
     call read_settings_solve_and_print_test(failures)
 end
 
@@ -3,16 +3,18 @@
 !
 module Settings
 use Types, only: dp
-use String, only: string_is_empty
+use String, only: string_is_empty, string_to_numbers
 use Constants, only: pi
 
 use CommandLineArgs, only: parsed_args, get_positional_value,&
+                            get_named_value, &
                             get_named_value_or_default, has_flag, &
                             parse_current_command_line_arguments, &
                             unrecognized_named_args, ARGUMENT_MAX_LENGTH
 implicit none
 private
-public :: read_from_parsed_command_line, read_from_command_line
+public :: read_from_parsed_command_line, read_from_command_line, &
+          HELP_MESSAGE_LENGTH
 
 !
 ! Stores program settings:
@@ -24,12 +26,23 @@ type, public :: program_settings
     ! size of the timestep
     real(dp) :: delta_t
 
+    ! Sizes of the timesteps, when the ODE is solved for several of them.
+    ! The first element is `delta_t`.
+    real(dp), allocatable :: delta_ts(:)
+
     ! Prints only solution for the final value of t
-    logical :: print_last
+    logical :: print_last = .false.
+
+    ! The number of OpenMP threads used to solve the ODE
+    ! for different timesteps
+    integer :: threads = 1
 end type program_settings
 
+! Maximum length of the help message
+integer, parameter :: HELP_MESSAGE_LENGTH = 2048
+
 ! Help message to be shown
-character(len=1024), parameter :: HELP_MESSAGE = NEW_LINE('h')//"&
+character(len=HELP_MESSAGE_LENGTH), parameter :: HELP_MESSAGE = NEW_LINE('h')//"&
     &This program solves ODE"//NEW_LINE('h')//"&
     &"//NEW_LINE('h')//"&
     &  x''(t) + x(t) = 0"//NEW_LINE('h')//"&
@@ -40,15 +53,30 @@ character(len=1024), parameter :: HELP_MESSAGE = NEW_LINE('h')//"&
     &Usage:&
     &"//NEW_LINE('h')//"&
     &"//NEW_LINE('h')//"&
-    & ./build/main [--t_end=6.2] [--delta_t=0.1]"//NEW_LINE('h')//"&
+    & ./build/main [--t_end=6.2] [--delta_t=0.1] [--print_last]"&
+    //NEW_LINE('h')//"&
+    &              [--threads=1]"//NEW_LINE('h')//"&
     &"//NEW_LINE('h')//"&
     &    --t_end=NUMBER   : the end value for t,"//NEW_LINE('h')//"&
     &               Default: 6.28."//NEW_LINE('h')//"&
     &"//NEW_LINE('h')//"&
     &    --delta_t=NUMBER : size of the timestep,"//NEW_LINE('h')//"&
     &               Default: 0.1."//NEW_LINE('h')//"&
+    &               With --print_last, a comma-separated list"&
+    //NEW_LINE('h')//"&
+    &               of timesteps can be used, e.g. 0.1,0.01."&
+    //NEW_LINE('h')//"&
     &"//NEW_LINE('h')//"&
-    &    --print_last : print only solution for the final t,"//NEW_LINE('h')//"&
+    &    --print_last : print only solution for the final t"&
+    //NEW_LINE('h')//"&
+    &               for each timestep, as a binary table"&
+    //NEW_LINE('h')//"&
+    &               (see README.md),"//NEW_LINE('h')//"&
+    &"//NEW_LINE('h')//"&
+    &    --threads=NUMBER : number of threads used to solve"&
+    //NEW_LINE('h')//"&
+    &               the ODE for different timesteps."//NEW_LINE('h')//"&
+    &               Default: 1."//NEW_LINE('h')//"&
     &"//NEW_LINE('h')//"&
     &    --help  : show this message."//NEW_LINE('h')
 
@@ -79,7 +107,7 @@ subroutine read_from_command_line(silent, settings, success)
     type(program_settings), intent(out) :: settings
     logical, intent(out) :: success
     type(parsed_args) :: parsed
-    character(len=1024) :: error_message
+    character(len=HELP_MESSAGE_LENGTH) :: error_message
 
     call parse_current_command_line_arguments(parsed)
 
@@ -120,7 +148,8 @@ subroutine read_from_parsed_command_line(parsed, settings, error_message)
     logical :: success
     character(len=ARGUMENT_MAX_LENGTH), allocatable :: unrecognized(:)
     integer :: unrecognized_count
-    character(len=ARGUMENT_MAX_LENGTH) :: valid_args(3)
+    character(len=ARGUMENT_MAX_LENGTH) :: valid_args(4)
+    character(len=ARGUMENT_MAX_LENGTH) :: text_value
 
     error_message = ""
 
@@ -150,6 +179,7 @@ subroutine read_from_parsed_command_line(parsed, settings, error_message)
     valid_args(1) = "t_end"
     valid_args(2) = "delta_t"
     valid_args(3) = "print_last"
+    valid_args(4) = "threads"
 
     call unrecognized_named_args(valid=valid_args, parsed=parsed, &
         unrecognized=unrecognized, count=unrecognized_count)
@@ -180,9 +210,17 @@ subroutine read_from_parsed_command_line(parsed, settings, error_message)
     ! delta_t
     ! --------------
 
-    call get_named_value_or_default(name='delta_t', parsed=parsed, &
-                                    default=DEFAULT_DELTA_T, &
-                                    value=settings%delta_t, success=success)
+    call get_named_value(name='delta_t', parsed=parsed, &
+                         value=text_value, success=success)
+
+    if (success) then
+        call string_to_numbers(str=text_value, numbers=settings%delta_ts, &
+                               success=success)
+    else
+        ! Named argument is not present. Use the default value.
+        settings%delta_ts = [DEFAULT_DELTA_T]
+        success = .true.
+    end if
 
     if (.not. success) then
         error_message = "ERROR: delta_t is not a number."//NEW_LINE('h')//"&
@@ -190,6 +228,35 @@ subroutine read_from_parsed_command_line(parsed, settings, error_message)
         return
     end if
 
+    settings%delta_t = settings%delta_ts(1)
+
+    if (size(settings%delta_ts) > 1 .and. .not. settings%print_last) then
+        error_message = "ERROR: several delta_t values can only be used &
+                        &with --print_last."//NEW_LINE('h')//"&
+                        &Run with --help for help."
+        return
+    end if
+
+
+    ! threads
+    ! --------------
+
+    call get_named_value_or_default(name='threads', parsed=parsed, &
+                                    default=1, &
+                                    value=settings%threads, success=success)
+
+    if (.not. success) then
+        error_message = "ERROR: threads is not a number."//NEW_LINE('h')//"&
+                        &Run with --help for help."
+        return
+    end if
+
+    if (settings%threads < 1) then
+        error_message = "ERROR: threads must be positive."//NEW_LINE('h')//"&
+                        &Run with --help for help."
+        return
+    end if
+
 end subroutine
 
 end module Settings
\ No newline at end of file
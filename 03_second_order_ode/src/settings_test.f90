@@ -2,7 +2,8 @@ module SettingsTest
 use Types, only: dp
 use AssertsTest, only: assert_equal, assert_true, assert_approx, assert_string_starts_with
 use CommandLineArgs, only: parsed_args, allocate_parsed
-use Settings, only: read_from_command_line, read_from_parsed_command_line, program_settings
+use Settings, only: read_from_command_line, read_from_parsed_command_line, program_settings, &
+                    HELP_MESSAGE_LENGTH
 use String, only: string_starts_with, string_is_empty
 implicit none
 private
@@ -54,6 +55,78 @@ subroutine read_from_parsed_command_line_test__named(failures)
     call assert_true(string_is_empty(error_message), __FILE__, __LINE__, failures)
     call assert_approx(settings%t_end, 2.31_dp, 1e-5_dp, __FILE__, __LINE__, failures)
     call assert_approx(settings%delta_t, 0.01_dp, 1e-5_dp, __FILE__, __LINE__, failures)
+    call assert_equal(size(settings%delta_ts), 1, __FILE__, __LINE__, failures)
+    call assert_equal(settings%threads, 1, __FILE__, __LINE__, failures)
+end
+
+subroutine read_from_parsed_command_line_test__delta_t_list(failures)
+    integer, intent(inout) :: failures
+    type(parsed_args) :: parsed
+    type(program_settings) :: settings
+    character(len=1024) :: error_message
+
+    call allocate_parsed(size=3, parsed=parsed)
+
+    parsed%positional_count = 0
+
+    parsed%named_count = 3
+    parsed%named_name(1) = "delta_t"
+    parsed%named_value(1) = "0.1,0.01,1e-7"
+
+    parsed%named_name(2) = "print_last"
+
+    parsed%named_name(3) = "threads"
+    parsed%named_value(3) = "4"
+
+    call read_from_parsed_command_line(parsed=parsed, settings=settings, error_message=error_message)
+
+    call assert_true(string_is_empty(error_message), __FILE__, __LINE__, failures)
+    call assert_equal(size(settings%delta_ts), 3, __FILE__, __LINE__, failures)
+    call assert_approx(settings%delta_ts(2), 0.01_dp, 1e-15_dp, __FILE__, __LINE__, failures)
+    call assert_approx(settings%delta_ts(3), 1e-7_dp, 1e-20_dp, __FILE__, __LINE__, failures)
+    call assert_approx(settings%delta_t, 0.1_dp, 1e-15_dp, __FILE__, __LINE__, failures)
+    call assert_equal(settings%threads, 4, __FILE__, __LINE__, failures)
+end
+
+subroutine read_from_parsed_command_line_test__list_without_print_last(failures)
+    integer, intent(inout) :: failures
+    type(parsed_args) :: parsed
+    type(program_settings) :: settings
+    character(len=1024) :: error_message
+
+    call allocate_parsed(size=2, parsed=parsed)
+
+    parsed%positional_count = 0
+
+    parsed%named_count = 1
+    parsed%named_name(1) = "delta_t"
+    parsed%named_value(1) = "0.1,0.01"
+
+    call read_from_parsed_command_line(parsed=parsed, settings=settings, error_message=error_message)
+
+    call assert_string_starts_with(error_message, &
+        "ERROR: several delta_t values can only be used with --print_last", &
+        __FILE__, __LINE__, failures)
+end
+
+subroutine read_from_parsed_command_line_test__threads_not_positive(failures)
+    integer, intent(inout) :: failures
+    type(parsed_args) :: parsed
+    type(program_settings) :: settings
+    character(len=1024) :: error_message
+
+    call allocate_parsed(size=2, parsed=parsed)
+
+    parsed%positional_count = 0
+
+    parsed%named_count = 1
+    parsed%named_name(1) = "threads"
+    parsed%named_value(1) = "0"
+
+    call read_from_parsed_command_line(parsed=parsed, settings=settings, error_message=error_message)
+
+    call assert_string_starts_with(error_message, "ERROR: threads must be positive", &
+        __FILE__, __LINE__, failures)
 end
 
 
@@ -183,7 +256,7 @@ subroutine show_help_test(failures)
     integer, intent(inout) :: failures
     type(parsed_args) :: parsed
     type(program_settings) :: settings
-    character(len=1024) :: error_message
+    character(len=HELP_MESSAGE_LENGTH) :: error_message
 
     call allocate_parsed(size=2, parsed=parsed)
 
@@ -224,6 +297,9 @@ subroutine settings_test_all(failures)
 
     call read_from_parsed_command_line_test__no_args(failures)
     call read_from_parsed_command_line_test__named(failures)
+    call read_from_parsed_command_line_test__delta_t_list(failures)
+    call read_from_parsed_command_line_test__list_without_print_last(failures)
+    call read_from_parsed_command_line_test__threads_not_positive(failures)
     call read_from_parsed_command_line_test__print_last(failures)
     call read_from_parsed_command_line_test__t_end_not_a_number(failures)
     call read_from_parsed_command_line_test__delta_t_not_a_number(failures)
@@ -5,7 +5,8 @@ module String
 use Types, only: dp
 implicit none
 private
-public :: string_starts_with, string_is_empty, string_to_number
+public :: string_starts_with, string_is_empty, string_to_number, &
+          string_to_numbers
 
 interface string_to_number
     module procedure string_to_real_dp, string_to_integer
@@ -107,4 +108,38 @@ subroutine string_to_integer(str, number, success)
     success = iostat == 0
 end subroutine
 
+!
+! Convert a string containing comma-separated numbers to an array
+! of real double precision numbers
+!
+! Inputs:
+! --------
+!
+! str : a string, for example "0.1,0.01,0.001"
+!
+! Outputs:
+! -------
+!
+! success : .true. if conversion was successful.
+!
+! numbers: the numbers converted from `str`
+!
+subroutine string_to_numbers(str, numbers, success)
+    character(len=*), intent(in) :: str
+    real(dp), allocatable, intent(out) :: numbers(:)
+    logical, intent(out) :: success
+    integer :: iostat, i, count
+
+    count = 1
+
+    do i = 1, len_trim(str)
+        if (str(i:i) == ',') count = count + 1
+    end do
+
+    allocate(numbers(count))
+
+    read(str, *, iostat = iostat) numbers
+    success = iostat == 0
+end subroutine
+
 end module String
\ No newline at end of file
@@ -4,7 +4,8 @@ use Types, only: dp
 use AssertsTest, only: assert_approx, assert_true, &
                         assert_equal
 
-use String, only: string_starts_with, string_is_empty, string_to_number
+use String, only: string_starts_with, string_is_empty, string_to_number, &
+                  string_to_numbers
 implicit none
 private
 public string_test_all
@@ -111,6 +112,45 @@ subroutine string_to_number_test__integer_failure(failures)
     call assert_true(.not. success, __FILE__, __LINE__, failures)
 end
 
+! string_to_numbers
+! -----------------
+
+subroutine string_to_numbers_test__success(failures)
+    integer, intent(inout) :: failures
+    logical :: success
+    real(dp), allocatable :: result(:)
+
+    call string_to_numbers("0.1,2,-3e-7", result, success)
+
+    call assert_true(success, __FILE__, __LINE__, failures)
+    call assert_equal(size(result), 3, __FILE__, __LINE__, failures)
+    call assert_approx(result(1), 0.1_dp, 1e-15_dp, __FILE__, __LINE__, failures)
+    call assert_approx(result(2), 2._dp, 1e-15_dp, __FILE__, __LINE__, failures)
+    call assert_approx(result(3), -3e-7_dp, 1e-20_dp, __FILE__, __LINE__, failures)
+end
+
+subroutine string_to_numbers_test__one_number(failures)
+    integer, intent(inout) :: failures
+    logical :: success
+    real(dp), allocatable :: result(:)
+
+    call string_to_numbers("0.25", result, success)
+
+    call assert_true(success, __FILE__, __LINE__, failures)
+    call assert_equal(size(result), 1, __FILE__, __LINE__, failures)
+    call assert_approx(result(1), 0.25_dp, 1e-15_dp, __FILE__, __LINE__, failures)
+end
+
+subroutine string_to_numbers_test__failure(failures)
+    integer, intent(inout) :: failures
+    logical :: success
+    real(dp), allocatable :: result(:)
+
+    call string_to_numbers("0.1,not a number", result, success)
+
+    call assert_true(.not. success, __FILE__, __LINE__, failures)
+end
+
 
 subroutine string_test_all(failures)
     integer, intent(inout) :: failures
@@ -127,6 +167,10 @@ subroutine string_test_all(failures)
 
     call string_to_number_test__integer_success(failures)
     call string_to_number_test__integer_failure(failures)
+
+    call string_to_numbers_test__success(failures)
+    call string_to_numbers_test__one_number(failures)
+    call string_to_numbers_test__failure(failures)
 end
 
 end module StringTest
@@ -70,7 +70,7 @@ def plot_solution(plot_dir, nx, nt, alpha, k):
 
     create_dir(plot_dir)
 
-    result = solve_pde(nx=nx, nt=nt, alpha=alpha, k=k)
+    result = solve_pde(nx=nx, nt=nt, alpha=alpha, k=k, errors='field')
 
     if result is None:
         return
@@ -1,12 +1,183 @@
 # Solve a heat equation
 import subprocess
 from plot_utils import create_dir
-import pandas as pd
 import numpy as np
 import os
+import struct
 
 
-def solve_pde(nx, nt, alpha, k):
+def find_records(path_to_data):
+    """
+    Finds positions of records in a binary file written by Fortran's
+    unformatted `write`. Each record is surrounded by 4-byte markers
+    containing its length in bytes. Records larger than 2 GB are split
+    by gfortran into several subrecords; the leading marker of all
+    but the last subrecord is negative.
+
+    Parameters
+    ----------
+    path_to_data : str
+        Path to the binary file.
+
+
+    Returns
+    -------
+        list of lists of (offset, length) tuples
+            For each record, the positions of its subrecords:
+            offset of the data from the start of the file and its
+            length in bytes.
+    """
+
+    records = []
+    subrecords = []
+    file_size = os.path.getsize(path_to_data)
+    position = 0
+
+    with open(path_to_data, "rb") as file:
+        while position < file_size:
+            file.seek(position)
+            (length,) = struct.unpack("@i", file.read(4))
+            subrecords.append((position + 4, abs(length)))
+            position += abs(length) + 8
+
+            if length >= 0:
+                records.append(subrecords)
+                subrecords = []
+
+    return records
+
+
+def read_integer(path_to_data, record):
+    """
+    Reads a 4-byte integer stored in a single record.
+
+    Parameters
+    ----------
+    path_to_data : str
+        Path to the binary file.
+
+    record : list of (offset, length) tuples
+        Position of the record, see `find_records`.
+
+
+    Returns
+    -------
+        int
+            The value.
+    """
+
+    offset, _ = record[0]
+
+    with open(path_to_data, "rb") as file:
+        file.seek(offset)
+        (value,) = struct.unpack("@i", file.read(4))
+
+    return value
+
+
+def map_array(path_to_data, record, shape):
+    """
+    Returns the array of double floats stored in a record, without reading
+    it into memory. The values are read from disk only when accessed.
+
+    Parameters
+    ----------
+    path_to_data : str
+        Path to the binary file.
+
+    record : list of (offset, length) tuples
+        Position of the record, see `find_records`.
+
+    shape : tuple of int
+        Shape of the array. The data is in the C order for this shape.
+
+
+    Returns
+    -------
+        numpy.ndarray
+            A read-only memory-mapped array. If the record is split into
+            subrecords, its data is not contiguous in the file,
+            and the array is read into memory instead.
+    """
+
+    if len(record) == 1:
+        offset, _ = record[0]
+
+        return np.memmap(path_to_data, dtype=np.float64, mode='r',
+                         offset=offset, shape=shape, order='C')
+
+    parts = [
+        np.memmap(path_to_data, dtype=np.uint8, mode='r',
+                  offset=offset, shape=(length,))
+        for offset, length in record
+    ]
+
+    return np.concatenate(parts).view(np.float64).reshape(shape)
+
+
+def read_solution_from_file(path_to_data):
+    """
+    Read solution from a binary file. Please refer to README.md
+    for description of the binary file format used here.
+
+    The arrays are memory-mapped: only the record markers are read
+    to find the positions of the data, and the values are read from disk
+    when they are accessed. Only the time frames that are used
+    are loaded into memory.
+
+    Parameters
+    ----------
+    path_to_data : str
+        Path to the binary file containing solution or errors data.
+
+
+    Returns
+    -------
+        (x, t, temperatures) tuple
+            x and t are 1D arrays of x and t values, temperatures
+            is a 2D array of the solution or its errors, the first
+            index is t and the second is x. The arrays are read-only.
+    """
+
+    records = find_records(path_to_data)
+    nx = read_integer(path_to_data, records[0])
+    nt = read_integer(path_to_data, records[1])
+    x_values = map_array(path_to_data, records[2], shape=(nx,))
+    t_values = map_array(path_to_data, records[3], shape=(nt,))
+    solution = map_array(path_to_data, records[4], shape=(nt, nx))
+
+    return (x_values, t_values, solution)
+
+
+def read_norms_from_file(path_to_data):
+    """
+    Read norms of the errors from a binary file. Please refer to README.md
+    for description of the binary file format used here.
+
+    Parameters
+    ----------
+    path_to_data : str
+        Path to the binary file containing the norms.
+
+
+    Returns
+    -------
+        (t, norms) tuple
+            t is a 1D array of t values, norms is a 2D array,
+            the first index is t, the second is the norm:
+            0 for L1, 1 for L2 and 2 for L_infinity.
+            The arrays are read-only.
+    """
+
+    records = find_records(path_to_data)
+    nt = read_integer(path_to_data, records[0])
+    t_values = map_array(path_to_data, records[1], shape=(nt,))
+    norms = map_array(path_to_data, records[2], shape=(nt, 3))
+
+    return (t_values, norms)
+
+
+def solve_pde(nx, nt, alpha, k, method='ftcs', errors='norms'):
     """
     Runs Fortran program that solves a heat equation.
 
@@ -25,16 +196,28 @@ def solve_pde(nx, nt, alpha, k):
     k : float
         Thermal difusivity of the metal rod.
 
+    method : str
+        Numerical method: ftcs, crank_nicolson or backward_euler.
+        The implicit methods are stable for any alpha.
+
+    errors : str
+        The errors to calculate: 'norms' for the L1, L2 and L_infinity norms
+        of the errors at each time, or 'field' for the errors
+        at all x and t points.
+
     Returns
     -------
         dict
-            Solution and its errors.
+            Solution and its errors. The errors contain either
+            x_values, t_values and temperatures (for 'field' errors),
+            or t_values, l1, l2 and linf arrays (for 'norms' errors).
     """
 
     create_dir("tmp")
 
     parameters = [
-        f'../build/main tmp/data tmp/errors --nx={nx} --nt={nt} --alpha={alpha} --k={k}'
+        f'../build/main tmp/data tmp/errors --nx={nx} --nt={nt} --alpha={alpha} --k={k} '
+        f'--method={method} --errors={errors}'
     ]
 
     child = subprocess.Popen(parameters,
@@ -50,17 +233,31 @@ def solve_pde(nx, nt, alpha, k):
         print(message)
         return None
 
-    df = pd.read_table("tmp/data", sep='\s+', header=None)
-    x_values = [df.values[0, 1:]]
-    t_values = np.transpose([df.values[1:, 0]])
-    temperatures = df.values[1:, 1:]
+    # The arrays are copied into memory, since the files are removed
+    # before returning
+    x, t, temperatures = read_solution_from_file("tmp/data")
+    x_values = np.array(x)[np.newaxis, :]
+    t_values = np.array(t)[:, np.newaxis]
     temperatures = np.clip(temperatures, 0, 100)
 
-    df = pd.read_table("tmp/errors", sep='\s+', header=None)
-    x_values_errors = [df.values[0, 1:]]
-    t_values_errors = np.transpose([df.values[1:, 0]])
-    temperatures_errors = df.values[1:, 1:]
-    temperatures_errors = np.clip(temperatures_errors, 0, 100)
+    if errors == 'field':
+        x, t, temperatures_errors = read_solution_from_file("tmp/errors")
+
+        errors_result = {
+            "x_values": np.array(x)[np.newaxis, :],
+            "t_values": np.array(t)[:, np.newaxis],
+            "temperatures": np.clip(temperatures_errors, 0, 100)
+        }
+    else:
+        t, norms = read_norms_from_file("tmp/errors")
+        norms = np.array(norms)
+
+        errors_result = {
+            "t_values": np.array(t),
+            "l1": norms[:, 0],
+            "l2": norms[:, 1],
+            "linf": norms[:, 2]
+        }
 
     os.remove("tmp/data")
     os.remove("tmp/errors")
@@ -72,9 +269,5 @@ def solve_pde(nx, nt, alpha, k):
             "t_values": t_values,
             "temperatures": temperatures
         },
-        "errors": {
-            "x_values": x_values_errors,
-            "t_values": t_values_errors,
-            "temperatures": temperatures_errors
-        }
+        "errors": errors_result
     }
\ No newline at end of file
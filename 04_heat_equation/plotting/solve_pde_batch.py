@@ -0,0 +1,332 @@
+# Solve a heat equation for many rods at once with NumPy
+import numpy as np
+
+# Amplitudes of the sine modes below this value are set to zero, since
+# they do not change the solution and arithmetic with subnormal numbers
+# is very slow
+SMALLEST_MODE = 1e-200
+
+
+def implicit_weight(method):
+    """
+    Returns the weight of the implicit part of the numerical method.
+
+    Parameters
+    ----------
+    method : str
+        Numerical method: ftcs, crank_nicolson or backward_euler.
+
+
+    Returns
+    -------
+        float
+            0 for ftcs, 0.5 for crank_nicolson and 1 for backward_euler.
+    """
+
+    weights = {'ftcs': 0., 'crank_nicolson': 0.5, 'backward_euler': 1.}
+
+    if method not in weights:
+        raise ValueError(f"Incorrect method name: '{method}'")
+
+    return weights[method]
+
+
+def step_explicit(temperatures, alpha):
+    """
+    Makes one time step of the heat equation with the ftcs method
+
+        T_i^{n+1} = T_i^n + alpha (T_{i+1}^n - 2 T_i^n + T_{i-1}^n)
+
+    for all rods of the batch. The boundary values do not change.
+
+    Parameters
+    ----------
+    temperatures : numpy.ndarray
+        2D array of temperatures at the current time,
+        the first index is the rod, the second is x.
+
+    alpha : numpy.ndarray
+        The alpha parameters of the rods, k dt / dx^2.
+
+
+    Returns
+    -------
+        numpy.ndarray
+            Temperatures at the next time, same shape as `temperatures`.
+    """
+
+    next_temperatures = temperatures.copy()
+
+    next_temperatures[:, 1:-1] += alpha[:, np.newaxis] * (
+        temperatures[:, 2:] - 2 * temperatures[:, 1:-1] + temperatures[:, :-2]
+    )
+
+    return next_temperatures
+
+
+def sine_eigenvalues(n):
+    """
+    Returns the eigenvalues of the second difference
+
+        u_{i+1} - 2 u_i + u_{i-1},  i = 1..n,  u_0 = u_{n+1} = 0,
+
+    whose eigenvectors are the discrete sine modes sin(pi i m / (n + 1)).
+
+    Parameters
+    ----------
+    n : int
+        Number of interior points.
+
+
+    Returns
+    -------
+        numpy.ndarray
+            1D array, -4 sin^2(pi m / (2 (n + 1))), m = 1..n.
+    """
+
+    modes = np.arange(1, n + 1)
+    return -4 * np.sin(np.pi * modes / (2 * (n + 1)))**2
+
+
+def sine_transform(values):
+    """
+    Returns the discrete sine transform of the last axis of `values`
+
+        y_m = sum_{i=1}^{n} u_i sin(pi i m / (n + 1)),  m = 1..n.
+
+    The transform is calculated with the fast Fourier transform of length
+    2 (n + 1), in O(n log n) operations. Applying the transform twice
+    gives the values multiplied by (n + 1) / 2.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        Array of u_1..u_n values in the last axis.
+
+
+    Returns
+    -------
+        numpy.ndarray
+            Array of y_1..y_n values, same shape as `values`.
+    """
+
+    n = values.shape[-1]
+    padded = np.zeros(values.shape[:-1] + (2 * (n + 1),))
+    padded[..., 1:n + 1] = values
+    return -np.fft.rfft(padded, axis=-1)[..., 1:n + 1].imag
+
+
+def solve_implicit(temperatures, alpha, theta):
+    """
+    Solves the heat equation with the theta method
+
+        T_i^{n+1} - theta alpha (T_{i+1}^{n+1} - 2 T_i^{n+1} + T_{i-1}^{n+1})
+          = T_i^n + (1 - theta) alpha (T_{i+1}^n - 2 T_i^n + T_{i-1}^n)
+
+    for all rods of the batch, with boundary values that do not change.
+    The matrix of the method is the same at all times, and its eigenvectors
+    are the discrete sine modes. The difference between the temperatures
+    and the straight line between the boundary values is expanded into
+    these modes once. Each mode is multiplied by its amplification factor
+    in each time step, and the temperatures are calculated from the modes
+    with the fast sine transform, without solving the tridiagonal systems.
+
+    Parameters
+    ----------
+    temperatures : numpy.ndarray
+        3D array of temperatures, the indices are the rod, t and x.
+        The values at the first time are the initial conditions,
+        the values at other times are calculated.
+
+    alpha : numpy.ndarray
+        The alpha parameters of the rods, k dt / dx^2.
+
+    theta : float
+        The weight of the implicit part: 0.5 for Crank-Nicolson
+        and 1 for backward Euler.
+    """
+
+    nx = temperatures.shape[2]
+    eigenvalues = sine_eigenvalues(nx - 2)
+    alpha = alpha[:, np.newaxis]
+
+    # Amplification factors of the modes, rod and mode indices
+    factors = (1 + (1 - theta) * alpha * eigenvalues) \
+        / (1 - theta * alpha * eigenvalues)
+
+    # Straight lines between the boundary values do not change in time
+    left = temperatures[:, 0, :1]
+    right = temperatures[:, 0, -1:]
+    steady = left + (right - left) * np.linspace(0, 1, nx)[1:-1]
+
+    modes = sine_transform(temperatures[:, 0, 1:-1] - steady) * (2 / (nx - 1))
+
+    for n in range(1, temperatures.shape[1]):
+        modes *= factors
+        modes[np.abs(modes) < SMALLEST_MODE] = 0
+        temperatures[:, n, 1:-1] = steady + sine_transform(modes)
+        temperatures[:, n, [0, -1]] = temperatures[:, 0, [0, -1]]
+
+
+def solve_same_nx(nx, nt, alpha, k, method, errors):
+    """
+    Solves the heat equation for the rods with the same number of x points.
+
+    Parameters
+    ----------
+    nx : int
+        Number of x points.
+
+    nt : int
+        Number of time points.
+
+    alpha : numpy.ndarray
+        Alpha parameters of the rods.
+
+    k : numpy.ndarray
+        Thermal diffusivities of the rods.
+
+    method : str
+        Numerical method: ftcs, crank_nicolson or backward_euler.
+
+    errors : str
+        The errors to calculate: 'norms' or 'field',
+        see `solve_pde_batch`.
+
+
+    Returns
+    -------
+        list of dict
+            Solutions and their errors, see `solve_pde_batch`.
+    """
+
+    theta = implicit_weight(method)
+    batch = len(alpha)
+    x = np.linspace(0, 1, nx)
+    dx = 1 / (nx - 1)
+    dt = alpha * dx**2 / k
+    t = np.arange(nt)[np.newaxis, :] * dt[:, np.newaxis]
+    decay = np.exp(-(np.pi**2) * k[:, np.newaxis] * t)
+    profile = 100 * np.sin(np.pi * x)
+
+    temperatures = np.empty((batch, nt, nx))
+    temperatures[:, 0, :] = profile
+    temperatures[:, 0, [0, -1]] = 0
+
+    if theta == 0:
+        for n in range(1, nt):
+            temperatures[:, n, :] = step_explicit(temperatures[:, n - 1, :],
+                                                  alpha=alpha)
+    else:
+        solve_implicit(temperatures=temperatures, alpha=alpha, theta=theta)
+
+    if errors == 'field':
+        errors_field = np.empty((batch, nt, nx))
+    else:
+        norms = np.empty((batch, nt, 3))
+
+    for n in range(nt):
+        exact = decay[:, n, np.newaxis] * profile
+        errors_n = np.abs(exact - temperatures[:, n, :])
+
+        if errors == 'field':
+            errors_field[:, n, :] = errors_n
+        else:
+            norms[:, n, 0] = dx * errors_n.sum(axis=1)
+            norms[:, n, 1] = np.sqrt(dx * (errors_n**2).sum(axis=1))
+            norms[:, n, 2] = errors_n.max(axis=1)
+
+    # Clip in place, the results of the rods are views of these arrays
+    np.clip(temperatures, 0, 100, out=temperatures)
+
+    if errors == 'field':
+        np.clip(errors_field, 0, 100, out=errors_field)
+
+    results = []
+
+    for i in range(batch):
+        if errors == 'field':
+            errors_result = {
+                "x_values": x[np.newaxis, :],
+                "t_values": t[i, :, np.newaxis],
+                "temperatures": errors_field[i]
+            }
+        else:
+            errors_result = {
+                "t_values": t[i],
+                "l1": norms[i, :, 0],
+                "l2": norms[i, :, 1],
+                "linf": norms[i, :, 2]
+            }
+
+        results.append({
+            "data": {
+                "x_values": x[np.newaxis, :],
+                "t_values": t[i, :, np.newaxis],
+                "temperatures": temperatures[i]
+            },
+            "errors": errors_result
+        })
+
+    return results
+
+
+def solve_pde_batch(nx, nt, alpha, k, method='ftcs', errors='norms'):
+    """
+    Solves the heat equation for many rods, without running the Fortran
+    program. The rods with the same number of x points are advanced
+    in time together, as a 2D array. The results are the same
+    as the ones of `solve_pde` for each rod.
+
+    The nx, alpha and k values are broadcast to the same length,
+    each element describes one rod.
+
+    Parameters
+    ----------
+    nx : int or list of int
+        Number of x points.
+
+    nt : int
+        Number of time points.
+
+    alpha : float or list of float
+        Alpha parameter of the numerical method.
+        Values larger than 0.5 reusult in instable ftcs solutions.
+
+    k : float or list of float
+        Thermal difusivity of the metal rod.
+
+    method : str
+        Numerical method: ftcs, crank_nicolson or backward_euler.
+        The implicit methods are stable for any alpha.
+
+    errors : str
+        The errors to calculate: 'norms' for the L1, L2 and L_infinity norms
+        of the errors at each time, or 'field' for the errors
+        at all x and t points.
+
+
+    Returns
+    -------
+        list of dict
+            Solutions and their errors for the rods, in the same format
+            as the result of `solve_pde`.
+    """
+
+    nx, alpha, k = np.broadcast_arrays(np.atleast_1d(nx),
+                                       np.atleast_1d(alpha).astype(float),
+                                       np.atleast_1d(k).astype(float))
+
+    results = [None] * len(nx)
+
+    for nx_value in np.unique(nx):
+        rods = np.flatnonzero(nx == nx_value)
+
+        group_results = solve_same_nx(nx=int(nx_value), nt=nt,
+                                      alpha=alpha[rods], k=k[rods],
+                                      method=method, errors=errors)
+
+        for rod, result in zip(rods, group_results):
+            results[rod] = result
+
+    return results
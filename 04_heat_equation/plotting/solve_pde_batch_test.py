@@ -0,0 +1,97 @@
+from solve_pde_batch import solve_pde_batch, sine_eigenvalues, \
+    sine_transform
+from solve_pde import solve_pde
+from pytest import approx
+import numpy as np
+import pytest
+
+
+def test_sine_eigenvalues():
+    eigenvalues = sine_eigenvalues(5)
+
+    indices = np.arange(1, 6)
+    sines = np.sin(np.pi * np.outer(indices, indices) / 6)
+
+    # The sine modes are the eigenvectors of the second difference
+    second_difference = -2 * np.identity(5) + np.eye(5, k=1) + np.eye(5, k=-1)
+
+    assert second_difference @ sines == \
+        approx(sines * eigenvalues[np.newaxis, :], abs=1e-14)
+
+
+def test_sine_transform():
+    values = np.array([[1, -2, 3.5, 0.25, 7], [0, 1, 0, 0, 0]])
+
+    indices = np.arange(1, 6)
+    sines = np.sin(np.pi * np.outer(indices, indices) / 6)
+
+    assert sine_transform(values) == approx(values @ sines, abs=1e-13)
+
+    # Applying the transform twice multiplies the values by (n + 1) / 2
+    assert sine_transform(sine_transform(values)) == \
+        approx(3 * values, abs=1e-13)
+
+
+@pytest.mark.parametrize("method, alpha", [('ftcs', [0.25, 0.1]),
+                                           ('crank_nicolson', [25, 2]),
+                                           ('backward_euler', [25, 2])])
+def test_solve_pde_batch__same_as_solve_pde(method, alpha):
+    k = [2.28e-5, 1e-4]
+    results = solve_pde_batch(nx=21, nt=50, alpha=alpha, k=k, method=method)
+
+    assert len(results) == 2
+
+    for i in range(2):
+        expected = solve_pde(nx=21, nt=50, alpha=alpha[i], k=k[i],
+                             method=method)
+
+        data = results[i]['data']
+        expected_data = expected['data']
+
+        assert data['x_values'].shape == (1, 21)
+        assert data['t_values'].shape == (50, 1)
+        assert data['x_values'] == approx(expected_data['x_values'])
+        assert data['t_values'] == approx(expected_data['t_values'])
+
+        assert data['temperatures'] == \
+            approx(expected_data['temperatures'], abs=1e-9)
+
+        for norm in ['t_values', 'l1', 'l2', 'linf']:
+            assert results[i]['errors'][norm] == \
+                approx(expected['errors'][norm], rel=1e-6, abs=1e-9)
+
+
+def test_solve_pde_batch__errors_field():
+    results = solve_pde_batch(nx=21, nt=50, alpha=25, k=2.28e-5,
+                              method='crank_nicolson', errors='field')
+
+    expected = solve_pde(nx=21, nt=50, alpha=25, k=2.28e-5,
+                         method='crank_nicolson', errors='field')
+
+    assert len(results) == 1
+    errors = results[0]['errors']
+    assert sorted(errors.keys()) == ['t_values', 'temperatures', 'x_values']
+    assert errors['x_values'].shape == (1, 21)
+    assert errors['t_values'].shape == (50, 1)
+
+    assert errors['temperatures'] == \
+        approx(expected['errors']['temperatures'], abs=1e-9)
+
+
+def test_solve_pde_batch__different_nx():
+    results = solve_pde_batch(nx=[21, 11, 21], nt=20, alpha=0.25,
+                              k=[1e-5, 2e-5, 3e-5])
+
+    assert len(results) == 3
+    assert sorted(results[0].keys()) == ['data', 'errors']
+    assert sorted(results[0]['errors'].keys()) == \
+        ['l1', 'l2', 'linf', 't_values']
+
+    assert [result['data']['x_values'].shape[1] for result in results] == \
+        [21, 11, 21]
+
+    # The rods are in the same order as the parameters
+    single = solve_pde_batch(nx=21, nt=20, alpha=0.25, k=3e-5)[0]
+
+    assert results[2]['data']['temperatures'].tolist() == \
+        single['data']['temperatures'].tolist()
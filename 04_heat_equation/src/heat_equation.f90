@@ -6,10 +6,12 @@ use Types, only: dp
 use Constants, only: pi
 use Settings, only: program_settings, read_from_command_line
 use FloatUtils, only: linspace
+use Tridiagonal, only: solve_tridiagonal
 implicit none
 private
-public :: solve_heat_equation, print_data, solve_and_create_output, &
-          read_settings_solve_and_create_output, write_to_file
+public :: solve_heat_equation, implicit_weight, step_implicit, &
+          error_norms, print_output, print_norms, solve_and_create_output, &
+          read_settings_solve_and_create_output
 
 contains
 
@@ -28,6 +30,10 @@ contains
 !
 ! where L = 1 m.􏰅
 !
+! The explicit forward differencing method (ftcs) is stable for
+! alpha <= 0.5. The implicit methods (crank_nicolson, backward_euler)
+! are stable for any alpha and can use much larger time steps.
+!
 !
 ! Inputs:
 ! -------
@@ -41,19 +47,25 @@ contains
 ! data : 2D array containing the solution for the temperature
 !        first coordinate is x, second is time.
 !
-! errors : 2D array containing the absolute value of the difference between
-!          the approximate and exact solutions.
+! errors : (optional) 2D array containing the absolute value of
+!          the difference between the approximate and exact solutions.
 !
 ! x_points : A 1D array containing the values of the x coordinate
 !
 ! t_points : A 1D array containing the values of the time coordinate
 !
-subroutine solve_heat_equation(options, data, errors, x_points, t_points)
+! norms : (optional) 2D array containing L1, L2 and L_infinity norms
+!         of the errors (first coordinate) at each time (second coordinate),
+!         see `error_norms`.
+!
+subroutine solve_heat_equation(options, data, errors, x_points, t_points, &
+                               norms)
     type(program_settings), intent(in) :: options
-    real(dp), allocatable, intent(out) :: data(:,:), errors(:,:)
+    real(dp), allocatable, intent(out) :: data(:,:)
+    real(dp), allocatable, intent(out), optional :: errors(:,:), norms(:,:)
     real(dp), allocatable, intent(out) :: x_points(:), t_points(:)
     real(dp) :: l, x0, x1, dx, t0, dt, alpha, k, t
-    real(dp), allocatable :: exact(:,:)
+    real(dp), allocatable :: exact(:)
     integer :: nx, nt, n
 
     k = options%k
@@ -69,10 +81,11 @@ subroutine solve_heat_equation(options, data, errors, x_points, t_points)
 
     ! Allocate the arrays
     allocate(data(nx, nt))
-    allocate(exact(nx, nt))
-    allocate(errors(nx, nt))
+    allocate(exact(nx))
     allocate(x_points(nx))
     allocate(t_points(nt))
+    if (present(errors)) allocate(errors(nx, nt))
+    if (present(norms)) allocate(norms(3, nt))
 
     ! Assign evenly spaced x values
     call linspace(x0, x1, x_points)
@@ -84,96 +97,216 @@ subroutine solve_heat_equation(options, data, errors, x_points, t_points)
     data(1, :) = 0
     data(nx, :) = 0
 
-    ! Calculate numerical solution using forward differencing method
-    do n = 1, nt - 1
-        data(2 : nx - 1, n + 1) = data(2 : nx - 1, n) &
-            + alpha * ( &
-                data(3 : nx, n) &
-                - 2 * data(2 : nx - 1, n) &
-                + data(1 : nx - 2, n) &
-            )
-    end do
+    if (options%method == "ftcs") then
+        ! Calculate numerical solution using forward differencing method
+        do n = 1, nt - 1
+            data(2 : nx - 1, n + 1) = data(2 : nx - 1, n) &
+                + alpha * ( &
+                    data(3 : nx, n) &
+                    - 2 * data(2 : nx - 1, n) &
+                    + data(1 : nx - 2, n) &
+                )
+        end do
+    else
+        do n = 1, nt - 1
+            call step_implicit(theta=implicit_weight(options%method), &
+                               alpha=alpha, current=data(:, n), &
+                               next=data(:, n + 1))
+        end do
+    end if
 
-    ! Calculate exact solution
+    ! Calculate exact solution and the errors, one time level at a time
     do n = 1, nt
         t = t0 + real(n - 1, dp) * dt
         t_points(n) = t
 
-        exact(:, n) = 100 * exp(-(pi**2)*k*t / (l**2)) * sin(pi * x_points / l)
-    end do
+        exact = 100 * exp(-(pi**2)*k*t / (l**2)) * sin(pi * x_points / l)
 
-    ! Calculate the errors
-    errors = abs(exact - data)
+        if (present(errors)) errors(:, n) = abs(exact - data(:, n))
+
+        if (present(norms)) then
+            norms(:, n) = error_norms(errors=abs(exact - data(:, n)), dx=dx)
+        end if
+    end do
 end subroutine
 
 
 !
-! Prints 2D array containing solutions (or their errors)
-! to a string variable. In addition to the solution, the first row
-! contains the x coordinate, and the first column contains the t coordinate
+! Calculates norms of the errors of the solution at one time level
 !
 ! Inputs:
 ! -------
 !
-! data : a 2D array containing solutions or errors for printing
+! errors : the absolute values of the errors at the x points.
 !
-! x_points : A 1D array containing the values of the x coordinate
+! dx : the distance between the x points.
 !
-! t_points : A 1D array containing the values of the time coordinate
+!
+! Outputs:
+! -------
+!
+! Returns : array with the three norms:
+!
+!   L1 = dx sum(errors),
+!
+!   L2 = sqrt(dx sum(errors^2)),
+!
+!   L_infinity = max(errors).
+!
+function error_norms(errors, dx) result(norms)
+    real(dp), intent(in) :: errors(:), dx
+    real(dp) :: norms(3)
+
+    norms(1) = dx * sum(errors)
+    norms(2) = sqrt(dx * sum(errors**2))
+    norms(3) = maxval(errors)
+end function
+
+
+!
+! Returns the weight of the implicit part of the method
+!
+! Inputs:
+! -------
+!
+! method : numerical method: ftcs, crank_nicolson, backward_euler
 !
 !
 ! Outputs:
 ! -------
 !
-! output : text output containing solution
+! Returns : 0 for ftcs, 0.5 for crank_nicolson and 1 for backward_euler.
 !
-subroutine print_data(data, x_points, t_points, output)
-    real(dp), intent(in) :: data(:,:),  x_points(:), t_points(:)
-    character(len=:), allocatable, intent(out) :: output
-    character(len=:), allocatable :: tmp_arr
-    character(len=1024*10) :: buffer
-    integer :: n, nx, j, allocated = 1024*10
-    character(len=1024) :: rowfmt
-
-    allocate(character(len=allocated) :: output)
-    output = ""
-    nx = size(x_points)
-    write(rowfmt,'(A,I4,A)') '(',nx + 1,'(1X,ES24.17))'
-    write(buffer, fmt = rowfmt) 0._dp, (x_points(j), j=1, nx)
-    output = output // trim(buffer) // new_line('A')
-
-    do n = 1, size(t_points)
-        write(buffer, fmt = rowfmt) t_points(n), (data(j, n), j=1, nx)
-        output = output // trim(buffer) // new_line('A')
-
-        ! Resize the string array if too small
-        if (len(output) > allocated / 2) then
-            allocated = 2 * allocated
-            allocate(character(len=allocated) :: tmp_arr)
-            tmp_arr = output
-            deallocate(output)
-            call move_alloc(tmp_arr, output)
-        end if
-    end do
+function implicit_weight(method) result(theta)
+    character(len=*), intent(in) :: method
+    real(dp) :: theta
+
+    select case (method)
+    case ("crank_nicolson")
+        theta = 0.5_dp
+    case ("backward_euler")
+        theta = 1
+    case default
+        theta = 0
+    end select
+end function
+
+
+!
+! Makes one time step of the heat equation with the theta method
+!
+!   T_i^{n+1} - theta alpha (T_{i+1}^{n+1} - 2 T_i^{n+1} + T_{i-1}^{n+1})
+!     = T_i^n + (1 - theta) alpha (T_{i+1}^n - 2 T_i^n + T_{i-1}^n),
+!
+! by solving the tridiagonal system for the interior points.
+! The boundary values are copied from the current time level.
+!
+! Inputs:
+! -------
+!
+! theta : the weight of the implicit part: 0.5 for Crank-Nicolson,
+!         1 for backward Euler.
+!
+! alpha : the alpha parameter of the numerical solution, k dt / dx^2.
+!
+! current : the temperatures at the current time level.
+!
+!
+! Outputs:
+! -------
+!
+! next : the temperatures at the next time level.
+!
+subroutine step_implicit(theta, alpha, current, next)
+    real(dp), intent(in) :: theta, alpha, current(:)
+    real(dp), intent(out) :: next(:)
+    real(dp), dimension(size(current) - 2) :: lower, diagonal, upper, rhs
+    integer :: nx
+
+    nx = size(current)
+    next(1) = current(1)
+    next(nx) = current(nx)
+    if (nx < 3) return
+
+    lower = -theta * alpha
+    diagonal = 1 + 2 * theta * alpha
+    upper = -theta * alpha
+
+    rhs = current(2 : nx - 1) &
+        + (1 - theta) * alpha * ( &
+            current(3 : nx) &
+            - 2 * current(2 : nx - 1) &
+            + current(1 : nx - 2) &
+        )
+
+    ! Add the boundary values of the next time level
+    rhs(1) = rhs(1) + theta * alpha * next(1)
+    rhs(nx - 2) = rhs(nx - 2) + theta * alpha * next(nx)
+
+    call solve_tridiagonal(lower=lower, diagonal=diagonal, upper=upper, &
+                           rhs=rhs, solution=next(2 : nx - 1))
 end subroutine
 
 
 !
-! Write text to a file
+! Prints 2D array containing solutions (or their errors) to a binary
+! data file. See README.md for description of the file format.
 !
 ! Inputs:
 ! -------
 !
-! text : a text to be written
+! filename : Name of the data file to print output to
+!
+! data : a 2D array containing solutions or errors for printing,
+!        the first coordinate is x, the second is t.
+!
+! x_points : A 1D array containing the values of the x coordinate
 !
-! path : path to a text file to be created
+! t_points : A 1D array containing the values of the time coordinate
 !
-subroutine write_to_file(text, path)
-    character(len=*), intent(in) :: text, path
+subroutine print_output(filename, data, x_points, t_points)
+    character(len=*), intent(in) :: filename
+    real(dp), intent(in) :: data(:,:),  x_points(:), t_points(:)
     integer, parameter :: out_unit=20
 
-    open(unit=out_unit, file=path, action="write", status="replace")
-    write(out_unit, "(a)") text
+    open(unit=out_unit, file=filename, form="unformatted", action="write", &
+        status="replace")
+
+    write(out_unit) size(x_points)
+    write(out_unit) size(t_points)
+    write(out_unit) x_points
+    write(out_unit) t_points
+    write(out_unit) data
+
+    close(unit=out_unit)
+end subroutine
+
+!
+! Prints norms of the errors to a binary data file.
+! See README.md for description of the file format.
+!
+! Inputs:
+! -------
+!
+! filename : Name of the data file to print output to
+!
+! norms : a 2D array containing L1, L2 and L_infinity norms of the errors
+!         (first coordinate) at each time (second coordinate).
+!
+! t_points : A 1D array containing the values of the time coordinate
+!
+subroutine print_norms(filename, norms, t_points)
+    character(len=*), intent(in) :: filename
+    real(dp), intent(in) :: norms(:,:), t_points(:)
+    integer, parameter :: out_unit=20
+
+    open(unit=out_unit, file=filename, form="unformatted", action="write", &
+        status="replace")
+
+    write(out_unit) size(t_points)
+    write(out_unit) t_points
+    write(out_unit) norms
+
     close(unit=out_unit)
 end subroutine
 
@@ -187,15 +320,20 @@ end subroutine
 !
 subroutine solve_and_create_output(options)
     type(program_settings), intent(in) :: options
-    real(dp), allocatable :: data(:,:), errors(:,:)
+    real(dp), allocatable :: data(:,:), errors(:,:), norms(:,:)
     real(dp), allocatable :: x_points(:), t_points(:)
-    character(len=:), allocatable :: data_output, errors_output
 
-    call solve_heat_equation(options, data, errors, x_points, t_points)
-    call print_data(data, x_points, t_points, data_output)
-    call print_data(errors, x_points, t_points, errors_output)
-    call write_to_file(data_output, options%output_path)
-    call write_to_file(errors_output, options%errors_path)
+    if (options%errors == "field") then
+        call solve_heat_equation(options, data, errors, x_points, t_points)
+        call print_output(options%errors_path, errors, x_points, t_points)
+    else
+        call solve_heat_equation(options, data, x_points=x_points, &
+                                 t_points=t_points, norms=norms)
+
+        call print_norms(options%errors_path, norms, t_points)
+    end if
+
+    call print_output(options%output_path, data, x_points, t_points)
 end subroutine
 
 !
@@ -2,9 +2,9 @@ module HeatEquationTest
 use Types, only: dp
 use AssertsTest, only: assert_true, assert_approx, assert_equal
 
-use HeatEquation, only: solve_heat_equation, print_data, &
-    solve_and_create_output, read_settings_solve_and_create_output, &
-    write_to_file
+use HeatEquation, only: solve_heat_equation, implicit_weight, &
+    step_implicit, error_norms, print_output, print_norms, &
+    solve_and_create_output, read_settings_solve_and_create_output
 
 use Settings, only: program_settings
 use FileUtils, only: file_exists, delete_file
@@ -53,103 +53,278 @@ subroutine solve_heat_eqn_test(failures)
     call assert_approx(errors(20, 10), 0.0_dp, 1e-5_dp, __FILE__, __LINE__, failures)
 end
 
-subroutine print_data_test(failures)
+subroutine solve_heat_eqn_test__implicit(failures)
     integer, intent(inout) :: failures
-    real(dp) :: data(3,3), value(4)
-    real(dp) :: x_points(3), t_points(3)
-    character(len=:), allocatable :: output
+    type(program_settings) :: options
+    real(dp), allocatable :: data(:,:), errors(:,:)
+    real(dp), allocatable :: x_points(:), t_points(:)
+    character(len=100) :: methods(2)
+    integer :: i
+
+    methods = [character(len=100) :: 'crank_nicolson', 'backward_euler']
+
+    do i = 1, 2
+        ! Time step is 100 times larger than the one of the stable
+        ! explicit method
+        options%nx = 21
+        options%nt = 5
+        options%alpha = 25
+        options%k = 2.28e-5
+        options%method = methods(i)
+
+        call solve_heat_equation(options, data, errors, x_points, t_points)
+
+        call assert_approx(t_points(5), 10964.9119_dp, 1e-3_dp, &
+                           __FILE__, __LINE__, failures)
+
+        call assert_approx(data(1, 5), 0.0_dp, 1e-10_dp, &
+                           __FILE__, __LINE__, failures)
+
+        call assert_approx(data(21, 5), 0.0_dp, 1e-10_dp, &
+                           __FILE__, __LINE__, failures)
+
+        ! The solution is symmetric
+        call assert_true(maxval(abs(data(:, 5) - data(21:1:-1, 5))) &
+                         < 1e-12_dp, __FILE__, __LINE__, failures)
+
+        ! The solution does not oscillate
+        call assert_true(all(data(2:20, 5) > 0), &
+                         __FILE__, __LINE__, failures)
+    end do
+
+    ! Backward Euler is first order accurate in time
+    ! (the exact value is 8.48)
+    call assert_approx(data(11, 5), 14.678542_dp, 1e-5_dp, &
+                       __FILE__, __LINE__, failures)
+
+    call assert_approx(errors(11, 5), 6.198045_dp, 1e-5_dp, &
+                       __FILE__, __LINE__, failures)
+
+    ! Crank-Nicolson is second order accurate in time
+    options%method = 'crank_nicolson'
+    call solve_heat_equation(options, data, errors, x_points, t_points)
+
+    call assert_approx(data(11, 5), 7.848628_dp, 1e-5_dp, &
+                       __FILE__, __LINE__, failures)
+
+    call assert_approx(errors(11, 5), 0.631870_dp, 1e-5_dp, &
+                       __FILE__, __LINE__, failures)
+end
+
+subroutine solve_heat_eqn_test__norms(failures)
+    integer, intent(inout) :: failures
+    type(program_settings) :: options
+    real(dp), allocatable :: data(:,:), errors(:,:), norms(:,:)
+    real(dp), allocatable :: data_norms(:,:)
+    real(dp), allocatable :: x_points(:), t_points(:)
+    integer :: n
+
+    options%nx = 20
+    options%nt = 100
+    options%alpha = 0.25_dp
+    options%k = 2.28e-5
+
+    call solve_heat_equation(options, data, errors, x_points, t_points)
+
+    call solve_heat_equation(options, data_norms, x_points=x_points, &
+                             t_points=t_points, norms=norms)
+
+    call assert_equal(size(norms, 1), 3, __FILE__, __LINE__, failures)
+    call assert_equal(size(norms, 2), 100, __FILE__, __LINE__, failures)
+
+    ! The solution does not depend on the errors output
+    call assert_true(maxval(abs(data - data_norms)) < tiny(1._dp), &
+                     __FILE__, __LINE__, failures)
+
+    ! The norms are calculated from the errors at each time
+    do n = 1, 100
+        call assert_approx(norms(3, n), maxval(errors(:, n)), 1e-15_dp, &
+                           __FILE__, __LINE__, failures)
+
+        call assert_approx(norms(1, n), sum(errors(:, n)) / 19, 1e-13_dp, &
+                           __FILE__, __LINE__, failures)
+    end do
+
+    call assert_approx(norms(3, 10), 0.65785847e-2_dp, 1e-5_dp, &
+                       __FILE__, __LINE__, failures)
+end
+
+subroutine error_norms_test(failures)
+    integer, intent(inout) :: failures
+    real(dp) :: norms(3)
+
+    norms = error_norms(errors=[0._dp, 3._dp, 4._dp, 0._dp], dx=0.5_dp)
+
+    call assert_approx(norms(1), 3.5_dp, 1e-15_dp, __FILE__, __LINE__, failures)
+    call assert_approx(norms(2), sqrt(12.5_dp), 1e-15_dp, __FILE__, __LINE__, failures)
+    call assert_approx(norms(3), 4._dp, 1e-15_dp, __FILE__, __LINE__, failures)
+end
+
+subroutine implicit_weight_test(failures)
+    integer, intent(inout) :: failures
+
+    call assert_approx(implicit_weight("ftcs"), 0._dp, 1e-15_dp, &
+                       __FILE__, __LINE__, failures)
+
+    call assert_approx(implicit_weight("crank_nicolson"), 0.5_dp, 1e-15_dp, &
+                       __FILE__, __LINE__, failures)
+
+    call assert_approx(implicit_weight("backward_euler"), 1._dp, 1e-15_dp, &
+                       __FILE__, __LINE__, failures)
+end
+
+subroutine step_implicit_test(failures)
+    integer, intent(inout) :: failures
+    real(dp) :: current(5), next(5)
+
+    current = [1._dp, 2._dp, 3._dp, 2._dp, 1._dp]
+
+    ! Explicit step with zero weight
+    call step_implicit(theta=0._dp, alpha=0.25_dp, current=current, next=next)
+
+    call assert_approx(next(1), 1._dp, 1e-14_dp, __FILE__, __LINE__, failures)
+    call assert_approx(next(2), 2._dp, 1e-14_dp, __FILE__, __LINE__, failures)
+    call assert_approx(next(3), 2.5_dp, 1e-14_dp, __FILE__, __LINE__, failures)
+    call assert_approx(next(4), 2._dp, 1e-14_dp, __FILE__, __LINE__, failures)
+    call assert_approx(next(5), 1._dp, 1e-14_dp, __FILE__, __LINE__, failures)
+
+    ! Backward Euler: the next values satisfy the implicit equations
+    call step_implicit(theta=1._dp, alpha=2._dp, current=current, next=next)
+
+    call assert_approx(next(1), 1._dp, 1e-14_dp, __FILE__, __LINE__, failures)
+    call assert_approx(next(5), 1._dp, 1e-14_dp, __FILE__, __LINE__, failures)
+
+    call assert_true(maxval(abs(next(2:4) &
+                     - 2._dp * (next(3:5) - 2 * next(2:4) + next(1:3)) &
+                     - current(2:4))) < 1e-14_dp, &
+                     __FILE__, __LINE__, failures)
+end
+
+subroutine print_output_test(failures)
+    integer, intent(inout) :: failures
+    real(dp) :: data(3,2), x_points(3), t_points(2)
+    real(dp) :: data_read(3,2), x_points_read(3), t_points_read(2)
+    integer :: nx, nt
     integer, parameter :: unit=15
 
-    data = reshape((/ 1, 2, 3, 4, 5, 6, 7, 8, 9 /), shape(data))
+    data = reshape((/ 1, 2, 3, 4, 5, 6 /), shape(data))
     x_points = [1.1_dp, 1.2_dp, 1.3_dp]
-    t_points = [0.1_dp, 0.2_dp, 0.3_dp]
+    t_points = [0.1_dp, 0.2_dp]
 
-    call print_data(data, x_points, t_points, output)
+    call print_output("test_data.dat", data, x_points, t_points)
 
     ! Verify the data
     ! ----------
 
-    call write_to_file(output, "test_data")
+    open(unit=unit, file="test_data.dat", form='unformatted', &
+        status='old', action='read' )
+
+    read (unit) nx
+    call assert_equal(nx, 3, __FILE__, __LINE__, failures)
+
+    read (unit) nt
+    call assert_equal(nt, 2, __FILE__, __LINE__, failures)
+
+    read (unit) x_points_read
+    call assert_approx(x_points_read(1), 1.1_dp, 1e-15_dp, __FILE__, __LINE__, failures)
+    call assert_approx(x_points_read(3), 1.3_dp, 1e-15_dp, __FILE__, __LINE__, failures)
+
+    read (unit) t_points_read
+    call assert_approx(t_points_read(1), 0.1_dp, 1e-15_dp, __FILE__, __LINE__, failures)
+    call assert_approx(t_points_read(2), 0.2_dp, 1e-15_dp, __FILE__, __LINE__, failures)
+
+    read (unit) data_read
+    call assert_approx(data_read(1, 1), 1._dp, 1e-15_dp, __FILE__, __LINE__, failures)
+    call assert_approx(data_read(3, 1), 3._dp, 1e-15_dp, __FILE__, __LINE__, failures)
+    call assert_approx(data_read(1, 2), 4._dp, 1e-15_dp, __FILE__, __LINE__, failures)
+    call assert_approx(data_read(3, 2), 6._dp, 1e-15_dp, __FILE__, __LINE__, failures)
+
+    close(unit=unit)
+
+    call delete_file("test_data.dat")
+end
 
-    open (unit=unit, file="test_data", status='old',    &
-        access='sequential', form='formatted', action='read' )
+subroutine print_norms_test(failures)
+    integer, intent(inout) :: failures
+    real(dp) :: norms(3,2), t_points(2)
+    real(dp) :: norms_read(3,2), t_points_read(2)
+    integer :: nt
+    integer, parameter :: unit=15
 
-    read (unit, *) value
-    call assert_approx(value(1), 0._dp, 1e-5_dp, __FILE__, __LINE__, failures)
-    call assert_approx(value(2), 1.1_dp, 1e-5_dp, __FILE__, __LINE__, failures)
-    call assert_approx(value(3), 1.2_dp, 1e-5_dp, __FILE__, __LINE__, failures)
-    call assert_approx(value(4), 1.3_dp, 1e-5_dp, __FILE__, __LINE__, failures)
+    norms = reshape((/ 1, 2, 3, 4, 5, 6 /), shape(norms))
+    t_points = [0.1_dp, 0.2_dp]
 
-    read (unit, *) value
-    call assert_approx(value(1), 0.1_dp, 1e-5_dp, __FILE__, __LINE__, failures)
-    call assert_approx(value(2), 1._dp, 1e-5_dp, __FILE__, __LINE__, failures)
-    call assert_approx(value(3), 2._dp, 1e-5_dp, __FILE__, __LINE__, failures)
-    call assert_approx(value(4), 3._dp, 1e-5_dp, __FILE__, __LINE__, failures)
+    call print_norms("test_norms.dat", norms, t_points)
 
-    read (unit, *) value
-    call assert_approx(value(1), 0.2_dp, 1e-5_dp, __FILE__, __LINE__, failures)
-    call assert_approx(value(2), 4._dp, 1e-5_dp, __FILE__, __LINE__, failures)
-    call assert_approx(value(3), 5._dp, 1e-5_dp, __FILE__, __LINE__, failures)
-    call assert_approx(value(4), 6._dp, 1e-5_dp, __FILE__, __LINE__, failures)
+    open(unit=unit, file="test_norms.dat", form='unformatted', &
+        status='old', action='read' )
 
-    read (unit, *) value
-    call assert_approx(value(1), 0.3_dp, 1e-5_dp, __FILE__, __LINE__, failures)
-    call assert_approx(value(2), 7._dp, 1e-5_dp, __FILE__, __LINE__, failures)
-    call assert_approx(value(3), 8._dp, 1e-5_dp, __FILE__, __LINE__, failures)
-    call assert_approx(value(4), 9._dp, 1e-5_dp, __FILE__, __LINE__, failures)
+    read (unit) nt
+    call assert_equal(nt, 2, __FILE__, __LINE__, failures)
+
+    read (unit) t_points_read
+    call assert_approx(t_points_read(2), 0.2_dp, 1e-15_dp, __FILE__, __LINE__, failures)
+
+    read (unit) norms_read
+    call assert_approx(norms_read(1, 1), 1._dp, 1e-15_dp, __FILE__, __LINE__, failures)
+    call assert_approx(norms_read(3, 1), 3._dp, 1e-15_dp, __FILE__, __LINE__, failures)
+    call assert_approx(norms_read(1, 2), 4._dp, 1e-15_dp, __FILE__, __LINE__, failures)
+    call assert_approx(norms_read(3, 2), 6._dp, 1e-15_dp, __FILE__, __LINE__, failures)
 
     close(unit=unit)
 
-    call delete_file("test_data")
+    call delete_file("test_norms.dat")
 end
 
 subroutine solve_and_create_output_test(failures)
     integer, intent(inout) :: failures
     type(program_settings) :: options
-    real(dp) :: data(4)
+    real(dp) :: x_points(3), t_points(3), data(3, 3)
+    integer :: nx, nt
     integer, parameter :: unit=15
 
     options%nx = 3
     options%nt = 3
     options%alpha = 0.25_dp
     options%k = 2.28e-5
-    options%output_path = "test_output.txt"
-    options%errors_path = "test_errors.txt"
+    options%output_path = "test_output.dat"
+    options%errors_path = "test_errors.dat"
+    options%errors = "field"
 
     call solve_and_create_output(options)
 
-    call assert_true(file_exists("test_output.txt"), __FILE__, __LINE__, failures)
-    call assert_true(file_exists("test_errors.txt"), __FILE__, __LINE__, failures)
+    call assert_true(file_exists("test_output.dat"), __FILE__, __LINE__, failures)
+    call assert_true(file_exists("test_errors.dat"), __FILE__, __LINE__, failures)
 
     ! Check output file
     ! ----------
 
-    open (unit=unit, file="test_output.txt", status='old',    &
-        access='sequential', form='formatted', action='read' )
-
-    read (unit, *) data
-    call assert_approx(data(1), 0._dp, 1e-5_dp, __FILE__, __LINE__, failures)
-    call assert_approx(data(2), 0._dp, 1e-5_dp, __FILE__, __LINE__, failures)
-    call assert_approx(data(3), 0.5_dp, 1e-5_dp, __FILE__, __LINE__, failures)
-    call assert_approx(data(4), 1._dp, 1e-5_dp, __FILE__, __LINE__, failures)
-
-    read (unit, *) data
-    call assert_approx(data(1), 0._dp, 1e-5_dp, __FILE__, __LINE__, failures)
-    call assert_approx(data(2), 0._dp, 1e-5_dp, __FILE__, __LINE__, failures)
-    call assert_approx(data(3), 100._dp, 1e-5_dp, __FILE__, __LINE__, failures)
-    call assert_approx(data(4), 0._dp, 1e-5_dp, __FILE__, __LINE__, failures)
-
-    read (unit, *) data
-    call assert_approx(data(1), 2741.22797_dp, 1e-5_dp, __FILE__, __LINE__, failures)
-    call assert_approx(data(2), 0._dp, 1e-5_dp, __FILE__, __LINE__, failures)
-    call assert_approx(data(3), 50._dp, 1e-5_dp, __FILE__, __LINE__, failures)
-    call assert_approx(data(4), 0._dp, 1e-5_dp, __FILE__, __LINE__, failures)
-
-    read (unit, *) data
-    call assert_approx(data(1), 5482.455946_dp, 1e-5_dp, __FILE__, __LINE__, failures)
-    call assert_approx(data(2), 0._dp, 1e-5_dp, __FILE__, __LINE__, failures)
-    call assert_approx(data(3), 25._dp, 1e-5_dp, __FILE__, __LINE__, failures)
-    call assert_approx(data(4), 0._dp, 1e-5_dp, __FILE__, __LINE__, failures)
+    open(unit=unit, file="test_output.dat", form='unformatted', &
+        status='old', action='read' )
+
+    read (unit) nx
+    call assert_equal(nx, 3, __FILE__, __LINE__, failures)
+
+    read (unit) nt
+    call assert_equal(nt, 3, __FILE__, __LINE__, failures)
+
+    read (unit) x_points
+    call assert_approx(x_points(1), 0._dp, 1e-5_dp, __FILE__, __LINE__, failures)
+    call assert_approx(x_points(2), 0.5_dp, 1e-5_dp, __FILE__, __LINE__, failures)
+    call assert_approx(x_points(3), 1._dp, 1e-5_dp, __FILE__, __LINE__, failures)
+
+    read (unit) t_points
+    call assert_approx(t_points(1), 0._dp, 1e-5_dp, __FILE__, __LINE__, failures)
+    call assert_approx(t_points(2), 2741.22797_dp, 1e-5_dp, __FILE__, __LINE__, failures)
+    call assert_approx(t_points(3), 5482.455946_dp, 1e-5_dp, __FILE__, __LINE__, failures)
+
+    read (unit) data
+    call assert_approx(data(1, 1), 0._dp, 1e-5_dp, __FILE__, __LINE__, failures)
+    call assert_approx(data(2, 1), 100._dp, 1e-5_dp, __FILE__, __LINE__, failures)
+    call assert_approx(data(3, 1), 0._dp, 1e-5_dp, __FILE__, __LINE__, failures)
+    call assert_approx(data(2, 2), 50._dp, 1e-5_dp, __FILE__, __LINE__, failures)
+    call assert_approx(data(2, 3), 25._dp, 1e-5_dp, __FILE__, __LINE__, failures)
+    call assert_approx(data(3, 3), 0._dp, 1e-5_dp, __FILE__, __LINE__, failures)
 
     close(unit=unit)
 
@@ -157,37 +332,74 @@ subroutine solve_and_create_output_test(failures)
     ! Check errors file
     ! ----------
 
-    open (unit=unit, file="test_errors.txt", status='old',    &
-        access='sequential', form='formatted', action='read' )
-
-    read (unit, *) data
-    call assert_approx(data(1), 0._dp, 1e-5_dp, __FILE__, __LINE__, failures)
-    call assert_approx(data(2), 0._dp, 1e-5_dp, __FILE__, __LINE__, failures)
-    call assert_approx(data(3), 0.5_dp, 1e-5_dp, __FILE__, __LINE__, failures)
-    call assert_approx(data(4), 1._dp, 1e-5_dp, __FILE__, __LINE__, failures)
-
-    read (unit, *) data
-    call assert_approx(data(1), 0._dp, 1e-5_dp, __FILE__, __LINE__, failures)
-    call assert_approx(data(2), 0._dp, 1e-5_dp, __FILE__, __LINE__, failures)
-    call assert_approx(data(3), 0._dp, 1e-5_dp, __FILE__, __LINE__, failures)
-    call assert_approx(data(4), 0._dp, 1e-5_dp, __FILE__, __LINE__, failures)
-
-    read (unit, *) data
-    call assert_approx(data(1), 2741.22797_dp, 1e-5_dp, __FILE__, __LINE__, failures)
-    call assert_approx(data(2), 0._dp, 1e-5_dp, __FILE__, __LINE__, failures)
-    call assert_approx(data(3), 3.9641485_dp, 1e-5_dp, __FILE__, __LINE__, failures)
-    call assert_approx(data(4), 0._dp, 1e-5_dp, __FILE__, __LINE__, failures)
-
-    read (unit, *) data
-    call assert_approx(data(1), 5482.455946_dp, 1e-5_dp, __FILE__, __LINE__, failures)
-    call assert_approx(data(2), 0._dp, 1e-5_dp, __FILE__, __LINE__, failures)
-    call assert_approx(data(3), 4.1212933_dp, 1e-5_dp, __FILE__, __LINE__, failures)
-    call assert_approx(data(4), 0._dp, 1e-5_dp, __FILE__, __LINE__, failures)
+    open(unit=unit, file="test_errors.dat", form='unformatted', &
+        status='old', action='read' )
+
+    read (unit) nx
+    call assert_equal(nx, 3, __FILE__, __LINE__, failures)
+
+    read (unit) nt
+    call assert_equal(nt, 3, __FILE__, __LINE__, failures)
+
+    read (unit) x_points
+    call assert_approx(x_points(2), 0.5_dp, 1e-5_dp, __FILE__, __LINE__, failures)
+
+    read (unit) t_points
+    call assert_approx(t_points(3), 5482.455946_dp, 1e-5_dp, __FILE__, __LINE__, failures)
+
+    read (unit) data
+    call assert_approx(data(2, 1), 0._dp, 1e-5_dp, __FILE__, __LINE__, failures)
+    call assert_approx(data(2, 2), 3.9641485_dp, 1e-5_dp, __FILE__, __LINE__, failures)
+    call assert_approx(data(2, 3), 4.1212933_dp, 1e-5_dp, __FILE__, __LINE__, failures)
+    call assert_approx(data(3, 3), 0._dp, 1e-5_dp, __FILE__, __LINE__, failures)
 
     close(unit=unit)
 
-    call delete_file("test_output.txt")
-    call delete_file("test_errors.txt")
+    call delete_file("test_output.dat")
+    call delete_file("test_errors.dat")
+end
+
+subroutine solve_and_create_output_test__norms(failures)
+    integer, intent(inout) :: failures
+    type(program_settings) :: options
+    real(dp) :: t_points(3), norms(3, 3)
+    integer :: nt
+    integer, parameter :: unit=15
+
+    options%nx = 3
+    options%nt = 3
+    options%alpha = 0.25_dp
+    options%k = 2.28e-5
+    options%output_path = "test_output.dat"
+    options%errors_path = "test_norms.dat"
+
+    call solve_and_create_output(options)
+
+    call assert_true(file_exists("test_output.dat"), __FILE__, __LINE__, failures)
+    call assert_true(file_exists("test_norms.dat"), __FILE__, __LINE__, failures)
+
+    open(unit=unit, file="test_norms.dat", form='unformatted', &
+        status='old', action='read' )
+
+    read (unit) nt
+    call assert_equal(nt, 3, __FILE__, __LINE__, failures)
+
+    read (unit) t_points
+    call assert_approx(t_points(3), 5482.455946_dp, 1e-5_dp, __FILE__, __LINE__, failures)
+
+    read (unit) norms
+
+    ! The error is only at the middle point
+    call assert_approx(norms(1, 2), 3.9641485_dp / 2, 1e-5_dp, __FILE__, __LINE__, failures)
+    call assert_approx(norms(2, 2), 3.9641485_dp / sqrt(2._dp), 1e-5_dp, &
+                       __FILE__, __LINE__, failures)
+    call assert_approx(norms(3, 2), 3.9641485_dp, 1e-5_dp, __FILE__, __LINE__, failures)
+    call assert_approx(norms(3, 3), 4.1212933_dp, 1e-5_dp, __FILE__, __LINE__, failures)
+
+    close(unit=unit)
+
+    call delete_file("test_output.dat")
+    call delete_file("test_norms.dat")
 end
 
 subroutine read_settings_solve_and_create_output_test(failures)
@@ -202,10 +414,18 @@ subroutine heat_equation_test_all(failures)
     integer, intent(inout) :: failures
 
     call solve_heat_eqn_test(failures)
+    call solve_heat_eqn_test__implicit(failures)
+    call solve_heat_eqn_test__norms(failures)
+    call error_norms_test(failures)
+    call implicit_weight_test(failures)
+    call step_implicit_test(failures)
+
+    call print_output_test(failures)
 
-    call print_data_test(failures)
+    call print_norms_test(failures)
 
     call solve_and_create_output_test(failures)
+    call solve_and_create_output_test__norms(failures)
 
     call read_settings_solve_and_create_output_test(failures)
 end
@@ -12,7 +12,8 @@ use CommandLineArgs, only: parsed_args, get_positional_value,&
                             unrecognized_named_args, ARGUMENT_MAX_LENGTH
 implicit none
 private
-public :: read_from_parsed_command_line, read_from_command_line
+public :: read_from_parsed_command_line, read_from_command_line, &
+          HELP_MESSAGE_LENGTH
 
 !
 ! Stores program settings:
@@ -44,10 +45,21 @@ type, public :: program_settings
 
     ! Thermal diffusivity of the rod in m^2 s^{-1} units
     real(dp) :: k
+
+    ! Numerical method used: ftcs, crank_nicolson, backward_euler
+    character(len=1024) :: method = "ftcs"
+
+    ! Errors written to the errors file:
+    !   norms: L1, L2 and L_infinity norms of the errors at each time,
+    !   field: the errors at all x and t points.
+    character(len=1024) :: errors = "norms"
 end type program_settings
 
+! Maximum length of the help message
+integer, parameter :: HELP_MESSAGE_LENGTH = 2048
+
 ! Help message to be shown
-character(len=1024), parameter :: HELP_MESSAGE = NEW_LINE('h')//"&
+character(len=HELP_MESSAGE_LENGTH), parameter :: HELP_MESSAGE = NEW_LINE('h')//"&
     &This program solves the heat equation"//NEW_LINE('h')//"&
     &"//NEW_LINE('h')//"&
     &  dT/dt = k d^2T/dx^2"//NEW_LINE('h')//"&
@@ -64,6 +76,7 @@ character(len=1024), parameter :: HELP_MESSAGE = NEW_LINE('h')//"&
     &"//NEW_LINE('h')//"&
     & ./build/main OUTPUT ERRORS [--nx=20] [--nt=300] &
     &[--alpha=0.2] [--k=2.28e-5]"//NEW_LINE('h')//"&
+    &        [--method=ftcs] [--errors=norms]"//NEW_LINE('h')//"&
     &"//NEW_LINE('h')//"&
     &    OUTPUT : path to the output data file"//NEW_LINE('h')//"&
     &"//NEW_LINE('h')//"&
@@ -80,12 +93,25 @@ character(len=1024), parameter :: HELP_MESSAGE = NEW_LINE('h')//"&
     &"//NEW_LINE('h')//"&
     &    --alpha=NUMBER : The alpha parameter of the numerical"//NEW_LINE('h')//"&
     &     solution of the heat equation. Values larger than"//NEW_LINE('h')//"&
-    &     0.5 results in unstable solutions. Default: 0.25."//NEW_LINE('h')//"&
+    &     0.5 results in unstable solutions for ftcs method."//NEW_LINE('h')//"&
+    &     Default: 0.25."//NEW_LINE('h')//"&
     &"//NEW_LINE('h')//"&
     &    --k=NUMBER : Thermal diffusivity of the rod in m^2 s^{-1}&
     & units."//NEW_LINE('h')//"&
     &                 Default: 2.28e-5."//NEW_LINE('h')//"&
     &"//NEW_LINE('h')//"&
+    &    --method=NAME : numerical method to use: ftcs (explicit"//NEW_LINE('h')//"&
+    &     forward differencing), crank_nicolson or backward_euler."&
+    //NEW_LINE('h')//"&
+    &     The implicit methods are stable for any alpha."//NEW_LINE('h')//"&
+    &     Default: ftcs."//NEW_LINE('h')//"&
+    &"//NEW_LINE('h')//"&
+    &    --errors=NAME : errors written to ERRORS file: norms (L1, L2"&
+    //NEW_LINE('h')//"&
+    &     and L_infinity norms of the errors at each time) or field"&
+    //NEW_LINE('h')//"&
+    &     (errors at all x and t points). Default: norms."//NEW_LINE('h')//"&
+    &"//NEW_LINE('h')//"&
     &    --help  : show this message."//NEW_LINE('h')
 
 ! Default values for the settings
@@ -95,6 +121,15 @@ integer, parameter :: DEFAULT_NX = 21
 integer, parameter :: DEFAULT_NT = 300
 real(dp), parameter :: DEFAULT_ALPHA = 0.25
 real(dp), parameter :: DEFAULT_K = 2.28e-5
+character(len=*), parameter :: DEFAULT_METHOD = "ftcs"
+
+character(len=*), parameter :: DEFAULT_ERRORS = "norms"
+
+character(len=100), parameter :: ALLOWED_METHODS(3) = &
+     [character(len=100) :: 'ftcs', 'crank_nicolson', 'backward_euler']
+
+character(len=100), parameter :: ALLOWED_ERRORS(2) = &
+     [character(len=100) :: 'norms', 'field']
 
 contains
 
@@ -117,7 +152,7 @@ subroutine read_from_command_line(silent, settings, success)
     type(program_settings), intent(out) :: settings
     logical, intent(out) :: success
     type(parsed_args) :: parsed
-    character(len=1024) :: error_message
+    character(len=HELP_MESSAGE_LENGTH) :: error_message
 
     call parse_current_command_line_arguments(parsed)
 
@@ -158,7 +193,7 @@ subroutine read_from_parsed_command_line(parsed, settings, error_message)
     logical :: success
     character(len=ARGUMENT_MAX_LENGTH), allocatable :: unrecognized(:)
     integer :: unrecognized_count
-    character(len=ARGUMENT_MAX_LENGTH) :: valid_args(4)
+    character(len=ARGUMENT_MAX_LENGTH) :: valid_args(6)
 
     error_message = ""
 
@@ -179,6 +214,8 @@ subroutine read_from_parsed_command_line(parsed, settings, error_message)
     valid_args(2) = "nt"
     valid_args(3) = "alpha"
     valid_args(4) = "k"
+    valid_args(5) = "method"
+    valid_args(6) = "errors"
 
     call unrecognized_named_args(valid=valid_args, parsed=parsed, &
         unrecognized=unrecognized, count=unrecognized_count)
@@ -276,6 +313,44 @@ subroutine read_from_parsed_command_line(parsed, settings, error_message)
         return
     end if
 
+    ! method
+    ! --------------
+
+    call get_named_value_or_default(name='method', parsed=parsed, &
+                                    default=DEFAULT_METHOD, &
+                                    value=settings%method, success=success)
+
+    if (.not. success) then
+        error_message = "ERROR: Failed to read method."//NEW_LINE('h')//"&
+                        &Run with --help for help."
+        return
+    end if
+
+    if (.not. any(ALLOWED_METHODS == settings%method)) then
+        error_message = "ERROR: Incorrect method name."//NEW_LINE('h')//"&
+                        &Run with --help for help."
+        return
+    end if
+
+    ! errors
+    ! --------------
+
+    call get_named_value_or_default(name='errors', parsed=parsed, &
+                                    default=DEFAULT_ERRORS, &
+                                    value=settings%errors, success=success)
+
+    if (.not. success) then
+        error_message = "ERROR: Failed to read errors."//NEW_LINE('h')//"&
+                        &Run with --help for help."
+        return
+    end if
+
+    if (.not. any(ALLOWED_ERRORS == settings%errors)) then
+        error_message = "ERROR: errors should be norms or field."//NEW_LINE('h')//"&
+                        &Run with --help for help."
+        return
+    end if
+
 end subroutine
 
 end module Settings
\ No newline at end of file
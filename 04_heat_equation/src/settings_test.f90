@@ -2,7 +2,8 @@ module SettingsTest
 use Types, only: dp
 use AssertsTest, only: assert_equal, assert_true, assert_approx, assert_string_starts_with
 use CommandLineArgs, only: parsed_args, allocate_parsed
-use Settings, only: read_from_command_line, read_from_parsed_command_line, program_settings
+use Settings, only: read_from_command_line, read_from_parsed_command_line, program_settings, &
+                    HELP_MESSAGE_LENGTH
 use String, only: string_starts_with, string_is_empty
 implicit none
 private
@@ -36,6 +37,8 @@ subroutine read_from_parsed_command_line_test__no_args(failures)
     call assert_equal(settings%nt, 300, __FILE__, __LINE__, failures)
     call assert_approx(settings%alpha, 0.25_dp, 1e-5_dp, __FILE__, __LINE__, failures)
     call assert_approx(settings%k, 2.28e-5_dp, 1e-5_dp, __FILE__, __LINE__, failures)
+    call assert_equal(settings%method, "ftcs", __FILE__, __LINE__, failures)
+    call assert_equal(settings%errors, "norms", __FILE__, __LINE__, failures)
 end
 
 subroutine read_from_parsed_command_line_test__named(failures)
@@ -44,13 +47,13 @@ subroutine read_from_parsed_command_line_test__named(failures)
     type(program_settings) :: settings
     character(len=1024) :: error_message
 
-    call allocate_parsed(size=4, parsed=parsed)
+    call allocate_parsed(size=6, parsed=parsed)
 
     parsed%positional_count = 2
     parsed%positional(1) = "data.txt"
     parsed%positional(2) = "errors.txt"
 
-    parsed%named_count = 4
+    parsed%named_count = 6
     parsed%named_name(1) = "nx"
     parsed%named_value(1) = "32"
 
@@ -63,6 +66,12 @@ subroutine read_from_parsed_command_line_test__named(failures)
     parsed%named_name(4) = "k"
     parsed%named_value(4) = "1.2e-2"
 
+    parsed%named_name(5) = "method"
+    parsed%named_value(5) = "crank_nicolson"
+
+    parsed%named_name(6) = "errors"
+    parsed%named_value(6) = "field"
+
     call read_from_parsed_command_line(parsed=parsed, settings=settings, error_message=error_message)
 
     call assert_true(string_is_empty(error_message), __FILE__, __LINE__, failures)
@@ -70,10 +79,33 @@ subroutine read_from_parsed_command_line_test__named(failures)
     call assert_equal(settings%nt, 118, __FILE__, __LINE__, failures)
     call assert_approx(settings%alpha, 0.55_dp, 1e-5_dp, __FILE__, __LINE__, failures)
     call assert_approx(settings%k, 0.012_dp, 1e-5_dp, __FILE__, __LINE__, failures)
+    call assert_equal(settings%method, "crank_nicolson", __FILE__, __LINE__, failures)
+    call assert_equal(settings%errors, "field", __FILE__, __LINE__, failures)
 end
 
+subroutine read_from_parsed_command_line_test__incorrect_method(failures)
+    integer, intent(inout) :: failures
+    type(parsed_args) :: parsed
+    type(program_settings) :: settings
+    character(len=1024) :: error_message
+
+    call allocate_parsed(size=2, parsed=parsed)
 
-subroutine show_help_test(failures)
+    parsed%positional_count = 2
+    parsed%positional(1) = "data.txt"
+    parsed%positional(2) = "errors.txt"
+
+    parsed%named_count = 1
+    parsed%named_name(1) = "method"
+    parsed%named_value(1) = "leapfrog"
+
+    call read_from_parsed_command_line(parsed=parsed, settings=settings, error_message=error_message)
+
+    call assert_string_starts_with(error_message, "ERROR: Incorrect method name.", &
+                                   __FILE__, __LINE__, failures)
+end
+
+subroutine read_from_parsed_command_line_test__incorrect_errors(failures)
     integer, intent(inout) :: failures
     type(parsed_args) :: parsed
     type(program_settings) :: settings
@@ -81,6 +113,29 @@ subroutine show_help_test(failures)
 
     call allocate_parsed(size=2, parsed=parsed)
 
+    parsed%positional_count = 2
+    parsed%positional(1) = "data.txt"
+    parsed%positional(2) = "errors.txt"
+
+    parsed%named_count = 1
+    parsed%named_name(1) = "errors"
+    parsed%named_value(1) = "all"
+
+    call read_from_parsed_command_line(parsed=parsed, settings=settings, error_message=error_message)
+
+    call assert_string_starts_with(error_message, "ERROR: errors should be norms or field.", &
+                                   __FILE__, __LINE__, failures)
+end
+
+
+subroutine show_help_test(failures)
+    integer, intent(inout) :: failures
+    type(parsed_args) :: parsed
+    type(program_settings) :: settings
+    character(len=HELP_MESSAGE_LENGTH) :: error_message
+
+    call allocate_parsed(size=2, parsed=parsed)
+
     parsed%positional_count = 0
     parsed%named_count = 1
 
@@ -116,6 +171,8 @@ subroutine settings_test_all(failures)
 
     call read_from_parsed_command_line_test__no_args(failures)
     call read_from_parsed_command_line_test__named(failures)
+    call read_from_parsed_command_line_test__incorrect_method(failures)
+    call read_from_parsed_command_line_test__incorrect_errors(failures)
 
     call show_help_test(failures)
 
@@ -0,0 +1,62 @@
+!
+! Solves systems of linear equations with tridiagonal matrices
+!
+module Tridiagonal
+use Types, only: dp
+implicit none
+private
+public :: solve_tridiagonal
+
+contains
+
+!
+! Solves the system of linear equations
+!
+!   lower(i) x(i-1) + diagonal(i) x(i) + upper(i) x(i+1) = rhs(i)
+!
+! using the Thomas algorithm, which takes O(n) operations. The matrix
+! needs to be diagonally dominant for the algorithm to be stable.
+!
+! Inputs:
+! -------
+!
+! lower : the elements below the diagonal, lower(1) is not used.
+!
+! diagonal : the elements on the diagonal.
+!
+! upper : the elements above the diagonal, upper(n) is not used.
+!
+! rhs : the right-hand side of the equations.
+!
+!
+! Outputs:
+! -------
+!
+! solution : the solution x of the system.
+!
+subroutine solve_tridiagonal(lower, diagonal, upper, rhs, solution)
+    real(dp), intent(in) :: lower(:), diagonal(:), upper(:), rhs(:)
+    real(dp), intent(out) :: solution(:)
+    real(dp) :: modified_upper(size(diagonal)), denominator
+    integer :: n, i
+
+    n = size(diagonal)
+    if (n == 0) return
+
+    ! Forward elimination, the solution array stores the modified rhs
+    modified_upper(1) = upper(1) / diagonal(1)
+    solution(1) = rhs(1) / diagonal(1)
+
+    do i = 2, n
+        denominator = diagonal(i) - lower(i) * modified_upper(i - 1)
+        modified_upper(i) = upper(i) / denominator
+        solution(i) = (rhs(i) - lower(i) * solution(i - 1)) / denominator
+    end do
+
+    ! Back substitution
+    do i = n - 1, 1, -1
+        solution(i) = solution(i) - modified_upper(i) * solution(i + 1)
+    end do
+end subroutine
+
+end module Tridiagonal
@@ -0,0 +1,53 @@
+module TridiagonalTest
+use Types, only: dp
+use Tridiagonal, only: solve_tridiagonal
+use AssertsTest, only: assert_approx
+implicit none
+private
+public tridiagonal_test_all
+
+contains
+
+subroutine solve_tridiagonal_test(failures)
+    integer, intent(inout) :: failures
+    real(dp) :: lower(4), diagonal(4), upper(4), rhs(4), solution(4)
+
+    lower = [0._dp, 1._dp, 1._dp, 1._dp]
+    diagonal = [4._dp, 4._dp, 4._dp, 4._dp]
+    upper = [1._dp, 1._dp, 1._dp, 0._dp]
+
+    ! The right-hand side of the solution [1, 2, 3, 4]
+    rhs = [6._dp, 12._dp, 18._dp, 19._dp]
+
+    call solve_tridiagonal(lower=lower, diagonal=diagonal, upper=upper, &
+                           rhs=rhs, solution=solution)
+
+    call assert_approx(solution(1), 1._dp, 1e-14_dp, __FILE__, __LINE__, failures)
+    call assert_approx(solution(2), 2._dp, 1e-14_dp, __FILE__, __LINE__, failures)
+    call assert_approx(solution(3), 3._dp, 1e-14_dp, __FILE__, __LINE__, failures)
+    call assert_approx(solution(4), 4._dp, 1e-14_dp, __FILE__, __LINE__, failures)
+end
+
+subroutine solve_tridiagonal_test__one_equation(failures)
+    integer, intent(inout) :: failures
+    real(dp) :: lower(1), diagonal(1), upper(1), rhs(1), solution(1)
+
+    lower = 7
+    diagonal = 2
+    upper = 5
+    rhs = 3
+
+    call solve_tridiagonal(lower=lower, diagonal=diagonal, upper=upper, &
+                           rhs=rhs, solution=solution)
+
+    call assert_approx(solution(1), 1.5_dp, 1e-14_dp, __FILE__, __LINE__, failures)
+end
+
+subroutine tridiagonal_test_all(failures)
+    integer, intent(inout) :: failures
+
+    call solve_tridiagonal_test(failures)
+    call solve_tridiagonal_test__one_equation(failures)
+end
+
+end module TridiagonalTest
@@ -47,7 +47,7 @@ def plot_3d(plot_dir, plot_file_name, nx, nt, method):
     else:
         x, y, z, dx, dt, dt_dx = result
 
-    z = np.clip(z, 0, 1.1)
+    z = np.clip(np.nan_to_num(z), 0, 1.1)
     x = [x]
     y = np.transpose([y])
 
@@ -119,7 +119,7 @@ def plot_2d(plot_dir, plot_file_name, nx, nt, method, plot_timesteps):
     for iy, t in enumerate(y):
         if iy % plot_every_k_timestep != 0:
             continue
-        velocities = z[iy, :]
+        velocities = np.nan_to_num(z[iy, :])
         plt.plot(x, velocities, label=f't={t:.2f} s')
 
     plt.xlabel("Position x [m]")
@@ -1,5 +1,6 @@
 # Show animated plots of solutions of advection equation
 
+import numpy as np
 import matplotlib.pyplot as plt
 from solver import solve_equation
 from matplotlib import animation
@@ -43,7 +44,7 @@ def animate(i, line, text, x_values, t_values, solution):
     """
 
     x = x_values
-    y = solution[i, :]
+    y = np.nan_to_num(solution[i, :])
     time = t_values[i]
     text.set_text(f't = {time:.2f} s')
     line.set_data(x, y)
@@ -39,7 +39,7 @@ def plot_at_time_index(plot_dir, plot_file_name, method,
                        time, it, x_values,
                        solution, dx, dt, dt_dx):
 
-    y = solution[it, :]
+    y = np.nan_to_num(solution[it, :])
     plt.plot(x_values, y)
 
     title = (
@@ -1,70 +1,177 @@
 # Solve a heat equation
 import subprocess
-from plot_utils import create_dir
 import numpy as np
 import os
+import shutil
 import struct
-import array
+import tempfile
+import weakref
 
 
-def read_solution_from_file(path_to_data):
+def find_records(path_to_data):
     """
-    Read solution from a binary file. Please refer to README.md
-    for description of the binary file format used here.
+    Finds positions of records in a binary file written by Fortran's
+    unformatted `write`. Each record is surrounded by 4-byte markers
+    containing its length in bytes. Records larger than 2 GB are split
+    by gfortran into several subrecords; the leading marker of all
+    but the last subrecord is negative.
 
     Parameters
     ----------
     path_to_data : str
-        Path to the binary file containing solution data.
+        Path to the binary file.
 
 
     Returns
     -------
-        (x, y, z) tuple
-            x, y, and z values of the solution,
-            where x and y and 1D arrays, and z is a 2D array.
+        list of lists of (offset, length) tuples
+            For each record, the positions of its subrecords:
+            offset of the data from the start of the file and its
+            length in bytes.
+    """
+
+    records = []
+    subrecords = []
+    file_size = os.path.getsize(path_to_data)
+    position = 0
+
+    with open(path_to_data, "rb") as file:
+        while position < file_size:
+            file.seek(position)
+            (length,) = struct.unpack("@i", file.read(4))
+            subrecords.append((position + 4, abs(length)))
+            position += abs(length) + 8
+
+            if length >= 0:
+                records.append(subrecords)
+                subrecords = []
+
+    return records
+
+
+def read_integer(path_to_data, record):
+    """
+    Reads a 4-byte integer stored in a single record.
+
+    Parameters
+    ----------
+    path_to_data : str
+        Path to the binary file.
+
+    record : list of (offset, length) tuples
+        Position of the record, see `find_records`.
+
+
+    Returns
+    -------
+        int
+            The value.
+    """
+
+    offset, _ = record[0]
+
+    with open(path_to_data, "rb") as file:
+        file.seek(offset)
+        (value,) = struct.unpack("@i", file.read(4))
+
+    return value
+
+
+def map_array(path_to_data, record, shape):
+    """
+    Returns the array of double floats stored in a record, without reading
+    it into memory. The values are read from disk only when accessed.
+
+    Parameters
+    ----------
+    path_to_data : str
+        Path to the binary file.
+
+    record : list of (offset, length) tuples
+        Position of the record, see `find_records`.
+
+    shape : tuple of int
+        Shape of the array. The data is in the C order for this shape.
+
+
+    Returns
+    -------
+        numpy.ndarray
+            A read-only memory-mapped array. If the record is split into
+            subrecords, its data is not contiguous in the file,
+            and the array is read into memory instead.
     """
 
-    data = open(path_to_data, "rb").read()
+    if len(record) == 1:
+        offset, _ = record[0]
+
+        return np.memmap(path_to_data, dtype=np.float64, mode='r',
+                         offset=offset, shape=shape, order='C')
+
+    parts = [
+        np.memmap(path_to_data, dtype=np.uint8, mode='r',
+                  offset=offset, shape=(length,))
+        for offset, length in record
+    ]
 
-    # nx: number of x points
-    # ----------
+    return np.concatenate(parts).view(np.float64).reshape(shape)
 
-    start = 0
-    end = 4*3
-    (_, nx, _) = struct.unpack("@iii", data[start: end])
 
-    # nt: number of t points
-    # ----------
+def remove_when_unused(subdir, array):
+    """
+    Removes the directory containing the file of a memory-mapped array
+    when the array and its views are no longer used. The directory is
+    removed at once if the array is not memory-mapped.
 
-    start = end
-    end = start + 4*3
-    (_, nt, _) = struct.unpack("@iii", data[start: end])
+    Parameters
+    ----------
+    subdir : str
+        Path to the directory.
 
-    # x values
-    # ---------
+    array : numpy.ndarray
+        Array returned by `map_array` from a file in the directory.
+    """
 
-    start = end + 4
-    end = start + nx * 8
-    x_values = array.array("d")
-    x_values.frombytes(data[start:end])
+    mapping = getattr(array, '_mmap', None)
 
-    # t values
-    # ---------
+    if mapping is None:
+        shutil.rmtree(subdir)
+    else:
+        # Called after the file is unmapped, so the directory
+        # can also be removed on Windows
+        weakref.finalize(mapping, shutil.rmtree, subdir, ignore_errors=True)
 
-    start = end + 8
-    end = start + nt * 8
-    t_values = array.array("d")
-    t_values.frombytes(data[start:end])
 
-    # Solution: 2D array
-    # ---------
+def read_solution_from_file(path_to_data):
+    """
+    Read solution from a binary file. Please refer to README.md
+    for description of the binary file format used here.
 
-    start = end + 8
-    end = start + nx * nt * 8
-    solution = array.array("d")
-    solution.frombytes(data[start:end])
-    solution = np.reshape(solution, (nt, nx), order='C')
+    The arrays are memory-mapped: only the record markers are read
+    to find the positions of the data, and the values are read from disk
+    when they are accessed. Only the time frames that are used
+    are loaded into memory.
+
+    Parameters
+    ----------
+    path_to_data : str
+        Path to the binary file containing solution data.
+
+
+    Returns
+    -------
+        (x, y, z) tuple
+            x, y, and z values of the solution,
+            where x and y and 1D arrays, and z is a 2D array.
+            The arrays are read-only.
+    """
+
+    records = find_records(path_to_data)
+    nx = read_integer(path_to_data, records[0])
+    nt = read_integer(path_to_data, records[1])
+    x_values = map_array(path_to_data, records[2], shape=(nx,))
+    t_values = map_array(path_to_data, records[3], shape=(nt,))
+    solution = map_array(path_to_data, records[4], shape=(nt, nx))
 
     return (x_values, t_values, solution)
 
@@ -106,14 +213,18 @@ def solve_equation(x_start, x_end, nx,
         (x, y, z, dx, dt, courant) tuple
             x, y, z :  values of the solution,
                        where x and y and 1D arrays, and z is a 2D array.
+                       The values of z are read from the file when
+                       they are accessed, and are NaN if the solution
+                       is unstable.
 
             dx, dt  : position and time steps
 
             dt_dx : ratio dt / dx
     """
 
-    subdir = "tmp"
-    create_dir(subdir)
+    # Use a private directory for the output file, so that
+    # several solutions can be calculated at the same time
+    subdir = tempfile.mkdtemp(prefix="solver_")
     path_to_data = os.path.join(subdir, "data.bin")
 
     parameters = [
@@ -139,16 +250,19 @@ def solve_equation(x_start, x_end, nx,
 
     if not success:
         print(message)
+        shutil.rmtree(subdir)
         return None
 
     x, y, z = read_solution_from_file(path_to_data)
-    dx = x[1] - x[0]
-    dt = y[1] - y[0]
 
-    os.remove(path_to_data)
-    os.rmdir(subdir)
+    # Copy the small arrays, the solution is read from the file
+    # when used and the file is removed after that
+    x = np.array(x)
+    y = np.array(y)
+    remove_when_unused(subdir, z)
 
+    dx = x[1] - x[0]
+    dt = y[1] - y[0]
     dt_dx = dt/dx
-    z = np.nan_to_num(z)
 
     return (x, y, z, dx, dt, dt_dx)
@@ -0,0 +1,67 @@
+from convergence import refinement_ladder, error_norms, observed_orders, \
+                        fitted_order, convergence_study, format_table, \
+                        make_plots
+import os
+import shutil
+from pytest import approx
+
+
+def test_refinement_ladder():
+    assert refinement_ladder(nx_coarsest=50, levels=4) == [50, 100, 200, 400]
+
+
+def test_error_norms():
+    norms = error_norms(values=[1, 2, 3], reference=[1, 0, 4], dx=0.5)
+
+    assert norms['L1'] == approx(1.5)
+    assert norms['L2'] == approx(2.5**0.5)
+    assert norms['Linf'] == approx(2)
+
+
+def test_observed_orders():
+    nx_values = [10, 20, 40]
+    errors = [1, 0.25, 0.0625]
+
+    assert observed_orders(nx_values, errors) == [approx(2), approx(2)]
+    assert fitted_order(nx_values, errors) == approx(2)
+
+
+def test_convergence_study():
+    study = convergence_study(method='upwind', initial_conditions='sine',
+                              nx_values=[50, 100, 200], courant_factor=0.5)
+
+    assert study['nx'] == [50, 100, 200]
+    assert study['dx'] == [approx(0.02), approx(0.01), approx(0.005)]
+    assert study['errors']['L1'][0] == approx(0.1142, rel=1e-3)
+
+    # Upwind method is first order
+    for norm in ['L1', 'L2', 'Linf']:
+        assert study['fitted_orders'][norm] == approx(1, abs=0.1)
+        assert len(study['orders'][norm]) == 2
+
+    table = format_table(study).splitlines()
+    assert len(table) == 5
+    assert table[1].split()[0] == "50"
+    assert table[-1].split()[0] == "fitted"
+
+
+def test_convergence_study__second_order():
+    study = convergence_study(method='lax-wendroff', initial_conditions='sine',
+                              nx_values=[50, 100, 200], courant_factor=0.5)
+
+    assert study['fitted_orders']['L2'] == approx(2, abs=0.05)
+
+
+def test_make_plots():
+    plot_dir = "test_plots"
+    plot_file_name = "convergence_upwind.pdf"
+    plot_file_path = os.path.join(plot_dir, plot_file_name)
+
+    if os.path.exists(plot_file_path):
+        os.remove(plot_file_path)
+
+    make_plots(plot_dir=plot_dir, show_plot=False, levels=2)
+
+    assert os.path.exists(plot_file_path)
+    os.remove(plot_file_path)
+    shutil.rmtree(plot_dir)
@@ -3,10 +3,11 @@
 #
 
 from plot_utils import create_dir
+import numpy as np
 import matplotlib.pyplot as plt
 from itertools import cycle
 import os
-from solver import solve_equation
+from solver import solve_equations
 
 
 def plot_at_time(methods, initial_conditions, courant_factor, nx,
@@ -51,19 +52,27 @@ def plot_at_time(methods, initial_conditions, courant_factor, nx,
     line_styles = ["-", "--", "-.", ":"]
     line_style_cycler = cycle(line_styles)
 
-    for method in methods:
-        result = solve_equation(x_start=0, x_end=1,
-                                nx=nx, t_start=0, t_end=time,
-                                method=method.lower(),
-                                initial_conditions=initial_conditions,
-                                velocity=1, courant_factor=courant_factor)
-
+    runs = [
+        dict(x_start=0, x_end=1,
+             nx=nx, t_start=0, t_end=time,
+             method=method.lower(),
+             initial_conditions=initial_conditions,
+             velocity=1, courant_factor=courant_factor,
+             max_frames=1)
+        for method in methods
+    ]
+
+    # Calculate solutions for all methods at the same time,
+    # keeping only the last time level
+    results = solve_equations(runs)
+
+    for method, result in zip(methods, results):
         if result is None:
             return
         else:
             x, y, z, dx, dt, dt_dx = result
             actual_time = y[-1]
-            plt.plot(x, z[-1, :], label=method,
+            plt.plot(x, np.nan_to_num(z[-1, :]), label=method,
                      linestyle=next(line_style_cycler))
 
     title = (
@@ -0,0 +1,212 @@
+# Cache of solutions calculated by the Fortran program.
+#
+# A solution is stored in a NumPy `.npz` file, whose name is the hash
+# of the parameters of the run and of the program binary. When the
+# program is rebuilt, its hash changes and the old solutions are not used.
+#
+# The total size of the cache is limited. When it is exceeded,
+# the solutions that have not been used for the longest time are removed.
+#
+import os
+import json
+import hashlib
+import tempfile
+import numpy as np
+
+CACHE_DIR = "solver_cache"
+
+# Maximum total size of the cached solutions, in bytes
+MAX_CACHE_SIZE = 500 * 1024**2
+
+PROGRAM_PATH = "build/main"
+
+# Hashes of the program binary, keyed by path, modification time and size
+PROGRAM_HASHES = {}
+
+
+def program_hash(path=PROGRAM_PATH):
+    """
+    Returns the hash of the program binary. The hash is calculated only
+    once for each version of the file.
+
+    Parameters
+    ----------
+    path : str
+        Path to the program binary.
+
+
+    Returns
+    -------
+        str
+            The hash.
+    """
+
+    stat = os.stat(path)
+    version = (path, stat.st_mtime_ns, stat.st_size)
+
+    if version not in PROGRAM_HASHES:
+        with open(path, "rb") as file:
+            PROGRAM_HASHES[version] = hashlib.sha256(file.read()).hexdigest()
+
+    return PROGRAM_HASHES[version]
+
+
+def cache_key(parameters, program_path=PROGRAM_PATH):
+    """
+    Returns the key of a solution in the cache.
+
+    Parameters
+    ----------
+    parameters : dict
+        Parameters of the run.
+
+    program_path : str
+        Path to the program binary.
+
+
+    Returns
+    -------
+        str
+            The key.
+    """
+
+    data = json.dumps(
+        dict(parameters=parameters, program=program_hash(program_path)),
+        sort_keys=True)
+
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def cache_path(key, cache_dir):
+    """
+    Returns the path of the cached solution file.
+
+    Parameters
+    ----------
+    key : str
+        Key of the solution, see `cache_key`.
+
+    cache_dir : str
+        Directory of the cache.
+
+
+    Returns
+    -------
+        str
+            The path.
+    """
+
+    return os.path.join(cache_dir, f"{key}.npz")
+
+
+def load_solution(key, cache_dir=CACHE_DIR):
+    """
+    Returns the solution from the cache.
+
+    Parameters
+    ----------
+    key : str
+        Key of the solution, see `cache_key`.
+
+    cache_dir : str
+        Directory of the cache.
+
+
+    Returns
+    -------
+        (x, y, z) tuple or None
+            x, y, and z values of the solution,
+            or None if the solution is not in the cache.
+    """
+
+    path = cache_path(key, cache_dir)
+
+    try:
+        with np.load(path) as data:
+            solution = (data["x"], data["y"], data["z"])
+
+        # Mark the solution as recently used
+        os.utime(path)
+    except FileNotFoundError:
+        # Not cached, or removed by another process
+        return None
+
+    return solution
+
+
+def save_solution(key, x, y, z, cache_dir=CACHE_DIR,
+                  max_size=MAX_CACHE_SIZE):
+    """
+    Saves the solution to the cache and removes the least recently used
+    solutions if the cache is larger than `max_size`.
+
+    Parameters
+    ----------
+    key : str
+        Key of the solution, see `cache_key`.
+
+    x, y, z : numpy.ndarray
+        The solution.
+
+    cache_dir : str
+        Directory of the cache.
+
+    max_size : int
+        Maximum total size of the cached solutions, in bytes.
+    """
+
+    os.makedirs(cache_dir, exist_ok=True)
+
+    # Write to a temporary file first, so that other processes
+    # never see a partially written solution
+    handle, temp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+
+    with os.fdopen(handle, "wb") as file:
+        np.savez(file, x=x, y=y, z=z)
+
+    os.replace(temp_path, cache_path(key, cache_dir))
+    evict(cache_dir=cache_dir, max_size=max_size)
+
+
+def evict(cache_dir=CACHE_DIR, max_size=MAX_CACHE_SIZE):
+    """
+    Removes the least recently used solutions until the total size
+    of the cache is not larger than `max_size`.
+
+    Parameters
+    ----------
+    cache_dir : str
+        Directory of the cache.
+
+    max_size : int
+        Maximum total size of the cached solutions, in bytes.
+    """
+
+    files = []
+
+    for entry in os.scandir(cache_dir):
+        if not entry.name.endswith(".npz"):
+            continue
+
+        try:
+            stat = entry.stat()
+        except FileNotFoundError:
+            # Removed by another process
+            continue
+
+        files.append((stat.st_mtime_ns, stat.st_size, entry.path))
+
+    total_size = sum(size for _, size, _ in files)
+
+    # Oldest first
+    for _, size, path in sorted(files):
+        if total_size <= max_size:
+            break
+
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            # Removed by another process
+            pass
+
+        total_size -= size
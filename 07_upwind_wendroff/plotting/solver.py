@@ -1,10 +1,147 @@
 # Solve a heat equation
 import subprocess
-from plot_utils import create_dir
 import numpy as np
 import os
+import shutil
 import struct
-import array
+import tempfile
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from solution_cache import cache_key, load_solution, save_solution
+
+
+def find_records(path_to_data):
+    """
+    Finds positions of records in a binary file written by Fortran's
+    unformatted `write`. Each record is surrounded by 4-byte markers
+    containing its length in bytes. Records larger than 2 GB are split
+    by gfortran into several subrecords; the leading marker of all
+    but the last subrecord is negative.
+
+    Parameters
+    ----------
+    path_to_data : str
+        Path to the binary file.
+
+
+    Returns
+    -------
+        list of lists of (offset, length) tuples
+            For each record, the positions of its subrecords:
+            offset of the data from the start of the file and its
+            length in bytes.
+    """
+
+    records = []
+    subrecords = []
+    file_size = os.path.getsize(path_to_data)
+    position = 0
+
+    with open(path_to_data, "rb") as file:
+        while position < file_size:
+            file.seek(position)
+            (length,) = struct.unpack("@i", file.read(4))
+            subrecords.append((position + 4, abs(length)))
+            position += abs(length) + 8
+
+            if length >= 0:
+                records.append(subrecords)
+                subrecords = []
+
+    return records
+
+
+def read_integer(path_to_data, record):
+    """
+    Reads a 4-byte integer stored in a single record.
+
+    Parameters
+    ----------
+    path_to_data : str
+        Path to the binary file.
+
+    record : list of (offset, length) tuples
+        Position of the record, see `find_records`.
+
+
+    Returns
+    -------
+        int
+            The value.
+    """
+
+    offset, _ = record[0]
+
+    with open(path_to_data, "rb") as file:
+        file.seek(offset)
+        (value,) = struct.unpack("@i", file.read(4))
+
+    return value
+
+
+def map_array(path_to_data, record, shape):
+    """
+    Returns the array of double floats stored in a record, without reading
+    it into memory. The values are read from disk only when accessed.
+
+    Parameters
+    ----------
+    path_to_data : str
+        Path to the binary file.
+
+    record : list of (offset, length) tuples
+        Position of the record, see `find_records`.
+
+    shape : tuple of int
+        Shape of the array. The data is in the C order for this shape.
+
+
+    Returns
+    -------
+        numpy.ndarray
+            A read-only memory-mapped array. If the record is split into
+            subrecords, its data is not contiguous in the file,
+            and the array is read into memory instead.
+    """
+
+    if len(record) == 1:
+        offset, _ = record[0]
+
+        return np.memmap(path_to_data, dtype=np.float64, mode='r',
+                         offset=offset, shape=shape, order='C')
+
+    parts = [
+        np.memmap(path_to_data, dtype=np.uint8, mode='r',
+                  offset=offset, shape=(length,))
+        for offset, length in record
+    ]
+
+    return np.concatenate(parts).view(np.float64).reshape(shape)
+
+
+def remove_when_unused(subdir, array):
+    """
+    Removes the directory containing the file of a memory-mapped array
+    when the array and its views are no longer used. The directory is
+    removed at once if the array is not memory-mapped.
+
+    Parameters
+    ----------
+    subdir : str
+        Path to the directory.
+
+    array : numpy.ndarray
+        Array returned by `map_array` from a file in the directory.
+    """
+
+    mapping = getattr(array, '_mmap', None)
+
+    if mapping is None:
+        shutil.rmtree(subdir)
+    else:
+        # Called after the file is unmapped, so the directory
+        # can also be removed on Windows
+        weakref.finalize(mapping, shutil.rmtree, subdir, ignore_errors=True)
 
 
 def read_solution_from_file(path_to_data):
@@ -12,6 +149,11 @@ def read_solution_from_file(path_to_data):
     Read solution from a binary file. Please refer to README.md
     for description of the binary file format used here.
 
+    The arrays are memory-mapped: only the record markers are read
+    to find the positions of the data, and the values are read from disk
+    when they are accessed. Only the time frames that are used
+    are loaded into memory.
+
     Parameters
     ----------
     path_to_data : str
@@ -23,56 +165,177 @@ def read_solution_from_file(path_to_data):
         (x, y, z) tuple
             x, y, and z values of the solution,
             where x and y and 1D arrays, and z is a 2D array.
+            The arrays are read-only.
     """
 
-    data = open(path_to_data, "rb").read()
+    records = find_records(path_to_data)
+    nx = read_integer(path_to_data, records[0])
+    nt = read_integer(path_to_data, records[1])
+    x_values = map_array(path_to_data, records[2], shape=(nx,))
+    t_values = map_array(path_to_data, records[3], shape=(nt,))
+    solution = map_array(path_to_data, records[4], shape=(nt, nx))
+
+    return (x_values, t_values, solution)
 
-    # nx: number of x points
-    # ----------
 
-    start = 0
-    end = 4*3
-    (_, nx, _) = struct.unpack("@iii", data[start: end])
+def read_record(path_to_data, record):
+    """
+    Reads all bytes of a record.
 
-    # nt: number of t points
-    # ----------
+    Parameters
+    ----------
+    path_to_data : str
+        Path to the binary file.
 
-    start = end
-    end = start + 4*3
-    (_, nt, _) = struct.unpack("@iii", data[start: end])
+    record : list of (offset, length) tuples
+        Position of the record, see `find_records`.
 
-    # x values
-    # ---------
 
-    start = end + 4
-    end = start + nx * 8
-    x_values = array.array("d")
-    x_values.frombytes(data[start:end])
+    Returns
+    -------
+        bytes
+            The data of the record.
+    """
 
-    # t values
-    # ---------
+    data = b''
 
-    start = end + 8
-    end = start + nt * 8
-    t_values = array.array("d")
-    t_values.frombytes(data[start:end])
+    with open(path_to_data, "rb") as file:
+        for offset, length in record:
+            file.seek(offset)
+            data += file.read(length)
 
-    # Solution: 2D array
-    # ---------
+    return data
 
-    start = end + 8
-    end = start + nx * nt * 8
-    solution = array.array("d")
-    solution.frombytes(data[start:end])
-    solution = np.reshape(solution, (nt, nx), order='C')
 
-    return (x_values, t_values, solution)
+def read_ensemble_from_file(path_to_data):
+    """
+    Read solutions of an ensemble from a binary file. Please refer to
+    README.md for description of the ensemble file format.
+
+    Parameters
+    ----------
+    path_to_data : str
+        Path to the binary file containing solution data.
+
+
+    Returns
+    -------
+        dict
+            x : 1D array of x values.
+
+            t : 2D array of t values, the first index is the member.
+
+            z : 3D array of solutions, the indices are member, t and x.
+
+            time_counts : 1D array with the number of t values of each
+                          member. The values after this number are zeros.
+
+            courant_factors : 1D array of Courant factors of the members.
+
+            initial_conditions : list of initial conditions of the members.
+    """
+
+    records = find_records(path_to_data)
+    nx = read_integer(path_to_data, records[0])
+    nt = read_integer(path_to_data, records[1])
+    members = read_integer(path_to_data, records[2])
+
+    names = read_record(path_to_data, records[7]).decode("ascii")
+    name_length = len(names) // members
+
+    return dict(
+        x=map_array(path_to_data, records[3], shape=(nx,)),
+        t=map_array(path_to_data, records[4], shape=(members, nt)),
+        z=map_array(path_to_data, records[8], shape=(members, nt, nx)),
+        time_counts=np.frombuffer(read_record(path_to_data, records[5]),
+                                  dtype=np.int32),
+        courant_factors=map_array(path_to_data, records[6],
+                                  shape=(members,)),
+        initial_conditions=[
+            names[i * name_length:(i + 1) * name_length].strip()
+            for i in range(members)
+        ]
+    )
+
+
+def output_arguments(output_stride=None, max_frames=None, output_times=None):
+    """
+    Returns command line arguments of the Fortran program that select
+    the time levels written to the output.
+
+    Parameters
+    ----------
+    output_stride : int
+        Output every `output_stride`-th time level and the last one.
+
+    max_frames : int
+        Output at most `max_frames` time levels evenly spaced in time,
+        including the last one.
+
+    output_times : list of float
+        Output only the time levels nearest to these times.
+
+    If all parameters are None, all time levels are written.
+
+    Returns
+    -------
+        str
+            The arguments.
+    """
+
+    arguments = ''
+
+    if output_stride is not None:
+        arguments += f' --output_stride={output_stride}'
+
+    if max_frames is not None:
+        arguments += f' --max_frames={max_frames}'
+
+    if output_times is not None:
+        times = ','.join(repr(float(time)) for time in output_times)
+        arguments += f' --output_times={times}'
+
+    return arguments
+
+
+def solution_with_steps(x, y, z, courant_factor, velocity):
+    """
+    Adds position and time steps to the solution.
+
+    Parameters
+    ----------
+    x, y, z : numpy.ndarray
+        Solution read from the output of the Fortran program.
+
+    courant_factor : float
+        Courant factor parameter of the numerical methods.
+
+    velocity : float
+        Parameter v in the advectino equation
+
+
+    Returns
+    -------
+        (x, y, z, dx, dt, courant) tuple
+            See `solve_equation`.
+    """
+
+    dx = x[1] - x[0]
+
+    # Calculated in the same way as in the Fortran program, since
+    # the solution may contain only one time level
+    dt = courant_factor * dx / velocity
+
+    dt_dx = dt/dx
+
+    return (x, y, z, dx, dt, dt_dx)
 
 
 def solve_equation(x_start, x_end, nx,
                    t_start, t_end, method,
                    initial_conditions, velocity,
-                   courant_factor):
+                   courant_factor, output_stride=None,
+                   max_frames=None, output_times=None, use_cache=True):
     """
     Runs Fortran program that solves equation
 
@@ -112,19 +375,48 @@ def solve_equation(x_start, x_end, nx,
     courant_factor : float
         Courant factor parameter of the numerical methods.
 
+    output_stride, max_frames, output_times :
+        Select the time levels to be returned, see `output_arguments`.
+        Only one of them can be used. By default, all time levels
+        are returned.
+
+    use_cache : bool
+        If True, the solution is loaded from the cache if it has been
+        calculated before with the same parameters and the same program
+        binary, see `solution_cache` module. New solutions are
+        saved to the cache.
+
     Returns
     -------
         (x, y, z, dx, dt, courant) tuple
             x, y, z :  values of the solution,
                        where x and y and 1D arrays, and z is a 2D array.
+                       The values of z are read from the file when
+                       they are accessed, and are NaN if the solution
+                       is unstable.
 
             dx, dt  : position and time steps
 
             dt_dx : ratio dt / dx
     """
 
-    subdir = "tmp"
-    create_dir(subdir)
+    if use_cache:
+        key = cache_key(dict(
+            x_start=x_start, x_end=x_end, nx=nx,
+            t_start=t_start, t_end=t_end, method=method,
+            initial_conditions=initial_conditions, velocity=velocity,
+            courant_factor=courant_factor, output_stride=output_stride,
+            max_frames=max_frames, output_times=output_times))
+
+        solution = load_solution(key)
+
+        if solution is not None:
+            x, y, z = solution
+            return solution_with_steps(x, y, z, courant_factor, velocity)
+
+    # Use a private directory for the output file, so that
+    # several solutions can be calculated at the same time
+    subdir = tempfile.mkdtemp(prefix="solver_")
     path_to_data = os.path.join(subdir, "data.bin")
 
     parameters = [
@@ -139,6 +431,9 @@ def solve_equation(x_start, x_end, nx,
             f' --t_end={t_end}'
             f' --velocity={velocity}'
             f' --courant_factor={courant_factor}'
+            + output_arguments(output_stride=output_stride,
+                               max_frames=max_frames,
+                               output_times=output_times)
         )
     ]
 
@@ -153,16 +448,129 @@ def solve_equation(x_start, x_end, nx,
 
     if not success:
         print(message)
+        shutil.rmtree(subdir)
         return None
 
     x, y, z = read_solution_from_file(path_to_data)
-    dx = x[1] - x[0]
-    dt = y[1] - y[0]
 
-    os.remove(path_to_data)
-    os.rmdir(subdir)
+    if use_cache:
+        save_solution(key, x, y, z)
 
-    dt_dx = dt/dx
-    z = np.nan_to_num(z)
+    # Copy the small arrays, the solution is read from the file
+    # when used and the file is removed after that
+    x = np.array(x)
+    y = np.array(y)
+    remove_when_unused(subdir, z)
 
-    return (x, y, z, dx, dt, dt_dx)
+    return solution_with_steps(x, y, z, courant_factor, velocity)
+
+
+def solve_ensemble(x_start, x_end, nx,
+                   t_start, t_end, method, velocity,
+                   courant_factors, initial_conditions,
+                   output_stride=None, max_frames=None, output_times=None):
+    """
+    Runs Fortran program once to solve the advection equation for all
+    combinations of Courant factors and initial conditions.
+
+    Parameters
+    ----------
+    courant_factors : list of float
+        Courant factors of the ensemble members.
+
+    initial_conditions : list of str
+        Initial conditions of the ensemble members: square, sine.
+
+    The rest of the parameters are described in `solve_equation`.
+
+
+    Returns
+    -------
+        dict
+            Solutions of the members, see `read_ensemble_from_file`.
+            The values of z are read from the file when they are accessed,
+            and are NaN if a solution is unstable.
+            The members are in the order (courant_factors[0],
+            initial_conditions[0]), (courant_factors[1],
+            initial_conditions[0]), ... The arrays of values after the
+            last time value of a member contain zeros.
+            Returns None if the program fails.
+    """
+
+    # Use a private directory for the output file, so that
+    # several solutions can be calculated at the same time
+    subdir = tempfile.mkdtemp(prefix="solver_")
+    path_to_data = os.path.join(subdir, "data.bin")
+    factors = ','.join(repr(float(factor)) for factor in courant_factors)
+
+    parameters = [
+        (
+            f'build/main {path_to_data}'
+            f' --method={method}'
+            f' --initial_conditions_list={",".join(initial_conditions)}'
+            f' --courant_factors={factors}'
+            f' --x_start={x_start}'
+            f' --x_end={x_end}'
+            f' --nx={nx}'
+            f' --t_start={t_start}'
+            f' --t_end={t_end}'
+            f' --velocity={velocity}'
+            + output_arguments(output_stride=output_stride,
+                               max_frames=max_frames,
+                               output_times=output_times)
+        )
+    ]
+
+    child = subprocess.Popen(parameters,
+                             stdout=subprocess.PIPE,
+                             stderr=subprocess.STDOUT,
+                             shell=True)
+
+    message = child.communicate()[0].decode('utf-8')
+
+    if child.returncode != 0:
+        print(message)
+        shutil.rmtree(subdir)
+        return None
+
+    ensemble = read_ensemble_from_file(path_to_data)
+
+    # Copy the small arrays, the solutions are read from the file
+    # when used and the file is removed after that
+    for name in ['x', 't', 'courant_factors']:
+        ensemble[name] = np.array(ensemble[name])
+
+    remove_when_unused(subdir, ensemble['z'])
+    return ensemble
+
+
+def solve_equations(runs, max_workers=None):
+    """
+    Runs the Fortran program for several sets of parameters at the same
+    time, each in its own process. The total time is about the time of the
+    slowest run.
+
+    Parameters
+    ----------
+    runs : list of dict
+        Keyword arguments passed to `solve_equation` for each run.
+
+    max_workers : int
+        The maximum number of runs at the same time.
+        If None, all runs are started together.
+
+    Returns
+    -------
+        list
+            Values returned by `solve_equation` for each run,
+            in the same order as `runs`.
+    """
+
+    if len(runs) == 0:
+        return []
+
+    if max_workers is None:
+        max_workers = len(runs)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(lambda run: solve_equation(**run), runs))
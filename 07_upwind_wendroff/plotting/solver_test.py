@@ -1,8 +1,16 @@
-from solver import read_solution_from_file, solve_equation
+from solver import read_solution_from_file, solve_equation, \
+                   solve_equations, find_records, map_array, \
+                   output_arguments, solve_ensemble
 from pytest import approx
+import struct
+import os
+import gc
 import numpy as np
 
 
+RECORDS_IN_TEST_OUTPUT = 5
+
+
 def test_read_solution_from_file():
     (x_values, t_values, solution) = read_solution_from_file(
         "plotting/test_data/test_output.dat")
@@ -30,6 +38,48 @@ def test_read_solution_from_file():
     assert solution[2, :].tolist() == [5, 6]
 
 
+def test_read_solution_from_file__memory_mapped():
+    (x_values, t_values, solution) = read_solution_from_file(
+        "plotting/test_data/test_output.dat")
+
+    assert isinstance(x_values, np.memmap)
+    assert isinstance(t_values, np.memmap)
+    assert isinstance(solution, np.memmap)
+    assert solution.dtype == np.float64
+    assert not solution.flags.writeable
+
+
+def test_find_records():
+    records = find_records("plotting/test_data/test_output.dat")
+
+    assert len(records) == RECORDS_IN_TEST_OUTPUT
+    assert records[0] == [(4, 4)]
+    assert records[1] == [(16, 4)]
+
+
+def test_map_array__subrecords():
+    # A record split into two subrecords, as gfortran does
+    # for records larger than 2 GB
+    path = "test_subrecords.dat"
+
+    with open(path, "wb") as file:
+        file.write(struct.pack("@i", -16))
+        file.write(struct.pack("@dd", 1, 2))
+        file.write(struct.pack("@i", 16))
+        file.write(struct.pack("@i", 8))
+        file.write(struct.pack("@d", 3))
+        file.write(struct.pack("@i", -8))
+
+    records = find_records(path)
+
+    assert records == [[(4, 16), (28, 8)]]
+
+    result = map_array(path, records[0], shape=(3,))
+
+    assert result.tolist() == [1, 2, 3]
+    os.remove(path)
+
+
 def test_solve_equation():
     result = solve_equation(x_start=0, x_end=1,
                             nx=100, t_start=0, t_end=1,
@@ -69,3 +119,156 @@ def test_solve_equation():
     assert z[100, 1] == approx(-0.089576252581, rel=1e-10)
     assert z[100, 20] == approx(-0.914047938031, rel=1e-10)
     assert z[100, 99] == approx(0.0298980822175, rel=1e-10)
+
+
+def test_solve_equation__removes_file_when_unused():
+    x, y, z = solve_equation(x_start=0, x_end=1,
+                             nx=100, t_start=0, t_end=1,
+                             method='upwind',
+                             initial_conditions='sine',
+                             velocity=1, courant_factor=0.5,
+                             use_cache=False)[:3]
+
+    # The small arrays are copied into memory
+    assert not isinstance(x, np.memmap)
+    assert not isinstance(y, np.memmap)
+
+    subdir = os.path.dirname(z.filename)
+    frame = z[100]
+    del z
+    gc.collect()
+
+    # The file is kept while a view of the solution is used
+    assert os.path.exists(subdir)
+    assert frame[20] == approx(-0.914047938031, rel=1e-10)
+
+    del frame
+    gc.collect()
+    assert not os.path.exists(subdir)
+
+
+def test_output_arguments():
+    assert output_arguments() == ''
+    assert output_arguments(output_stride=3) == ' --output_stride=3'
+    assert output_arguments(max_frames=10) == ' --max_frames=10'
+
+    assert output_arguments(output_times=[0.5, 1]) == \
+        ' --output_times=0.5,1.0'
+
+
+def solve_for_output_test(**output):
+    return solve_equation(x_start=0, x_end=1, nx=100, t_start=0, t_end=1,
+                          method='upwind', initial_conditions='sine',
+                          velocity=1, courant_factor=0.5, **output)
+
+
+def test_solve_equation__output_stride():
+    x, y, z = solve_for_output_test()[:3]
+    x_selected, y_selected, z_selected = \
+        solve_for_output_test(output_stride=10)[:3]
+
+    # Every 10th time level and the last one
+    indices = sorted(set(range(0, len(y), 10)) | {len(y) - 1})
+
+    assert x_selected.tolist() == x.tolist()
+    assert y_selected.tolist() == y[indices].tolist()
+    assert z_selected.tolist() == z[indices].tolist()
+
+
+def test_solve_equation__max_frames():
+    y, z = solve_for_output_test()[1:3]
+    y_selected, z_selected = solve_for_output_test(max_frames=1)[1:3]
+
+    assert y_selected.tolist() == [y[-1]]
+    assert z_selected.tolist() == [z[-1].tolist()]
+
+    y_selected = solve_for_output_test(max_frames=5)[1]
+
+    assert len(y_selected) == 5
+    assert y_selected[0] == 0
+    assert y_selected[2] == approx(0.5, abs=0.005)
+    assert y_selected[4] == y[-1]
+
+
+def test_solve_equation__output_times():
+    y, z = solve_for_output_test()[1:3]
+
+    y_selected, z_selected = \
+        solve_for_output_test(output_times=[0.5, 0.2514])[1:3]
+
+    # Time levels nearest to the output times
+    indices = [np.abs(y - 0.2514).argmin(), np.abs(y - 0.5).argmin()]
+
+    assert y_selected.tolist() == y[indices].tolist()
+    assert z_selected.tolist() == z[indices].tolist()
+
+
+def test_solve_equations():
+    runs = [
+        dict(x_start=0, x_end=1, nx=100, t_start=0, t_end=1,
+             method=method, initial_conditions='sine',
+             velocity=1, courant_factor=0.5)
+        for method in ['upwind', 'lax-wendroff']
+    ]
+
+    results = solve_equations(runs)
+
+    assert len(results) == 2
+
+    for run, result in zip(runs, results):
+        x, y, z = result[:3]
+        expected_x, expected_y, expected_z = solve_equation(**run)[:3]
+
+        assert x.tolist() == expected_x.tolist()
+        assert y.tolist() == expected_y.tolist()
+        assert z.tolist() == expected_z.tolist()
+
+    # Different methods give different solutions
+    assert results[0][2].tolist() != results[1][2].tolist()
+
+    assert solve_equations([]) == []
+
+
+def test_solve_ensemble():
+    parameters = dict(x_start=0, x_end=1, nx=50, t_start=0, t_end=0.5,
+                      method='lax-wendroff', velocity=1)
+
+    ensemble = solve_ensemble(courant_factors=[0.5, 1, 0.25],
+                              initial_conditions=['square', 'sine'],
+                              **parameters)
+
+    assert ensemble['courant_factors'].tolist() == [0.5, 1, 0.25] * 2
+
+    assert ensemble['initial_conditions'] == \
+        ['square'] * 3 + ['sine'] * 3
+
+    assert ensemble['z'].shape[0] == 6
+    assert ensemble['t'].shape == ensemble['z'].shape[:2]
+
+    # The time grid is padded to the member with the smallest time step
+    assert ensemble['t'].shape[1] == ensemble['time_counts'].max()
+
+    # Compare with solving for each member separately
+    for member in range(6):
+        x, y, z, _, _, _ = solve_equation(
+            courant_factor=ensemble['courant_factors'][member],
+            initial_conditions=ensemble['initial_conditions'][member],
+            use_cache=False, **parameters)
+
+        nt = ensemble['time_counts'][member]
+        assert nt == len(y)
+        assert ensemble['x'].tolist() == x.tolist()
+        assert ensemble['t'][member, :nt].tolist() == y.tolist()
+        assert ensemble['z'][member, :nt].tolist() == z.tolist()
+        assert not ensemble['z'][member, nt:].any()
+
+
+def test_solve_ensemble__output_times():
+    ensemble = solve_ensemble(x_start=0, x_end=1, nx=50, t_start=0, t_end=1,
+                              method='upwind', velocity=1,
+                              courant_factors=[0.5, 0.9],
+                              initial_conditions=['sine'],
+                              output_times=[0.5, 1])
+
+    assert ensemble['time_counts'].tolist() == [2, 2]
+    assert ensemble['t'][:, 1].tolist() == [approx(1), approx(1, abs=0.02)]
@@ -8,18 +8,22 @@ use Settings, only: program_settings, read_from_command_line
 use FloatUtils, only: linspace
 use Output, only: write_output
 use Grid, only: set_grid
+use Snapshots, only: select_output_indices
 use InitialConditions, only: set_initial
-use Step, only: step_exact, step_ftcs, step_lax, step_upwind, step_lax_wendroff
+use Step, only: advance
+use Ensemble, only: is_ensemble, solve_and_create_ensemble_output
 implicit none
 private
 public :: solve_equation, solve_and_create_output, &
-          read_settings_solve_and_create_output, remove_ghost_cells
+          read_settings_solve_and_create_output
 
 contains
 
 
 !
-! Change the size of the time dimension in solution and t_points arrays
+! Change the size of the time dimension in solution and t_points arrays.
+! Only the first `keep_elements` time levels are copied, the new elements
+! are not initialized since they are overwritten by the solver.
 !
 ! Inputs:
 ! -------
@@ -48,8 +52,7 @@ subroutine resize_arrays(new_size, keep_elements, solution, t_points)
     ! -------
 
     allocate(t_points_buffer(new_size))
-    t_points_buffer = 0
-    t_points_buffer(1:keep_elements) = t_points
+    t_points_buffer(1:keep_elements) = t_points(1:keep_elements)
     deallocate(t_points)
     call move_alloc(t_points_buffer, t_points)
 
@@ -57,31 +60,7 @@ subroutine resize_arrays(new_size, keep_elements, solution, t_points)
     ! -------
 
     allocate(solution_buffer(size(solution, 1), new_size))
-    solution_buffer = 0
-    solution_buffer(:, 1:keep_elements) = solution
-    deallocate(solution)
-    call move_alloc(solution_buffer, solution)
-end subroutine
-
-
-!
-! Removes the ghost cells, which are the values corresponding to
-! the first and last x-values. The ghost cells are temporary cells
-! and are not needed after the solution has been calculated.
-!
-! Outputs:
-! -------
-!
-! solution : 2D array containing the solution for the advection equation
-!        first coordinate is x, second is time.
-!
-subroutine remove_ghost_cells(solution)
-    real(dp), allocatable, intent(inout) :: solution(:,:)
-    real(dp), allocatable :: solution_buffer(:,:)
-
-    allocate(solution_buffer(size(solution, 1) - 2, size(solution, 2)))
-    solution_buffer = 0
-    solution_buffer(:, :) = solution(2 : size(solution, 1) - 1,:)
+    solution_buffer(:, 1:keep_elements) = solution(:, 1:keep_elements)
     deallocate(solution)
     call move_alloc(solution_buffer, solution)
 end subroutine
@@ -130,56 +109,32 @@ subroutine iterate(options, tmax, dx, dt, v, &
     real(dp), allocatable, intent(in) :: x_points(:)
     real(dp), allocatable, intent(inout) :: solution(:,:)
     real(dp), allocatable, intent(inout) :: t_points(:)
-    integer :: nx
 
-    nx = size(solution, 1) ! number of x points plus two ghost points
     nt = 1
 
     ! Calculate numerical solution
     do while (t_points(nt) < tmax)
-        ! Update the ghost cells.
-        ! The leftmost cell gets the values of nx-1 x cell
-        ! and the rightmost cell gets the value of the second x cell.
-        solution(1, nt) = solution(nx - 1, nt)
-        solution(nx, nt) = solution(2, nt)
-
-        ! Increment the time value
         nt = nt + 1
-        t_points(nt) = t_points(nt - 1) + dt
 
         ! Resize the time dimension of the arrays if needed
-        if (nt > nt_allocated / 2) then
+        if (nt > nt_allocated) then
             nt_allocated = 2 * nt_allocated
 
             call resize_arrays(new_size=nt_allocated, &
-                               keep_elements=size(t_points), &
+                               keep_elements=nt - 1, &
                                solution=solution, t_points=t_points)
         end if
 
-        select case (options%method)
-        case ("exact")
-           call step_exact(options=options, t=t_points(nt), x_points=x_points,&
-                           nt=nt, solution=solution)
-        case ("ftcs")
-           call step_ftcs(nx=nx, nt=nt, dx=dx, dt=dt, v=v, solution=solution)
-        case ("lax")
-           call step_lax(nx=nx, nt=nt, dx=dx, dt=dt, v=v, solution=solution)
-        case ("upwind")
-           call step_upwind(nx=nx, nt=nt, dx=dx, dt=dt, v=v, solution=solution)
-        case ("lax-wendroff")
-           call step_lax_wendroff(nx=nx, nt=nt, dx=dx, dt=dt, v=v, &
-                                  solution=solution)
-        case default
-           print "(a, a)", "ERROR: unknown method ", trim(options%method)
-           call exit(41)
-        end select
+        call advance(options=options, x_points=x_points, dx=dx, dt=dt, v=v, &
+                     nt=nt, t_points=t_points, solution=solution)
     end do
 end subroutine
 
 
 !
-! Solve the advection equation
-!
+! Calculates the solution of the advection equation for all time levels.
+! The arrays are the working storage of the solver: they include
+! the ghost cells and the unused time levels after `nt`.
 !
 ! Inputs:
 ! -------
@@ -197,12 +152,15 @@ end subroutine
 !
 ! t_points : A 1D array containing the values of the time coordinate
 !
-subroutine solve_equation(options, solution, x_points, t_points)
+! nt : the number of calculated time levels
+!
+subroutine calculate_solution(options, solution, x_points, t_points, nt)
     type(program_settings), intent(in) :: options
     real(dp), allocatable, intent(out) :: solution(:,:)
     real(dp), allocatable, intent(out) :: x_points(:), t_points(:)
+    integer, intent(out) :: nt
     real(dp) :: dx, tmin, tmax, dt, v, courant
-    integer :: nt, nt_allocated
+    integer :: nt_allocated
 
     ! Assign shortcut variables from settings
     ! ----------
@@ -229,20 +187,64 @@ subroutine solve_equation(options, solution, x_points, t_points)
     dx = x_points(2) - x_points(1)
     dt = courant * dx / v
 
+    ! The time step is constant, allocate all time levels at once
+    ! (plus one for the rounding errors in t) instead of growing the arrays
+    nt_allocated = max(nt_allocated, ceiling((tmax - tmin) / dt) + 2)
+
+    call resize_arrays(new_size=nt_allocated, keep_elements=1, &
+                       solution=solution, t_points=t_points)
+
     call iterate(options=options, tmax=tmax, dx=dx, dt=dt, v=v, &
                  nt=nt, nt_allocated=nt_allocated, solution=solution, &
                  x_points=x_points, t_points=t_points)
+end subroutine
 
-    ! Remove unused elements from t dimension of arrays
-    call resize_arrays(new_size=nt, keep_elements=nt, &
-                       solution=solution, t_points=t_points)
 
-    call remove_ghost_cells(solution)
+!
+! Solve the advection equation
+!
+!
+! Inputs:
+! -------
+!
+! options : program options
+!
+!
+! Outputs:
+! -------
+!
+! solution : 2D array containing the solution for the advection equation
+!        first coordinate is x, second is time.
+!
+! x_points : A 1D array containing the values of the x coordinate
+!
+! t_points : A 1D array containing the values of the time coordinate
+!
+subroutine solve_equation(options, solution, x_points, t_points)
+    type(program_settings), intent(in) :: options
+    real(dp), allocatable, intent(out) :: solution(:,:)
+    real(dp), allocatable, intent(out) :: x_points(:), t_points(:)
+    real(dp), allocatable :: work(:,:)
+    integer :: nx, nt
+
+    call calculate_solution(options=options, solution=work, &
+                            x_points=x_points, t_points=t_points, nt=nt)
+
+    ! Copy the interior cells of the calculated time levels,
+    ! which is the only copy of the solution
+    nx = size(x_points)
+    solution = work(2 : nx + 1, 1 : nt)
+    t_points = t_points(1 : nt)
 end subroutine
 
 
 !
-! Solves PDE and prints solutions to a file
+! Solves PDE and prints solutions to a file. Only the time levels
+! selected with `output_stride`, `max_frames` or `output_times`
+! settings are printed. If `courant_factors` or `initial_conditions_list`
+! settings are given, the solutions for the ensemble are printed.
+! The interior cells of the selected levels are written directly
+! from the working storage of the solver.
 !
 ! Inputs:
 ! -------
@@ -253,11 +255,25 @@ subroutine solve_and_create_output(options)
     type(program_settings), intent(in) :: options
     real(dp), allocatable :: solution(:,:)
     real(dp), allocatable :: x_points(:), t_points(:)
+    integer, allocatable :: indices(:)
+    integer :: nx, nt
+
+    if (is_ensemble(options)) then
+        call solve_and_create_ensemble_output(options)
+        return
+    end if
+
+    call calculate_solution(options=options, solution=solution, &
+                            x_points=x_points, t_points=t_points, nt=nt)
+
+    call select_output_indices(options=options, t_points=t_points(1 : nt), &
+                               indices=indices)
 
-    call solve_equation(options, solution, x_points, t_points)
+    nx = size(x_points)
 
     call write_output(filename=options%output_path, &
-                      solution=solution, x_points=x_points, t_points=t_points)
+                      solution=solution(2 : nx + 1, :), x_points=x_points, &
+                      t_points=t_points, indices=indices)
 end subroutine
 
 
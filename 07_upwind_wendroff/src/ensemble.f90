@@ -0,0 +1,305 @@
+!
+! Solves the advection equation for an ensemble of Courant factors
+! and initial conditions in a single run
+!
+module Ensemble
+use Types, only: dp
+use Settings, only: program_settings
+use Grid, only: set_grid
+use InitialConditions, only: set_initial
+use Snapshots, only: select_output_indices
+use Step, only: advance
+use Output, only: write_ensemble_output
+implicit none
+private
+public :: is_ensemble, ensemble_members, solve_ensemble, &
+          solve_and_create_ensemble_output
+
+contains
+
+!
+! Returns .true. if the settings describe an ensemble of equations
+!
+! Inputs:
+! -------
+!
+! options : program options
+!
+function is_ensemble(options) result(ensemble)
+    type(program_settings), intent(in) :: options
+    logical :: ensemble
+
+    ensemble = allocated(options%courant_factors) .or. &
+               allocated(options%initial_conditions_list)
+end function
+
+
+!
+! Creates the settings for the members of the ensemble, which are
+! all combinations of `courant_factors` and `initial_conditions_list`.
+! If one of the lists is not given, `courant_factor` or
+! `initial_conditions` setting is used instead.
+!
+! Inputs:
+! -------
+!
+! options : program options
+!
+!
+! Outputs:
+! -------
+!
+! members : settings of the members. The Courant factor changes faster
+!           than the initial conditions: for factors 0.5,1
+!           and conditions square,sine the members are
+!           (0.5, square), (1, square), (0.5, sine), (1, sine).
+!
+subroutine ensemble_members(options, members)
+    type(program_settings), intent(in) :: options
+    type(program_settings), allocatable, intent(out) :: members(:)
+    integer :: factor_count, conditions_count, i, j, member
+
+    factor_count = 1
+    if (allocated(options%courant_factors)) &
+        factor_count = size(options%courant_factors)
+
+    conditions_count = 1
+    if (allocated(options%initial_conditions_list)) &
+        conditions_count = size(options%initial_conditions_list)
+
+    allocate(members(factor_count * conditions_count))
+    member = 0
+
+    do i = 1, conditions_count
+        do j = 1, factor_count
+            member = member + 1
+            members(member) = options
+
+            if (allocated(options%courant_factors)) then
+                members(member)%courant_factor = options%courant_factors(j)
+            end if
+
+            if (allocated(options%initial_conditions_list)) then
+                members(member)%initial_conditions = &
+                    options%initial_conditions_list(i)
+            end if
+        end do
+    end do
+end subroutine
+
+
+!
+! Change the size of the time dimension in solution and t_points arrays
+! of the ensemble
+!
+! Inputs:
+! -------
+!
+! new_size : The new size of the time dimensions
+!
+!
+! Outputs:
+! -------
+!
+! solution : 3D array containing the solutions, the coordinates are
+!            x, time and ensemble member.
+!
+! t_points : A 2D array containing the values of the time coordinate
+!            for each member.
+!
+subroutine resize_ensemble_arrays(new_size, solution, t_points)
+    integer, intent(in) :: new_size
+    real(dp), allocatable, intent(inout) :: solution(:, :, :)
+    real(dp), allocatable, intent(inout) :: t_points(:, :)
+    real(dp), allocatable :: solution_buffer(:, :, :)
+    real(dp), allocatable :: t_points_buffer(:, :)
+    integer :: keep_elements
+
+    keep_elements = min(new_size, size(t_points, 1))
+
+    allocate(t_points_buffer(new_size, size(t_points, 2)))
+    t_points_buffer = 0
+    t_points_buffer(1:keep_elements, :) = t_points(1:keep_elements, :)
+    call move_alloc(t_points_buffer, t_points)
+
+    allocate(solution_buffer(size(solution, 1), new_size, size(solution, 3)))
+    solution_buffer = 0
+    solution_buffer(:, 1:keep_elements, :) = solution(:, 1:keep_elements, :)
+    call move_alloc(solution_buffer, solution)
+end subroutine
+
+
+!
+! Solve the advection equation for all members of the ensemble.
+! The members are advanced together, one time index at a time, until
+! all of them reach the end time. Since the time steps of the members
+! are different, they have different numbers of time values.
+!
+! Inputs:
+! -------
+!
+! options : program options
+!
+! members : settings of the ensemble members, see `ensemble_members`.
+!
+!
+! Outputs:
+! -------
+!
+! solution : 3D array containing the solutions, the coordinates are
+!            x, time and ensemble member.
+!
+! x_points : A 1D array containing the values of the x coordinate
+!
+! t_points : A 2D array containing the values of the time coordinate
+!            for each member.
+!
+! time_counts : the number of time values of each member. The values
+!               of `t_points` and `solution` after this number are zeros.
+!
+subroutine solve_ensemble(options, members, solution, x_points, t_points, &
+                          time_counts)
+
+    type(program_settings), intent(in) :: options
+    type(program_settings), intent(in) :: members(:)
+    real(dp), allocatable, intent(out) :: solution(:, :, :)
+    real(dp), allocatable, intent(out) :: x_points(:), t_points(:, :)
+    integer, allocatable, intent(out) :: time_counts(:)
+    real(dp), allocatable :: member_solution(:, :), member_t_points(:)
+    real(dp) :: dt(size(members))
+    real(dp) :: dx, v
+    integer :: nx, nt, nt_allocated, member
+
+    ! Initialize the arrays, the grid is the same for all members
+    call set_grid(options=options, solution=member_solution, &
+                  x_points=x_points, t_points=member_t_points, &
+                  nt_allocated=nt_allocated)
+
+    nx = size(member_solution, 1) ! number of x points plus two ghost points
+
+    allocate(solution(nx, nt_allocated, size(members)))
+    allocate(t_points(nt_allocated, size(members)))
+    allocate(time_counts(size(members)))
+    solution = 0
+    t_points = 0
+
+    ! Set initial conditions and time steps
+    ! -------
+
+    dx = x_points(2) - x_points(1)
+    v = options%velocity
+
+    do member = 1, size(members)
+        call set_initial(type=members(member)%initial_conditions, &
+                         x_points=x_points, solution=solution(:, :, member))
+
+        t_points(1, member) = options%t_start
+        dt(member) = members(member)%courant_factor * dx / v
+    end do
+
+    time_counts = 1
+    nt = 1
+
+    ! Calculate numerical solutions
+    do while (any(time_counts == nt .and. t_points(nt, :) < options%t_end))
+        nt = nt + 1
+
+        ! Resize the time dimension of the arrays if needed
+        if (nt > nt_allocated / 2) then
+            nt_allocated = 2 * nt_allocated
+
+            call resize_ensemble_arrays(new_size=nt_allocated, &
+                                        solution=solution, t_points=t_points)
+        end if
+
+        do member = 1, size(members)
+            ! Skip the members that have reached the end time
+            if (time_counts(member) /= nt - 1) cycle
+            if (t_points(nt - 1, member) >= options%t_end) cycle
+
+            call advance(options=members(member), x_points=x_points, &
+                         dx=dx, dt=dt(member), v=v, nt=nt, &
+                         t_points=t_points(:, member), &
+                         solution=solution(:, :, member))
+
+            time_counts(member) = nt
+        end do
+    end do
+
+    ! Remove unused time values and the ghost cells
+    call resize_ensemble_arrays(new_size=nt, solution=solution, &
+                                t_points=t_points)
+
+    solution = solution(2 : nx - 1, :, :)
+end subroutine
+
+
+!
+! Solves the advection equation for the ensemble and prints solutions
+! to a file. For each member, only the time levels selected with
+! `output_stride`, `max_frames` or `output_times` settings are printed.
+!
+! Inputs:
+! -------
+!
+! options : program options
+!
+subroutine solve_and_create_ensemble_output(options)
+    type(program_settings), intent(in) :: options
+    type(program_settings), allocatable :: members(:)
+    real(dp), allocatable :: solution(:, :, :), output_solution(:, :, :)
+    real(dp), allocatable :: x_points(:), t_points(:, :), output_t_points(:, :)
+    integer, allocatable :: time_counts(:), output_time_counts(:)
+    integer, allocatable :: indices(:)
+    integer :: member, count
+
+    ! Allocate before the call, otherwise gfortran warns that the bounds
+    ! may be used uninitialized when the array is deallocated on entry
+    ! to `ensemble_members`
+    allocate(members(0))
+    call ensemble_members(options=options, members=members)
+
+    call solve_ensemble(options=options, members=members, &
+                        solution=solution, x_points=x_points, &
+                        t_points=t_points, time_counts=time_counts)
+
+    ! Select the time levels for each member
+    ! -------
+
+    allocate(output_time_counts(size(members)))
+
+    do member = 1, size(members)
+        call select_output_indices(options=members(member), &
+            t_points=t_points(1 : time_counts(member), member), &
+            indices=indices)
+
+        output_time_counts(member) = size(indices)
+    end do
+
+    allocate(output_solution(size(solution, 1), maxval(output_time_counts), &
+                             size(members)))
+
+    allocate(output_t_points(maxval(output_time_counts), size(members)))
+    output_solution = 0
+    output_t_points = 0
+
+    do member = 1, size(members)
+        call select_output_indices(options=members(member), &
+            t_points=t_points(1 : time_counts(member), member), &
+            indices=indices)
+
+        count = size(indices)
+        output_t_points(1 : count, member) = t_points(indices, member)
+        output_solution(:, 1 : count, member) = solution(:, indices, member)
+    end do
+
+    call write_ensemble_output(filename=options%output_path, &
+                               solution=output_solution, &
+                               x_points=x_points, &
+                               t_points=output_t_points, &
+                               time_counts=output_time_counts, &
+                               courant_factors=members%courant_factor, &
+                               initial_conditions=members%initial_conditions)
+end subroutine
+
+end module Ensemble
@@ -0,0 +1,199 @@
+module EnsembleTest
+use Types, only: dp
+use AssertsTest, only: assert_true, assert_equal
+use Settings, only: program_settings
+use Output, only: INITIAL_CONDITIONS_LENGTH
+use AdvectionEquation, only: solve_equation, solve_and_create_output
+use Ensemble, only: is_ensemble, ensemble_members, solve_ensemble
+use FileUtils, only: file_exists, delete_file
+implicit none
+private
+public ensemble_test_all
+
+contains
+
+!
+! Returns settings for the tests
+!
+function test_options() result(options)
+    type(program_settings) :: options
+
+    options%method = 'upwind'
+    options%initial_conditions = 'square'
+    options%x_start = 0
+    options%x_end = 1
+    options%nx = 50
+    options%t_start = 0
+    options%t_end = 0.5_dp
+    options%velocity = 1.0_dp
+    options%courant_factor = 0.5_dp
+end function
+
+
+subroutine ensemble_members_test(failures)
+    integer, intent(inout) :: failures
+    type(program_settings) :: options
+    type(program_settings), allocatable :: members(:)
+
+    options = test_options()
+    call assert_true(.not. is_ensemble(options), __FILE__, __LINE__, failures)
+
+    options%courant_factors = [0.5_dp, 1._dp]
+    options%initial_conditions_list = [character(len=100) :: 'square', 'sine']
+    call assert_true(is_ensemble(options), __FILE__, __LINE__, failures)
+
+    call ensemble_members(options=options, members=members)
+
+    call assert_equal(size(members), 4, __FILE__, __LINE__, failures)
+
+    call assert_true(all(abs(members%courant_factor - [0.5_dp, 1._dp, &
+                                                         0.5_dp, 1._dp]) &
+                         < 1e-15_dp), &
+                     __FILE__, __LINE__, failures)
+
+    call assert_equal(members(2)%initial_conditions, "square", &
+                      __FILE__, __LINE__, failures)
+
+    call assert_equal(members(3)%initial_conditions, "sine", &
+                      __FILE__, __LINE__, failures)
+
+    call assert_equal(members(4)%method, "upwind", &
+                      __FILE__, __LINE__, failures)
+end
+
+
+subroutine ensemble_members_test__one_list(failures)
+    integer, intent(inout) :: failures
+    type(program_settings) :: options
+    type(program_settings), allocatable :: members(:)
+
+    options = test_options()
+    options%courant_factors = [0.5_dp, 0.8_dp, 1._dp]
+
+    call ensemble_members(options=options, members=members)
+
+    call assert_equal(size(members), 3, __FILE__, __LINE__, failures)
+
+    call assert_true(all(members%initial_conditions == "square"), &
+                     __FILE__, __LINE__, failures)
+end
+
+
+subroutine solve_ensemble_test__same_as_single_runs(failures)
+    integer, intent(inout) :: failures
+    type(program_settings) :: options
+    type(program_settings), allocatable :: members(:)
+    real(dp), allocatable :: solution(:, :, :), single_solution(:, :)
+    real(dp), allocatable :: x_points(:), t_points(:, :), single_t_points(:)
+    real(dp), allocatable :: single_x_points(:)
+    integer, allocatable :: time_counts(:)
+    integer :: member, nt
+
+    options = test_options()
+    options%courant_factors = [0.5_dp, 1._dp, 0.3_dp]
+    options%initial_conditions_list = [character(len=100) :: 'square', 'sine']
+
+    call ensemble_members(options=options, members=members)
+
+    call solve_ensemble(options=options, members=members, &
+                        solution=solution, x_points=x_points, &
+                        t_points=t_points, time_counts=time_counts)
+
+    call assert_equal(size(solution, 1), 50, __FILE__, __LINE__, failures)
+    call assert_equal(size(solution, 3), 6, __FILE__, __LINE__, failures)
+
+    ! The time grid is padded to the member with the smallest time step
+    call assert_equal(size(t_points, 1), maxval(time_counts), &
+                      __FILE__, __LINE__, failures)
+
+    call assert_equal(time_counts(3), maxval(time_counts), &
+                      __FILE__, __LINE__, failures)
+
+    do member = 1, size(members)
+        call solve_equation(members(member), single_solution, &
+                            single_x_points, single_t_points)
+
+        nt = time_counts(member)
+        call assert_equal(nt, size(single_t_points), &
+                          __FILE__, __LINE__, failures)
+
+        call assert_true(all(abs(x_points - single_x_points) < 1e-15_dp), &
+                         __FILE__, __LINE__, failures)
+
+        ! Same results as solving for each member separately
+        call assert_true(all(abs(t_points(1:nt, member) - single_t_points) &
+                             < 1e-15_dp), &
+                         __FILE__, __LINE__, failures)
+
+        call assert_true(all(abs(solution(:, 1:nt, member) - single_solution) &
+                             < 1e-15_dp), &
+                         __FILE__, __LINE__, failures)
+
+        ! Padding
+        call assert_true(all(abs(solution(:, nt + 1:, member)) < 1e-15_dp), &
+                         __FILE__, __LINE__, failures)
+    end do
+end
+
+
+subroutine solve_and_create_output_test__ensemble(failures)
+    integer, intent(inout) :: failures
+    type(program_settings) :: options
+    integer :: unit, nx, nt, member_count
+    real(dp), allocatable :: x_points(:), t_points(:, :), courant_factors(:)
+    integer, allocatable :: time_counts(:)
+    character(len=INITIAL_CONDITIONS_LENGTH), allocatable :: names(:)
+
+    options = test_options()
+    options%output_path = "test_ensemble.dat"
+    options%courant_factors = [0.5_dp, 1._dp]
+    options%initial_conditions_list = [character(len=100) :: 'square', 'sine']
+    options%max_frames = 3
+
+    call solve_and_create_output(options)
+
+    call assert_true(file_exists("test_ensemble.dat"), &
+                     __FILE__, __LINE__, failures)
+
+    open(newunit=unit, file="test_ensemble.dat", form='unformatted', &
+         status='old', action='read')
+
+    read (unit) nx
+    read (unit) nt
+    read (unit) member_count
+    call assert_equal(nx, 50, __FILE__, __LINE__, failures)
+    call assert_equal(nt, 3, __FILE__, __LINE__, failures)
+    call assert_equal(member_count, 4, __FILE__, __LINE__, failures)
+
+    allocate(x_points(nx), t_points(nt, member_count))
+    allocate(time_counts(member_count), courant_factors(member_count))
+    allocate(names(member_count))
+
+    read (unit) x_points
+    read (unit) t_points
+    read (unit) time_counts
+    call assert_true(all(time_counts == 3), __FILE__, __LINE__, failures)
+
+    read (unit) courant_factors
+    call assert_true(all(abs(courant_factors - [0.5_dp, 1._dp, 0.5_dp, 1._dp]) &
+                         < 1e-15_dp), &
+                     __FILE__, __LINE__, failures)
+
+    read (unit) names
+    call assert_equal(names(4), "sine", __FILE__, __LINE__, failures)
+
+    close(unit=unit)
+    call delete_file("test_ensemble.dat")
+end
+
+
+subroutine ensemble_test_all(failures)
+    integer, intent(inout) :: failures
+
+    call ensemble_members_test(failures)
+    call ensemble_members_test__one_list(failures)
+    call solve_ensemble_test__same_as_single_runs(failures)
+    call solve_and_create_output_test__ensemble(failures)
+end
+
+end module EnsembleTest
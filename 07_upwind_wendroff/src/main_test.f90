@@ -7,8 +7,10 @@ program MainTest
     use AdvectionEquationTest, only: advection_equation_test_all
     use OutputTest, only: output_test_all
     use GridTest, only: grid_test_all
+    use SnapshotsTest, only: snapshots_test_all
     use InitialConditionsTest, only: init_test_all
     use StepTest, only: step_test_all
+    use EnsembleTest, only: ensemble_test_all
     implicit none
 
     integer :: failures = 0
@@ -23,8 +25,10 @@ program MainTest
     call advection_equation_test_all(failures)
     call output_test_all(failures)
     call grid_test_all(failures)
+    call snapshots_test_all(failures)
     call init_test_all(failures)
     call step_test_all(failures)
+    call ensemble_test_all(failures)
 
     if (failures == 0) then
         print *, NEW_LINE('h')//'Tests finished successfully'
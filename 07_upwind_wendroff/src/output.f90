@@ -5,7 +5,10 @@ module Output
 use Types, only: dp
 implicit none
 private
-public :: write_output
+public :: write_output, write_ensemble_output, INITIAL_CONDITIONS_LENGTH
+
+! Length of the names of initial conditions in the ensemble output
+integer, parameter :: INITIAL_CONDITIONS_LENGTH = 32
 
 contains
 
@@ -25,20 +28,91 @@ contains
 !
 ! t_points : A 1D array containing the values of t
 !
-subroutine write_output(filename, solution, x_points, t_points)
+! indices : (optional) indices of the time levels to be printed.
+!           If not present, all time levels are printed.
+!
+subroutine write_output(filename, solution, x_points, t_points, indices)
     character(len=*), intent(in) :: filename
     real(dp), intent(in) :: solution(:, :)
     real(dp), intent(in) :: x_points(:), t_points(:)
+    integer, intent(in), optional :: indices(:)
+    integer, allocatable :: levels(:)
+    integer :: i
 
     integer, parameter :: out_unit=20
 
     open(unit=out_unit, file=filename, form="unformatted", action="write", &
         status="replace")
 
+    if (present(indices)) then
+        allocate(levels(size(indices)))
+        levels(:) = indices
+    else
+        allocate(levels(size(t_points)))
+        levels(:) = [(i, i = 1, size(t_points))]
+    end if
+
+    write(out_unit) size(x_points)
+    write(out_unit) size(levels)
+    write(out_unit) x_points
+    write(out_unit) t_points(levels)
+    write(out_unit) (solution(:, levels(i)), i = 1, size(levels))
+
+    close(unit=out_unit)
+end subroutine
+
+
+!
+! Prints solution of an ensemble of equations to a binary data file.
+! See README.md for description of the file format.
+!
+! Inputs:
+! --------
+!
+! filename : Name of the data file to print output to
+!
+! solution : 3D array containing the solutions (values of v)
+!            the first coordinate is x, the second is t, the third is
+!            the index of the ensemble member.
+!
+! x_points : A 1D array containing the values of x
+!
+! t_points : A 2D array containing the values of t for each member
+!
+! time_counts : the number of time values of each member. The values
+!               of `t_points` and `solution` after this number
+!               are zeros.
+!
+! courant_factors : Courant factors of the members
+!
+! initial_conditions : initial conditions of the members
+!
+subroutine write_ensemble_output(filename, solution, x_points, t_points, &
+                                 time_counts, courant_factors, &
+                                 initial_conditions)
+
+    character(len=*), intent(in) :: filename
+    real(dp), intent(in) :: solution(:, :, :)
+    real(dp), intent(in) :: x_points(:), t_points(:, :)
+    integer, intent(in) :: time_counts(:)
+    real(dp), intent(in) :: courant_factors(:)
+    character(len=*), intent(in) :: initial_conditions(:)
+    character(len=INITIAL_CONDITIONS_LENGTH) :: names(size(initial_conditions))
+    integer :: out_unit
+
+    names = initial_conditions
+
+    open(newunit=out_unit, file=filename, form="unformatted", &
+         action="write", status="replace")
+
     write(out_unit) size(x_points)
-    write(out_unit) size(t_points)
+    write(out_unit) size(t_points, 1)
+    write(out_unit) size(t_points, 2)
     write(out_unit) x_points
     write(out_unit) t_points
+    write(out_unit) time_counts
+    write(out_unit) courant_factors
+    write(out_unit) names
     write(out_unit) solution
 
     close(unit=out_unit)
@@ -60,10 +60,55 @@ subroutine write_output_test(failures)
 end
 
 
+subroutine write_output_test__indices(failures)
+    integer, intent(inout) :: failures
+    real(dp) :: solution(4, 5)
+    real(dp) :: solution_read(2, 2)
+    real(dp) :: x_points_read(2), t_points_read(2)
+    integer, parameter :: unit=20
+    integer :: nx, nt, i
+
+    solution = reshape([(i, i = 1, 20)], shape(solution))
+
+    ! Write the interior cells of the second and fifth time levels
+    call write_output(filename="test_output.dat", solution=solution(2:3, :), &
+                      x_points=[1.1_dp, 1.2_dp], &
+                      t_points=[0.1_dp, 0.2_dp, 0.3_dp, 0.4_dp, 0.5_dp], &
+                      indices=[2, 5])
+
+    open(unit=unit, file="test_output.dat", form='unformatted', &
+        status='old', action='read' )
+
+    read (unit) nx
+    call assert_equal(nx, 2, __FILE__, __LINE__, failures)
+
+    read (unit) nt
+    call assert_equal(nt, 2, __FILE__, __LINE__, failures)
+
+    read (unit) x_points_read
+
+    read (unit) t_points_read
+    call assert_true(all(abs(t_points_read - [0.2_dp, 0.5_dp]) < 1e-15_dp), &
+                     __FILE__, __LINE__, failures)
+
+    read (unit) solution_read
+    call assert_true(all(abs(solution_read(:, 1) - [6, 7]) < 1e-15_dp), &
+                     __FILE__, __LINE__, failures)
+
+    call assert_true(all(abs(solution_read(:, 2) - [18, 19]) < 1e-15_dp), &
+                     __FILE__, __LINE__, failures)
+
+    close(unit=unit)
+
+    call delete_file("test_output.dat")
+end
+
+
 subroutine output_test_all(failures)
     integer, intent(inout) :: failures
 
     call write_output_test(failures)
+    call write_output_test__indices(failures)
 end
 
 end module OutputTest
@@ -3,7 +3,7 @@
 !
 module Settings
 use Types, only: dp
-use String, only: string_is_empty
+use String, only: string_is_empty, string_to_number
 use Constants, only: pi
 
 use CommandLineArgs, only: parsed_args, get_positional_value,&
@@ -50,6 +50,25 @@ type, public :: program_settings
 
     ! Numerical method used: ('square', 'sine')
     character(len=1024) :: initial_conditions
+
+    ! Write every `output_stride`-th time level to the output
+    integer :: output_stride = 1
+
+    ! The maximum number of time levels written to the output,
+    ! zero if all time levels are written
+    integer :: max_frames = 0
+
+    ! Write only the time levels nearest to these times.
+    ! Not allocated if the times are not specified.
+    real(dp), allocatable :: output_times(:)
+
+    ! Courant factors of the ensemble members.
+    ! Not allocated if the program is not in ensemble mode.
+    real(dp), allocatable :: courant_factors(:)
+
+    ! Initial conditions of the ensemble members.
+    ! Not allocated if the program is not in ensemble mode.
+    character(len=100), allocatable :: initial_conditions_list(:)
 end type program_settings
 
 ! Help message to be shown
@@ -69,6 +88,10 @@ character(len=HELP_MESSAGE_LENGTH), parameter :: HELP_MESSAGE = &
     //NEW_LINE('h')//"&
     &       [--t_end=1] [--velocity=1] [--courant_factor=0.5]"&
     //NEW_LINE('h')//"&
+    &       [--output_stride=1 | --max_frames=0 | --output_times=LIST]"&
+    //NEW_LINE('h')//"&
+    &       [--courant_factors=LIST] [--initial_conditions_list=LIST]"&
+    //NEW_LINE('h')//"&
     &"//NEW_LINE('h')//"&
     &    OUTPUT : path to the output data file"//NEW_LINE('h')//"&
     &"//NEW_LINE('h')//"&
@@ -103,6 +126,41 @@ character(len=HELP_MESSAGE_LENGTH), parameter :: HELP_MESSAGE = &
     //NEW_LINE('h')//"&
     &                  Default: 0.5."//NEW_LINE('h')//"&
     &"//NEW_LINE('h')//"&
+    &    --output_stride=NUMBER : write every NUMBER-th time level."&
+    //NEW_LINE('h')//"&
+    &                  The last time level is always written."&
+    //NEW_LINE('h')//"&
+    &                  Default: 1."//NEW_LINE('h')//"&
+    &"//NEW_LINE('h')//"&
+    &    --max_frames=NUMBER : write at most NUMBER time levels, evenly"&
+    //NEW_LINE('h')//"&
+    &                  spaced in time, including the last one."&
+    //NEW_LINE('h')//"&
+    &                  Default: 0 (write all time levels)."&
+    //NEW_LINE('h')//"&
+    &"//NEW_LINE('h')//"&
+    &    --output_times=LIST : comma-separated list of times, for example"&
+    //NEW_LINE('h')//"&
+    &                  0.1,0.5. Write only the time levels nearest"&
+    //NEW_LINE('h')//"&
+    &                  to these times."//NEW_LINE('h')//"&
+    &"//NEW_LINE('h')//"&
+    &    --courant_factors=LIST : comma-separated list of Courant factors."&
+    //NEW_LINE('h')//"&
+    &                  Solve for an ensemble of all combinations"&
+    //NEW_LINE('h')//"&
+    &                  of these Courant factors and initial conditions."&
+    //NEW_LINE('h')//"&
+    &"//NEW_LINE('h')//"&
+    &    --initial_conditions_list=LIST : comma-separated list of initial"&
+    //NEW_LINE('h')//"&
+    &                  conditions, for example square,sine. Solve for"&
+    //NEW_LINE('h')//"&
+    &                  an ensemble of all combinations of these initial"&
+    //NEW_LINE('h')//"&
+    &                  conditions and Courant factors."&
+    //NEW_LINE('h')//"&
+    &"//NEW_LINE('h')//"&
     &    --help  : show this message."//NEW_LINE('h')
 
 ! Default values for the settings
@@ -116,6 +174,8 @@ real(dp), parameter :: DEFAULT_T_START = 0._dp
 real(dp), parameter :: DEFAULT_T_END = 1._dp
 real(dp), parameter :: DEFAULT_VELOCITY = 1.0_dp
 real(dp), parameter :: DEFAULT_COURANT_FACTOR = 0.5_dp
+integer, parameter :: DEFAULT_OUTPUT_STRIDE = 1
+integer, parameter :: DEFAULT_MAX_FRAMES = 0
 
 character(len=100), parameter :: DEFAULT_METHOD = "lax"
 character(len=100), parameter :: DEFAULT_INITIAL_CONDITIONS = "square"
@@ -188,6 +248,104 @@ subroutine make_message(text, message)
         "Run with --help for help."
 end subroutine
 
+!
+! Reads a comma-separated list of numbers, for example "0.1,0.5".
+!
+! Inputs:
+! --------
+!
+! text: the list of numbers
+!
+!
+! Outputs:
+! -------
+!
+! numbers : the numbers read from `text`.
+!
+! success : .true. if all the numbers were successfully read.
+!
+subroutine read_list_of_numbers(text, numbers, success)
+    character(len=*), intent(in) :: text
+    real(dp), allocatable, intent(out) :: numbers(:)
+    logical, intent(out) :: success
+    integer :: i, count, start, separator
+
+    count = 1
+
+    do i = 1, len_trim(text)
+        if (text(i:i) == ',') count = count + 1
+    end do
+
+    allocate(numbers(count))
+    start = 1
+
+    do i = 1, count
+        separator = index(text(start:), ',')
+
+        if (separator == 0) then
+            separator = len_trim(text) + 1
+        else
+            separator = start + separator - 1
+        end if
+
+        success = .not. string_is_empty(text(start:separator - 1))
+        if (.not. success) return
+
+        call string_to_number(text(start:separator - 1), numbers(i), success)
+        if (.not. success) return
+
+        start = separator + 1
+    end do
+end subroutine
+
+!
+! Reads a comma-separated list of words, for example "square,sine".
+!
+! Inputs:
+! --------
+!
+! text: the list of words
+!
+!
+! Outputs:
+! -------
+!
+! words : the words read from `text`.
+!
+! success : .true. if none of the words are empty.
+!
+subroutine read_list_of_words(text, words, success)
+    character(len=*), intent(in) :: text
+    character(len=*), allocatable, intent(out) :: words(:)
+    logical, intent(out) :: success
+    integer :: i, count, start, separator
+
+    count = 1
+
+    do i = 1, len_trim(text)
+        if (text(i:i) == ',') count = count + 1
+    end do
+
+    allocate(words(count))
+    start = 1
+
+    do i = 1, count
+        separator = index(text(start:), ',')
+
+        if (separator == 0) then
+            separator = len_trim(text) + 1
+        else
+            separator = start + separator - 1
+        end if
+
+        success = .not. string_is_empty(text(start:separator - 1))
+        if (.not. success) return
+
+        words(i) = adjustl(text(start:separator - 1))
+        start = separator + 1
+    end do
+end subroutine
+
 !
 ! Reads settings from parsed command line arguments.
 !
@@ -210,8 +368,9 @@ subroutine read_from_parsed_command_line(parsed, settings, error_message)
     character(len=*), intent(out) :: error_message
     logical :: success
     character(len=ARGUMENT_MAX_LENGTH), allocatable :: unrecognized(:)
-    integer :: unrecognized_count
-    character(len=ARGUMENT_MAX_LENGTH) :: valid_args(12)
+    integer :: unrecognized_count, output_selections, i
+    character(len=ARGUMENT_MAX_LENGTH) :: output_times, list
+    character(len=ARGUMENT_MAX_LENGTH) :: valid_args(17)
 
     error_message = ""
 
@@ -240,6 +399,11 @@ subroutine read_from_parsed_command_line(parsed, settings, error_message)
     valid_args(10) = "initial_conditions"
     valid_args(11) = "h"
     valid_args(12) = "help"
+    valid_args(13) = "output_stride"
+    valid_args(14) = "max_frames"
+    valid_args(15) = "output_times"
+    valid_args(16) = "courant_factors"
+    valid_args(17) = "initial_conditions_list"
 
     call unrecognized_named_args(valid=valid_args, parsed=parsed, &
         unrecognized=unrecognized, count=unrecognized_count)
@@ -361,6 +525,75 @@ subroutine read_from_parsed_command_line(parsed, settings, error_message)
         return
     end if
 
+    ! output_stride
+    ! --------------
+
+    call get_named_value_or_default(name='output_stride', parsed=parsed, &
+                                    default=DEFAULT_OUTPUT_STRIDE, &
+                                    value=settings%output_stride, &
+                                    success=success)
+
+    if (.not. success) then
+        call make_message("output_stride is not a number", error_message)
+        return
+    end if
+
+    if (settings%output_stride < 1) then
+        call make_message("output_stride must be positive", error_message)
+        return
+    end if
+
+    ! max_frames
+    ! --------------
+
+    call get_named_value_or_default(name='max_frames', parsed=parsed, &
+                                    default=DEFAULT_MAX_FRAMES, &
+                                    value=settings%max_frames, &
+                                    success=success)
+
+    if (.not. success) then
+        call make_message("max_frames is not a number", error_message)
+        return
+    end if
+
+    if (settings%max_frames < 0) then
+        call make_message("max_frames must not be negative", error_message)
+        return
+    end if
+
+    ! output_times
+    ! --------------
+
+    call get_named_value_or_default(name='output_times', parsed=parsed, &
+                                    default="", value=output_times, &
+                                    success=success)
+
+    if (.not. string_is_empty(output_times)) then
+        call read_list_of_numbers(text=output_times, &
+                                  numbers=settings%output_times, &
+                                  success=success)
+
+        if (.not. success) then
+            call make_message("output_times is not a list of numbers", &
+                              error_message)
+            return
+        end if
+    end if
+
+    output_selections = 0
+    if (settings%output_stride /= DEFAULT_OUTPUT_STRIDE) &
+        output_selections = output_selections + 1
+    if (settings%max_frames /= DEFAULT_MAX_FRAMES) &
+        output_selections = output_selections + 1
+    if (allocated(settings%output_times)) &
+        output_selections = output_selections + 1
+
+    if (output_selections > 1) then
+        call make_message("Only one of output_stride, max_frames and &
+                          &output_times can be used", error_message)
+        return
+    end if
+
     ! method
     ! --------------
 
@@ -396,6 +629,53 @@ subroutine read_from_parsed_command_line(parsed, settings, error_message)
         call make_message("Incorrect initial_conditions", error_message)
         return
     end if
+
+    ! courant_factors
+    ! --------------
+
+    call get_named_value_or_default(name='courant_factors', parsed=parsed, &
+                                    default="", value=list, success=success)
+
+    if (.not. string_is_empty(list)) then
+        call read_list_of_numbers(text=list, &
+                                  numbers=settings%courant_factors, &
+                                  success=success)
+
+        if (.not. success) then
+            call make_message("courant_factors is not a list of numbers", &
+                              error_message)
+            return
+        end if
+    end if
+
+    ! initial_conditions_list
+    ! --------------
+
+    call get_named_value_or_default(name='initial_conditions_list', &
+                                    parsed=parsed, default="", value=list, &
+                                    success=success)
+
+    if (.not. string_is_empty(list)) then
+        call read_list_of_words(text=list, &
+                                words=settings%initial_conditions_list, &
+                                success=success)
+
+        if (.not. success) then
+            call make_message("initial_conditions_list is not a list", &
+                              error_message)
+            return
+        end if
+
+        do i = 1, size(settings%initial_conditions_list)
+            if (.not. any(ALLOWED_INITIAL_CONDITIONS == &
+                          settings%initial_conditions_list(i))) then
+
+                call make_message("Incorrect initial_conditions_list", &
+                                  error_message)
+                return
+            end if
+        end do
+    end if
 end subroutine
 
 end module Settings
\ No newline at end of file
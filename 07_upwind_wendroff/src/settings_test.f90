@@ -186,6 +186,130 @@ subroutine read_from_parsed_command_line_test__incorrect_method(failures)
 end
 
 
+subroutine read_from_parsed_command_line_test__output_times(failures)
+    integer, intent(inout) :: failures
+    type(parsed_args) :: parsed
+    type(program_settings) :: settings
+    character(len=1024) :: error_message
+
+    call allocate_parsed(size=1, parsed=parsed)
+
+    parsed%positional_count = 1
+    parsed%positional(1) = "data.bin"
+    parsed%named_count = 1
+    parsed%named_name(1) = "output_times"
+    parsed%named_value(1) = "0.5,0.1,2"
+
+    call read_from_parsed_command_line(parsed=parsed, settings=settings, &
+                                       error_message=error_message)
+
+    call assert_true(string_is_empty(error_message), &
+                     __FILE__, __LINE__, failures)
+
+    call assert_equal(size(settings%output_times), 3, &
+                      __FILE__, __LINE__, failures)
+
+    call assert_approx(settings%output_times(1), 0.5_dp, 1e-5_dp, &
+                       __FILE__, __LINE__, failures)
+
+    call assert_approx(settings%output_times(2), 0.1_dp, 1e-5_dp, &
+                       __FILE__, __LINE__, failures)
+
+    call assert_approx(settings%output_times(3), 2._dp, 1e-5_dp, &
+                       __FILE__, __LINE__, failures)
+
+    call assert_equal(settings%output_stride, 1, __FILE__, __LINE__, failures)
+    call assert_equal(settings%max_frames, 0, __FILE__, __LINE__, failures)
+end
+
+
+subroutine read_from_parsed_command_line_test__output_conflict(failures)
+    integer, intent(inout) :: failures
+    type(parsed_args) :: parsed
+    type(program_settings) :: settings
+    character(len=1024) :: error_message
+
+    call allocate_parsed(size=2, parsed=parsed)
+
+    parsed%positional_count = 1
+    parsed%positional(1) = "data.bin"
+    parsed%named_count = 2
+    parsed%named_name(1) = "output_stride"
+    parsed%named_value(1) = "3"
+    parsed%named_name(2) = "max_frames"
+    parsed%named_value(2) = "10"
+
+    call read_from_parsed_command_line(parsed=parsed, settings=settings, &
+                                       error_message=error_message)
+
+    call assert_string_starts_with(error_message, &
+                                   "ERROR: Only one of output_stride", &
+                                   __FILE__, __LINE__, failures)
+end
+
+
+subroutine read_from_parsed_command_line_test__ensemble(failures)
+    integer, intent(inout) :: failures
+    type(parsed_args) :: parsed
+    type(program_settings) :: settings
+    character(len=1024) :: error_message
+
+    call allocate_parsed(size=2, parsed=parsed)
+
+    parsed%positional_count = 1
+    parsed%positional(1) = "data.bin"
+    parsed%named_count = 2
+    parsed%named_name(1) = "courant_factors"
+    parsed%named_value(1) = "0.5,1"
+    parsed%named_name(2) = "initial_conditions_list"
+    parsed%named_value(2) = "sine,square"
+
+    call read_from_parsed_command_line(parsed=parsed, settings=settings, &
+                                       error_message=error_message)
+
+    call assert_true(string_is_empty(error_message), &
+                     __FILE__, __LINE__, failures)
+
+    call assert_equal(size(settings%courant_factors), 2, &
+                      __FILE__, __LINE__, failures)
+
+    call assert_approx(settings%courant_factors(2), 1._dp, 1e-5_dp, &
+                       __FILE__, __LINE__, failures)
+
+    call assert_equal(size(settings%initial_conditions_list), 2, &
+                      __FILE__, __LINE__, failures)
+
+    call assert_equal(settings%initial_conditions_list(1), "sine", &
+                      __FILE__, __LINE__, failures)
+
+    call assert_equal(settings%initial_conditions_list(2), "square", &
+                      __FILE__, __LINE__, failures)
+end
+
+
+subroutine read_from_parsed_command_line_test__incorrect_ensemble(failures)
+    integer, intent(inout) :: failures
+    type(parsed_args) :: parsed
+    type(program_settings) :: settings
+    character(len=1024) :: error_message
+
+    call allocate_parsed(size=1, parsed=parsed)
+
+    parsed%positional_count = 1
+    parsed%positional(1) = "data.bin"
+    parsed%named_count = 1
+    parsed%named_name(1) = "initial_conditions_list"
+    parsed%named_value(1) = "square,triangle"
+
+    call read_from_parsed_command_line(parsed=parsed, settings=settings, &
+                                       error_message=error_message)
+
+    call assert_string_starts_with(error_message, &
+                                   "ERROR: Incorrect initial_conditions_list", &
+                                   __FILE__, __LINE__, failures)
+end
+
+
 subroutine show_help_test(failures)
     integer, intent(inout) :: failures
     type(parsed_args) :: parsed
@@ -232,6 +356,10 @@ subroutine settings_test_all(failures)
     call read_from_parsed_command_line_test__no_args(failures)
     call read_from_parsed_command_line_test__named(failures)
     call read_from_parsed_command_line_test__incorrect_method(failures)
+    call read_from_parsed_command_line_test__output_times(failures)
+    call read_from_parsed_command_line_test__output_conflict(failures)
+    call read_from_parsed_command_line_test__ensemble(failures)
+    call read_from_parsed_command_line_test__incorrect_ensemble(failures)
     call show_help_test(failures)
     call read_from_command_line_test(failures)
 end
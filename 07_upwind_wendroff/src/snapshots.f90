@@ -0,0 +1,241 @@
+!
+! Select the time levels of the solution that are written to the output
+!
+module Snapshots
+use Types, only: dp
+use Settings, only: program_settings
+implicit none
+private
+public :: init_schedule, select_frames, select_output_indices
+
+!
+! Stores the state of the selection of time levels
+!
+type, public :: output_schedule
+    ! Select every `stride`-th time level. Used when `times` is
+    ! not allocated.
+    integer :: stride = 1
+
+    ! Select the time levels nearest to these times, sorted
+    real(dp), allocatable :: times(:)
+
+    ! Always select the last time level
+    logical :: include_last = .true.
+
+    ! Index of the next element of `times` to look for
+    integer :: next_time = 1
+
+    ! Index of the last selected time level, zero if none
+    integer :: last_selected = 0
+end type output_schedule
+
+contains
+
+!
+! Creates the schedule that selects the time levels
+! using `output_stride`, `max_frames` and `output_times` settings.
+!
+! Inputs:
+! -------
+!
+! options : program options
+!
+!
+! Outputs:
+! -------
+!
+! schedule : the schedule for `select_frames`
+!
+subroutine init_schedule(options, schedule)
+    type(program_settings), intent(in) :: options
+    type(output_schedule), intent(out) :: schedule
+    real(dp) :: time_step, time
+    integer :: i, j
+
+    if (allocated(options%output_times)) then
+        schedule%times = options%output_times
+        schedule%include_last = .false.
+
+        ! Sort the times
+        do i = 2, size(schedule%times)
+            time = schedule%times(i)
+            j = i - 1
+
+            do while (j >= 1)
+                if (schedule%times(j) <= time) exit
+                schedule%times(j + 1) = schedule%times(j)
+                j = j - 1
+            end do
+
+            schedule%times(j + 1) = time
+        end do
+    else if (options%max_frames > 0) then
+        ! The last time level is one of the frames, and the other frames
+        ! are the nearest to evenly spaced times
+        allocate(schedule%times(options%max_frames - 1))
+
+        if (options%max_frames > 1) then
+            time_step = (options%t_end - options%t_start) / &
+                        (options%max_frames - 1)
+
+            do i = 1, options%max_frames - 1
+                schedule%times(i) = options%t_start + (i - 1) * time_step
+            end do
+        end if
+    else
+        schedule%stride = options%output_stride
+    end if
+end subroutine
+
+
+!
+! Adds a time level to the list of selected levels,
+! unless it has already been selected
+!
+! Inputs:
+! -------
+!
+! index : index of the time level
+!
+!
+! Outputs:
+! -------
+!
+! schedule : the schedule, see `init_schedule`
+!
+! frames : indices of the selected time levels
+!
+! count : the number of selected time levels
+!
+subroutine add_frame(index, schedule, frames, count)
+    integer, intent(in) :: index
+    type(output_schedule), intent(inout) :: schedule
+    integer, intent(inout) :: frames(:)
+    integer, intent(inout) :: count
+
+    if (index <= schedule%last_selected) return
+
+    count = count + 1
+    frames(count) = index
+    schedule%last_selected = index
+end subroutine
+
+
+!
+! Selects the time levels that need to be written to the output
+! after the solution at time index `nt` has been calculated.
+! The function is called for each time index in order, starting from 1.
+! It can select the previous time level, if it is nearer to an
+! output time than the current one.
+!
+! Inputs:
+! -------
+!
+! t_points : A 1D array containing the values of the time coordinate,
+!            calculated up to index `nt`.
+!
+! nt : the time index that has just been calculated
+!
+! is_last : .true. if `nt` is the last time index
+!
+!
+! Outputs:
+! -------
+!
+! schedule : the schedule, see `init_schedule`
+!
+! frames : indices of the selected time levels, in increasing order
+!
+! count : the number of selected time levels (0, 1 or 2)
+!
+subroutine select_frames(t_points, nt, is_last, schedule, frames, count)
+    real(dp), intent(in) :: t_points(:)
+    integer, intent(in) :: nt
+    logical, intent(in) :: is_last
+    type(output_schedule), intent(inout) :: schedule
+    integer, intent(out) :: frames(2)
+    integer, intent(out) :: count
+    real(dp) :: time
+
+    count = 0
+    frames = 0
+
+    if (.not. allocated(schedule%times)) then
+        if (mod(nt - 1, schedule%stride) == 0 .or. is_last) then
+            call add_frame(nt, schedule, frames, count)
+        end if
+
+        return
+    end if
+
+    do while (schedule%next_time <= size(schedule%times))
+        time = schedule%times(schedule%next_time)
+
+        if (time > t_points(nt)) then
+            ! The time has not been reached yet
+            if (.not. is_last) exit
+
+            ! The time is after the end of the solution
+            call add_frame(nt, schedule, frames, count)
+        else if (nt == 1) then
+            call add_frame(nt, schedule, frames, count)
+        else if (time - t_points(nt - 1) <= t_points(nt) - time) then
+            call add_frame(nt - 1, schedule, frames, count)
+        else
+            call add_frame(nt, schedule, frames, count)
+        end if
+
+        schedule%next_time = schedule%next_time + 1
+    end do
+
+    if (is_last .and. schedule%include_last) then
+        call add_frame(nt, schedule, frames, count)
+    end if
+end subroutine
+
+
+!
+! Selects the time levels of a calculated solution that need to be
+! written to the output.
+!
+! Inputs:
+! -------
+!
+! options : program options
+!
+! t_points : A 1D array containing the values of the time coordinate
+!
+!
+! Outputs:
+! -------
+!
+! indices : indices of the selected time levels, in increasing order
+!
+subroutine select_output_indices(options, t_points, indices)
+    type(program_settings), intent(in) :: options
+    real(dp), intent(in) :: t_points(:)
+    integer, allocatable, intent(out) :: indices(:)
+    integer, allocatable :: selected(:)
+    type(output_schedule) :: schedule
+    integer :: frames(2), count, total, nt
+
+    ! Allocated on the heap, since the number of time levels can be
+    ! too large for the stack
+    allocate(selected(size(t_points)))
+
+    call init_schedule(options=options, schedule=schedule)
+    total = 0
+
+    do nt = 1, size(t_points)
+        call select_frames(t_points=t_points, nt=nt, &
+                           is_last=nt == size(t_points), &
+                           schedule=schedule, frames=frames, count=count)
+
+        selected(total + 1 : total + count) = frames(1:count)
+        total = total + count
+    end do
+
+    indices = selected(1:total)
+end subroutine
+
+end module Snapshots
@@ -7,7 +7,8 @@ use Settings, only: program_settings
 use InitialConditions, only: calculate_initial
 implicit none
 private
-public :: step_exact, step_ftcs, step_lax, step_upwind, step_lax_wendroff
+public :: step_exact, step_ftcs, step_lax, step_upwind, step_lax_wendroff, &
+          advance
 
 contains
 
@@ -226,4 +227,73 @@ subroutine step_lax_wendroff(nx, nt, dx, dt, v, solution)
 end subroutine
 
 
+!
+! Calculate the time value and the solution at time index `nt`
+! from the previous time index, using the method from the options
+!
+! Inputs:
+! -------
+!
+! options : program options
+!
+! x_points : A 1D array containing the values of the x coordinate
+!
+! dx : size of space step
+!
+! dt : size of time step
+!
+! v : velocity parameter in advection equation
+!
+! nt : the current time index in solutions array for which the solution needs
+!      to be calcualted.
+!
+!
+! Outputs:
+! -------
+!
+! t_points : A 1D array containing the values of the time coordinate
+!
+! solution : 2D array containing the solution for the advection equation
+!        first coordinate is x, second is time.
+!
+subroutine advance(options, x_points, dx, dt, v, nt, t_points, solution)
+    type(program_settings), intent(in) :: options
+    real(dp), intent(in) :: x_points(:)
+    real(dp), intent(in) :: dx, dt, v
+    integer, intent(in) :: nt
+    real(dp), intent(inout) :: t_points(:)
+    real(dp), intent(inout) :: solution(:,:)
+    integer :: nx
+
+    nx = size(solution, 1) ! number of x points plus two ghost points
+
+    ! Update the ghost cells.
+    ! The leftmost cell gets the values of nx-1 x cell
+    ! and the rightmost cell gets the value of the second x cell.
+    solution(1, nt - 1) = solution(nx - 1, nt - 1)
+    solution(nx, nt - 1) = solution(2, nt - 1)
+
+    ! Increment the time value
+    t_points(nt) = t_points(nt - 1) + dt
+
+    select case (options%method)
+    case ("exact")
+       call step_exact(options=options, t=t_points(nt), x_points=x_points,&
+                       nt=nt, solution=solution)
+    case ("ftcs")
+       call step_ftcs(nx=nx, nt=nt, dx=dx, dt=dt, v=v, solution=solution)
+    case ("lax")
+       call step_lax(nx=nx, nt=nt, dx=dx, dt=dt, v=v, solution=solution)
+    case ("upwind")
+       call step_upwind(nx=nx, nt=nt, dx=dx, dt=dt, v=v, solution=solution)
+    case ("lax-wendroff")
+       call step_lax_wendroff(nx=nx, nt=nt, dx=dx, dt=dt, v=v, &
+                              solution=solution)
+    case default
+       print "(a, a)", "ERROR: unknown method ", trim(options%method)
+       call exit(41)
+    end select
+end subroutine
+
+
 end module Step
\ No newline at end of file
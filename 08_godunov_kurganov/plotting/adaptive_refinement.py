@@ -0,0 +1,280 @@
+#
+# Compare the solutions calculated with adaptive mesh refinement (AMR)
+# with the solution on the uniform grid with the cells of the finest
+# AMR level: their errors and the costs of calculating them.
+#
+
+from plot_utils import create_dir
+import matplotlib.pyplot as plt
+import numpy as np
+import os
+import time
+from solver import solve_equation, solve_amr_equation
+from work_precision import exact_square_solution, cell_updates
+
+
+def composite_error(frame):
+    """
+    Returns the L1 error of the composite AMR solution for square
+    initial conditions.
+
+    Parameters
+    ----------
+    frame : dict
+        The composite solution, see `read_amr_frames` in `solver` module.
+
+
+    Returns
+    -------
+        float
+            The error.
+    """
+
+    exact = exact_square_solution(x=frame['x'], t=frame['t'])
+    return (frame['dx'] * np.abs(frame['z'][:, 0] - exact)).sum()
+
+
+def compare_with_uniform(nx_finest, levels_values, amr_threshold=0.01,
+                         amr_detector='gradient', t_end=0.4,
+                         courant_factor=0.5, repeats=1):
+    """
+    Solves the equation with the Kurganov-Tadmor method for square initial
+    conditions on the uniform grid and with AMR. The finest cells
+    of all AMR runs have the size of the cells of the uniform grid.
+
+    Parameters
+    ----------
+    nx_finest : int
+        The number of x points of the uniform grid.
+
+    levels_values : list of int
+        The numbers of AMR levels of the runs.
+
+    amr_threshold : float
+        The cells are refined where the detector value exceeds
+        the threshold.
+
+    amr_detector : str
+        Detector of the cells that need refinement: gradient, shock.
+
+    t_end : float
+        The time of the compared solutions, at most 0.5.
+
+    courant_factor : float
+        Courant factor parameter of the numerical methods.
+
+    repeats : int
+        The number of runs of each grid, the shortest time is used.
+
+
+    Returns
+    -------
+        list of dict
+            Results of the uniform grid, followed by the AMR runs:
+
+            levels : the number of levels, 1 for the uniform grid
+
+            nx : the number of x points of the coarsest level
+
+            error : L1 error of the solution at the end time
+
+            cell_updates : the number of cell updates on all levels
+
+            cells : the number of cells at the end time
+
+            seconds : the time of the run
+
+            frame : the composite solution at the end time,
+                    see `read_amr_frames` in `solver` module.
+                    None for the uniform grid.
+
+        None if the program failed.
+    """
+
+    times = []
+
+    for _ in range(repeats):
+        start = time.perf_counter()
+
+        result = solve_equation(x_start=0, x_end=1, nx=nx_finest, t_start=0,
+                                t_end=t_end, method='kurganov',
+                                initial_conditions='square',
+                                courant_factor=courant_factor,
+                                max_frames=1, use_cache=False)
+
+        times.append(time.perf_counter() - start)
+
+        if result is None:
+            return None
+
+    x, y, z, dx = result
+
+    results = [dict(
+        levels=1, nx=nx_finest,
+        error=dx * np.abs(z[-1, :, 0] - exact_square_solution(x, y[-1])).sum(),
+        cell_updates=cell_updates(nx=nx_finest, t_end=t_end,
+                                  courant_factor=courant_factor,
+                                  limiter='none'),
+        cells=nx_finest, seconds=min(times), frame=None
+    )]
+
+    for levels in levels_values:
+        nx = nx_finest // 2**(levels - 1)
+        times = []
+
+        for _ in range(repeats):
+            start = time.perf_counter()
+
+            result = solve_amr_equation(x_start=0, x_end=1, nx=nx, t_start=0,
+                                        t_end=t_end, method='kurganov',
+                                        initial_conditions='square',
+                                        courant_factor=courant_factor,
+                                        amr_levels=levels,
+                                        amr_threshold=amr_threshold,
+                                        amr_detector=amr_detector,
+                                        max_frames=1)
+
+            times.append(time.perf_counter() - start)
+
+            if result is None:
+                return None
+
+        frame = result[1][-1]
+
+        results.append(dict(
+            levels=levels, nx=nx, error=composite_error(frame),
+            cell_updates=frame['cell_updates'], cells=len(frame['x']),
+            seconds=min(times), frame=frame
+        ))
+
+    return results
+
+
+def format_table(results):
+    """
+    Returns the table of the errors and the costs, relative to the
+    uniform grid.
+
+    Parameters
+    ----------
+    results : list of dict
+        The results of `compare_with_uniform`.
+
+
+    Returns
+    -------
+        str
+            The text of the table.
+    """
+
+    uniform = results[0]
+
+    lines = [f"{'levels':>6} {'nx':>6} {'L1 error':>11} {'error ratio':>12} "
+             f"{'cell updates':>13} {'fewer updates':>14} {'cells':>6} "
+             f"{'time [s]':>9}"]
+
+    for result in results:
+        lines.append(
+            f"{result['levels']:>6} {result['nx']:>6} "
+            f"{result['error']:>11.4e} "
+            f"{result['error'] / uniform['error']:>12.3f} "
+            f"{result['cell_updates']:>13} "
+            f"{uniform['cell_updates'] / result['cell_updates']:>14.1f} "
+            f"{result['cells']:>6} {result['seconds']:>9.3f}")
+
+    return '\n'.join(lines)
+
+
+def plot_composite_solution(frame, plot_dir, file_name, show_plot):
+    """
+    Plots the composite AMR solution, with the cells of different levels
+    shown with different colors, and the exact solution.
+
+    Parameters
+    ----------
+    frame : dict
+        The composite solution, see `read_amr_frames` in `solver` module.
+
+    plot_dir : str
+        Directory where the plot file is saved
+
+    file_name : str
+        Plot file name
+
+    show_plot : bool
+        If False the plot will not be shown on screen (only saved to a file).
+        False value is used in unit tests.
+    """
+
+    fig, ax = plt.subplots(figsize=(8, 6))
+    x_exact = np.linspace(0, 1, 2000)
+
+    ax.plot(x_exact, exact_square_solution(x=x_exact, t=frame['t']),
+            color='black', linewidth=1, label='Exact')
+
+    for level in np.unique(frame['levels']):
+        cells = frame['levels'] == level
+
+        ax.plot(frame['x'][cells], frame['z'][cells, 0], marker='o',
+                linestyle='none', markersize=3, label=f"Level {level}")
+
+    ax.set_xlabel("Position x [m]")
+    ax.set_ylabel("Velocity u [m/s]")
+    ax.set_title(f"AMR solution of Burgers' equation at t={frame['t']:.2f} s")
+    ax.legend()
+    ax.grid(alpha=0.3)
+    fig.tight_layout()
+
+    create_dir(plot_dir)
+    fig.savefig(os.path.join(plot_dir, file_name))
+
+    if show_plot:
+        plt.show()
+
+    plt.close(fig)
+
+
+def make_plots(plot_dir, show_plot, nx_finest=800, levels_values=None,
+               repeats=3):
+    """
+    Compares AMR runs with the uniform grid, prints the table
+    and plots the composite solution of the run with most levels.
+
+    Parameters
+    ----------
+    plot_dir : str
+        Directory where the plot files will be saved.
+
+    show_plot : bool
+        If False the plot will not be shown on screen (only saved to a file).
+        False value is used in unit tests.
+
+    nx_finest : int
+        The number of x points of the uniform grid.
+
+    levels_values : list of int
+        The numbers of AMR levels of the runs.
+
+    repeats : int
+        The number of runs of each grid, the shortest time is used.
+    """
+
+    if levels_values is None:
+        levels_values = [2, 3, 4]
+
+    results = compare_with_uniform(nx_finest=nx_finest,
+                                   levels_values=levels_values,
+                                   repeats=repeats)
+
+    if results is None:
+        return
+
+    print(format_table(results))
+
+    plot_composite_solution(frame=results[-1]['frame'], plot_dir=plot_dir,
+                            file_name="amr_solution.pdf",
+                            show_plot=show_plot)
+
+
+if __name__ == '__main__':
+    make_plots(plot_dir="plots", show_plot=True)
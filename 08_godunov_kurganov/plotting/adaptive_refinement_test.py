@@ -0,0 +1,49 @@
+from adaptive_refinement import composite_error, compare_with_uniform, \
+                                format_table, make_plots
+import numpy as np
+import os
+import shutil
+from pytest import approx
+
+
+def test_composite_error():
+    frame = dict(t=0.4, x=np.array([0.1, 0.5, 0.9]),
+                 dx=np.array([0.5, 0.25, 0.25]),
+                 z=np.array([[0.5], [0.625], [0]]))
+
+    assert composite_error(frame) == approx(0.5)
+
+
+def test_compare_with_uniform():
+    results = compare_with_uniform(nx_finest=800, levels_values=[3, 4])
+
+    assert [result['levels'] for result in results] == [1, 3, 4]
+    assert [result['nx'] for result in results] == [800, 200, 100]
+    assert results[0]['frame'] is None
+
+    # The accuracy of the uniform grid with fewer cell updates
+    for result in results[1:]:
+        assert result['error'] < 1.1 * results[0]['error']
+        assert result['cell_updates'] < 0.5 * results[0]['cell_updates']
+        assert result['cells'] < 400
+
+    table = format_table(results).splitlines()
+    assert len(table) == 4
+    assert table[1].split()[:2] == ['1', '800']
+    assert table[1].split()[3] == '1.000'
+
+
+def test_make_plots():
+    plot_dir = "test_plots"
+    plot_file_name = "amr_solution.pdf"
+    plot_file_path = os.path.join(plot_dir, plot_file_name)
+
+    if os.path.exists(plot_file_path):
+        os.remove(plot_file_path)
+
+    make_plots(plot_dir=plot_dir, show_plot=False, nx_finest=200,
+               levels_values=[3], repeats=1)
+
+    assert os.path.exists(plot_file_path)
+    os.remove(plot_file_path)
+    shutil.rmtree(plot_dir)
@@ -0,0 +1,222 @@
+#
+# Strong scaling benchmark: measure the time of solving Burgers' equation
+# on the same grid with different numbers of threads.
+#
+
+from plot_utils import create_dir
+import matplotlib.pyplot as plt
+import os
+import time
+from solver import solve_equation
+
+
+def thread_counts(max_threads):
+    """
+    Returns the numbers of threads for the benchmark: the powers of two
+    smaller than `max_threads`, and `max_threads`.
+
+    Parameters
+    ----------
+    max_threads : int
+        The largest number of threads, usually the number of cores.
+
+
+    Returns
+    -------
+        list of int
+            The numbers of threads.
+    """
+
+    counts = []
+    threads = 1
+
+    while threads < max_threads:
+        counts.append(threads)
+        threads *= 2
+
+    counts.append(max_threads)
+    return counts
+
+
+def benchmark(threads_list, nx, t_end, method, repeats=3):
+    """
+    Measures the time of solving the equation with the Fortran program.
+    Each run is repeated several times, and the shortest time is used.
+
+    Parameters
+    ----------
+    threads_list : list of int
+        The numbers of threads.
+
+    nx : int
+        The number of x points in the grid.
+
+    t_end : float
+        The largest t value.
+
+    method : str
+        Numerical method to be used: godunov, kurganov
+
+    repeats : int
+        The number of runs for each number of threads.
+
+
+    Returns
+    -------
+        dict
+            threads : the numbers of threads
+
+            seconds : the times of the runs
+
+            speedup : the times with one thread divided by the times
+                      of the runs
+
+            efficiency : speedup divided by the number of threads
+    """
+
+    seconds = []
+
+    for threads in threads_list:
+        times = []
+
+        for _ in range(repeats):
+            start = time.perf_counter()
+
+            # Only the last time level is written to the output, so that
+            # the calculation takes most of the time
+            solve_equation(x_start=0, x_end=1, nx=nx, t_start=0, t_end=t_end,
+                           method=method, initial_conditions='sine',
+                           courant_factor=0.5, max_frames=1,
+                           use_cache=False, threads=threads)
+
+            times.append(time.perf_counter() - start)
+
+        seconds.append(min(times))
+
+    speedup = [seconds[0] * threads_list[0] / value for value in seconds]
+
+    return dict(
+        threads=list(threads_list),
+        seconds=seconds,
+        speedup=speedup,
+        efficiency=[value / threads
+                    for value, threads in zip(speedup, threads_list)]
+    )
+
+
+def format_table(results):
+    """
+    Returns the table of the benchmark results.
+
+    Parameters
+    ----------
+    results : dict
+        The results of `benchmark`.
+
+
+    Returns
+    -------
+        str
+            The text of the table.
+    """
+
+    lines = [f"{'threads':>8} {'time [s]':>10} {'speedup':>8} "
+             f"{'efficiency':>10}"]
+
+    for i, threads in enumerate(results['threads']):
+        lines.append(f"{threads:>8} {results['seconds'][i]:>10.3f} "
+                     f"{results['speedup'][i]:>8.2f} "
+                     f"{results['efficiency'][i]:>10.2f}")
+
+    return '\n'.join(lines)
+
+
+def plot_speedup(results, title, plot_dir, file_name, show_plot):
+    """
+    Plots the speedup versus the number of threads.
+
+    Parameters
+    ----------
+    results : dict
+        The results of `benchmark`.
+
+    title : str
+        Title of the plot.
+
+    plot_dir : str
+        Directory where the plot file is saved
+
+    file_name : str
+        Plot file name
+
+    show_plot : bool
+        If False the plot will not be shown on screen (only saved to a file).
+        False value is used in unit tests.
+    """
+
+    plt.figure(figsize=(8, 6))
+
+    plt.plot(results['threads'], results['threads'], linestyle='dashed',
+             color='0.5', label='Ideal')
+
+    plt.plot(results['threads'], results['speedup'], marker='o',
+             label='Measured')
+
+    plt.title(title)
+    plt.xlabel("Number of threads")
+    plt.ylabel("Speedup")
+    plt.legend()
+    plt.grid(alpha=0.3)
+    plt.tight_layout()
+
+    create_dir(plot_dir)
+    plt.savefig(os.path.join(plot_dir, file_name))
+
+    if show_plot:
+        plt.show()
+
+    plt.close()
+
+
+def make_plots(plot_dir, show_plot, nx=10000, t_end=0.01, max_threads=None):
+    """
+    Runs the benchmark for both methods, prints the tables
+    and creates the plots.
+
+    Parameters
+    ----------
+    plot_dir : str
+        Directory where the plot files will be saved.
+
+    show_plot : bool
+        If False the plot will not be shown on screen (only saved to a file).
+        False value is used in unit tests.
+
+    nx : int
+        The number of x points in the grid.
+
+    t_end : float
+        The largest t value.
+
+    max_threads : int
+        The largest number of threads. If None, the number of cores is used.
+    """
+
+    if max_threads is None:
+        max_threads = os.cpu_count()
+
+    for method in ['Godunov', 'Kurganov']:
+        results = benchmark(threads_list=thread_counts(max_threads), nx=nx,
+                            t_end=t_end, method=method.lower())
+
+        print(f"\n{method}, nx={nx}:\n{format_table(results)}")
+
+        plot_speedup(results=results,
+                     title=f"Strong scaling of {method} method, nx={nx}",
+                     plot_dir=plot_dir,
+                     file_name=f"threads_{method.lower()}.pdf",
+                     show_plot=show_plot)
+
+
+if __name__ == '__main__':
+    make_plots(plot_dir="plots", show_plot=True)
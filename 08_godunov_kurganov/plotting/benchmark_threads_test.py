@@ -0,0 +1,41 @@
+from benchmark_threads import thread_counts, benchmark, format_table, \
+                              make_plots
+import os
+import shutil
+from pytest import approx
+
+
+def test_thread_counts():
+    assert thread_counts(1) == [1]
+    assert thread_counts(4) == [1, 2, 4]
+    assert thread_counts(6) == [1, 2, 4, 6]
+
+
+def test_benchmark():
+    results = benchmark(threads_list=[1, 2], nx=100, t_end=0.1,
+                        method='kurganov', repeats=1)
+
+    assert results['threads'] == [1, 2]
+    assert len(results['seconds']) == 2
+    assert results['speedup'][0] == approx(1)
+    assert results['efficiency'][1] == approx(results['speedup'][1] / 2)
+
+    table = format_table(results).splitlines()
+    assert len(table) == 3
+    assert table[2].split()[0] == "2"
+
+
+def test_make_plots():
+    plot_dir = "test_plots"
+    plot_file_name = "threads_godunov.pdf"
+    plot_file_path = os.path.join(plot_dir, plot_file_name)
+
+    if os.path.exists(plot_file_path):
+        os.remove(plot_file_path)
+
+    make_plots(plot_dir=plot_dir, show_plot=False, nx=100, t_end=0.1,
+               max_threads=2)
+
+    assert os.path.exists(plot_file_path)
+    os.remove(plot_file_path)
+    shutil.rmtree(plot_dir)
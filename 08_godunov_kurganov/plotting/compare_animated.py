@@ -1,7 +1,7 @@
 # Show animated plots of solutions of advection equation
 
 import matplotlib.pyplot as plt
-from solver import solve_equation
+from solver import solve_equations
 from matplotlib import animation
 from itertools import cycle
 from plot_solution import find_nearest_index
@@ -118,6 +118,7 @@ def prepare_for_animation(methods, initial_conditions, t_end, nx, ylim,
     x_values = []
     y_values = []
     z_values = []
+    runs = []
 
     for method in methods:
         this_courant = courant_factor
@@ -129,12 +130,16 @@ def prepare_for_animation(methods, initial_conditions, t_end, nx, ylim,
             this_nx *= 100
             this_courant *= 100
 
-        result = solve_equation(x_start=0, x_end=1,
-                                nx=this_nx, t_start=0, t_end=t_end,
-                                method=method.lower(),
-                                initial_conditions=initial_conditions,
-                                courant_factor=this_courant)
+        runs.append(dict(x_start=0, x_end=1,
+                         nx=this_nx, t_start=0, t_end=t_end,
+                         method=method.lower(),
+                         initial_conditions=initial_conditions,
+                         courant_factor=this_courant))
 
+    # Calculate solutions for all methods at the same time
+    results = solve_equations(runs)
+
+    for result in results:
         if result is None:
             return
         else:
@@ -0,0 +1,443 @@
+#
+# Study the convergence of numerical methods: solve Burgers' equation
+# on a ladder of grids, each twice finer than the previous one,
+# and calculate the errors and the observed orders of convergence.
+# Burgers' equation has no exact solution in this program, and the solutions
+# are compared with a solution on a finer reference grid instead.
+#
+
+from plot_utils import create_dir
+import matplotlib.pyplot as plt
+import numpy as np
+import os
+import subprocess
+from solver import solve_equations, stream_equation
+
+# Norms of the errors
+NORMS = ['L1', 'L2', 'Linf']
+
+
+def refinement_ladder(nx_coarsest, levels):
+    """
+    Returns the numbers of x points of the grids, each grid is twice
+    finer than the previous one.
+
+    Parameters
+    ----------
+    nx_coarsest : int
+        The number of x points in the coarsest grid.
+
+    levels : int
+        The number of grids.
+
+
+    Returns
+    -------
+        list of int
+            The numbers of x points.
+    """
+
+    return [nx_coarsest * 2**level for level in range(levels)]
+
+
+def restrict(values, nx):
+    """
+    Restricts the solution from a fine grid onto a coarse grid, by
+    averaging the values of the fine cells inside each coarse cell.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        Values at the centers of the cells of the fine grid.
+
+    nx : int
+        The number of cells in the coarse grid. The number of cells
+        in the fine grid must be a multiple of `nx`.
+
+
+    Returns
+    -------
+        numpy.ndarray
+            Values in the cells of the coarse grid.
+    """
+
+    values = np.asarray(values)
+
+    if len(values) % nx != 0:
+        raise ValueError(
+            f"Can not restrict {len(values)} cells onto {nx} cells")
+
+    return values.reshape(nx, len(values) // nx).mean(axis=1)
+
+
+def error_norms(values, reference, dx):
+    """
+    Calculates the norms of the error of the solution.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        The solution.
+
+    reference : numpy.ndarray
+        The reference solution on the same grid.
+
+    dx : float
+        Size of the cells.
+
+
+    Returns
+    -------
+        dict
+            L1, L2 and Linf norms of the error.
+    """
+
+    error = np.abs(np.asarray(values) - np.asarray(reference))
+
+    return dict(
+        L1=dx * error.sum(),
+        L2=np.sqrt(dx * (error**2).sum()),
+        Linf=error.max()
+    )
+
+
+def observed_orders(nx_values, errors):
+    """
+    Calculates the observed orders of convergence between
+    consecutive grids.
+
+    Parameters
+    ----------
+    nx_values : list of int
+        The numbers of x points of the grids.
+
+    errors : list of float
+        The errors of the solutions on the grids.
+
+
+    Returns
+    -------
+        list of float
+            The orders, one less than the number of grids.
+    """
+
+    return [
+        np.log(errors[i] / errors[i + 1]) /
+        np.log(nx_values[i + 1] / nx_values[i])
+        for i in range(len(nx_values) - 1)
+    ]
+
+
+def fitted_order(nx_values, errors):
+    """
+    Calculates the order of convergence by fitting a straight line
+    to the errors on the log-log scale.
+
+    Parameters
+    ----------
+    nx_values : list of int
+        The numbers of x points of the grids.
+
+    errors : list of float
+        The errors of the solutions on the grids.
+
+
+    Returns
+    -------
+        float
+            The order.
+    """
+
+    slope, _ = np.polyfit(np.log(nx_values), np.log(errors), 1)
+    return -slope
+
+
+def reference_solutions(times, run):
+    """
+    Solves the equation on the reference grid and returns the solutions
+    at the given times. Each solution is interpolated linearly between
+    the two time levels around the time, so it is compared with the other
+    grids at the same time. The solution is streamed from the program,
+    and only two time levels are kept in memory.
+
+    Parameters
+    ----------
+    times : list of float
+        The times of the solutions.
+
+    run : dict
+        Keyword arguments passed to `stream_equation`, except `t_end`,
+        which is the largest of `times`.
+
+
+    Returns
+    -------
+        list of numpy.ndarray
+            Solutions at `times`, each of shape (nx, unit_vector_dimension).
+
+    Raises
+    -------
+        subprocess.CalledProcessError
+            If the program has failed.
+    """
+
+    order = np.argsort(times)
+    solutions = [None] * len(times)
+    found = 0
+    previous_t, previous = None, None
+
+    for _, t, solution in stream_equation(t_end=max(times), **run):
+        while found < len(order) and times[order[found]] <= t:
+            time = times[order[found]]
+
+            if previous is None or t == time:
+                solutions[order[found]] = np.array(solution)
+            else:
+                weight = (time - previous_t) / (t - previous_t)
+                solutions[order[found]] = (1 - weight) * previous \
+                    + weight * solution
+
+            found += 1
+
+        previous_t, previous = t, solution
+
+    return solutions
+
+
+def convergence_study(method, initial_conditions, nx_values, courant_factor,
+                      t_end, reference_nx=None, max_workers=None):
+    """
+    Solves Burgers' equation on several grids and compares the solutions
+    at the end time with the solution on the reference grid, restricted
+    onto each of the grids. The grids are solved at the same time,
+    in separate processes, and the reference grid is solved after them.
+
+    The time level nearest to `t_end` is used on each grid, and its time
+    is slightly different for each grid. The reference solution is
+    interpolated to the same time (see `reference_solutions`), so that
+    the difference in time does not add to the errors.
+
+    Parameters
+    ----------
+    method : str
+        Numerical method to be used: godunov, kurganov
+
+    initial_conditions : str
+        Type of initial conditions: square, sine
+
+    nx_values : list of int
+        The numbers of x points of the grids, see `refinement_ladder`.
+
+    courant_factor : float
+        Courant factor parameter of the numerical methods.
+
+    t_end : float
+        The time of the compared solutions.
+
+    reference_nx : int
+        The number of x points of the reference grid, must be a multiple
+        of all `nx_values`. If None, the reference grid is four times finer
+        than the finest grid.
+
+    max_workers : int
+        The maximum number of runs of the grids at the same time.
+        If None, all runs are started together.
+
+
+    Returns
+    -------
+        dict
+            nx : the numbers of x points
+
+            dx : sizes of the cells
+
+            reference_nx : the number of x points of the reference grid
+
+            errors : dict with lists of errors for each norm from `NORMS`
+
+            orders : dict with lists of the observed orders
+                     between consecutive grids for each norm
+
+            fitted_orders : dict with fitted order for each norm
+
+        None if the program failed.
+    """
+
+    if reference_nx is None:
+        reference_nx = 4 * max(nx_values)
+
+    runs = [
+        dict(x_start=0, x_end=1, nx=nx, t_start=0, t_end=t_end,
+             method=method, initial_conditions=initial_conditions,
+             courant_factor=courant_factor, output_times=[t_end])
+        for nx in nx_values
+    ]
+
+    results = solve_equations(runs, max_workers=max_workers)
+
+    if any(result is None for result in results):
+        return None
+
+    times = [y[-1] for _, y, _, _ in results]
+
+    try:
+        references = reference_solutions(
+            times=times,
+            run=dict(x_start=0, x_end=1, nx=reference_nx, t_start=0,
+                     method=method, initial_conditions=initial_conditions,
+                     courant_factor=courant_factor))
+    except subprocess.CalledProcessError as error:
+        print(error.stderr)
+        return None
+
+    errors = {norm: [] for norm in NORMS}
+    dx_values = []
+
+    for nx, (_, _, z, dx), reference in zip(nx_values, results, references):
+        reference = restrict(reference[:, 0], nx)
+        norms = error_norms(z[-1, :, 0], reference, dx)
+        dx_values.append(dx)
+
+        for norm in NORMS:
+            errors[norm].append(norms[norm])
+
+    return dict(
+        nx=list(nx_values),
+        dx=dx_values,
+        reference_nx=reference_nx,
+        errors=errors,
+        orders={norm: observed_orders(nx_values, errors[norm])
+                for norm in NORMS},
+        fitted_orders={norm: fitted_order(nx_values, errors[norm])
+                       for norm in NORMS}
+    )
+
+
+def format_table(study):
+    """
+    Returns the table of the errors and observed orders.
+
+    Parameters
+    ----------
+    study : dict
+        The results of `convergence_study`.
+
+
+    Returns
+    -------
+        str
+            The text of the table.
+    """
+
+    header = f"{'nx':>8} {'dx':>10}"
+
+    for norm in NORMS:
+        header += f" {norm + ' error':>12} {'order':>6}"
+
+    lines = [header]
+
+    for i, nx in enumerate(study['nx']):
+        line = f"{nx:>8} {study['dx'][i]:>10.3e}"
+
+        for norm in NORMS:
+            order = '' if i == 0 else f"{study['orders'][norm][i - 1]:.2f}"
+            line += f" {study['errors'][norm][i]:>12.4e} {order:>6}"
+
+        lines.append(line)
+
+    line = f"{'fitted':>8} {'':>10}"
+
+    for norm in NORMS:
+        line += f" {'':>12} {study['fitted_orders'][norm]:>6.2f}"
+
+    lines.append(line)
+    return '\n'.join(lines)
+
+
+def plot_convergence(study, title, plot_dir, file_name, show_plot):
+    """
+    Makes a log-log plot of the errors versus the size of the cells.
+
+    Parameters
+    ----------
+    study : dict
+        The results of `convergence_study`.
+
+    title : str
+        Title of the plot.
+
+    plot_dir : str
+        Directory where the plot file is saved
+
+    file_name : str
+        Plot file name
+
+    show_plot : bool
+        If False the plot will not be shown on screen (only saved to a file).
+        False value is used in unit tests.
+    """
+
+    plt.figure(figsize=(8, 6))
+    markers = ['o', 's', '^']
+
+    for norm, marker in zip(NORMS, markers):
+        plt.loglog(study['dx'], study['errors'][norm], marker=marker,
+                   label=f"{norm}, order {study['fitted_orders'][norm]:.2f}")
+
+    plt.title(title)
+    plt.xlabel(r"$\Delta x$")
+    plt.ylabel("Error")
+    plt.legend(loc='lower right')
+    plt.grid(True, which='both', alpha=0.3)
+    plt.tight_layout()
+
+    create_dir(plot_dir)
+    plt.savefig(os.path.join(plot_dir, file_name))
+
+    if show_plot:
+        plt.show()
+
+    plt.close()
+
+
+def make_plots(plot_dir, show_plot, levels=5):
+    """
+    Studies convergence of the numerical methods, prints the tables
+    and creates the plots.
+
+    Parameters
+    ----------
+    plot_dir : str
+        Directory where the plot files will be saved.
+
+    show_plot : bool
+        If False the plot will not be shown on screen (only saved to a file).
+        False value is used in unit tests.
+
+    levels : int
+        The number of grids.
+    """
+
+    nx_values = refinement_ladder(nx_coarsest=50, levels=levels)
+
+    # The end time is before the shock forms, when the solution is smooth
+    for method in ['Godunov', 'Kurganov']:
+        study = convergence_study(method=method.lower(),
+                                  initial_conditions='sine',
+                                  nx_values=nx_values, courant_factor=0.5,
+                                  t_end=0.1)
+
+        if study is None:
+            return
+
+        print(f"\n{method}:\n{format_table(study)}")
+
+        plot_convergence(study=study,
+                         title=f"Convergence of {method} method",
+                         plot_dir=plot_dir,
+                         file_name=f"convergence_{method.lower()}.pdf",
+                         show_plot=show_plot)
+
+
+if __name__ == '__main__':
+    make_plots(plot_dir="plots", show_plot=True)
@@ -0,0 +1,93 @@
+from convergence import refinement_ladder, restrict, error_norms, \
+                        observed_orders, fitted_order, convergence_study, \
+                        format_table, make_plots, reference_solutions
+from solver import stream_equation
+import numpy as np
+import os
+import shutil
+import pytest
+from pytest import approx
+
+
+def test_refinement_ladder():
+    assert refinement_ladder(nx_coarsest=50, levels=4) == [50, 100, 200, 400]
+
+
+def test_restrict():
+    values = np.array([1, 3, 2, 4, 5, 7])
+
+    assert restrict(values, 3).tolist() == [2, 3, 6]
+    assert restrict(values, 1).tolist() == [approx(22 / 6)]
+    assert restrict(values, 6).tolist() == values.tolist()
+
+
+def test_restrict__not_multiple():
+    with pytest.raises(ValueError):
+        restrict(np.array([1, 2, 3]), 2)
+
+
+def test_error_norms():
+    norms = error_norms(values=[1, 2, 3], reference=[1, 0, 4], dx=0.5)
+
+    assert norms['L1'] == approx(1.5)
+    assert norms['L2'] == approx(2.5**0.5)
+    assert norms['Linf'] == approx(2)
+
+
+def test_observed_orders():
+    nx_values = [10, 20, 40]
+    errors = [1, 0.25, 0.0625]
+
+    assert observed_orders(nx_values, errors) == [approx(2), approx(2)]
+    assert fitted_order(nx_values, errors) == approx(2)
+
+
+def test_reference_solutions():
+    run = dict(x_start=0, x_end=1, nx=50, t_start=0, method='kurganov',
+               initial_conditions='sine', courant_factor=0.5)
+
+    frames = list(stream_equation(t_end=0.05, **run))
+    _, t3, frame3 = frames[3]
+    _, t4, frame4 = frames[4]
+
+    solutions = reference_solutions(times=[t4, (t3 + t4) / 2, t3], run=run)
+
+    assert len(solutions) == 3
+    assert solutions[0].tolist() == frame4.tolist()
+    assert solutions[1] == approx((frame3 + frame4) / 2, rel=1e-12)
+    assert solutions[2] == approx(frame3, rel=1e-12)
+
+
+@pytest.mark.parametrize("method", ['godunov', 'kurganov'])
+def test_convergence_study(method):
+    study = convergence_study(method=method, initial_conditions='sine',
+                              nx_values=[50, 100, 200], courant_factor=0.5,
+                              t_end=0.1)
+
+    assert study['nx'] == [50, 100, 200]
+    assert study['reference_nx'] == 800
+    assert study['dx'] == [approx(0.02), approx(0.01), approx(0.005)]
+
+    # Both methods are first order for smooth solutions
+    assert study['fitted_orders']['L1'] == approx(1, abs=0.15)
+    assert len(study['orders']['L1']) == 2
+
+    table = format_table(study).splitlines()
+    assert len(table) == 5
+    assert table[1].split()[0] == "50"
+    assert table[-1].split()[0] == "fitted"
+
+
+def test_make_plots():
+    plot_dir = "test_plots"
+    plot_file_name = "convergence_kurganov.pdf"
+    plot_file_path = os.path.join(plot_dir, plot_file_name)
+
+    if os.path.exists(plot_file_path):
+        os.remove(plot_file_path)
+
+    make_plots(plot_dir=plot_dir, show_plot=False, levels=2)
+
+    assert os.path.exists(plot_file_path)
+    os.remove(plot_file_path)
+    shutil.rmtree(plot_dir)
@@ -0,0 +1,491 @@
+# Solve Burgers' equation
+#
+#   u_t + u u_x = 0
+#
+# with NumPy, without running the Fortran program. The numerical methods
+# are the same as in the Fortran program (see src/interface_flux.f90
+# and src/step.f90), the calculations are vectorized over all cells
+# and interfaces.
+#
+import numpy as np
+
+METHODS = ['godunov', 'kurganov']
+LIMITERS = ['none', 'minmod', 'vanleer', 'mc']
+
+
+def cell_centers(x_start, x_end, nx):
+    """
+    Returns the x values of the centers of the cells.
+
+    Parameters
+    ----------
+    x_start, x_end : float
+        The smallest and largest x values.
+
+    nx : int
+        The number of cells.
+
+
+    Returns
+    -------
+        numpy.ndarray
+            The x values.
+    """
+
+    dx = (x_end - x_start) / nx
+    first = x_start + dx / 2
+    last = x_end - dx / 2
+
+    if nx == 1:
+        return np.array([first])
+
+    return first + (last - first) * np.arange(nx) / (nx - 1)
+
+
+def initial_values(initial_conditions, x):
+    """
+    Returns the solution at the start time.
+
+    Parameters
+    ----------
+    initial_conditions : str
+        Type of initial conditions: square, sine.
+
+    x : numpy.ndarray
+        The x values.
+
+
+    Returns
+    -------
+        numpy.ndarray
+            Values of u at x.
+    """
+
+    if initial_conditions == 'square':
+        return np.where((x > 0.25) & (x <= 0.75), 1.0, 0.0)
+    elif initial_conditions == 'sine':
+        return np.sin(2 * np.pi * x)
+    else:
+        raise ValueError(
+            f"Unknown initial conditions type: {initial_conditions}")
+
+
+def godunov_flux(u_left, u_right, flux_left, flux_right):
+    """
+    Calculate fluxes through cell interfaces using Godunov's method.
+
+    Parameters
+    ----------
+    u_left, u_right : numpy.ndarray
+        Values of u on both sides of the cell interfaces.
+
+    flux_left, flux_right : numpy.ndarray
+        Values of flux in the cells on both sides of the cell interfaces.
+
+
+    Returns
+    -------
+        numpy.ndarray
+            Fluxes through the cell interfaces.
+    """
+
+    shock_speed = 0.5 * (u_left + u_right)
+
+    shock_flux = np.where(shock_speed > 0, flux_left, flux_right)
+
+    rarefaction_flux = np.where(
+        u_left > 0, flux_left,
+        np.where(u_right < 0, flux_right, 0.0))
+
+    return np.where(u_left > u_right, shock_flux, rarefaction_flux)
+
+
+def kurganov_flux(u_left, u_right, flux_left, flux_right,
+                  eigenvalue_left, eigenvalue_right):
+    """
+    Calculate fluxes through cell interfaces using Kurganov and Tadmor
+    method.
+
+    Parameters
+    ----------
+    u_left, u_right : numpy.ndarray
+        Values of u on both sides of the cell interfaces.
+
+    flux_left, flux_right : numpy.ndarray
+        Values of flux in the cells on both sides of the cell interfaces.
+
+    eigenvalue_left, eigenvalue_right : numpy.ndarray
+        Eigenvalues for the cells on both sides of the cell interfaces.
+
+
+    Returns
+    -------
+        numpy.ndarray
+            Fluxes through the cell interfaces.
+    """
+
+    max_eigenvalue = np.maximum(eigenvalue_left, eigenvalue_right)
+
+    return 0.5 * (flux_left + flux_right
+                  - max_eigenvalue * (u_right - u_left))
+
+
+def interface_fluxes(method, u, fluxes, eigenvalues):
+    """
+    Calculate fluxes through cell interfaces.
+
+    Parameters
+    ----------
+    method : str
+        Numerical method: godunov, kurganov.
+
+    u : numpy.ndarray
+        Values of u in all cells, including the two ghost cells.
+
+    fluxes : numpy.ndarray
+        Values of flux in all cells.
+
+    eigenvalues : numpy.ndarray
+        Eigenvalues for all cells.
+
+
+    Returns
+    -------
+        numpy.ndarray
+            Fluxes through the nx + 1 cell interfaces.
+    """
+
+    if method == 'godunov':
+        return godunov_flux(u_left=u[:-1], u_right=u[1:],
+                            flux_left=fluxes[:-1], flux_right=fluxes[1:])
+    elif method == 'kurganov':
+        return kurganov_flux(u_left=u[:-1], u_right=u[1:],
+                             flux_left=fluxes[:-1], flux_right=fluxes[1:],
+                             eigenvalue_left=eigenvalues[:-1],
+                             eigenvalue_right=eigenvalues[1:])
+    else:
+        raise ValueError(f"Unknown method: {method}")
+
+
+def limited_slopes(limiter, left_difference, right_difference):
+    """
+    Calculates the limited slopes of the solution in the cells, multiplied
+    by the size of the cells.
+
+    Parameters
+    ----------
+    limiter : str
+        Slope limiter: minmod, vanleer, mc.
+
+    left_difference, right_difference : numpy.ndarray
+        Differences of u between the cells and their left neighbours,
+        and between the right neighbours and the cells.
+
+
+    Returns
+    -------
+        numpy.ndarray
+            The slopes, which are zero at extrema.
+    """
+
+    is_monotone = left_difference * right_difference > 0
+    left_size = np.abs(left_difference)
+    right_size = np.abs(right_difference)
+
+    if limiter == 'minmod':
+        slopes = np.sign(left_difference) * np.minimum(left_size, right_size)
+    elif limiter == 'vanleer':
+        with np.errstate(divide='ignore', invalid='ignore'):
+            slopes = 2 * left_difference * right_difference \
+                / (left_difference + right_difference)
+    elif limiter == 'mc':
+        slopes = np.sign(left_difference) * np.minimum(
+            np.minimum(2 * left_size,
+                       0.5 * np.abs(left_difference + right_difference)),
+            2 * right_size)
+    else:
+        raise ValueError(f"Unknown limiter: {limiter}")
+
+    return np.where(is_monotone, slopes, 0.0)
+
+
+def reconstruct_states(limiter, u):
+    """
+    Reconstructs the values of u on both sides of the cell interfaces
+    using piecewise linear functions with limited slopes (MUSCL).
+
+    Parameters
+    ----------
+    limiter : str
+        Slope limiter: minmod, vanleer, mc.
+
+    u : numpy.ndarray
+        Values of u in all cells, including the two ghost cells.
+
+
+    Returns
+    -------
+        (u_left, u_right) tuple
+            Values of u on the left and right sides of the nx + 1
+            cell interfaces.
+    """
+
+    slopes = np.empty(u.shape)
+
+    slopes[1:-1] = limited_slopes(limiter=limiter,
+                                  left_difference=u[1:-1] - u[:-2],
+                                  right_difference=u[2:] - u[1:-1])
+
+    # The ghost cells are copies of the cells from the other end
+    slopes[0] = slopes[-2]
+    slopes[-1] = slopes[1]
+
+    return (u[:-1] + 0.5 * slopes[:-1], u[1:] - 0.5 * slopes[1:])
+
+
+def reconstructed_interface_fluxes(method, limiter, u):
+    """
+    Calculate fluxes through cell interfaces from the values of u
+    reconstructed with `reconstruct_states`.
+
+    Parameters
+    ----------
+    method : str
+        Numerical method: godunov, kurganov.
+
+    limiter : str
+        Slope limiter: minmod, vanleer, mc.
+
+    u : numpy.ndarray
+        Values of u in all cells, including the two ghost cells.
+
+
+    Returns
+    -------
+        numpy.ndarray
+            Fluxes through the nx + 1 cell interfaces.
+    """
+
+    u_left, u_right = reconstruct_states(limiter=limiter, u=u)
+    flux_left = 0.5 * u_left**2
+    flux_right = 0.5 * u_right**2
+
+    if method == 'godunov':
+        return godunov_flux(u_left=u_left, u_right=u_right,
+                            flux_left=flux_left, flux_right=flux_right)
+    elif method == 'kurganov':
+        return kurganov_flux(u_left=u_left, u_right=u_right,
+                             flux_left=flux_left, flux_right=flux_right,
+                             eigenvalue_left=np.abs(u_left),
+                             eigenvalue_right=np.abs(u_right))
+    else:
+        raise ValueError(f"Unknown method: {method}")
+
+
+def update_ghost_cells(u):
+    """
+    Copies the values from the other end of the periodic domain
+    to the ghost cells.
+
+    Parameters
+    ----------
+    u : numpy.ndarray
+        Values of u in all cells, including the two ghost cells.
+        The array is modified.
+    """
+
+    u[0] = u[-2]
+    u[-1] = u[1]
+
+
+def step_finite_volume(u, dx, dt, fluxes):
+    """
+    Calculate values of u for one step of finite volume method.
+
+    Parameters
+    ----------
+    u : numpy.ndarray
+        Values of u in all cells at the previous time step, including
+        the two ghost cells.
+
+    dx, dt : float
+        Space and time steps.
+
+    fluxes : numpy.ndarray
+        Fluxes through the cell interfaces.
+
+
+    Returns
+    -------
+        numpy.ndarray
+            Values of u in all cells at the next time step. The ghost cells
+            are not calculated.
+    """
+
+    a = dt / dx
+    u_next = np.empty(u.shape)
+    u_next[1:-1] = u[1:-1] - a * (fluxes[1:] - fluxes[:-1])
+    return u_next
+
+
+def select_output_indices(t_values, t_start, t_end, output_stride=None,
+                          max_frames=None, output_times=None):
+    """
+    Selects the time levels that are returned, in the same way as the
+    Fortran program (see src/snapshots.f90).
+
+    Parameters
+    ----------
+    t_values : numpy.ndarray
+        The t values of the solution.
+
+    t_start, t_end : float
+        The smallest and largest t values from the settings.
+
+    output_stride, max_frames, output_times :
+        See `output_arguments` in solver.py.
+
+
+    Returns
+    -------
+        list of int
+            Indices of the selected time levels, in increasing order.
+    """
+
+    nt = len(t_values)
+
+    if output_times is not None:
+        times = sorted(output_times)
+        include_last = False
+    elif max_frames is not None and max_frames > 0:
+        # The last time level is one of the frames, and the other frames
+        # are the nearest to evenly spaced times
+        times = []
+        include_last = True
+
+        if max_frames > 1:
+            time_step = (t_end - t_start) / (max_frames - 1)
+            times = [t_start + i * time_step for i in range(max_frames - 1)]
+    else:
+        stride = 1 if output_stride is None else output_stride
+        return sorted(set(range(0, nt, stride)) | {nt - 1})
+
+    selected = []
+
+    def add_frame(index):
+        if len(selected) == 0 or index > selected[-1]:
+            selected.append(index)
+
+    next_time = 0
+
+    for i in range(nt):
+        is_last = i == nt - 1
+
+        while next_time < len(times):
+            time = times[next_time]
+
+            if time > t_values[i]:
+                # The time has not been reached yet
+                if not is_last:
+                    break
+
+                # The time is after the end of the solution
+                add_frame(i)
+            elif i == 0:
+                add_frame(i)
+            elif time - t_values[i - 1] <= t_values[i] - time:
+                add_frame(i - 1)
+            else:
+                add_frame(i)
+
+            next_time += 1
+
+        if is_last and include_last:
+            add_frame(i)
+
+    return selected
+
+
+def solve_equation(x_start, x_end, nx, t_start, t_end, method,
+                   initial_conditions, courant_factor, output_stride=None,
+                   max_frames=None, output_times=None, limiter='none'):
+    """
+    Solves Burgers' equation with NumPy.
+
+    Parameters
+    ----------
+    The parameters are described in `solve_equation` in solver.py.
+
+
+    Returns
+    -------
+        (x, y, z) tuple
+            x, y, and z values of the solution, where x and y and 1D
+            arrays, and z is an array of shape (nt, nx, 1).
+    """
+
+    selections = [output_stride, max_frames, output_times]
+
+    if sum(selection is not None for selection in selections) > 1:
+        raise ValueError("Only one of output_stride, max_frames and "
+                         "output_times can be used")
+
+    if method not in METHODS:
+        raise ValueError(f"Unknown method: {method}")
+
+    if limiter not in LIMITERS:
+        raise ValueError(f"Unknown limiter: {limiter}")
+
+    x = cell_centers(x_start=x_start, x_end=x_end, nx=nx)
+    dx = x[1] - x[0]
+
+    # Values of u, including the two ghost cells
+    u = np.zeros(nx + 2)
+    u[1:-1] = initial_values(initial_conditions=initial_conditions, x=x)
+
+    t_values = [t_start]
+    solution = [u[1:-1]]
+
+    while t_values[-1] < t_end:
+        update_ghost_cells(u)
+
+        fluxes = 0.5 * u**2
+        eigenvalues = np.abs(u)
+
+        dt = courant_factor * dx / eigenvalues.max()
+        t_values.append(t_values[-1] + dt)
+
+        if limiter == 'none':
+            u = step_finite_volume(
+                u=u, dx=dx, dt=dt,
+                fluxes=interface_fluxes(method=method, u=u, fluxes=fluxes,
+                                        eigenvalues=eigenvalues))
+        else:
+            # Two-stage SSP Runge-Kutta method
+            u_stage = step_finite_volume(
+                u=u, dx=dx, dt=dt,
+                fluxes=reconstructed_interface_fluxes(
+                    method=method, limiter=limiter, u=u))
+
+            update_ghost_cells(u_stage)
+
+            u_step = step_finite_volume(
+                u=u_stage, dx=dx, dt=dt,
+                fluxes=reconstructed_interface_fluxes(
+                    method=method, limiter=limiter, u=u_stage))
+
+            u_step[1:-1] = 0.5 * (u[1:-1] + u_step[1:-1])
+            u = u_step
+
+        solution.append(u[1:-1])
+
+    y = np.array(t_values)
+
+    indices = select_output_indices(
+        t_values=y, t_start=t_start, t_end=t_end,
+        output_stride=output_stride, max_frames=max_frames,
+        output_times=output_times)
+
+    z = np.array([solution[i] for i in indices])[:, :, np.newaxis]
+
+    return (x, y[indices], z)
@@ -0,0 +1,168 @@
+from numpy_solver import godunov_flux, kurganov_flux, step_finite_volume, \
+                         select_output_indices, limited_slopes, \
+                         reconstruct_states
+from solver import solve_equation
+import numpy as np
+import pytest
+
+
+def test_godunov_flux():
+    u_left = np.array([1, -1, 1, -1, -1])
+    u_right = np.array([0.5, -2, 2, -0.5, 1])
+    flux_left = 0.5 * u_left**2
+    flux_right = 0.5 * u_right**2
+
+    flux = godunov_flux(u_left=u_left, u_right=u_right,
+                        flux_left=flux_left, flux_right=flux_right)
+
+    # Shock moving right, shock moving left, rarefaction moving right,
+    # rarefaction moving left, transonic rarefaction
+    assert flux.tolist() == [0.5, 2, 0.5, 0.125, 0]
+
+
+def test_kurganov_flux():
+    flux = kurganov_flux(u_left=np.array([1.]), u_right=np.array([-2.]),
+                         flux_left=np.array([0.5]), flux_right=np.array([2.]),
+                         eigenvalue_left=np.array([1.]),
+                         eigenvalue_right=np.array([2.]))
+
+    assert flux.tolist() == [approx_value(0.5 * (0.5 + 2 + 2 * 3))]
+
+
+def approx_value(value):
+    return pytest.approx(value, rel=1e-15)
+
+
+def test_step_finite_volume():
+    u = np.array([0, 1, 2, 0])
+
+    u_next = step_finite_volume(u=u, dx=0.5, dt=0.1,
+                                fluxes=np.array([1, 2, 4]))
+
+    assert u_next[1:-1].tolist() == [approx_value(0.8), approx_value(1.6)]
+
+
+def test_limited_slopes():
+    left = np.array([1, -3, 1, 1, 0, -0.1])
+    right = np.array([3, -1, -3, 1.2, 3, -3])
+
+    assert limited_slopes('minmod', left, right).tolist() == \
+        [1, -1, 0, 1, 0, -0.1]
+
+    assert limited_slopes('vanleer', left, right).tolist() == \
+        [1.5, -1.5, 0, approx_value(2.4 / 2.2), 0, approx_value(-0.6 / 3.1)]
+
+    assert limited_slopes('mc', left, right).tolist() == \
+        [2, -2, 0, approx_value(1.1), 0, approx_value(-0.2)]
+
+
+def test_limited_slopes__unknown_limiter():
+    with pytest.raises(ValueError):
+        limited_slopes('superbee', np.array([1.]), np.array([2.]))
+
+
+def test_reconstruct_states():
+    # Four cells and two ghost cells from the periodic domain
+    u = np.array([4, 1, 2, 4, 4, 1])
+
+    u_left, u_right = reconstruct_states(limiter='minmod', u=u)
+
+    assert u_left.tolist() == [4, 1, 2.5, 4, 4]
+    assert u_right.tolist() == [1, 1.5, 4, 4, 1]
+
+
+def test_select_output_indices():
+    t = np.array([0, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6])
+
+    assert select_output_indices(t, t_start=0, t_end=0.6) == \
+        [0, 1, 2, 3, 4, 5, 6]
+
+    assert select_output_indices(t, t_start=0, t_end=0.6,
+                                 output_stride=4) == [0, 4, 6]
+
+    assert select_output_indices(t, t_start=0, t_end=0.6,
+                                 max_frames=3) == [0, 3, 6]
+
+    assert select_output_indices(
+        t, t_start=0, t_end=0.6,
+        output_times=[0.68, 2, 0.04, 0.33, 0.29]) == [0, 3, 6]
+
+
+@pytest.mark.parametrize("method", ['godunov', 'kurganov'])
+@pytest.mark.parametrize("initial_conditions", ['square', 'sine'])
+def test_solve_equation__same_as_fortran(method, initial_conditions):
+    parameters = dict(x_start=0, x_end=1, nx=100, t_start=0, t_end=1,
+                      method=method, initial_conditions=initial_conditions,
+                      courant_factor=0.5, use_cache=False)
+
+    x, y, z, dx = solve_equation(**parameters, backend='numpy')
+
+    x_fortran, y_fortran, z_fortran, dx_fortran = solve_equation(
+        **parameters, backend='fortran')
+
+    assert dx == dx_fortran
+    assert x.tolist() == x_fortran.tolist()
+    assert y.shape == y_fortran.shape
+    assert z.shape == z_fortran.shape
+
+    if initial_conditions == 'square':
+        # Same operations in the same order give identical results
+        assert np.array_equal(y, y_fortran)
+        assert np.array_equal(z, z_fortran)
+    else:
+        # NumPy's sine can differ from Fortran's in the last digit
+        assert np.allclose(y, y_fortran, rtol=1e-13, atol=0)
+        assert np.allclose(z, z_fortran, rtol=0, atol=1e-12)
+
+
+@pytest.mark.parametrize("output", [
+    dict(output_stride=10),
+    dict(max_frames=5),
+    dict(output_times=[0.5, 0.1]),
+])
+def test_solve_equation__output_same_as_fortran(output):
+    parameters = dict(x_start=0, x_end=1, nx=50, t_start=0, t_end=1,
+                      method='kurganov', initial_conditions='sine',
+                      courant_factor=0.5, use_cache=False, **output)
+
+    _, y, z, _ = solve_equation(**parameters, backend='numpy')
+    _, y_fortran, z_fortran, _ = solve_equation(**parameters)
+
+    assert np.allclose(y, y_fortran, rtol=1e-13, atol=0)
+    assert np.allclose(z, z_fortran, rtol=0, atol=1e-12)
+
+
+@pytest.mark.parametrize("method", ['godunov', 'kurganov'])
+@pytest.mark.parametrize("limiter", ['minmod', 'vanleer', 'mc'])
+def test_solve_equation__limiter_same_as_fortran(method, limiter):
+    parameters = dict(x_start=0, x_end=1, nx=100, t_start=0, t_end=1,
+                      method=method, initial_conditions='square',
+                      courant_factor=0.5, use_cache=False, limiter=limiter)
+
+    _, y, z, _ = solve_equation(**parameters, backend='numpy')
+    _, y_fortran, z_fortran, _ = solve_equation(**parameters)
+
+    assert np.array_equal(y, y_fortran)
+    assert np.array_equal(z, z_fortran)
+
+
+def test_solve_equation__unknown_backend():
+    with pytest.raises(ValueError):
+        solve_equation(x_start=0, x_end=1, nx=10, t_start=0, t_end=1,
+                       method='kurganov', initial_conditions='sine',
+                       courant_factor=0.5, backend='gpu')
+
+
+def test_solve_equation__unknown_method():
+    with pytest.raises(ValueError):
+        solve_equation(x_start=0, x_end=1, nx=10, t_start=0, t_end=1,
+                       method='upwind', initial_conditions='sine',
+                       courant_factor=0.5, backend='numpy')
+
+
+def test_solve_equation__unknown_limiter():
+    with pytest.raises(ValueError):
+        solve_equation(x_start=0, x_end=1, nx=10, t_start=0, t_end=1,
+                       method='kurganov', initial_conditions='sine',
+                       courant_factor=0.5, backend='numpy',
+                       limiter='superbee')
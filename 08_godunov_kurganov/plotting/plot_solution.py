@@ -6,7 +6,7 @@ from plot_utils import create_dir
 import matplotlib.pyplot as plt
 from itertools import cycle
 import os
-from solver import solve_equation
+from solver import solve_equations
 import numpy as np
 
 
@@ -84,13 +84,21 @@ def plot_at_time(methods, initial_conditions, courant_factor, nx,
     if time == 0:
         time += 0.1
 
-    for method in methods:
-        result = solve_equation(x_start=0, x_end=1,
-                                nx=nx, t_start=0, t_end=time,
-                                method=method.lower(),
-                                initial_conditions=initial_conditions,
-                                courant_factor=courant_factor)
-
+    runs = [
+        dict(x_start=0, x_end=1,
+             nx=nx, t_start=0, t_end=time,
+             method=method.lower(),
+             initial_conditions=initial_conditions,
+             courant_factor=courant_factor,
+             output_times=[plot_at_time])
+        for method in methods
+    ]
+
+    # Calculate solutions for all methods at the same time,
+    # keeping only the time level nearest to `plot_at_time`
+    results = solve_equations(runs)
+
+    for method, result in zip(methods, results):
         if result is None:
             return
         else:
@@ -0,0 +1,88 @@
+from solution_cache import program_hash, cache_key, cache_path, \
+                           load_solution, save_solution, evict
+from solver import solve_equation
+import numpy as np
+import os
+import shutil
+import time
+
+
+def test_program_hash():
+    path = "test_program_hash.bin"
+
+    with open(path, "wb") as file:
+        file.write(b"one")
+
+    first = program_hash(path)
+    assert program_hash(path) == first
+
+    with open(path, "wb") as file:
+        file.write(b"two")
+
+    # Make sure modification time is different
+    os.utime(path, ns=(0, 0))
+
+    assert program_hash(path) != first
+    os.remove(path)
+
+
+def test_cache_key():
+    key = cache_key(dict(nx=100, method="godunov"))
+
+    assert key == cache_key(dict(method="godunov", nx=100))
+    assert key != cache_key(dict(nx=101, method="godunov"))
+
+
+def test_save_solution():
+    cache_dir = "test_cache_save"
+    x = np.array([1.1, 1.2])
+    y = np.array([0, 0.1, 0.2])
+    z = np.array([[1, 2], [3, 4], [5, np.nan]])
+
+    assert load_solution("missing", cache_dir=cache_dir) is None
+
+    save_solution("key", x, y, z, cache_dir=cache_dir)
+    x_loaded, y_loaded, z_loaded = load_solution("key", cache_dir=cache_dir)
+
+    assert x_loaded.tolist() == x.tolist()
+    assert y_loaded.tolist() == y.tolist()
+    assert z_loaded[:2].tolist() == z[:2].tolist()
+    assert np.isnan(z_loaded[2, 1])
+
+    shutil.rmtree(cache_dir)
+
+
+def test_evict():
+    cache_dir = "test_cache_evict"
+    x = np.zeros(1000)
+
+    for key in ["one", "two", "three"]:
+        save_solution(key, x, x, x, cache_dir=cache_dir)
+
+    size = os.path.getsize(cache_path("one", cache_dir))
+
+    # Use the first solution, so the second one is the least recently used
+    time.sleep(0.01)
+    load_solution("one", cache_dir=cache_dir)
+
+    evict(cache_dir=cache_dir, max_size=2 * size)
+
+    assert os.path.exists(cache_path("one", cache_dir))
+    assert not os.path.exists(cache_path("two", cache_dir))
+    assert os.path.exists(cache_path("three", cache_dir))
+
+    shutil.rmtree(cache_dir)
+
+
+def test_solve_equation__cached():
+    parameters = dict(x_start=0, x_end=1, nx=100, t_start=0, t_end=0.5,
+                      method='godunov', initial_conditions='square',
+                      courant_factor=0.5)
+
+    expected = solve_equation(**parameters, use_cache=False)
+    first = solve_equation(**parameters)
+    second = solve_equation(**parameters)
+
+    for result in [first, second]:
+        for value, expected_value in zip(result, expected):
+            assert np.array_equal(value, expected_value)
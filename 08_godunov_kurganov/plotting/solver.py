@@ -1,10 +1,131 @@
 # Solve a heat equation
 import subprocess
-from plot_utils import create_dir
+import io
 import numpy as np
 import os
 import struct
-import array
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from solution_cache import cache_key, load_solution, save_solution
+import numpy_solver
+
+# The first bytes of a file in the chunked format
+CHUNKED_MAGIC = b"BURGCHK1"
+
+# The first bytes of a file in the AMR format
+AMR_MAGIC = b"BURGAMR1"
+
+# The first bytes of a file in the 2D format
+OUTPUT_2D_MAGIC = b"BURG2D01"
+
+
+def find_records(path_to_data):
+    """
+    Finds positions of records in a binary file written by Fortran's
+    unformatted `write`. Each record is surrounded by 4-byte markers
+    containing its length in bytes. Records larger than 2 GB are split
+    by gfortran into several subrecords; the leading marker of all
+    but the last subrecord is negative.
+
+    Parameters
+    ----------
+    path_to_data : str
+        Path to the binary file.
+
+
+    Returns
+    -------
+        list of lists of (offset, length) tuples
+            For each record, the positions of its subrecords:
+            offset of the data from the start of the file and its
+            length in bytes.
+    """
+
+    records = []
+    subrecords = []
+    file_size = os.path.getsize(path_to_data)
+    position = 0
+
+    with open(path_to_data, "rb") as file:
+        while position < file_size:
+            file.seek(position)
+            (length,) = struct.unpack("@i", file.read(4))
+            subrecords.append((position + 4, abs(length)))
+            position += abs(length) + 8
+
+            if length >= 0:
+                records.append(subrecords)
+                subrecords = []
+
+    return records
+
+
+def read_integer(path_to_data, record):
+    """
+    Reads a 4-byte integer stored in a single record.
+
+    Parameters
+    ----------
+    path_to_data : str
+        Path to the binary file.
+
+    record : list of (offset, length) tuples
+        Position of the record, see `find_records`.
+
+
+    Returns
+    -------
+        int
+            The value.
+    """
+
+    offset, _ = record[0]
+
+    with open(path_to_data, "rb") as file:
+        file.seek(offset)
+        (value,) = struct.unpack("@i", file.read(4))
+
+    return value
+
+
+def map_array(path_to_data, record, shape):
+    """
+    Returns the array of double floats stored in a record, without reading
+    it into memory. The values are read from disk only when accessed.
+
+    Parameters
+    ----------
+    path_to_data : str
+        Path to the binary file.
+
+    record : list of (offset, length) tuples
+        Position of the record, see `find_records`.
+
+    shape : tuple of int
+        Shape of the array. The data is in the C order for this shape.
+
+
+    Returns
+    -------
+        numpy.ndarray
+            A read-only memory-mapped array. If the record is split into
+            subrecords, its data is not contiguous in the file,
+            and the array is read into memory instead.
+    """
+
+    if len(record) == 1:
+        offset, _ = record[0]
+
+        return np.memmap(path_to_data, dtype=np.float64, mode='r',
+                         offset=offset, shape=shape, order='C')
+
+    parts = [
+        np.memmap(path_to_data, dtype=np.uint8, mode='r',
+                  offset=offset, shape=(length,))
+        for offset, length in record
+    ]
+
+    return np.concatenate(parts).view(np.float64).reshape(shape)
 
 
 def read_solution_from_file(path_to_data):
@@ -12,6 +133,11 @@ def read_solution_from_file(path_to_data):
     Read solution from a binary file. Please refer to README.md
     for description of the binary file format used here.
 
+    The arrays are memory-mapped: only the record markers are read
+    to find the positions of the data, and the values are read from disk
+    when they are accessed. Only the time frames that are used
+    are loaded into memory.
+
     Parameters
     ----------
     path_to_data : str
@@ -23,63 +149,720 @@ def read_solution_from_file(path_to_data):
         (x, y, z) tuple
             x, y, and z values of the solution,
             where x and y and 1D arrays, and z is a 2D array.
+            The arrays are read-only.
+    """
+
+    if is_chunked(path_to_data):
+        return read_chunked_solution(path_to_data)
+
+    records = find_records(path_to_data)
+    nx = read_integer(path_to_data, records[0])
+    nt = read_integer(path_to_data, records[1])
+    unit_vector_dimension = read_integer(path_to_data, records[2])
+    x_values = map_array(path_to_data, records[3], shape=(nx,))
+    t_values = map_array(path_to_data, records[4], shape=(nt,))
+
+    solution = map_array(path_to_data, records[5],
+                         shape=(nt, nx, unit_vector_dimension))
+
+    return (x_values, t_values, solution)
+
+
+def is_chunked(path_to_data):
+    """
+    Returns True if the file is in the chunked format.
+
+    Parameters
+    ----------
+    path_to_data : str
+        Path to the binary file.
+    """
+
+    with open(path_to_data, "rb") as file:
+        return file.read(len(CHUNKED_MAGIC)) == CHUNKED_MAGIC
+
+
+def read_chunked_header(path_to_data):
     """
+    Reads the header of a file in the chunked format. Please refer to
+    README.md for description of the format.
+
+    Parameters
+    ----------
+    path_to_data : str
+        Path to the binary file.
+
 
-    data = open(path_to_data, "rb").read()
+    Returns
+    -------
+        dict
+            nx, nt, unit_vector_dimension : sizes of the solution
 
-    # nx: number of x points
-    # ----------
+            chunk_size : the number of time levels in a chunk
 
-    start = 0
-    end = 4*3
-    (_, nx, _) = struct.unpack("@iii", data[start: end])
+            dtype : type of the stored values, float32 or float64
 
-    # nt: number of t points
-    # ----------
+            compressed : True if chunks are compressed with zlib
 
-    start = end
-    end = start + 4*3
-    (_, nt, _) = struct.unpack("@iii", data[start: end])
+            x, t : 1D arrays with x and t values
 
-    # unit_vector_dimension
-    # ----------
+            chunks : list of (offset, size) tuples, the positions of the
+                     chunks in the file and their stored sizes in bytes.
+    """
 
-    start = end
-    end = start + 4*3
-    (_, unit_vector_dimension, _) = struct.unpack("@iii", data[start: end])
+    with open(path_to_data, "rb") as file:
+        if file.read(len(CHUNKED_MAGIC)) != CHUNKED_MAGIC:
+            raise ValueError(f"Not a chunked solution file: {path_to_data}")
 
-    # x values
-    # ---------
+        nx, nt, dimension, chunk_size, value_bytes, compression = \
+            struct.unpack("@6i", file.read(24))
 
-    start = end + 4
-    end = start + nx * 8
-    x_values = array.array("d")
-    x_values.frombytes(data[start:end])
+        (index_offset,) = struct.unpack("@q", file.read(8))
+        x = np.frombuffer(file.read(8 * nx), dtype=np.float64)
+        t = np.frombuffer(file.read(8 * nt), dtype=np.float64)
+        chunk_count = (nt + chunk_size - 1) // chunk_size
+        file.seek(index_offset)
 
-    # t values
-    # ---------
+        index = np.frombuffer(file.read(16 * chunk_count), dtype=np.int64)
 
-    start = end + 8
-    end = start + nt * 8
-    t_values = array.array("d")
-    t_values.frombytes(data[start:end])
+    return dict(
+        nx=nx, nt=nt, unit_vector_dimension=dimension,
+        chunk_size=chunk_size,
+        dtype=np.float32 if value_bytes == 4 else np.float64,
+        compressed=compression == 1,
+        x=x, t=t,
+        chunks=[(int(offset), int(size))
+                for offset, size in index.reshape(chunk_count, 2)]
+    )
 
-    # Solution: array
-    # ---------
 
-    start = end + 8
-    end = start + unit_vector_dimension * nx * nt * 8
-    solution = array.array("d")
-    solution.frombytes(data[start:end])
-    solution = np.reshape(solution, (nt, nx, unit_vector_dimension), order='C')
+def read_chunk(path_to_data, header, chunk):
+    """
+    Reads one chunk of time levels from a file in the chunked format.
 
-    return (x_values, t_values, solution)
+    Parameters
+    ----------
+    path_to_data : str
+        Path to the binary file.
+
+    header : dict
+        The header of the file, see `read_chunked_header`.
+
+    chunk : int
+        Index of the chunk, starting from zero.
+
+
+    Returns
+    -------
+        numpy.ndarray
+            Read-only array of shape (frames, nx, unit_vector_dimension).
+            Uncompressed chunks are memory-mapped.
+    """
+
+    offset, size = header['chunks'][chunk]
+    first = chunk * header['chunk_size']
+    frames = min(header['chunk_size'], header['nt'] - first)
+    shape = (frames, header['nx'], header['unit_vector_dimension'])
+
+    if not header['compressed']:
+        return np.memmap(path_to_data, dtype=header['dtype'], mode='r',
+                         offset=offset, shape=shape, order='C')
+
+    with open(path_to_data, "rb") as file:
+        file.seek(offset)
+        data = zlib.decompress(file.read(size))
+
+    return np.frombuffer(data, dtype=header['dtype']).reshape(shape)
+
+
+def read_frame(path_to_data, header, index):
+    """
+    Reads a single time level from a file in the chunked format.
+    Only the chunk containing the time level is read.
+
+    Parameters
+    ----------
+    path_to_data : str
+        Path to the binary file.
+
+    header : dict
+        The header of the file, see `read_chunked_header`.
+
+    index : int
+        Index of the time level, starting from zero.
+
+
+    Returns
+    -------
+        numpy.ndarray
+            Array of shape (nx, unit_vector_dimension).
+    """
+
+    chunk = read_chunk(path_to_data, header, index // header['chunk_size'])
+    return chunk[index % header['chunk_size']]
+
+
+def read_chunked_solution(path_to_data):
+    """
+    Read solution from a file in the chunked format.
+
+    Parameters
+    ----------
+    path_to_data : str
+        Path to the binary file.
+
+
+    Returns
+    -------
+        (x, y, z) tuple
+            x, y, and z values of the solution, where x and y and 1D
+            arrays, and z is an array of shape
+            (nt, nx, unit_vector_dimension) with the stored precision.
+    """
+
+    header = read_chunked_header(path_to_data)
+
+    chunks = [
+        read_chunk(path_to_data, header, chunk)
+        for chunk in range(len(header['chunks']))
+    ]
+
+    return (header['x'], header['t'], np.concatenate(chunks))
+
+
+def read_exactly(stream, size):
+    """
+    Reads the given number of bytes from a stream, waiting for them
+    to arrive if needed.
+
+    Parameters
+    ----------
+    stream : binary file object
+        The stream, for example, the standard output of a process.
+
+    size : int
+        Number of bytes to read.
+
+
+    Returns
+    -------
+        bytes or None
+            The data, or None if the stream has ended before the data
+            was read.
+    """
+
+    data = b''
+
+    while len(data) < size:
+        chunk = stream.read(size - len(data))
+
+        if len(chunk) == 0:
+            return None
+
+        data += chunk
+
+    return data
+
+
+def read_stream_header(stream):
+    """
+    Reads the header of the solution streamed by the Fortran program.
+    Please refer to README.md for description of the stream format.
+
+    Parameters
+    ----------
+    stream : binary file object
+        The stream, for example, the standard output of a process.
+
+
+    Returns
+    -------
+        (x, unit_vector_dimension) tuple or None
+            x : 1D array of x values
+
+            unit_vector_dimension : number of values at each x
+
+            Returns None if the stream has ended before the header.
+    """
+
+    data = read_exactly(stream, 8)
+
+    if data is None:
+        return None
+
+    nx, unit_vector_dimension = struct.unpack("@ii", data)
+    data = read_exactly(stream, nx * 8)
+
+    if data is None:
+        return None
+
+    return (np.frombuffer(data, dtype=np.float64), unit_vector_dimension)
+
+
+def read_stream_frames(stream, nx, unit_vector_dimension):
+    """
+    Reads the solution streamed by the Fortran program one time value
+    at a time. Please refer to README.md for description of
+    the stream format.
+
+    Parameters
+    ----------
+    stream : binary file object
+        The stream positioned after the header, see `read_stream_header`.
+
+    nx : int
+        Number of x values.
+
+    unit_vector_dimension : int
+        Number of values at each x.
+
+
+    Yields
+    -------
+        (t, solution) tuple
+            t : float, the time value
+
+            solution : 2D array of shape (nx, unit_vector_dimension)
+                       containing the solution at time t.
+    """
+
+    frame_size = 8 + nx * unit_vector_dimension * 8
+
+    while True:
+        data = read_exactly(stream, frame_size)
+
+        if data is None:
+            return
+
+        frame = np.frombuffer(data, dtype=np.float64)
+        yield frame[0], frame[1:].reshape(nx, unit_vector_dimension)
+
+
+def read_stream_from_file(path_to_data):
+    """
+    Read solution from a file written in the stream format
+    (with `--format=stream` setting). Please refer to README.md
+    for description of the stream format.
+
+    Parameters
+    ----------
+    path_to_data : str
+        Path to the file containing solution data.
+
+
+    Returns
+    -------
+        (x, y, z) tuple
+            x, y, and z values of the solution,
+            where x and y and 1D arrays, and z is a 3D array
+            of shape (nt, nx, unit_vector_dimension).
+    """
+
+    with open(path_to_data, 'rb') as stream:
+        x, unit_vector_dimension = read_stream_header(stream)
+
+        frames = list(read_stream_frames(
+            stream, nx=len(x), unit_vector_dimension=unit_vector_dimension))
+
+    t_values = np.array([t for t, _ in frames])
+
+    solution = np.empty((len(frames), len(x), unit_vector_dimension))
+
+    for i, (_, frame) in enumerate(frames):
+        solution[i] = frame
+
+    return (x, t_values, solution)
+
+
+def read_amr_header(stream):
+    """
+    Reads the header of the solution calculated with adaptive mesh
+    refinement (AMR). Please refer to README.md for description
+    of the AMR format.
+
+    Parameters
+    ----------
+    stream : binary file object
+        The stream, for example, the standard output of a process.
+
+
+    Returns
+    -------
+        dict or None
+            nx : the number of cells of the coarsest level
+
+            levels : the number of refinement levels
+
+            unit_vector_dimension : number of values in each cell
+
+            x_start, x_end : the smallest and the largest x values
+
+            Returns None if the stream has ended before the header.
+    """
+
+    data = read_exactly(stream, len(AMR_MAGIC) + 28)
+
+    if data is None:
+        return None
+
+    if data[:len(AMR_MAGIC)] != AMR_MAGIC:
+        raise ValueError("Not an AMR solution")
+
+    nx, levels, dimension = struct.unpack("@3i", data[8:20])
+    x_start, x_end = struct.unpack("@2d", data[20:])
+
+    return dict(nx=nx, levels=levels, unit_vector_dimension=dimension,
+                x_start=x_start, x_end=x_end)
+
+
+def read_amr_frames(stream, header):
+    """
+    Reads the composite solutions calculated with AMR one time value
+    at a time. The cells of the finer levels are smaller, so the number
+    of cells changes between the frames.
+
+    Parameters
+    ----------
+    stream : binary file object
+        The stream positioned after the header, see `read_amr_header`.
+
+    header : dict
+        The header, see `read_amr_header`.
+
+
+    Yields
+    -------
+        dict
+            t : float, the time value
+
+            cell_updates : the number of cell updates made so far
+                           on all levels
+
+            levels : 1D array of refinement levels of the cells,
+                     starting from 1
+
+            x : 1D array of x values at the centers of the cells
+
+            dx : 1D array of sizes of the cells
+
+            z : 2D array of shape (cells, unit_vector_dimension)
+                containing the solution at time t.
+    """
+
+    dimension = header['unit_vector_dimension']
+    coarse_dx = (header['x_end'] - header['x_start']) / header['nx']
+
+    while True:
+        data = read_exactly(stream, 20)
+
+        if data is None:
+            return
+
+        t, cell_updates, cells = struct.unpack("@dqi", data)
+        data = read_exactly(stream, cells * (12 + 8 * dimension))
+
+        if data is None:
+            return
+
+        levels = np.frombuffer(data, dtype=np.int32, count=cells)
+
+        x = np.frombuffer(data, dtype=np.float64, count=cells,
+                          offset=4 * cells)
+
+        z = np.frombuffer(data, dtype=np.float64, offset=12 * cells)
+
+        yield dict(t=t, cell_updates=cell_updates, levels=levels, x=x,
+                   dx=coarse_dx / 2.0**(levels - 1),
+                   z=z.reshape(cells, dimension))
+
+
+def read_amr_solution(path_to_data):
+    """
+    Read solution calculated with AMR (with `--amr_levels` setting)
+    from a file. Please refer to README.md for description
+    of the AMR format.
+
+    Parameters
+    ----------
+    path_to_data : str
+        Path to the file containing solution data.
+
+
+    Returns
+    -------
+        (header, frames) tuple
+            header : dict, see `read_amr_header`
+
+            frames : list of dict, see `read_amr_frames`
+    """
+
+    with open(path_to_data, 'rb') as stream:
+        header = read_amr_header(stream)
+        frames = list(read_amr_frames(stream, header))
+
+    return (header, frames)
+
+
+def parse_2d_solution(data):
+    """
+    Returns the two-dimensional solution stored in the data in the 2D
+    format, without copying the data. Please refer to README.md for
+    description of the 2D format.
+
+    Parameters
+    ----------
+    data : bytes-like object
+        The data in the 2D format, for example, bytes or numpy.memmap.
+        If the data ends in the middle of a frame, the incomplete frame
+        is ignored.
+
+
+    Returns
+    -------
+        dict
+            x : 1D array of x values at the centers of the cells
+
+            y : 1D array of y values at the centers of the cells
+
+            t : 1D array of time values of the frames
+
+            z : 4D array of shape (frames, ny, nx, unit_vector_dimension)
+                containing the solution. The element z[i, j, k, 0]
+                is the value at time t[i], y[j] and x[k].
+    """
+
+    header_size = len(OUTPUT_2D_MAGIC) + 44
+
+    if bytes(data[:len(OUTPUT_2D_MAGIC)]) != OUTPUT_2D_MAGIC:
+        raise ValueError("Not a 2D solution")
+
+    nx, ny, dimension = struct.unpack(
+        "@3i", bytes(data[len(OUTPUT_2D_MAGIC):len(OUTPUT_2D_MAGIC) + 12]))
+
+    x_start, x_end, y_start, y_end = struct.unpack(
+        "@4d", bytes(data[len(OUTPUT_2D_MAGIC) + 12:header_size]))
+
+    frame_type = np.dtype([('t', np.float64),
+                           ('z', np.float64, (ny, nx, dimension))])
+
+    frames = np.frombuffer(
+        data, dtype=frame_type, offset=header_size,
+        count=(len(data) - header_size) // frame_type.itemsize)
+
+    dx = (x_end - x_start) / nx
+    dy = (y_end - y_start) / ny
+
+    return dict(x=np.linspace(x_start + dx / 2, x_end - dx / 2, nx),
+                y=np.linspace(y_start + dy / 2, y_end - dy / 2, ny),
+                t=frames['t'], z=frames['z'])
+
+
+def read_2d_solution(path_to_data):
+    """
+    Read the two-dimensional solution (calculated with `--ny` setting)
+    from a file. The file is memory-mapped, so the values are read from
+    disk only when they are accessed.
+
+    Parameters
+    ----------
+    path_to_data : str
+        Path to the file containing solution data.
+
+
+    Returns
+    -------
+        dict
+            The solution, see `parse_2d_solution`.
+    """
+
+    return parse_2d_solution(np.memmap(path_to_data, dtype=np.uint8,
+                                       mode='r'))
+
+
+def output_arguments(output_stride=None, max_frames=None, output_times=None):
+    """
+    Returns command line arguments of the Fortran program that select
+    the time levels written to the output.
+
+    Parameters
+    ----------
+    output_stride : int
+        Output every `output_stride`-th time level and the last one.
+
+    max_frames : int
+        Output at most `max_frames` time levels evenly spaced in time,
+        including the last one.
+
+    output_times : list of float
+        Output only the time levels nearest to these times.
+
+    If all parameters are None, all time levels are written.
+
+    Returns
+    -------
+        str
+            The arguments.
+    """
+
+    arguments = ''
+
+    if output_stride is not None:
+        arguments += f' --output_stride={output_stride}'
+
+    if max_frames is not None:
+        arguments += f' --max_frames={max_frames}'
+
+    if output_times is not None:
+        times = ','.join(repr(float(time)) for time in output_times)
+        arguments += f' --output_times={times}'
+
+    return arguments
+
+
+def solver_command(output, x_start, x_end, nx,
+                   t_start, t_end, method,
+                   initial_conditions,
+                   courant_factor, output_stride=None,
+                   max_frames=None, output_times=None, threads=1,
+                   limiter='none', amr_levels=1, amr_threshold=0.01,
+                   amr_detector='gradient', ny=0):
+    """
+    Returns the command that runs the Fortran program.
+
+    Parameters
+    ----------
+    output : str
+        Path to the output file, or '-' to stream the solution
+        to standard output.
+
+    The rest of the parameters are described in `solve_equation`,
+    `solve_amr_equation` and `solve_2d_equation`.
+
+
+    Returns
+    -------
+        str
+            The command.
+    """
+
+    mode_arguments = ''
+
+    if amr_levels > 1:
+        mode_arguments = (f' --amr_levels={amr_levels}'
+                          f' --amr_threshold={amr_threshold}'
+                          f' --amr_detector={amr_detector}')
+
+    if ny > 0:
+        mode_arguments += f' --ny={ny}'
+
+    return (
+        f'build/main {output}'
+        f' --method={method}'
+        f' --initial_conditions={initial_conditions}'
+        f' --x_start={x_start}'
+        f' --x_end={x_end}'
+        f' --nx={nx}'
+        f' --t_start={t_start}'
+        f' --t_end={t_end}'
+        f' --courant_factor={courant_factor}'
+        f' --limiter={limiter}'
+        f' --threads={threads}'
+        + mode_arguments
+        + output_arguments(output_stride=output_stride,
+                           max_frames=max_frames,
+                           output_times=output_times)
+    )
+
+
+def stream_equation(x_start, x_end, nx,
+                    t_start, t_end, method,
+                    initial_conditions,
+                    courant_factor, output_stride=None,
+                    max_frames=None, output_times=None, threads=1,
+                    limiter='none'):
+    """
+    Runs Fortran program that solves equation
+
+        v_t + v v_x = 0
+
+    and yields the solution for each output time level as soon as it is
+    calculated. The solution is passed through a pipe, without
+    using any files.
+
+    Parameters
+    ----------
+    The parameters are described in `solve_equation`.
+
+
+    Yields
+    -------
+        (x, t, solution) tuple
+            x : 1D array of x values, the same for all time values
+
+            t : float, the time value
+
+            solution : 2D array of shape (nx, unit_vector_dimension)
+                       containing the solution at time t.
+
+    Raises
+    -------
+        subprocess.CalledProcessError
+            If the program has failed. The error message
+            is in `stderr` attribute.
+    """
+
+    command = solver_command(output='-', x_start=x_start, x_end=x_end,
+                             nx=nx, t_start=t_start, t_end=t_end,
+                             method=method,
+                             initial_conditions=initial_conditions,
+                             courant_factor=courant_factor,
+                             output_stride=output_stride,
+                             max_frames=max_frames,
+                             output_times=output_times,
+                             threads=threads,
+                             limiter=limiter)
+
+    child = subprocess.Popen(command,
+                             stdout=subprocess.PIPE,
+                             stderr=subprocess.PIPE,
+                             shell=True)
+
+    finished = False
+
+    try:
+        header = read_stream_header(child.stdout)
+
+        if header is not None:
+            x, unit_vector_dimension = header
+
+            for t, solution in read_stream_frames(
+                    child.stdout, nx=len(x),
+                    unit_vector_dimension=unit_vector_dimension):
+
+                yield x, t, solution
+
+        finished = True
+    finally:
+        if not finished:
+            # The reader has stopped early, the solution is not needed
+            child.kill()
+
+        child.stdout.close()
+        message = child.stderr.read().decode('utf-8')
+        child.stderr.close()
+        child.wait()
+
+    if child.returncode != 0:
+        raise subprocess.CalledProcessError(returncode=child.returncode,
+                                            cmd=command, stderr=message)
 
 
 def solve_equation(x_start, x_end, nx,
                    t_start, t_end, method,
                    initial_conditions,
-                   courant_factor):
+                   courant_factor, output_stride=None,
+                   max_frames=None, output_times=None, use_cache=True,
+                   backend='fortran', threads=1, limiter='none'):
     """
     Runs Fortran program that solves equation
 
@@ -116,6 +899,34 @@ def solve_equation(x_start, x_end, nx,
     courant_factor : float
         Courant factor parameter of the numerical methods.
 
+    output_stride, max_frames, output_times :
+        Select the time levels to be returned, see `output_arguments`.
+        Only one of them can be used. By default, all time levels
+        are returned.
+
+    use_cache : bool
+        If True, the solution is loaded from the cache if it has been
+        calculated before with the same parameters and the same program
+        binary, see `solution_cache` module. New solutions are
+        saved to the cache.
+
+    backend : str
+        'fortran' runs the Fortran program. 'numpy' solves the equation
+        in this process with NumPy (see `numpy_solver` module), which is
+        faster for small grids since no process is started and no files
+        are written. The NumPy solutions are not cached.
+
+    threads : int
+        The number of threads used by the Fortran program. The solution
+        does not depend on the number of threads, and it is not
+        a part of the cache key.
+
+    limiter : str
+        Slope limiter of the second-order reconstruction: none, minmod,
+        vanleer, mc. With a limiter, the time steps are made with
+        the two-stage SSP Runge-Kutta method. If 'none', the method is
+        first order.
+
     Returns
     -------
         (x, y, z, dx, dt, courant) tuple
@@ -127,42 +938,228 @@ def solve_equation(x_start, x_end, nx,
             dt_dx : ratio dt / dx
     """
 
-    subdir = "tmp"
-    create_dir(subdir)
-    path_to_data = os.path.join(subdir, "data.bin")
-
-    parameters = [
-        (
-            f'build/main {path_to_data}'
-            f' --method={method}'
-            f' --initial_conditions={initial_conditions}'
-            f' --x_start={x_start}'
-            f' --x_end={x_end}'
-            f' --nx={nx}'
-            f' --t_start={t_start}'
-            f' --t_end={t_end}'
-            f' --courant_factor={courant_factor}'
-        )
-    ]
+    if backend == 'numpy':
+        x, y, z = numpy_solver.solve_equation(
+            x_start=x_start, x_end=x_end, nx=nx,
+            t_start=t_start, t_end=t_end, method=method,
+            initial_conditions=initial_conditions,
+            courant_factor=courant_factor, output_stride=output_stride,
+            max_frames=max_frames, output_times=output_times,
+            limiter=limiter)
 
-    child = subprocess.Popen(parameters,
-                             stdout=subprocess.PIPE,
-                             stderr=subprocess.STDOUT,
-                             shell=True)
+        return (x, y, np.nan_to_num(z), x[1] - x[0])
+    elif backend != 'fortran':
+        raise ValueError(f"Unknown backend: {backend}")
+
+    if use_cache:
+        key = cache_key(dict(
+            x_start=x_start, x_end=x_end, nx=nx,
+            t_start=t_start, t_end=t_end, method=method,
+            initial_conditions=initial_conditions,
+            courant_factor=courant_factor, output_stride=output_stride,
+            max_frames=max_frames, output_times=output_times,
+            limiter=limiter))
+
+        solution = load_solution(key)
+
+        if solution is not None:
+            x, y, z = solution
+            return (x, y, np.nan_to_num(z), x[1] - x[0])
+
+    # The solution is streamed from the program and collected into
+    # arrays that are enlarged when they are full
+    nt = 0
+    t_values = np.empty(16)
+    solution = None
+
+    try:
+        for x, t, frame in stream_equation(
+                x_start=x_start, x_end=x_end, nx=nx,
+                t_start=t_start, t_end=t_end, method=method,
+                initial_conditions=initial_conditions,
+                courant_factor=courant_factor,
+                output_stride=output_stride,
+                max_frames=max_frames,
+                output_times=output_times,
+                threads=threads,
+                limiter=limiter):
 
-    message = child.communicate()[0].decode('utf-8')
-    rc = child.returncode
-    success = rc == 0
+            if solution is None:
+                solution = np.empty((len(t_values),) + frame.shape)
 
-    if not success:
-        print(message)
+            if nt == len(t_values):
+                t_values = np.resize(t_values, 2 * nt)
+                solution = np.resize(solution, (2 * nt,) + frame.shape)
+
+            t_values[nt] = t
+            solution[nt] = frame
+            nt += 1
+    except subprocess.CalledProcessError as error:
+        print(error.stderr)
         return None
 
-    x, y, z = read_solution_from_file(path_to_data)
-    dx = x[1] - x[0]
+    y = t_values[:nt]
 
-    os.remove(path_to_data)
-    os.rmdir(subdir)
-    z = np.nan_to_num(z)
+    if use_cache:
+        save_solution(key, x, y, solution[:nt])
+
+    z = np.nan_to_num(solution[:nt])
+    dx = x[1] - x[0]
 
     return (x, y, z, dx)
+
+
+def solve_amr_equation(x_start, x_end, nx,
+                       t_start, t_end, method,
+                       initial_conditions,
+                       courant_factor, amr_levels, amr_threshold=0.01,
+                       amr_detector='gradient', output_stride=None,
+                       max_frames=None, output_times=None, threads=1):
+    """
+    Runs Fortran program that solves equation
+
+        v_t + v v_x = 0
+
+    with adaptive mesh refinement (AMR) and returns the composite
+    solutions. The solution is passed through a pipe, without
+    using any files.
+
+    Parameters
+    ----------
+    nx : int
+        The number of cells of the coarsest level
+
+    amr_levels : int
+        The number of refinement levels, each level has cells
+        twice smaller than the previous one.
+
+    amr_threshold : float
+        The cells are refined where the detector value exceeds
+        the threshold.
+
+    amr_detector : str
+        Detector of the cells that need refinement: gradient, shock.
+
+    The rest of the parameters are described in `solve_equation`.
+
+
+    Returns
+    -------
+        (header, frames) tuple
+            header : dict, see `read_amr_header`
+
+            frames : list of dict, see `read_amr_frames`
+
+        None if the program failed.
+    """
+
+    command = solver_command(output='-', x_start=x_start, x_end=x_end,
+                             nx=nx, t_start=t_start, t_end=t_end,
+                             method=method,
+                             initial_conditions=initial_conditions,
+                             courant_factor=courant_factor,
+                             output_stride=output_stride,
+                             max_frames=max_frames,
+                             output_times=output_times,
+                             threads=threads,
+                             amr_levels=amr_levels,
+                             amr_threshold=amr_threshold,
+                             amr_detector=amr_detector)
+
+    child = subprocess.run(command, stdout=subprocess.PIPE,
+                           stderr=subprocess.PIPE, shell=True)
+
+    if child.returncode != 0:
+        print(child.stderr.decode('utf-8'))
+        return None
+
+    stream = io.BytesIO(child.stdout)
+    header = read_amr_header(stream)
+    return (header, list(read_amr_frames(stream, header)))
+
+
+def solve_2d_equation(x_start, x_end, nx, ny,
+                      t_start, t_end, method,
+                      initial_conditions,
+                      courant_factor, output_stride=None,
+                      max_frames=None, output_times=None, threads=1):
+    """
+    Runs Fortran program that solves equation
+
+        v_t + v v_x + v v_y = 0
+
+    in two dimensions with dimensional splitting and returns the solution.
+    The solution is passed through a pipe, without using any files.
+
+    Parameters
+    ----------
+    x_start : float
+        The smallest x and y value
+
+    x_end : float
+        The largest x and y value
+
+    nx, ny : int
+        The numbers of x and y points in the grid
+
+    The rest of the parameters are described in `solve_equation`.
+
+
+    Returns
+    -------
+        dict
+            The solution, see `parse_2d_solution`.
+
+        None if the program failed.
+    """
+
+    command = solver_command(output='-', x_start=x_start, x_end=x_end,
+                             nx=nx, t_start=t_start, t_end=t_end,
+                             method=method,
+                             initial_conditions=initial_conditions,
+                             courant_factor=courant_factor,
+                             output_stride=output_stride,
+                             max_frames=max_frames,
+                             output_times=output_times,
+                             threads=threads, ny=ny)
+
+    child = subprocess.run(command, stdout=subprocess.PIPE,
+                           stderr=subprocess.PIPE, shell=True)
+
+    if child.returncode != 0:
+        print(child.stderr.decode('utf-8'))
+        return None
+
+    return parse_2d_solution(child.stdout)
+
+
+def solve_equations(runs, max_workers=None):
+    """
+    Runs the Fortran program for several sets of parameters at the same
+    time, each in its own process. The total time is about the time of the
+    slowest run.
+
+    Parameters
+    ----------
+    runs : list of dict
+        Keyword arguments passed to `solve_equation` for each run.
+
+    max_workers : int
+        The maximum number of runs at the same time.
+        If None, all runs are started together.
+
+    Returns
+    -------
+        list
+            Values returned by `solve_equation` for each run,
+            in the same order as `runs`.
+    """
+
+    if len(runs) == 0:
+        return []
+
+    if max_workers is None:
+        max_workers = len(runs)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(lambda run: solve_equation(**run), runs))
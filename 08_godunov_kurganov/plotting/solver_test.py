@@ -1,5 +1,22 @@
-from solver import read_solution_from_file, solve_equation
+from solver import read_solution_from_file, solve_equation, \
+                   solve_equations, find_records, map_array, \
+                   output_arguments, \
+                   read_stream_header, read_stream_frames, \
+                   stream_equation, solver_command, \
+                   read_chunked_header, read_chunked_solution, read_frame, \
+                   read_stream_from_file, read_amr_header, \
+                   read_amr_frames, read_amr_solution, solve_amr_equation, \
+                   parse_2d_solution, read_2d_solution, solve_2d_equation
 from pytest import approx
+import pytest
+import struct
+import subprocess
+import io
+import os
+import numpy as np
+
+
+RECORDS_IN_TEST_OUTPUT = 6
 
 
 def test_read_solution_from_file():
@@ -29,6 +46,229 @@ def test_read_solution_from_file():
     assert solution[2, :, 0].tolist() == [5, 6]
 
 
+def test_read_solution_from_file__memory_mapped():
+    (x_values, t_values, solution) = read_solution_from_file(
+        "plotting/test_data/test_output.dat")
+
+    assert isinstance(x_values, np.memmap)
+    assert isinstance(t_values, np.memmap)
+    assert isinstance(solution, np.memmap)
+    assert solution.dtype == np.float64
+    assert not solution.flags.writeable
+
+
+def test_find_records():
+    records = find_records("plotting/test_data/test_output.dat")
+
+    assert len(records) == RECORDS_IN_TEST_OUTPUT
+    assert records[0] == [(4, 4)]
+    assert records[1] == [(16, 4)]
+
+
+def test_map_array__subrecords():
+    # A record split into two subrecords, as gfortran does
+    # for records larger than 2 GB
+    path = "test_subrecords.dat"
+
+    with open(path, "wb") as file:
+        file.write(struct.pack("@i", -16))
+        file.write(struct.pack("@dd", 1, 2))
+        file.write(struct.pack("@i", 16))
+        file.write(struct.pack("@i", 8))
+        file.write(struct.pack("@d", 3))
+        file.write(struct.pack("@i", -8))
+
+    records = find_records(path)
+
+    assert records == [[(4, 16), (28, 8)]]
+
+    result = map_array(path, records[0], shape=(3,))
+
+    assert result.tolist() == [1, 2, 3]
+    os.remove(path)
+
+
+def write_chunked_test_output(path, arguments):
+    parameters = dict(x_start=0, x_end=1, nx=100, t_start=0, t_end=1,
+                      method='kurganov', initial_conditions='sine',
+                      courant_factor=0.5)
+
+    subprocess.run(solver_command(output=path, **parameters) + arguments,
+                   shell=True, check=True, stdout=subprocess.DEVNULL)
+
+
+@pytest.mark.parametrize("arguments", [
+    "",
+    " --compression=zlib",
+    " --precision=single",
+    " --precision=single --compression=zlib --chunk_size=7",
+])
+def test_read_chunked_solution(arguments):
+    path = "test_chunked.dat"
+    write_chunked_test_output("test_binary.dat", "")
+    write_chunked_test_output(path, " --format=chunked" + arguments)
+
+    x, y, z = read_solution_from_file("test_binary.dat")
+    x_chunked, y_chunked, z_chunked = read_solution_from_file(path)
+
+    assert x_chunked.tolist() == x.tolist()
+    assert y_chunked.tolist() == y.tolist()
+    assert z_chunked.shape == z.shape
+
+    if "single" in arguments:
+        assert z_chunked.dtype == np.float32
+        assert np.allclose(z_chunked, z, rtol=1e-6, atol=1e-7, equal_nan=True)
+    else:
+        assert np.array_equal(z_chunked, z, equal_nan=True)
+
+    del x, y, z, x_chunked, y_chunked, z_chunked
+    os.remove(path)
+    os.remove("test_binary.dat")
+
+
+def test_read_frame():
+    path = "test_chunked.dat"
+    write_chunked_test_output(path, " --format=chunked --chunk_size=10"
+                                    " --compression=zlib")
+
+    header = read_chunked_header(path)
+    _, _, z = read_chunked_solution(path)
+
+    assert header['chunk_size'] == 10
+    assert header['compressed']
+    assert len(header['chunks']) == (header['nt'] + 9) // 10
+
+    for index in [0, 9, 10, header['nt'] - 1]:
+        assert np.array_equal(read_frame(path, header, index), z[index],
+                              equal_nan=True)
+
+    os.remove(path)
+
+
+def test_read_chunked_header__not_chunked():
+    with pytest.raises(ValueError):
+        read_chunked_header("plotting/test_data/test_output.dat")
+
+
+def test_read_stream():
+    data = struct.pack("@ii", 2, 1) + struct.pack("@dd", 1.1, 1.2)
+    data += struct.pack("@ddd", 0.1, 1, 2)
+    data += struct.pack("@ddd", 0.2, 3, 4)
+
+    # Incomplete frame at the end of the stream is ignored
+    data += struct.pack("@d", 0.3)
+
+    stream = io.BytesIO(data)
+    x, unit_vector_dimension = read_stream_header(stream)
+
+    assert x.tolist() == [1.1, 1.2]
+    assert unit_vector_dimension == 1
+
+    frames = list(read_stream_frames(stream, nx=2, unit_vector_dimension=1))
+
+    assert len(frames) == 2
+    assert frames[0][0] == 0.1
+    assert frames[0][1].tolist() == [[1], [2]]
+    assert frames[1][0] == 0.2
+    assert frames[1][1].tolist() == [[3], [4]]
+
+
+def test_read_stream_header__empty():
+    assert read_stream_header(io.BytesIO(b'')) is None
+
+
+def test_stream_equation():
+    parameters = dict(x_start=0, x_end=1, nx=100, t_start=0, t_end=1,
+                      method='kurganov', initial_conditions='sine',
+                      courant_factor=0.5)
+
+    frames = list(stream_equation(**parameters))
+
+    # Compare with the solution saved to a file
+    path = "test_stream_equation.dat"
+    subprocess.run(solver_command(output=path, **parameters),
+                   shell=True, check=True, stdout=subprocess.DEVNULL)
+
+    x, y, z = read_solution_from_file(path)
+
+    assert len(frames) == len(y)
+
+    for i, (x_frame, t, solution) in enumerate(frames):
+        assert x_frame.tolist() == x.tolist()
+        assert t == y[i]
+        assert solution.tolist() == z[i].tolist()
+
+    del x, y, z
+    os.remove(path)
+
+
+def test_stream_equation__output_times():
+    parameters = dict(x_start=0, x_end=1, nx=100, t_start=0, t_end=1,
+                      method='godunov', initial_conditions='square',
+                      courant_factor=0.5, output_times=[0, 0.3, 0.31, 5])
+
+    frames = list(stream_equation(**parameters))
+
+    # The same time levels are selected when the solution is saved to a file
+    path = "test_stream_equation_output_times.dat"
+    subprocess.run(solver_command(output=path, **parameters),
+                   shell=True, check=True, stdout=subprocess.DEVNULL)
+
+    y, z = read_solution_from_file(path)[1:]
+
+    assert len(y) == 4
+    assert [t for _, t, _ in frames] == y.tolist()
+    assert [solution.tolist() for _, _, solution in frames] == z.tolist()
+
+    del y, z
+    os.remove(path)
+
+
+def test_read_stream_from_file():
+    parameters = dict(x_start=0, x_end=1, nx=100, t_start=0, t_end=1,
+                      method='kurganov', initial_conditions='sine',
+                      courant_factor=0.5, output_times=[0.2, 0.21, 0.7])
+
+    path = "test_read_stream_from_file.dat"
+    subprocess.run(solver_command(output=path, **parameters)
+                   + " --format=stream",
+                   shell=True, check=True, stdout=subprocess.DEVNULL)
+
+    x, y, z = read_stream_from_file(path)
+    os.remove(path)
+
+    expected_x, expected_y, expected_z, _ = solve_equation(**parameters)
+
+    assert x.tolist() == expected_x.tolist()
+    assert y.tolist() == expected_y.tolist()
+    assert z.tolist() == expected_z.tolist()
+
+
+def test_stream_equation__stop_early():
+    frames = stream_equation(x_start=0, x_end=1, nx=100, t_start=0, t_end=1,
+                             method='godunov', initial_conditions='sine',
+                             courant_factor=0.5)
+
+    x, t, solution = next(frames)
+
+    assert t == 0
+    assert solution[1, 0] == approx(0.0941083133185, rel=1e-10)
+
+    # Stops the program
+    frames.close()
+
+
+def test_stream_equation__error():
+    frames = stream_equation(x_start=0, x_end=1, nx=100, t_start=0, t_end=1,
+                             method='unknown', initial_conditions='sine',
+                             courant_factor=0.5)
+
+    with pytest.raises(subprocess.CalledProcessError) as error:
+        list(frames)
+
+    assert "Incorrect method name" in error.value.stderr
+
+
 def test_solve_equation():
     result = solve_equation(x_start=0, x_end=1,
                             nx=100, t_start=0, t_end=1,
@@ -66,3 +306,268 @@ def test_solve_equation():
     assert z[100, 1, 0] == approx(0.03094713569910027, rel=1e-10)
     assert z[100, 20, 0] == approx(0.2940487409211191, rel=1e-10)
     assert z[100, 99, 0] == approx(-0.016778795278254, rel=1e-10)
+
+
+def test_output_arguments():
+    assert output_arguments() == ''
+    assert output_arguments(output_stride=3) == ' --output_stride=3'
+    assert output_arguments(max_frames=10) == ' --max_frames=10'
+
+    assert output_arguments(output_times=[0.5, 1]) == \
+        ' --output_times=0.5,1.0'
+
+
+def solve_for_output_test(**output):
+    return solve_equation(x_start=0, x_end=1, nx=100, t_start=0, t_end=1,
+                          method='godunov', initial_conditions='sine',
+                          courant_factor=0.5, **output)
+
+
+def test_solve_equation__output_stride():
+    x, y, z = solve_for_output_test()[:3]
+    x_selected, y_selected, z_selected = \
+        solve_for_output_test(output_stride=10)[:3]
+
+    # Every 10th time level and the last one
+    indices = sorted(set(range(0, len(y), 10)) | {len(y) - 1})
+
+    assert x_selected.tolist() == x.tolist()
+    assert y_selected.tolist() == y[indices].tolist()
+    assert z_selected.tolist() == z[indices].tolist()
+
+
+def test_solve_equation__max_frames():
+    y, z = solve_for_output_test()[1:3]
+    y_selected, z_selected = solve_for_output_test(max_frames=1)[1:3]
+
+    assert y_selected.tolist() == [y[-1]]
+    assert z_selected.tolist() == [z[-1].tolist()]
+
+    y_selected = solve_for_output_test(max_frames=5)[1]
+
+    assert len(y_selected) == 5
+    assert y_selected[0] == 0
+    assert y_selected[2] == approx(0.5, abs=0.005)
+    assert y_selected[4] == y[-1]
+
+
+def test_solve_equation__output_times():
+    y, z = solve_for_output_test()[1:3]
+
+    y_selected, z_selected = \
+        solve_for_output_test(output_times=[0.5, 0.2514])[1:3]
+
+    # Time levels nearest to the output times
+    indices = [np.abs(y - 0.2514).argmin(), np.abs(y - 0.5).argmin()]
+
+    assert y_selected.tolist() == y[indices].tolist()
+    assert z_selected.tolist() == z[indices].tolist()
+
+
+@pytest.mark.parametrize("method", ['godunov', 'kurganov'])
+def test_solve_equation__threads(method):
+    parameters = dict(x_start=0, x_end=1, nx=500, t_start=0, t_end=0.5,
+                      method=method, initial_conditions='sine',
+                      courant_factor=0.5, use_cache=False)
+
+    _, y, z, _ = solve_equation(**parameters)
+    _, y_threads, z_threads, _ = solve_equation(**parameters, threads=3)
+
+    # Same solution to the last bit
+    assert np.array_equal(y, y_threads)
+    assert np.array_equal(z, z_threads)
+
+
+def test_solve_equation__limiter():
+    parameters = dict(x_start=0, x_end=1, nx=100, t_start=0, t_end=0.4,
+                      method='kurganov', initial_conditions='square',
+                      courant_factor=0.5, use_cache=False, max_frames=1)
+
+    _, _, z, _ = solve_equation(**parameters)
+    _, _, z_limited, _ = solve_equation(**parameters, limiter='mc')
+
+    assert z.shape == z_limited.shape
+    assert not np.array_equal(z, z_limited)
+
+    # No new extrema
+    assert z_limited.min() > -1e-12
+    assert z_limited.max() < 1 + 1e-12
+
+
+def test_read_amr_frames():
+    data = b"BURGAMR1" + struct.pack("@3i", 2, 2, 1)
+    data += struct.pack("@dd", 0, 1)
+
+    # Frame with one cell of the first level and two of the second
+    data += struct.pack("@dqi", 0.1, 12, 3) + struct.pack("@3i", 2, 2, 1)
+    data += struct.pack("@3d", 0.125, 0.375, 0.75)
+    data += struct.pack("@3d", 1, 2, 3)
+
+    # Incomplete frame at the end of the stream is ignored
+    data += struct.pack("@d", 0.2)
+
+    stream = io.BytesIO(data)
+    header = read_amr_header(stream)
+
+    assert header == dict(nx=2, levels=2, unit_vector_dimension=1,
+                          x_start=0, x_end=1)
+
+    frames = list(read_amr_frames(stream, header))
+
+    assert len(frames) == 1
+    assert frames[0]['t'] == 0.1
+    assert frames[0]['cell_updates'] == 12
+    assert frames[0]['levels'].tolist() == [2, 2, 1]
+    assert frames[0]['x'].tolist() == [0.125, 0.375, 0.75]
+    assert frames[0]['dx'].tolist() == [0.25, 0.25, 0.5]
+    assert frames[0]['z'].tolist() == [[1], [2], [3]]
+
+
+def test_read_amr_header__not_amr():
+    with pytest.raises(ValueError):
+        read_amr_header(io.BytesIO(b"BURGCHK1" + bytes(28)))
+
+
+def test_solve_amr_equation():
+    parameters = dict(x_start=0, x_end=1, nx=50, t_start=0, t_end=0.4,
+                      method='kurganov', initial_conditions='square',
+                      courant_factor=0.5, amr_levels=3, max_frames=3)
+
+    header, frames = solve_amr_equation(**parameters)
+
+    assert header['nx'] == 50
+    assert header['levels'] == 3
+    assert len(frames) == 3
+    assert frames[0]['t'] == 0
+    assert frames[-1]['t'] >= 0.4
+    assert frames[0]['cell_updates'] == 0
+    assert frames[-1]['cell_updates'] > frames[1]['cell_updates']
+
+    for frame in frames:
+        # The cells cover the domain
+        assert frame['dx'].sum() == approx(1, rel=1e-14)
+        assert all(np.diff(frame['x']) > 0)
+        assert set(frame['levels'].tolist()) == {1, 2, 3}
+
+        # Conservation
+        assert (frame['dx'] * frame['z'][:, 0]).sum() == approx(0.5, rel=1e-13)
+
+    # Compare with the solution saved to a file
+    path = "test_amr_solution.dat"
+    subprocess.run(solver_command(output=path, **parameters),
+                   shell=True, check=True, stdout=subprocess.DEVNULL)
+
+    header_file, frames_file = read_amr_solution(path)
+    os.remove(path)
+
+    assert header_file == header
+    assert len(frames_file) == len(frames)
+
+    for frame, frame_file in zip(frames, frames_file):
+        assert frame['t'] == frame_file['t']
+        assert frame['x'].tolist() == frame_file['x'].tolist()
+        assert frame['z'].tolist() == frame_file['z'].tolist()
+
+
+def test_solve_amr_equation__error(capsys):
+    result = solve_amr_equation(x_start=0, x_end=1, nx=50, t_start=0,
+                                t_end=0.4, method='kurganov',
+                                initial_conditions='square',
+                                courant_factor=0.5, amr_levels=3,
+                                amr_detector='curvature')
+
+    assert result is None
+    assert "Incorrect amr_detector name" in capsys.readouterr().out
+
+
+def test_parse_2d_solution():
+    data = (b"BURG2D01" + struct.pack("@3i", 3, 2, 1)
+            + struct.pack("@4d", 0, 1, 0, 2)
+            + struct.pack("@7d", 0.5, 1, 2, 3, 4, 5, 6)
+            + struct.pack("@7d", 0.7, 7, 8, 9, 10, 11, 12)
+            + struct.pack("@2d", 0.9, 1))  # incomplete frame
+
+    solution = parse_2d_solution(data)
+
+    assert solution['x'].tolist() == approx([1 / 6, 0.5, 5 / 6])
+    assert solution['y'].tolist() == approx([0.5, 1.5])
+    assert solution['t'].tolist() == [0.5, 0.7]
+    assert solution['z'].shape == (2, 2, 3, 1)
+
+    # The x index changes first in the file
+    assert solution['z'][0, :, :, 0].tolist() == [[1, 2, 3], [4, 5, 6]]
+    assert solution['z'][1, 1, 0, 0] == 10
+
+
+def test_parse_2d_solution__not_2d():
+    with pytest.raises(ValueError):
+        parse_2d_solution(b"BURGAMR1" + bytes(44))
+
+
+@pytest.mark.parametrize("method", ['godunov', 'kurganov'])
+def test_solve_2d_equation(method):
+    parameters = dict(x_start=0, x_end=1, nx=40, ny=30, t_start=0,
+                      t_end=0.3, method=method,
+                      initial_conditions='square', courant_factor=0.5,
+                      max_frames=3)
+
+    solution = solve_2d_equation(**parameters)
+
+    assert solution['x'][0] == approx(0.0125)
+    assert solution['y'][-1] == approx(1 - 1 / 60)
+    assert solution['t'][0] == 0
+    assert solution['t'][-1] >= 0.3
+    assert solution['z'].shape == (3, 30, 40, 1)
+
+    # Conservation
+    for frame in solution['z']:
+        assert frame.sum() / (30 * 40) == approx(0.25, rel=1e-13)
+
+    # Compare with the solution saved to a file
+    path = "test_2d_solution.dat"
+    subprocess.run(solver_command(output=path, **parameters),
+                   shell=True, check=True, stdout=subprocess.DEVNULL)
+
+    solution_file = read_2d_solution(path)
+
+    assert np.array_equal(solution_file['t'], solution['t'])
+    assert np.array_equal(solution_file['z'], solution['z'])
+
+    del solution_file
+    os.remove(path)
+
+
+def test_solve_2d_equation__error(capsys):
+    solution = solve_2d_equation(x_start=0, x_end=1, nx=40, ny=30,
+                                 t_start=0, t_end=0.3, method='unknown',
+                                 initial_conditions='square',
+                                 courant_factor=0.5)
+
+    assert solution is None
+    assert "Incorrect method name" in capsys.readouterr().out
+
+
+def test_solve_equations():
+    runs = [
+        dict(x_start=0, x_end=1, nx=100, t_start=0, t_end=1,
+             method=method, initial_conditions='sine',
+             courant_factor=0.5)
+        for method in ['godunov', 'kurganov']
+    ]
+
+    results = solve_equations(runs)
+
+    assert len(results) == 2
+
+    for run, result in zip(runs, results):
+        x, y, z = result[:3]
+        expected_x, expected_y, expected_z = solve_equation(**run)[:3]
+
+        assert x.tolist() == expected_x.tolist()
+        assert y.tolist() == expected_y.tolist()
+        assert z.tolist() == expected_z.tolist()
+
+    # Different methods give different solutions
+    assert results[0][2].tolist() != results[1][2].tolist()
+
+    assert solve_equations([]) == []
@@ -0,0 +1,382 @@
+#
+# Work-precision benchmark: compare the errors and the costs of the first
+# order Kurganov-Tadmor method with the second order methods that use
+# limited (MUSCL) reconstruction and SSP-RK2 time steps.
+#
+
+from plot_utils import create_dir
+import matplotlib.pyplot as plt
+import numpy as np
+import os
+import time
+from solver import solve_equation
+
+# Limiters of the compared methods, 'none' is the first order method
+LIMITERS = ['none', 'minmod', 'vanleer', 'mc']
+
+
+def exact_square_solution(x, t):
+    """
+    Returns the exact solution of Burgers' equation for the square initial
+    conditions: a rarefaction wave starting at x=0.25 and a shock
+    starting at x=0.75. The solution is valid for t <= 0.5, before the
+    shock reaches the end of the periodic domain [0, 1].
+
+    Parameters
+    ----------
+    x : numpy.ndarray
+        The x values.
+
+    t : float
+        The time value.
+
+
+    Returns
+    -------
+        numpy.ndarray
+            Values of u at x.
+    """
+
+    x = np.asarray(x)
+    u = np.zeros(x.shape)
+    fan = (x > 0.25) & (x < 0.25 + t)
+    u[fan] = (x[fan] - 0.25) / t
+    u[(x >= 0.25 + t) & (x < 0.75 + t / 2)] = 1
+    return u
+
+
+def cell_updates(nx, t_end, courant_factor, limiter):
+    """
+    Returns the number of cell updates of a run, which measures the work
+    independently of the computer. The largest speed of the square wave is
+    one, so the time step is `courant_factor * dx`. The second order
+    methods make two updates in each time step.
+
+    Parameters
+    ----------
+    nx : int
+        The number of x points in the grid.
+
+    t_end : float
+        The largest t value, the smallest is zero.
+
+    courant_factor : float
+        Courant factor parameter of the numerical methods.
+
+    limiter : str
+        Slope limiter: none, minmod, vanleer, mc.
+
+
+    Returns
+    -------
+        int
+            The number of cell updates.
+    """
+
+    steps = int(np.ceil(t_end * nx / courant_factor - 1e-9))
+    stages = 1 if limiter == 'none' else 2
+    return nx * steps * stages
+
+
+def work_precision(limiter, nx_values, t_end=0.4, courant_factor=0.5,
+                   repeats=1):
+    """
+    Solves the equation with the Kurganov-Tadmor method for square initial
+    conditions on several grids and measures the errors and the costs.
+
+    Parameters
+    ----------
+    limiter : str
+        Slope limiter: none, minmod, vanleer, mc.
+
+    nx_values : list of int
+        The numbers of x points of the grids.
+
+    t_end : float
+        The time of the compared solutions, at most 0.5.
+
+    courant_factor : float
+        Courant factor parameter of the numerical methods.
+
+    repeats : int
+        The number of runs for each grid, the shortest time is used.
+
+
+    Returns
+    -------
+        dict
+            limiter : the limiter
+
+            nx : the numbers of x points
+
+            errors : L1 errors of the solutions at `t_end`
+
+            cell_updates : the numbers of cell updates, see `cell_updates`
+
+            seconds : the times of the runs
+
+        None if the program failed.
+    """
+
+    errors = []
+    seconds = []
+
+    for nx in nx_values:
+        times = []
+
+        for _ in range(repeats):
+            start = time.perf_counter()
+
+            result = solve_equation(x_start=0, x_end=1, nx=nx, t_start=0,
+                                    t_end=t_end, method='kurganov',
+                                    initial_conditions='square',
+                                    courant_factor=courant_factor,
+                                    max_frames=1, use_cache=False,
+                                    limiter=limiter)
+
+            times.append(time.perf_counter() - start)
+
+            if result is None:
+                return None
+
+        x, y, z, dx = result
+        exact = exact_square_solution(x=x, t=y[-1])
+        errors.append(dx * np.abs(z[-1, :, 0] - exact).sum())
+        seconds.append(min(times))
+
+    return dict(
+        limiter=limiter,
+        nx=list(nx_values),
+        errors=errors,
+        cell_updates=[cell_updates(nx=nx, t_end=t_end,
+                                   courant_factor=courant_factor,
+                                   limiter=limiter)
+                      for nx in nx_values],
+        seconds=seconds
+    )
+
+
+def cost_for_error(results, error, cost='cell_updates'):
+    """
+    Returns the cost of reaching the error, interpolated linearly
+    between the grids on the log-log scale.
+
+    Parameters
+    ----------
+    results : dict
+        The results of `work_precision`.
+
+    error : float
+        The L1 error.
+
+    cost : str
+        The measure of the cost: cell_updates, seconds or nx.
+
+
+    Returns
+    -------
+        float
+            The cost, or None if the error is not reached or is smaller
+            than the errors of all grids.
+    """
+
+    errors = np.log(results['errors'])
+    costs = np.log(results[cost])
+    target = np.log(error)
+
+    for i in range(len(errors) - 1):
+        if errors[i] >= target >= errors[i + 1]:
+            if errors[i] == errors[i + 1]:
+                return float(np.exp(costs[i]))
+
+            fraction = (errors[i] - target) / (errors[i] - errors[i + 1])
+            log_cost = costs[i] + fraction * (costs[i + 1] - costs[i])
+            return float(np.exp(log_cost))
+
+    return None
+
+
+def format_table(results_list):
+    """
+    Returns the table of the errors and the costs.
+
+    Parameters
+    ----------
+    results_list : list of dict
+        The results of `work_precision` for each limiter.
+
+
+    Returns
+    -------
+        str
+            The text of the table.
+    """
+
+    lines = [f"{'limiter':>8} {'nx':>6} {'L1 error':>11} "
+             f"{'cell updates':>13} {'time [s]':>9}"]
+
+    for results in results_list:
+        for i, nx in enumerate(results['nx']):
+            lines.append(f"{results['limiter']:>8} {nx:>6} "
+                         f"{results['errors'][i]:>11.4e} "
+                         f"{results['cell_updates'][i]:>13} "
+                         f"{results['seconds'][i]:>9.3f}")
+
+    return '\n'.join(lines)
+
+
+def format_savings(results_list, error):
+    """
+    Returns the table of the costs of reaching the error with each
+    limiter, relative to the first order method.
+
+    Parameters
+    ----------
+    results_list : list of dict
+        The results of `work_precision` for each limiter, the first one
+        is for the first order method.
+
+    error : float
+        The L1 error.
+
+
+    Returns
+    -------
+        str
+            The text of the table.
+    """
+
+    costs = ['nx', 'cell_updates', 'seconds']
+    lines = [f"Cost of reaching L1 error {error:.3e}:",
+             f"{'limiter':>8} {'nx':>8} {'cell updates':>13} {'time [s]':>9}"
+             f" {'fewer cells':>12} {'fewer updates':>14}"]
+
+    first_order = {cost: cost_for_error(results_list[0], error, cost)
+                   for cost in costs}
+
+    for results in results_list:
+        values = {cost: cost_for_error(results, error, cost)
+                  for cost in costs}
+
+        if values['nx'] is None:
+            lines.append(f"{results['limiter']:>8} {'not reached':>8}")
+            continue
+
+        line = (f"{results['limiter']:>8} {values['nx']:>8.0f} "
+                f"{values['cell_updates']:>13.3e} {values['seconds']:>9.3f}")
+
+        if first_order['nx'] is not None:
+            fewer_cells = first_order['nx'] / values['nx']
+
+            fewer_updates = \
+                first_order['cell_updates'] / values['cell_updates']
+
+            line += f" {fewer_cells:>12.1f} {fewer_updates:>14.1f}"
+
+        lines.append(line)
+
+    return '\n'.join(lines)
+
+
+def plot_work_precision(results_list, plot_dir, file_name, show_plot):
+    """
+    Makes log-log plots of the errors versus the number of cell updates
+    and versus the time of the runs.
+
+    Parameters
+    ----------
+    results_list : list of dict
+        The results of `work_precision` for each limiter.
+
+    plot_dir : str
+        Directory where the plot file is saved
+
+    file_name : str
+        Plot file name
+
+    show_plot : bool
+        If False the plot will not be shown on screen (only saved to a file).
+        False value is used in unit tests.
+    """
+
+    fig, (ax_updates, ax_time) = plt.subplots(1, 2, figsize=(12, 5))
+    markers = ['o', 's', '^', 'D']
+
+    for results, marker in zip(results_list, markers):
+        label = results['limiter']
+
+        if label == 'none':
+            label = 'first order'
+
+        ax_updates.loglog(results['cell_updates'], results['errors'],
+                          marker=marker, label=label)
+
+        ax_time.loglog(results['seconds'], results['errors'],
+                       marker=marker, label=label)
+
+    ax_updates.set_xlabel("Cell updates")
+    ax_time.set_xlabel("Time [s]")
+
+    for ax in [ax_updates, ax_time]:
+        ax.set_ylabel("L1 error")
+        ax.legend()
+        ax.grid(True, which='both', alpha=0.3)
+
+    fig.suptitle("Work-precision of Kurganov-Tadmor method, square wave")
+    fig.tight_layout()
+
+    create_dir(plot_dir)
+    fig.savefig(os.path.join(plot_dir, file_name))
+
+    if show_plot:
+        plt.show()
+
+    plt.close(fig)
+
+
+def make_plots(plot_dir, show_plot, nx_values=None, repeats=3):
+    """
+    Runs the benchmark for all limiters, prints the tables
+    and creates the plot.
+
+    Parameters
+    ----------
+    plot_dir : str
+        Directory where the plot files will be saved.
+
+    show_plot : bool
+        If False the plot will not be shown on screen (only saved to a file).
+        False value is used in unit tests.
+
+    nx_values : list of int
+        The numbers of x points of the grids.
+
+    repeats : int
+        The number of runs for each grid, the shortest time is used.
+    """
+
+    if nx_values is None:
+        nx_values = [50, 100, 200, 400, 800, 1600]
+
+    results_list = []
+
+    for limiter in LIMITERS:
+        results = work_precision(limiter=limiter, nx_values=nx_values,
+                                 repeats=repeats)
+
+        if results is None:
+            return
+
+        results_list.append(results)
+
+    print(format_table(results_list))
+
+    # The error of the first order method on the finest grid
+    print(f"\n{format_savings(results_list, results_list[0]['errors'][-1])}")
+
+    plot_work_precision(results_list=results_list, plot_dir=plot_dir,
+                        file_name="work_precision.pdf", show_plot=show_plot)
+
+
+if __name__ == '__main__':
+    make_plots(plot_dir="plots", show_plot=True)
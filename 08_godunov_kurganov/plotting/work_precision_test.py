@@ -0,0 +1,94 @@
+from work_precision import exact_square_solution, cell_updates, \
+                           work_precision, cost_for_error, format_table, \
+                           format_savings, make_plots
+from solver import solve_equation
+import numpy as np
+import os
+import shutil
+from pytest import approx
+
+
+def test_exact_square_solution():
+    x = np.array([0.1, 0.3, 0.5, 0.7, 0.97])
+
+    assert exact_square_solution(x=x, t=0.4).tolist() == \
+        [0, approx(0.125), approx(0.625), 1, 0]
+
+    assert exact_square_solution(x=x, t=0.1).tolist() == \
+        [0, approx(0.5), 1, 1, 0]
+
+
+def test_cell_updates():
+    assert cell_updates(nx=100, t_end=0.4, courant_factor=0.5,
+                        limiter='none') == 100 * 80
+
+    assert cell_updates(nx=100, t_end=0.4, courant_factor=0.5,
+                        limiter='mc') == 2 * 100 * 80
+
+
+def test_cell_updates__same_as_number_of_steps():
+    nx = 100
+
+    _, y, _, _ = solve_equation(x_start=0, x_end=1, nx=nx, t_start=0,
+                                t_end=0.4, method='kurganov',
+                                initial_conditions='square',
+                                courant_factor=0.5, use_cache=False,
+                                backend='numpy', limiter='mc')
+
+    steps = len(y) - 1
+
+    assert cell_updates(nx=nx, t_end=0.4, courant_factor=0.5,
+                        limiter='mc') == 2 * nx * steps
+
+
+def test_cost_for_error():
+    results = dict(errors=[1, 0.1, 0.01], cell_updates=[10, 100, 1000],
+                   nx=[1, 2, 4], seconds=[1, 2, 3])
+
+    assert cost_for_error(results, 0.1) == approx(100)
+    assert cost_for_error(results, 10**-0.5) == approx(10**1.5)
+    assert cost_for_error(results, 0.001) is None
+    assert cost_for_error(results, 2) is None
+
+
+def test_work_precision():
+    first_order = work_precision(limiter='none', nx_values=[50, 100, 200])
+    second_order = work_precision(limiter='mc', nx_values=[50, 100, 200])
+
+    assert first_order['nx'] == [50, 100, 200]
+    assert len(first_order['seconds']) == 3
+    assert first_order['cell_updates'] == [2000, 8000, 32000]
+
+    # The errors decrease with grid refinement
+    assert all(np.diff(first_order['errors']) < 0)
+    assert all(np.diff(second_order['errors']) < 0)
+
+    # The same error is reached with fewer cells
+    error = first_order['errors'][-1]
+    nx_first_order = cost_for_error(first_order, error, cost='nx')
+    nx_second_order = cost_for_error(second_order, error, cost='nx')
+    assert nx_first_order / nx_second_order > 2
+
+    table = format_table([first_order, second_order]).splitlines()
+    assert len(table) == 7
+    assert table[4].split()[:2] == ['mc', '50']
+
+    savings = format_savings([first_order, second_order], error).splitlines()
+    assert len(savings) == 4
+    assert savings[2].split()[-2:] == ['1.0', '1.0']
+
+
+def test_make_plots():
+    plot_dir = "test_plots"
+    plot_file_name = "work_precision.pdf"
+    plot_file_path = os.path.join(plot_dir, plot_file_name)
+
+    if os.path.exists(plot_file_path):
+        os.remove(plot_file_path)
+
+    make_plots(plot_dir=plot_dir, show_plot=False, nx_values=[50, 100],
+               repeats=1)
+
+    assert os.path.exists(plot_file_path)
+    os.remove(plot_file_path)
+    shutil.rmtree(plot_dir)
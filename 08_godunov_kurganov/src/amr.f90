@@ -0,0 +1,925 @@
+!
+! Solves the equation with block-structured adaptive mesh refinement (AMR).
+!
+! The grid consists of levels, each having cells twice smaller than
+! the previous level. The first level covers the whole domain, the other
+! levels cover only the patches: the intervals of cells where
+! the solution has large gradients or shocks. The patches are
+! found again at each time step of the first level.
+!
+! Each level is advanced with its own time step, which is twice smaller
+! than the time step of the previous level (subcycling), so the Courant
+! factor is the same on all levels. The fluxes through the boundaries
+! of the patches are corrected after the finer level has been advanced,
+! so that the scheme is conservative.
+!
+module Amr
+!$ use omp_lib, only: omp_set_num_threads
+use Types, only: dp, i8
+use Settings, only: program_settings
+use FloatUtils, only: linspace
+use Output, only: open_stream
+use AmrOutput, only: write_amr_header, write_amr_frame
+use Snapshots, only: output_schedule, init_schedule, select_frames
+use InitialConditions, only: calculate_initial
+use Physics, only: state_vectors_to_primitive_in_place, &
+                   calculate_fluxes, calculate_eigenvalues, &
+                   largest_eigenvalue
+
+use InterfaceFlux, only: calculate_interface_fluxes
+use Step, only: step_finite_volume
+implicit none
+private
+public :: find_patches, flag_cells, init_levels, regrid, advance_amr, &
+          composite_solution, solve_amr_equation, solve_and_create_amr_output
+
+!
+! Stores the cells of one refinement level. The arrays contain all cells
+! of the domain, but only the cells in the patches are calculated.
+!
+type, public :: amr_level
+    ! The number of cells covering the whole domain
+    integer :: nx
+
+    ! Size of the cells
+    real(dp) :: dx
+
+    ! State vectors in the cells. The values of the cells next to the
+    ! patches are used as ghost cells.
+    real(dp), allocatable :: state_vectors(:, :)
+
+    ! State vectors at the beginning of the current time step of the level
+    real(dp), allocatable :: old_state_vectors(:, :)
+
+    ! Fluxes through the right interfaces of the cells
+    ! in the current time step
+    real(dp), allocatable :: interface_fluxes(:, :)
+
+    ! Fluxes through the right interfaces of the cells, multiplied
+    ! by the time steps and summed over the steps made during a single step
+    ! of the previous level. Only the interfaces at the boundaries of
+    ! the patches are summed.
+    real(dp), allocatable :: flux_sums(:, :)
+
+    ! .true. for the cells in the patches
+    logical, allocatable :: covered(:)
+
+    ! The first cells of the patches and the numbers of cells in them.
+    ! A patch can continue from the end of the periodic domain
+    ! to its beginning.
+    integer, allocatable :: patch_starts(:), patch_sizes(:)
+end type amr_level
+
+contains
+
+!
+! Returns the index of a cell in the periodic domain
+!
+! Inputs:
+! -------
+!
+! index : the index, which can be outside of range 1..nx
+!
+! nx : the number of cells in the domain
+!
+function wrap(index, nx) result(wrapped)
+    integer, intent(in) :: index, nx
+    integer :: wrapped
+
+    wrapped = modulo(index - 1, nx) + 1
+end function
+
+
+!
+! Returns indices of consecutive cells of the periodic domain
+!
+! Inputs:
+! -------
+!
+! start : the index of the first cell, which can be outside of range 1..nx
+!
+! count : the number of cells
+!
+! nx : the number of cells in the domain
+!
+function cell_indices(start, count, nx) result(indices)
+    integer, intent(in) :: start, count, nx
+    integer :: indices(count)
+    integer :: i
+
+    indices = [(wrap(start + i - 1, nx), i = 1, count)]
+end function
+
+
+!
+! Finds the patches: the intervals of consecutive covered cells
+!
+! Inputs:
+! -------
+!
+! covered : .true. for the cells that are in the patches
+!
+!
+! Outputs:
+! -------
+!
+! starts : the first cells of the patches
+!
+! sizes : the numbers of cells in the patches
+!
+subroutine find_patches(covered, starts, sizes)
+    logical, intent(in) :: covered(:)
+    integer, allocatable, intent(out) :: starts(:), sizes(:)
+    integer :: found_starts(size(covered)), found_sizes(size(covered))
+    integer :: nx, gap, count, i, cell
+
+    nx = size(covered)
+
+    if (all(covered)) then
+        starts = [1]
+        sizes = [nx]
+        return
+    end if
+
+    ! Start the search after the last uncovered cell, so that the patch
+    ! continuing from the end of the domain to its beginning is not split
+    gap = findloc(covered, .false., dim=1, back=.true.)
+    count = 0
+
+    do i = 1, nx
+        cell = wrap(gap + i, nx)
+        if (.not. covered(cell)) cycle
+
+        if (.not. covered(wrap(cell - 1, nx))) then
+            count = count + 1
+            found_starts(count) = cell
+            found_sizes(count) = 0
+        end if
+
+        found_sizes(count) = found_sizes(count) + 1
+    end do
+
+    starts = found_starts(1:count)
+    sizes = found_sizes(1:count)
+end subroutine
+
+
+!
+! Flags the cells that need to be refined
+!
+! Inputs:
+! -------
+!
+! detector : the detector of cells needing refinement:
+!
+!       gradient : the largest difference between the values in the cell
+!                  and the neighbouring cells exceeds the threshold.
+!
+!       shock : the value in the left neighbour exceeds the value in the
+!               right one by more than the threshold. The characteristics
+!               of Burgers' equation converge there, forming a shock.
+!
+! threshold : the threshold of the detector
+!
+! buffer : the number of cells around the detected cells that are also
+!          flagged, so that the moving features remain in the refined
+!          region until the next refinement
+!
+! values : the values of the first component of the state vectors
+!
+! covered : .true. for the cells in the patches of the level
+!
+!
+! Outputs:
+! -------
+!
+! flags : .true. for the cells that need to be refined. Only the cells
+!         in the patches are flagged, excluding the first and the last
+!         cells of the patches. This leaves a cell of this level
+!         around the refined cells, from which the ghost cells
+!         of the finer level are filled.
+!
+subroutine flag_cells(detector, threshold, buffer, values, covered, flags)
+    character(len=*), intent(in) :: detector
+    real(dp), intent(in) :: threshold
+    integer, intent(in) :: buffer
+    real(dp), intent(in) :: values(:)
+    logical, intent(in) :: covered(:)
+    logical, intent(out) :: flags(size(values))
+    logical :: interior(size(values)), detected(size(values))
+    real(dp) :: left_difference, right_difference
+    integer :: nx, i
+
+    nx = size(values)
+
+    do i = 1, nx
+        interior(i) = covered(wrap(i - 1, nx)) .and. covered(i) .and. &
+                      covered(wrap(i + 1, nx))
+    end do
+
+    detected = .false.
+
+    do i = 1, nx
+        if (.not. interior(i)) cycle
+
+        left_difference = values(i) - values(wrap(i - 1, nx))
+        right_difference = values(wrap(i + 1, nx)) - values(i)
+
+        select case (detector)
+        case ("gradient")
+            detected(i) = max(abs(left_difference), abs(right_difference)) &
+                          > threshold
+        case ("shock")
+            detected(i) = -(left_difference + right_difference) > threshold
+        case default
+            print "(a, a)", "ERROR: unknown AMR detector ", trim(detector)
+            call exit(41)
+        end select
+    end do
+
+    flags = .false.
+
+    do i = 1, nx
+        if (detected(i)) flags(cell_indices(i - buffer, 2 * buffer + 1, nx)) &
+            = .true.
+    end do
+
+    flags = flags .and. interior
+end subroutine
+
+
+!
+! Finds the patches of the levels from the current solution.
+! The levels are processed from the coarsest to the finest, each level
+! is refined where the cells are flagged by `flag_cells`.
+!
+! Inputs:
+! -------
+!
+! options : program options
+!
+! inject : if .true. the cells that have been added to the patches get
+!          the values of the cells of the previous level containing them.
+!          If .false., the values of the cells are not changed, which is
+!          used when the initial conditions are set on all levels.
+!
+!
+! Outputs:
+! -------
+!
+! levels : the refinement levels
+!
+subroutine regrid(options, inject, levels)
+    type(program_settings), intent(in) :: options
+    logical, intent(in) :: inject
+    type(amr_level), intent(inout) :: levels(:)
+    logical, allocatable :: flags(:)
+    integer :: level, i, buffer
+
+    do level = 1, size(levels) - 1
+        allocate(flags(levels(level)%nx))
+
+        ! Features move by at most one cell of the first level during
+        ! its time step, which is 2**(level - 1) cells of this level
+        buffer = 2**(level - 1) + 1
+
+        call flag_cells(detector=options%amr_detector, &
+                        threshold=options%amr_threshold, &
+                        buffer=buffer, &
+                        values=levels(level)%state_vectors(1, :), &
+                        covered=levels(level)%covered, flags=flags)
+
+        associate(fine => levels(level + 1))
+            do i = 1, levels(level)%nx
+                if (inject .and. flags(i) .and. .not. fine%covered(2 * i)) then
+                    fine%state_vectors(:, 2 * i - 1) = &
+                        levels(level)%state_vectors(:, i)
+
+                    fine%state_vectors(:, 2 * i) = &
+                        levels(level)%state_vectors(:, i)
+                end if
+
+                fine%covered(2 * i - 1 : 2 * i) = flags(i)
+            end do
+
+            call find_patches(covered=fine%covered, &
+                              starts=fine%patch_starts, &
+                              sizes=fine%patch_sizes)
+        end associate
+
+        deallocate(flags)
+    end do
+end subroutine
+
+
+!
+! Replaces the values of the cells of a level that are covered by the
+! finer level with the averages of the finer cells
+!
+! Inputs:
+! -------
+!
+! fine : the finer level
+!
+!
+! Outputs:
+! -------
+!
+! coarse : the level
+!
+subroutine average_down(fine, coarse)
+    type(amr_level), intent(in) :: fine
+    type(amr_level), intent(inout) :: coarse
+    integer :: i
+
+    do i = 1, coarse%nx
+        if (.not. fine%covered(2 * i)) cycle
+
+        coarse%state_vectors(:, i) = 0.5_dp * &
+            (fine%state_vectors(:, 2 * i - 1) + fine%state_vectors(:, 2 * i))
+    end do
+end subroutine
+
+
+!
+! Allocates the levels and sets initial conditions in all their cells,
+! then finds the patches with `regrid`
+!
+! Inputs:
+! -------
+!
+! options : program options
+!
+!
+! Outputs:
+! -------
+!
+! levels : the refinement levels
+!
+subroutine init_levels(options, levels)
+    type(program_settings), intent(in) :: options
+    type(amr_level), allocatable, intent(out) :: levels(:)
+    real(dp), allocatable :: x_points(:), initial(:, :)
+    integer :: level, nx, dimension
+
+    allocate(levels(options%amr_levels))
+    dimension = options%state_vector_dimension
+
+    do level = 1, size(levels)
+        nx = options%nx * 2**(level - 1)
+        levels(level)%nx = nx
+        levels(level)%dx = (options%x_end - options%x_start) / nx
+
+        allocate(x_points(nx), initial(dimension, nx + 2))
+
+        call linspace(options%x_start + levels(level)%dx / 2, &
+                      options%x_end - levels(level)%dx / 2, x_points)
+
+        call calculate_initial(type=options%initial_conditions, &
+                               x_points=x_points, state_vectors=initial)
+
+        levels(level)%state_vectors = initial(:, 2 : nx + 1)
+        levels(level)%old_state_vectors = levels(level)%state_vectors
+        allocate(levels(level)%interface_fluxes(dimension, nx))
+        allocate(levels(level)%flux_sums(dimension, nx))
+        levels(level)%interface_fluxes = 0
+        levels(level)%flux_sums = 0
+
+        allocate(levels(level)%covered(nx))
+        levels(level)%covered = level == 1
+
+        call find_patches(covered=levels(level)%covered, &
+                          starts=levels(level)%patch_starts, &
+                          sizes=levels(level)%patch_sizes)
+
+        deallocate(x_points, initial)
+    end do
+
+    call regrid(options=options, inject=.false., levels=levels)
+
+    ! Make the coarse cells consistent with the finer ones
+    do level = size(levels) - 1, 1, -1
+        call average_down(fine=levels(level + 1), coarse=levels(level))
+    end do
+end subroutine
+
+
+!
+! Sets the ghost cells of the patches of the finer level from
+! the values of the coarse level, interpolated linearly in time
+!
+! Inputs:
+! -------
+!
+! coarse : the coarse level, which has been advanced by its time step
+!
+! fraction : the time of the ghost cells after the beginning of the
+!            time step of the coarse level, divided by the time step
+!
+!
+! Outputs:
+! -------
+!
+! fine : the finer level
+!
+subroutine fill_ghost_cells(coarse, fraction, fine)
+    type(amr_level), intent(in) :: coarse
+    real(dp), intent(in) :: fraction
+    type(amr_level), intent(inout) :: fine
+    integer :: patch, ghosts(2), i, parent
+
+    do patch = 1, size(fine%patch_starts)
+        ! A patch covering the whole domain has no ghost cells
+        if (fine%patch_sizes(patch) == fine%nx) cycle
+
+        ghosts = [wrap(fine%patch_starts(patch) - 1, fine%nx), &
+                  wrap(fine%patch_starts(patch) + fine%patch_sizes(patch), &
+                       fine%nx)]
+
+        do i = 1, 2
+            parent = (ghosts(i) + 1) / 2
+
+            fine%state_vectors(:, ghosts(i)) = &
+                (1 - fraction) * coarse%old_state_vectors(:, parent) &
+                + fraction * coarse%state_vectors(:, parent)
+        end do
+    end do
+end subroutine
+
+
+!
+! Calculates the state vectors in a patch at the next time step
+! using the numerical method of the uniform grid
+!
+! Inputs:
+! -------
+!
+! options : program options
+!
+! start : the first cell of the patch
+!
+! count : the number of cells in the patch
+!
+! dt : the time step of the level
+!
+!
+! Outputs:
+! -------
+!
+! level : the level containing the patch
+!
+subroutine advance_patch(options, start, count, dt, level)
+    type(program_settings), intent(in) :: options
+    integer, intent(in) :: start, count
+    real(dp), intent(in) :: dt
+    type(amr_level), intent(inout) :: level
+    real(dp), allocatable :: state_vectors(:, :, :), fluxes(:, :)
+    real(dp), allocatable :: eigenvalues(:), interface_fluxes(:, :)
+    integer :: left, right
+
+    allocate(state_vectors(size(level%state_vectors, 1), count + 2, 2))
+    allocate(fluxes(size(level%state_vectors, 1), count + 2))
+    allocate(eigenvalues(count + 2))
+    allocate(interface_fluxes(size(level%state_vectors, 1), count + 1))
+
+    ! The patch with a ghost cell on each side
+    state_vectors(:, :, 1) = &
+        level%state_vectors(:, cell_indices(start - 1, count + 2, level%nx))
+
+    call calculate_fluxes(state_vectors=state_vectors(:, :, 1), fluxes=fluxes)
+
+    call calculate_eigenvalues(state_vectors=state_vectors(:, :, 1), &
+                               eigenvalues=eigenvalues)
+
+    call calculate_interface_fluxes(options=options, &
+                fluxes=fluxes, &
+                eigenvalues=eigenvalues, &
+                state_vectors=state_vectors(:, :, 1), &
+                interface_fluxes=interface_fluxes)
+
+    call step_finite_volume(nt=2, dx=level%dx, dt=dt, &
+                            state_vectors=state_vectors, &
+                            interface_fluxes=interface_fluxes)
+
+    level%state_vectors(:, cell_indices(start, count, level%nx)) = &
+        state_vectors(:, 2 : count + 1, 2)
+
+    level%interface_fluxes(:, cell_indices(start - 1, count + 1, level%nx)) &
+        = interface_fluxes
+
+    ! Sum the fluxes through the boundaries of the patch
+    left = wrap(start - 1, level%nx)
+    right = wrap(start + count - 1, level%nx)
+
+    level%flux_sums(:, left) = level%flux_sums(:, left) &
+                               + dt * interface_fluxes(:, 1)
+
+    level%flux_sums(:, right) = level%flux_sums(:, right) &
+                                + dt * interface_fluxes(:, count + 1)
+end subroutine
+
+
+!
+! Corrects the coarse cells next to the patches of the finer level,
+! replacing the coarse fluxes through the boundaries of the patches with
+! the fluxes of the finer level. This keeps the sum of the state vectors
+! over the domain the same as in the uniform grid.
+!
+! Inputs:
+! -------
+!
+! fine : the finer level, advanced to the end of the coarse time step
+!
+! dt : the time step of the coarse level
+!
+!
+! Outputs:
+! -------
+!
+! coarse : the coarse level
+!
+subroutine correct_fluxes(fine, dt, coarse)
+    type(amr_level), intent(in) :: fine
+    real(dp), intent(in) :: dt
+    type(amr_level), intent(inout) :: coarse
+    real(dp) :: correction(size(coarse%state_vectors, 1))
+    integer :: i, right
+
+    do i = 1, coarse%nx
+        right = wrap(i + 1, coarse%nx)
+
+        ! Find the boundaries of the patches of the finer level
+        if (fine%covered(2 * i) .eqv. fine%covered(2 * right)) cycle
+
+        correction = (fine%flux_sums(:, 2 * i) &
+                      - dt * coarse%interface_fluxes(:, i)) / coarse%dx
+
+        if (fine%covered(2 * i)) then
+            ! The patch is on the left of the coarse cell
+            coarse%state_vectors(:, right) = &
+                coarse%state_vectors(:, right) + correction
+        else
+            ! The patch is on the right of the coarse cell
+            coarse%state_vectors(:, i) = coarse%state_vectors(:, i) - correction
+        end if
+    end do
+end subroutine
+
+
+!
+! Advances a level and all finer levels by the time step of the level.
+! The finer level makes two steps, each twice smaller.
+!
+! Inputs:
+! -------
+!
+! options : program options
+!
+! level : the index of the level
+!
+! dt : the time step of the level
+!
+!
+! Outputs:
+! -------
+!
+! levels : the refinement levels
+!
+! cell_updates : the number of cell updates, which is increased by the
+!                number of calculated cells on all levels
+!
+recursive subroutine advance_level(options, level, dt, levels, cell_updates)
+    type(program_settings), intent(in) :: options
+    integer, intent(in) :: level
+    real(dp), intent(in) :: dt
+    type(amr_level), intent(inout) :: levels(:)
+    integer(i8), intent(inout) :: cell_updates
+    integer :: patch, substep
+
+    levels(level)%old_state_vectors = levels(level)%state_vectors
+
+    do patch = 1, size(levels(level)%patch_starts)
+        call advance_patch(options=options, &
+                           start=levels(level)%patch_starts(patch), &
+                           count=levels(level)%patch_sizes(patch), &
+                           dt=dt, level=levels(level))
+
+        cell_updates = cell_updates + levels(level)%patch_sizes(patch)
+    end do
+
+    if (level == size(levels)) return
+    if (size(levels(level + 1)%patch_starts) == 0) return
+
+    ! Advance the finer level by two steps
+    ! -------
+
+    levels(level + 1)%flux_sums = 0
+
+    do substep = 0, 1
+        call fill_ghost_cells(coarse=levels(level), fraction=0.5_dp * substep, &
+                              fine=levels(level + 1))
+
+        call advance_level(options=options, level=level + 1, dt=0.5_dp * dt, &
+                           levels=levels, cell_updates=cell_updates)
+    end do
+
+    call correct_fluxes(fine=levels(level + 1), dt=dt, coarse=levels(level))
+    call average_down(fine=levels(level + 1), coarse=levels(level))
+end subroutine
+
+
+!
+! Finds the patches and advances all levels by a time step
+! of the first level
+!
+! Inputs:
+! -------
+!
+! options : program options
+!
+!
+! Outputs:
+! -------
+!
+! levels : the refinement levels
+!
+! dt : the time step of the first level
+!
+! cell_updates : the number of cell updates, which is increased by the
+!                number of calculated cells on all levels
+!
+subroutine advance_amr(options, levels, dt, cell_updates)
+    type(program_settings), intent(in) :: options
+    type(amr_level), intent(inout) :: levels(:)
+    real(dp), intent(out) :: dt
+    integer(i8), intent(inout) :: cell_updates
+    real(dp), allocatable :: eigenvalues(:)
+    real(dp) :: largest
+    integer :: level, patch
+
+    call regrid(options=options, inject=.true., levels=levels)
+
+    ! The time step is calculated from the largest eigenvalue on all levels
+    largest = 0
+
+    do level = 1, size(levels)
+        associate(current => levels(level))
+            do patch = 1, size(current%patch_starts)
+                allocate(eigenvalues(current%patch_sizes(patch)))
+
+                call calculate_eigenvalues( &
+                    state_vectors=current%state_vectors(:, &
+                        cell_indices(current%patch_starts(patch), &
+                                     current%patch_sizes(patch), current%nx)), &
+                    eigenvalues=eigenvalues)
+
+                largest = max(largest, largest_eigenvalue(eigenvalues))
+                deallocate(eigenvalues)
+            end do
+        end associate
+    end do
+
+    dt = options%courant_factor * levels(1)%dx / largest
+
+    call advance_level(options=options, level=1, dt=dt, levels=levels, &
+                       cell_updates=cell_updates)
+end subroutine
+
+
+!
+! Adds a cell to the composite solution. If the cell is refined,
+! the cells of the finer level are added instead.
+!
+! Inputs:
+! -------
+!
+! levels : the refinement levels
+!
+! level : the level of the cell
+!
+! i : the index of the cell in the level
+!
+! x_start : the smallest x value
+!
+!
+! Outputs:
+! -------
+!
+! count : the number of cells added so far
+!
+! cell_levels, x_points, primitive_vectors : see `composite_solution`
+!
+recursive subroutine add_composite_cell(levels, level, i, x_start, count, &
+                                        cell_levels, x_points, &
+                                        primitive_vectors)
+    type(amr_level), intent(in) :: levels(:)
+    integer, intent(in) :: level, i
+    real(dp), intent(in) :: x_start
+    integer, intent(inout) :: count
+    integer, intent(inout) :: cell_levels(:)
+    real(dp), intent(inout) :: x_points(:), primitive_vectors(:, :)
+
+    if (level < size(levels)) then
+        if (levels(level + 1)%covered(2 * i)) then
+            call add_composite_cell(levels=levels, level=level + 1, &
+                i=2 * i - 1, x_start=x_start, count=count, &
+                cell_levels=cell_levels, x_points=x_points, &
+                primitive_vectors=primitive_vectors)
+
+            call add_composite_cell(levels=levels, level=level + 1, &
+                i=2 * i, x_start=x_start, count=count, &
+                cell_levels=cell_levels, x_points=x_points, &
+                primitive_vectors=primitive_vectors)
+
+            return
+        end if
+    end if
+
+    count = count + 1
+    cell_levels(count) = level
+    x_points(count) = x_start + (i - 0.5_dp) * levels(level)%dx
+    primitive_vectors(:, count) = levels(level)%state_vectors(:, i)
+end subroutine
+
+
+!
+! Returns the composite solution: the finest cells available at each
+! position, in increasing order of x
+!
+! Inputs:
+! -------
+!
+! options : program options
+!
+! levels : the refinement levels
+!
+!
+! Outputs:
+! -------
+!
+! cell_levels : refinement levels of the cells, starting from 1
+!
+! x_points : x values at the centers of the cells
+!
+! primitive_vectors : primitive vectors in the cells
+!
+subroutine composite_solution(options, levels, cell_levels, x_points, &
+                              primitive_vectors)
+
+    type(program_settings), intent(in) :: options
+    type(amr_level), intent(in) :: levels(:)
+    integer, allocatable, intent(out) :: cell_levels(:)
+    real(dp), allocatable, intent(out) :: x_points(:), primitive_vectors(:, :)
+    integer :: cells, level, i, added
+
+    ! Each refined cell is replaced by two finer cells
+    cells = levels(1)%nx
+
+    do level = 2, size(levels)
+        cells = cells + count(levels(level)%covered) / 2
+    end do
+
+    allocate(cell_levels(cells), x_points(cells))
+    allocate(primitive_vectors(size(levels(1)%state_vectors, 1), cells))
+    added = 0
+
+    do i = 1, levels(1)%nx
+        call add_composite_cell(levels=levels, level=1, i=i, &
+                                x_start=options%x_start, count=added, &
+                                cell_levels=cell_levels, x_points=x_points, &
+                                primitive_vectors=primitive_vectors)
+    end do
+
+    call state_vectors_to_primitive_in_place(vectors=primitive_vectors)
+end subroutine
+
+
+!
+! Solves the equation with AMR from `t_start` to `t_end`
+!
+! Inputs:
+! -------
+!
+! options : program options
+!
+!
+! Outputs:
+! -------
+!
+! levels : the refinement levels containing the solution at time `t`
+!
+! t : the time of the solution, the first time not smaller than `t_end`
+!
+! cell_updates : the number of cell updates on all levels
+!
+subroutine solve_amr_equation(options, levels, t, cell_updates)
+    type(program_settings), intent(in) :: options
+    type(amr_level), allocatable, intent(out) :: levels(:)
+    real(dp), intent(out) :: t
+    integer(i8), intent(out) :: cell_updates
+    real(dp) :: dt
+
+    !$ call omp_set_num_threads(options%threads)
+
+    call init_levels(options=options, levels=levels)
+    t = options%t_start
+    cell_updates = 0
+
+    do while (t < options%t_end)
+        call advance_amr(options=options, levels=levels, dt=dt, &
+                         cell_updates=cell_updates)
+
+        t = t + dt
+    end do
+end subroutine
+
+
+!
+! Solves the equation with AMR and writes the composite solution
+! to a file in the AMR format (see README.md) while it is being
+! calculated. The time levels are selected with `output_stride`,
+! `max_frames` or `output_times` settings.
+!
+! Inputs:
+! -------
+!
+! options : program options
+!
+subroutine solve_and_create_amr_output(options)
+    type(program_settings), intent(in) :: options
+    type(amr_level), allocatable :: levels(:)
+    type(output_schedule) :: schedule
+    integer, allocatable :: cell_levels(:), previous_cell_levels(:)
+    real(dp), allocatable :: x_points(:), previous_x_points(:)
+    real(dp), allocatable :: values(:, :), previous_values(:, :)
+    integer(i8) :: cell_updates, previous_cell_updates
+    real(dp) :: dt, t_previous, t
+    integer :: out_unit, nt, frames(2), count, i
+
+    !$ call omp_set_num_threads(options%threads)
+
+    call init_levels(options=options, levels=levels)
+
+    call open_stream(filename=options%output_path, out_unit=out_unit)
+
+    call write_amr_header(out_unit=out_unit, nx=options%nx, &
+        levels=options%amr_levels, &
+        state_vector_dimension=options%state_vector_dimension, &
+        x_start=options%x_start, x_end=options%x_end)
+
+    call init_schedule(options=options, schedule=schedule)
+    t = options%t_start
+    t_previous = t
+    nt = 1
+    cell_updates = 0
+    previous_cell_updates = 0
+
+    call composite_solution(options=options, levels=levels, &
+                            cell_levels=cell_levels, x_points=x_points, &
+                            primitive_vectors=values)
+
+    do
+        ! Write the selected time levels, they are either
+        ! the current or the previous one
+        call select_frames(t_previous=t_previous, t_current=t, nt=nt, &
+                           is_last=t >= options%t_end, schedule=schedule, &
+                           frames=frames, count=count)
+
+        do i = 1, count
+            if (frames(i) == nt) then
+                call write_amr_frame(out_unit=out_unit, t=t, &
+                    cell_updates=cell_updates, cell_levels=cell_levels, &
+                    x_points=x_points, primitive_vectors=values)
+            else
+                call write_amr_frame(out_unit=out_unit, t=t_previous, &
+                    cell_updates=previous_cell_updates, &
+                    cell_levels=previous_cell_levels, &
+                    x_points=previous_x_points, &
+                    primitive_vectors=previous_values)
+            end if
+        end do
+
+        if (t >= options%t_end) exit
+
+        ! The current composite solution becomes the previous one
+        call move_alloc(cell_levels, previous_cell_levels)
+        call move_alloc(x_points, previous_x_points)
+        call move_alloc(values, previous_values)
+        previous_cell_updates = cell_updates
+
+        call advance_amr(options=options, levels=levels, dt=dt, &
+                         cell_updates=cell_updates)
+
+        nt = nt + 1
+        t_previous = t
+        t = t + dt
+
+        call composite_solution(options=options, levels=levels, &
+                                cell_levels=cell_levels, x_points=x_points, &
+                                primitive_vectors=values)
+    end do
+
+    close(unit=out_unit)
+end subroutine
+
+end module Amr
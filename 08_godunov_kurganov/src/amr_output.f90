@@ -0,0 +1,87 @@
+!
+! Write solution calculated with adaptive mesh refinement (AMR)
+! to a file in the AMR format
+!
+module AmrOutput
+use Types, only: dp, i8
+implicit none
+private
+public :: write_amr_header, write_amr_frame, AMR_MAGIC
+
+! The first bytes of the file identifying the format
+character(len=8), parameter :: AMR_MAGIC = "BURGAMR1"
+
+contains
+
+!
+! Writes the header of the AMR file. It is followed by the frames
+! written with `write_amr_frame`. See README.md for description
+! of the file format.
+!
+! Inputs:
+! --------
+!
+! out_unit : unit number of the stream, see `open_stream` in Output module
+!
+! nx : the number of cells of the coarsest level
+!
+! levels : the number of refinement levels
+!
+! state_vector_dimension : number of primitive variables in each cell
+!
+! x_start, x_end : the smallest and the largest x values
+!
+subroutine write_amr_header(out_unit, nx, levels, state_vector_dimension, &
+                            x_start, x_end)
+
+    integer, intent(in) :: out_unit, nx, levels, state_vector_dimension
+    real(dp), intent(in) :: x_start, x_end
+
+    write(out_unit) AMR_MAGIC
+    write(out_unit) nx, levels, state_vector_dimension
+    write(out_unit) x_start, x_end
+    flush(out_unit)
+end subroutine
+
+
+!
+! Writes the composite solution at one time value. The cells
+! of different levels have different sizes, so the number of cells
+! changes between the frames. The frame is flushed, so the reader
+! receives it before the next time step is calculated.
+!
+! Inputs:
+! --------
+!
+! out_unit : unit number of the stream
+!
+! t : the value of time
+!
+! cell_updates : the number of cell updates made so far on all levels
+!
+! cell_levels : refinement levels of the cells, starting from 1
+!
+! x_points : x values at the centers of the cells, in increasing order
+!
+! primitive_vectors : primitive vectors in the cells
+!
+subroutine write_amr_frame(out_unit, t, cell_updates, cell_levels, &
+                           x_points, primitive_vectors)
+
+    integer, intent(in) :: out_unit
+    real(dp), intent(in) :: t
+    integer(i8), intent(in) :: cell_updates
+    integer, intent(in) :: cell_levels(:)
+    real(dp), intent(in) :: x_points(:)
+    real(dp), intent(in) :: primitive_vectors(:, :)
+
+    write(out_unit) t
+    write(out_unit) cell_updates
+    write(out_unit) size(x_points)
+    write(out_unit) cell_levels
+    write(out_unit) x_points
+    write(out_unit) primitive_vectors
+    flush(out_unit)
+end subroutine
+
+end module AmrOutput
@@ -0,0 +1,86 @@
+module AmrOutputTest
+use Types, only: dp, i8
+use AmrOutput, only: write_amr_header, write_amr_frame, AMR_MAGIC
+use Output, only: open_stream
+use FileUtils, only: delete_file
+use AssertsTest, only: assert_true, assert_approx, assert_equal
+implicit none
+private
+public amr_output_test_all
+
+contains
+
+subroutine write_amr_output_test(failures)
+    integer, intent(inout) :: failures
+    integer :: out_unit, unit, nx, levels, dimension, n_cells
+    integer :: cell_levels(3)
+    integer(i8) :: cell_updates
+    real(dp) :: x_start, x_end, t, x_points(3), values(1, 3)
+    character(len=8) :: magic
+
+    call open_stream(filename="test_amr.dat", out_unit=out_unit)
+
+    call write_amr_header(out_unit=out_unit, nx=2, levels=2, &
+                          state_vector_dimension=1, x_start=0._dp, &
+                          x_end=1._dp)
+
+    call write_amr_frame(out_unit=out_unit, t=0.1_dp, cell_updates=12_i8, &
+                         cell_levels=[2, 2, 1], &
+                         x_points=[0.125_dp, 0.375_dp, 0.75_dp], &
+                         primitive_vectors=reshape([1._dp, 2._dp, 3._dp], &
+                                                   [1, 3]))
+
+    close(unit=out_unit)
+
+    open(newunit=unit, file="test_amr.dat", form='unformatted', &
+        access='stream', status='old', action='read' )
+
+    ! Header
+    ! ----------
+
+    read (unit) magic
+    call assert_true(magic == AMR_MAGIC, __FILE__, __LINE__, failures)
+
+    read (unit) nx, levels, dimension
+    call assert_equal(nx, 2, __FILE__, __LINE__, failures)
+    call assert_equal(levels, 2, __FILE__, __LINE__, failures)
+    call assert_equal(dimension, 1, __FILE__, __LINE__, failures)
+
+    read (unit) x_start, x_end
+    call assert_approx(x_start, 0._dp, 1e-15_dp, __FILE__, __LINE__, failures)
+    call assert_approx(x_end, 1._dp, 1e-15_dp, __FILE__, __LINE__, failures)
+
+    ! Frame
+    ! ----------
+
+    read (unit) t, cell_updates, n_cells
+    call assert_approx(t, 0.1_dp, 1e-15_dp, __FILE__, __LINE__, failures)
+
+    call assert_true(cell_updates == 12_i8, __FILE__, __LINE__, failures)
+    call assert_equal(n_cells, 3, __FILE__, __LINE__, failures)
+
+    read (unit) cell_levels, x_points, values
+    call assert_true(all(cell_levels == [2, 2, 1]), &
+                     __FILE__, __LINE__, failures)
+
+    call assert_true(all(abs(x_points - [0.125_dp, 0.375_dp, 0.75_dp]) &
+                         < 1e-15_dp), &
+                     __FILE__, __LINE__, failures)
+
+    call assert_true(all(abs(values(1, :) - [1._dp, 2._dp, 3._dp]) &
+                         < 1e-15_dp), &
+                     __FILE__, __LINE__, failures)
+
+    close(unit=unit)
+
+    call delete_file("test_amr.dat")
+end
+
+
+subroutine amr_output_test_all(failures)
+    integer, intent(inout) :: failures
+
+    call write_amr_output_test(failures)
+end
+
+end module AmrOutputTest
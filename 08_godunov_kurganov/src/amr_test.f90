@@ -0,0 +1,375 @@
+module AmrTest
+use Types, only: dp, i8
+use AssertsTest, only: assert_true, assert_approx, assert_equal
+use Settings, only: program_settings
+use Amr, only: amr_level, find_patches, flag_cells, init_levels, &
+               composite_solution, solve_amr_equation, &
+               solve_and_create_amr_output
+use AmrOutput, only: AMR_MAGIC
+use Equation, only: solve_equation
+use EquationTest, only: exact_square_solution
+use FileUtils, only: file_exists, delete_file
+implicit none
+private
+public amr_test_all
+
+contains
+
+!
+! Returns settings for the tests
+!
+function test_options() result(options)
+    type(program_settings) :: options
+
+    options%method = 'kurganov'
+    options%initial_conditions = 'square'
+    options%x_start = 0
+    options%x_end = 1
+    options%nx = 50
+    options%t_start = 0
+    options%t_end = 0.4_dp
+    options%courant_factor = 0.5_dp
+    options%amr_levels = 3
+end function
+
+
+subroutine find_patches_test(failures)
+    integer, intent(inout) :: failures
+    integer, allocatable :: starts(:), sizes(:)
+
+    call find_patches(covered=[.true., .true., .false., .false., &
+                               .true., .true., .true., .false.], &
+                      starts=starts, sizes=sizes)
+
+    call assert_true(all(starts == [1, 5]), __FILE__, __LINE__, failures)
+    call assert_true(all(sizes == [2, 3]), __FILE__, __LINE__, failures)
+
+    ! The patch continues from the end of the domain to its beginning
+    call find_patches(covered=[.true., .false., .false., .true., .true., &
+                               .true.], &
+                      starts=starts, sizes=sizes)
+
+    call assert_true(all(starts == [4]), __FILE__, __LINE__, failures)
+    call assert_true(all(sizes == [4]), __FILE__, __LINE__, failures)
+
+    ! All cells
+    call find_patches(covered=[.true., .true., .true.], &
+                      starts=starts, sizes=sizes)
+
+    call assert_true(all(starts == [1]), __FILE__, __LINE__, failures)
+    call assert_true(all(sizes == [3]), __FILE__, __LINE__, failures)
+
+    ! No cells
+    call find_patches(covered=[.false., .false.], starts=starts, sizes=sizes)
+    call assert_equal(size(starts), 0, __FILE__, __LINE__, failures)
+end
+
+
+subroutine flag_cells_test(failures)
+    integer, intent(inout) :: failures
+    real(dp) :: values(10)
+    logical :: covered(10), flags(10)
+
+    values = [0._dp, 0._dp, 0._dp, 1._dp, 1._dp, 1._dp, 0.5_dp, 0._dp, &
+              0._dp, 0._dp]
+
+    covered = .true.
+
+    ! Both jumps are detected
+    call flag_cells(detector="gradient", threshold=0.3_dp, buffer=0, &
+                    values=values, covered=covered, flags=flags)
+
+    call assert_true(all(flags .eqv. [.false., .false., .true., .true., &
+                                      .false., .true., .true., .true., &
+                                      .false., .false.]), &
+                     __FILE__, __LINE__, failures)
+
+    ! Only the decreasing values, where the shock is formed
+    call flag_cells(detector="shock", threshold=0.3_dp, buffer=0, &
+                    values=values, covered=covered, flags=flags)
+
+    call assert_true(all(flags .eqv. [.false., .false., .false., .false., &
+                                      .false., .true., .true., .true., &
+                                      .false., .false.]), &
+                     __FILE__, __LINE__, failures)
+
+    ! The buffer cells around the detected cells
+    call flag_cells(detector="shock", threshold=0.8_dp, buffer=1, &
+                    values=values, covered=covered, flags=flags)
+
+    call assert_true(all(flags .eqv. [.false., .false., .false., .false., &
+                                      .false., .true., .true., .true., &
+                                      .false., .false.]), &
+                     __FILE__, __LINE__, failures)
+
+    ! The first and the last cells of the patches are not flagged
+    covered(6) = .false.
+
+    call flag_cells(detector="gradient", threshold=0.3_dp, buffer=1, &
+                    values=values, covered=covered, flags=flags)
+
+    call assert_true(all(flags .eqv. [.false., .true., .true., .true., &
+                                      .false., .false., .false., .true., &
+                                      .true., .false.]), &
+                     __FILE__, __LINE__, failures)
+end
+
+
+subroutine init_levels_test(failures)
+    integer, intent(inout) :: failures
+    type(program_settings) :: options
+    type(amr_level), allocatable :: levels(:)
+    integer :: level, i, parent
+
+    options = test_options()
+    options%nx = 20
+
+    call init_levels(options=options, levels=levels)
+
+    call assert_equal(size(levels), 3, __FILE__, __LINE__, failures)
+    call assert_equal(levels(3)%nx, 80, __FILE__, __LINE__, failures)
+
+    call assert_approx(levels(3)%dx, 0.0125_dp, 1e-15_dp, &
+                       __FILE__, __LINE__, failures)
+
+    ! Two patches at the jumps at x=0.25 and x=0.75
+    call assert_equal(size(levels(2)%patch_starts), 2, &
+                      __FILE__, __LINE__, failures)
+
+    call assert_equal(size(levels(3)%patch_starts), 2, &
+                      __FILE__, __LINE__, failures)
+
+    call assert_true(.not. levels(2)%covered(1), __FILE__, __LINE__, failures)
+    call assert_true(levels(2)%covered(10), __FILE__, __LINE__, failures)
+    call assert_true(levels(3)%covered(20), __FILE__, __LINE__, failures)
+
+    ! Each cell of a finer level is inside a patch of the previous level,
+    ! and so are its neighbours
+    do level = 2, 3
+        do i = 1, levels(level)%nx
+            if (.not. levels(level)%covered(i)) cycle
+            parent = (i + 1) / 2
+
+            call assert_true(all(levels(level - 1)%covered( &
+                                 [parent - 1, parent, parent + 1])), &
+                             __FILE__, __LINE__, failures)
+        end do
+    end do
+end
+
+
+!
+! Returns the sum of the values multiplied by the sizes of the cells
+!
+function composite_integral(options, levels) result(integral)
+    type(program_settings), intent(in) :: options
+    type(amr_level), intent(in) :: levels(:)
+    real(dp) :: integral
+    integer, allocatable :: cell_levels(:)
+    real(dp), allocatable :: x_points(:), values(:, :)
+
+    call composite_solution(options=options, levels=levels, &
+                            cell_levels=cell_levels, x_points=x_points, &
+                            primitive_vectors=values)
+
+    integral = sum(values(1, :) * levels(cell_levels)%dx)
+end function
+
+
+subroutine composite_solution_test(failures)
+    integer, intent(inout) :: failures
+    type(program_settings) :: options
+    type(amr_level), allocatable :: levels(:)
+    integer, allocatable :: cell_levels(:)
+    real(dp), allocatable :: x_points(:), values(:, :)
+
+    options = test_options()
+    options%nx = 20
+
+    call init_levels(options=options, levels=levels)
+
+    call composite_solution(options=options, levels=levels, &
+                            cell_levels=cell_levels, x_points=x_points, &
+                            primitive_vectors=values)
+
+    call assert_equal(size(x_points), 20 + count(levels(2)%covered) / 2 &
+                                         + count(levels(3)%covered) / 2, &
+                      __FILE__, __LINE__, failures)
+
+    ! The cells are ordered and do not overlap
+    call assert_true(all(x_points(2:) - x_points(:size(x_points) - 1) > 0), &
+                     __FILE__, __LINE__, failures)
+
+    call assert_approx(x_points(1), 0.025_dp, 1e-15_dp, &
+                       __FILE__, __LINE__, failures)
+
+    call assert_true(all(cell_levels([1, size(cell_levels)]) == 1), &
+                     __FILE__, __LINE__, failures)
+
+    call assert_true(any(cell_levels == 3), __FILE__, __LINE__, failures)
+
+    ! The jumps are resolved by the finest cells
+    call assert_approx(composite_integral(options, levels), 0.5_dp, &
+                       1e-14_dp, __FILE__, __LINE__, failures)
+end
+
+
+subroutine solve_amr_equation_test__conservation(failures)
+    integer, intent(inout) :: failures
+    type(program_settings) :: options
+    type(amr_level), allocatable :: levels(:)
+    integer(i8) :: cell_updates
+    real(dp) :: t
+    character(len=100) :: methods(2)
+    integer :: i
+
+    methods = [character(len=100) :: 'godunov', 'kurganov']
+
+    do i = 1, 2
+        options = test_options()
+        options%method = methods(i)
+        options%nx = 40
+        options%t_end = 0.3_dp
+
+        call solve_amr_equation(options=options, levels=levels, t=t, &
+                                cell_updates=cell_updates)
+
+        call assert_true(t >= 0.3_dp, __FILE__, __LINE__, failures)
+
+        ! The fine patches follow the shock
+        call assert_true(any(levels(3)%covered), __FILE__, __LINE__, failures)
+
+        ! The integral of the solution does not change
+        call assert_approx(composite_integral(options, levels), 0.5_dp, &
+                           1e-13_dp, __FILE__, __LINE__, failures)
+    end do
+end
+
+
+subroutine solve_amr_equation_test__same_accuracy_as_uniform(failures)
+    integer, intent(inout) :: failures
+    type(program_settings) :: options
+    type(amr_level), allocatable :: levels(:)
+    real(dp), allocatable :: primitive_vectors(:, :, :)
+    real(dp), allocatable :: x_points(:), t_points(:), values(:, :)
+    integer, allocatable :: cell_levels(:)
+    integer(i8) :: cell_updates, uniform_cell_updates
+    real(dp) :: t, error, uniform_error
+    integer :: nt
+
+    ! Uniform grid with the cells of the finest level
+    ! -------
+
+    options = test_options()
+    options%nx = 400
+    options%amr_levels = 1
+
+    call solve_equation(options=options, primitive_vectors=primitive_vectors, &
+                        x_points=x_points, t_points=t_points)
+
+    nt = size(t_points)
+
+    uniform_error = sum(abs(primitive_vectors(1, :, nt) - &
+        exact_square_solution(x=x_points, t=t_points(nt)))) / options%nx
+
+    uniform_cell_updates = int(options%nx, i8) * (nt - 1)
+
+    ! AMR with three levels
+    ! -------
+
+    options = test_options()
+    options%nx = 100
+
+    call solve_amr_equation(options=options, levels=levels, t=t, &
+                            cell_updates=cell_updates)
+
+    call assert_true(t >= 0.4_dp, __FILE__, __LINE__, failures)
+
+    call composite_solution(options=options, levels=levels, &
+                            cell_levels=cell_levels, x_points=x_points, &
+                            primitive_vectors=values)
+
+    error = sum(abs(values(1, :) - exact_square_solution(x=x_points, t=t)) &
+                * levels(cell_levels)%dx)
+
+    call assert_true(error < 1.1_dp * uniform_error, &
+                     __FILE__, __LINE__, failures)
+
+    call assert_true(cell_updates < uniform_cell_updates / 2, &
+                     __FILE__, __LINE__, failures)
+end
+
+
+subroutine solve_and_create_amr_output_test(failures)
+    integer, intent(inout) :: failures
+    type(program_settings) :: options
+    integer :: unit, nx, levels, dimension, n_cells, frame
+    integer, allocatable :: cell_levels(:)
+    integer(i8) :: cell_updates
+    real(dp), allocatable :: x_points(:), values(:, :)
+    real(dp) :: x_start, x_end, t, times(3)
+    character(len=8) :: magic
+
+    options = test_options()
+    options%output_path = "test_amr_solution.dat"
+    options%max_frames = 3
+
+    call solve_and_create_amr_output(options)
+
+    call assert_true(file_exists("test_amr_solution.dat"), &
+                     __FILE__, __LINE__, failures)
+
+    open(newunit=unit, file="test_amr_solution.dat", form='unformatted', &
+        access='stream', status='old', action='read' )
+
+    read (unit) magic, nx, levels, dimension, x_start, x_end
+    call assert_true(magic == AMR_MAGIC, __FILE__, __LINE__, failures)
+    call assert_equal(nx, 50, __FILE__, __LINE__, failures)
+    call assert_equal(levels, 3, __FILE__, __LINE__, failures)
+    call assert_equal(dimension, 1, __FILE__, __LINE__, failures)
+
+    do frame = 1, 3
+        read (unit) t, cell_updates, n_cells
+        times(frame) = t
+        allocate(cell_levels(n_cells), x_points(n_cells))
+        allocate(values(dimension, n_cells))
+        read (unit) cell_levels, x_points, values
+
+        if (frame == 1) then
+            call assert_true(cell_updates == 0, __FILE__, __LINE__, failures)
+        else
+            call assert_true(cell_updates > 0, __FILE__, __LINE__, failures)
+        end if
+
+        call assert_true(any(cell_levels == 3), __FILE__, __LINE__, failures)
+
+        call assert_approx(sum(values(1, :) * (x_end - x_start) &
+                               / (nx * 2**(cell_levels - 1))), &
+                           0.5_dp, 1e-13_dp, __FILE__, __LINE__, failures)
+
+        deallocate(cell_levels, x_points, values)
+    end do
+
+    call assert_approx(times(1), 0._dp, 1e-15_dp, &
+                       __FILE__, __LINE__, failures)
+
+    call assert_true(times(3) >= 0.4_dp, __FILE__, __LINE__, failures)
+
+    close(unit=unit)
+    call delete_file("test_amr_solution.dat")
+end
+
+
+subroutine amr_test_all(failures)
+    integer, intent(inout) :: failures
+
+    call find_patches_test(failures)
+    call flag_cells_test(failures)
+    call init_levels_test(failures)
+    call composite_solution_test(failures)
+    call solve_amr_equation_test__conservation(failures)
+    call solve_amr_equation_test__same_accuracy_as_uniform(failures)
+    call solve_and_create_amr_output_test(failures)
+end
+
+end module AmrTest
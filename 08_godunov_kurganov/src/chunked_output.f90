@@ -0,0 +1,160 @@
+!
+! Write solution to a file in chunked format
+!
+module ChunkedOutput
+use, intrinsic :: iso_c_binding, only: c_int8_t, c_loc, c_ptr
+use Types, only: sp, dp, i8
+use Zlib, only: compress_data
+implicit none
+private
+public :: write_chunked_output, CHUNKED_MAGIC
+
+! The first bytes of the file identifying the format
+character(len=8), parameter :: CHUNKED_MAGIC = "BURGCHK1"
+
+contains
+
+!
+! Prints solution to a binary file, with time levels stored in chunks
+! of `chunk_size` levels. A single time level can be read without
+! reading the whole file. See README.md for description
+! of the file format.
+!
+! Inputs:
+! --------
+!
+! filename : Name of the data file to print output to
+!
+! primitive_vectors : array containing the solution
+!                     consting of primitve vectors
+!
+! x_points : A 1D array containing the values of x
+!
+! t_points : A 1D array containing the values of t
+!
+! chunk_size : the number of time levels in a chunk
+!
+! single_precision : if .true. store the solution as single precision
+!                    floats
+!
+! compress : if .true. compress each chunk with zlib
+!
+! indices : (optional) indices of the time levels to be printed.
+!           If not present, all time levels are printed.
+!
+subroutine write_chunked_output(filename, primitive_vectors, x_points, &
+                                t_points, chunk_size, single_precision, &
+                                compress, indices)
+
+    character(len=*), intent(in) :: filename
+    real(dp), intent(in) :: primitive_vectors(:, :, :)
+    real(dp), intent(in) :: x_points(:), t_points(:)
+    integer, intent(in) :: chunk_size
+    logical, intent(in) :: single_precision, compress
+    integer, intent(in), optional :: indices(:)
+    integer, allocatable :: levels(:)
+    real(sp), allocatable, target :: values_sp(:)
+    real(dp), allocatable, target :: values_dp(:)
+    integer(c_int8_t), allocatable :: compressed(:)
+    integer(i8), allocatable :: chunk_offsets(:), chunk_sizes(:)
+    integer(i8) :: index_offset, index_position, position
+    type(c_ptr) :: source
+    integer :: out_unit, nt, chunk_count, chunk, first, last, value_bytes
+    integer :: data_size, compressed_size, compression, i
+
+    if (present(indices)) then
+        allocate(levels(size(indices)))
+        levels(:) = indices
+    else
+        allocate(levels(size(t_points)))
+        levels(:) = [(i, i = 1, size(t_points))]
+    end if
+
+    nt = size(levels)
+    chunk_count = (nt + chunk_size - 1) / chunk_size
+    allocate(chunk_offsets(chunk_count), chunk_sizes(chunk_count))
+
+    value_bytes = 8
+    if (single_precision) value_bytes = 4
+
+    compression = 0
+    if (compress) compression = 1
+
+    open(newunit=out_unit, file=filename, access="stream", &
+        form="unformatted", action="write", status="replace")
+
+    ! Header
+    ! -------
+
+    write(out_unit) CHUNKED_MAGIC
+    write(out_unit) size(x_points), nt, size(primitive_vectors, 1)
+    write(out_unit) chunk_size, value_bytes, compression
+
+    ! Position of the chunk index, written after the chunks
+    inquire(unit=out_unit, pos=index_position)
+    write(out_unit) 0_i8
+
+    write(out_unit) x_points
+    write(out_unit) t_points(levels)
+
+    ! Chunks
+    ! -------
+
+    do chunk = 1, chunk_count
+        first = (chunk - 1) * chunk_size + 1
+        last = min(chunk * chunk_size, nt)
+
+        inquire(unit=out_unit, pos=position)
+        chunk_offsets(chunk) = position - 1
+
+        if (single_precision) then
+            values_sp = reshape( &
+                real(primitive_vectors(:, :, levels(first:last)), sp), &
+                [size(primitive_vectors, 1) * size(primitive_vectors, 2) &
+                 * (last - first + 1)])
+
+            data_size = size(values_sp) * value_bytes
+            source = c_loc(values_sp)
+        else
+            values_dp = reshape(primitive_vectors(:, :, levels(first:last)), &
+                [size(primitive_vectors, 1) * size(primitive_vectors, 2) &
+                 * (last - first + 1)])
+
+            data_size = size(values_dp) * value_bytes
+            source = c_loc(values_dp)
+        end if
+
+        if (compress) then
+            call compress_data(source=source, source_size=data_size, &
+                               compressed=compressed, &
+                               compressed_size=compressed_size)
+
+            write(out_unit) compressed(1:compressed_size)
+            chunk_sizes(chunk) = compressed_size
+        else
+            if (single_precision) then
+                write(out_unit) values_sp
+            else
+                write(out_unit) values_dp
+            end if
+
+            chunk_sizes(chunk) = data_size
+        end if
+    end do
+
+    ! Chunk index
+    ! -------
+
+    inquire(unit=out_unit, pos=position)
+    index_offset = position - 1
+
+    do chunk = 1, chunk_count
+        write(out_unit) chunk_offsets(chunk), chunk_sizes(chunk)
+    end do
+
+    write(out_unit, pos=index_position) index_offset
+
+    close(unit=out_unit)
+end subroutine
+
+end module ChunkedOutput
@@ -0,0 +1,229 @@
+module ChunkedOutputTest
+use ChunkedOutput, only: write_chunked_output, CHUNKED_MAGIC
+use Types, only: sp, dp, i8
+use FileUtils, only: file_exists, delete_file
+use AssertsTest, only: assert_true, assert_approx, assert_equal
+implicit none
+private
+public chunked_output_test_all
+
+contains
+
+!
+! Writes a test solution with two values in state vector, three x points
+! and five time levels
+!
+subroutine write_test_solution(filename, single_precision, compress)
+    character(len=*), intent(in) :: filename
+    logical, intent(in) :: single_precision, compress
+    real(dp) :: primitive_vectors(2, 3, 5)
+    integer :: i
+
+    primitive_vectors = reshape([(0.5_dp * i, i = 1, 30)], &
+                                shape(primitive_vectors))
+
+    call write_chunked_output(filename=filename, &
+                              primitive_vectors=primitive_vectors, &
+                              x_points=[1.1_dp, 1.2_dp, 1.3_dp], &
+                              t_points=[0.1_dp, 0.2_dp, 0.3_dp, 0.4_dp, 0.5_dp], &
+                              chunk_size=2, &
+                              single_precision=single_precision, &
+                              compress=compress)
+end subroutine
+
+
+subroutine write_chunked_output_test__double(failures)
+    integer, intent(inout) :: failures
+    character(len=8) :: magic
+    integer :: nx, nt, dim, chunk_size, value_bytes, compression, unit
+    integer(i8) :: index_offset, offsets(3), sizes(3)
+    real(dp) :: x_points(3), t_points(5), last_chunk(2, 3)
+    integer :: chunk
+
+    call write_test_solution(filename="test_chunked.dat", &
+                             single_precision=.false., compress=.false.)
+
+    call assert_true(file_exists("test_chunked.dat"), &
+                     __FILE__, __LINE__, failures)
+
+    open(newunit=unit, file="test_chunked.dat", access="stream", &
+         form='unformatted', status='old', action='read')
+
+    read (unit) magic
+    call assert_true(magic == CHUNKED_MAGIC, __FILE__, __LINE__, failures)
+
+    read (unit) nx, nt, dim
+    call assert_equal(nx, 3, __FILE__, __LINE__, failures)
+    call assert_equal(nt, 5, __FILE__, __LINE__, failures)
+    call assert_equal(dim, 2, __FILE__, __LINE__, failures)
+
+    read (unit) chunk_size, value_bytes, compression
+    call assert_equal(chunk_size, 2, __FILE__, __LINE__, failures)
+    call assert_equal(value_bytes, 8, __FILE__, __LINE__, failures)
+    call assert_equal(compression, 0, __FILE__, __LINE__, failures)
+
+    read (unit) index_offset
+    read (unit) x_points, t_points
+
+    call assert_approx(x_points(3), 1.3_dp, 1e-10_dp, &
+                       __FILE__, __LINE__, failures)
+
+    call assert_approx(t_points(5), 0.5_dp, 1e-10_dp, &
+                       __FILE__, __LINE__, failures)
+
+    ! Three chunks: two time levels, two time levels and one time level
+    read (unit, pos=index_offset + 1) (offsets(chunk), sizes(chunk), &
+                                       chunk = 1, 3)
+
+    call assert_true(all(sizes == [96_i8, 96_i8, 48_i8]), &
+                     __FILE__, __LINE__, failures)
+
+    call assert_true(offsets(2) == offsets(1) + sizes(1), &
+                     __FILE__, __LINE__, failures)
+
+    call assert_true(index_offset == offsets(3) + sizes(3), &
+                     __FILE__, __LINE__, failures)
+
+    read (unit, pos=offsets(3) + 1) last_chunk
+
+    call assert_approx(last_chunk(1, 1), 12.5_dp, 1e-10_dp, &
+                       __FILE__, __LINE__, failures)
+
+    call assert_approx(last_chunk(2, 3), 15._dp, 1e-10_dp, &
+                       __FILE__, __LINE__, failures)
+
+    close(unit=unit)
+    call delete_file("test_chunked.dat")
+end
+
+
+subroutine write_chunked_output_test__single(failures)
+    integer, intent(inout) :: failures
+    character(len=8) :: magic
+    integer :: nx, nt, dim, chunk_size, value_bytes, compression, unit
+    integer(i8) :: index_offset, offsets(3), sizes(3)
+    real(sp) :: first_chunk(2, 3, 2)
+    integer :: chunk
+
+    call write_test_solution(filename="test_chunked.dat", &
+                             single_precision=.true., compress=.false.)
+
+    open(newunit=unit, file="test_chunked.dat", access="stream", &
+         form='unformatted', status='old', action='read')
+
+    read (unit) magic, nx, nt, dim, chunk_size, value_bytes, compression
+    call assert_equal(value_bytes, 4, __FILE__, __LINE__, failures)
+
+    read (unit) index_offset
+
+    read (unit, pos=index_offset + 1) (offsets(chunk), sizes(chunk), &
+                                       chunk = 1, 3)
+
+    call assert_true(all(sizes == [48_i8, 48_i8, 24_i8]), &
+                     __FILE__, __LINE__, failures)
+
+    read (unit, pos=offsets(1) + 1) first_chunk
+
+    call assert_approx(real(first_chunk(1, 1, 1), dp), 0.5_dp, 1e-6_dp, &
+                       __FILE__, __LINE__, failures)
+
+    call assert_approx(real(first_chunk(2, 3, 2), dp), 6._dp, 1e-6_dp, &
+                       __FILE__, __LINE__, failures)
+
+    close(unit=unit)
+    call delete_file("test_chunked.dat")
+end
+
+
+subroutine write_chunked_output_test__compressed(failures)
+    integer, intent(inout) :: failures
+    character(len=8) :: magic
+    integer :: nx, nt, dim, chunk_size, value_bytes, compression, unit
+    integer(i8) :: index_offset, offsets(3), sizes(3)
+    integer :: chunk
+
+    call write_test_solution(filename="test_chunked.dat", &
+                             single_precision=.false., compress=.true.)
+
+    open(newunit=unit, file="test_chunked.dat", access="stream", &
+         form='unformatted', status='old', action='read')
+
+    read (unit) magic, nx, nt, dim, chunk_size, value_bytes, compression
+    call assert_equal(compression, 1, __FILE__, __LINE__, failures)
+
+    read (unit) index_offset
+
+    read (unit, pos=index_offset + 1) (offsets(chunk), sizes(chunk), &
+                                       chunk = 1, 3)
+
+    call assert_true(all(sizes > 0), __FILE__, __LINE__, failures)
+
+    call assert_true(offsets(2) == offsets(1) + sizes(1), &
+                     __FILE__, __LINE__, failures)
+
+    call assert_true(index_offset == offsets(3) + sizes(3), &
+                     __FILE__, __LINE__, failures)
+
+    close(unit=unit)
+    call delete_file("test_chunked.dat")
+end
+
+
+subroutine write_chunked_output_test__indices(failures)
+    integer, intent(inout) :: failures
+    character(len=8) :: magic
+    integer :: nx, nt, dim, chunk_size, value_bytes, compression, unit
+    integer(i8) :: index_offset, offset, chunk_size_bytes
+    real(dp) :: primitive_vectors(2, 3, 5), t_points(2), chunk(2, 3, 2)
+    integer :: i
+
+    primitive_vectors = reshape([(0.5_dp * i, i = 1, 30)], &
+                                shape(primitive_vectors))
+
+    call write_chunked_output(filename="test_chunked.dat", &
+                              primitive_vectors=primitive_vectors, &
+                              x_points=[1.1_dp, 1.2_dp, 1.3_dp], &
+                              t_points=[0.1_dp, 0.2_dp, 0.3_dp, 0.4_dp, 0.5_dp], &
+                              chunk_size=2, &
+                              single_precision=.false., &
+                              compress=.false., &
+                              indices=[2, 5])
+
+    open(newunit=unit, file="test_chunked.dat", access="stream", &
+         form='unformatted', status='old', action='read')
+
+    read (unit) magic, nx, nt, dim, chunk_size, value_bytes, compression
+    call assert_equal(nt, 2, __FILE__, __LINE__, failures)
+
+    read (unit) index_offset
+    read (unit, pos=index_offset + 1) offset, chunk_size_bytes
+    call assert_true(chunk_size_bytes == 96_i8, __FILE__, __LINE__, failures)
+
+    read (unit, pos=8 + 6 * 4 + 8 + 3 * 8 + 1) t_points
+
+    call assert_true(all(abs(t_points - [0.2_dp, 0.5_dp]) < 1e-15_dp), &
+                     __FILE__, __LINE__, failures)
+
+    read (unit, pos=offset + 1) chunk
+
+    call assert_true(all(abs(chunk(:, :, 1) - primitive_vectors(:, :, 2)) &
+                         < 1e-15_dp), __FILE__, __LINE__, failures)
+
+    call assert_true(all(abs(chunk(:, :, 2) - primitive_vectors(:, :, 5)) &
+                         < 1e-15_dp), __FILE__, __LINE__, failures)
+
+    close(unit=unit)
+    call delete_file("test_chunked.dat")
+end
+
+
+subroutine chunked_output_test_all(failures)
+    integer, intent(inout) :: failures
+
+    call write_chunked_output_test__double(failures)
+    call write_chunked_output_test__single(failures)
+    call write_chunked_output_test__compressed(failures)
+    call write_chunked_output_test__indices(failures)
+end
+
+end module ChunkedOutputTest
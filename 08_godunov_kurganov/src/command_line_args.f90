@@ -658,7 +658,8 @@ end subroutine
 ! Deternimes if the argument is a named argument.
 ! For example "--help" is a named argument, and "file.jpg" is not.
 ! This functino is needed to distigush named arguments that start with '-'
-! from negative numbers, like -3.
+! from negative numbers, like -3. A single '-' is not a named argument,
+! it is commonly used as a file name meaning the standard input or output.
 !
 ! Inputs:
 ! --------
@@ -677,6 +678,10 @@ function is_named(str) result(result)
     integer :: flag_name_start_index
     integer :: char_index
 
+    if (trim(str) == "-") then
+        result = .false.
+        return
+    end if
 
     if (string_starts_with(str, "-") .or. string_starts_with(str, "--")) then
         if (string_starts_with(str, "-")) flag_name_start_index = 2
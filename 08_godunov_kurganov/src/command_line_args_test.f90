@@ -452,6 +452,7 @@ subroutine is_named_test(failures)
     call assert_true(.not. is_named('-7'), __FILE__, __LINE__, failures)
     call assert_true(.not. is_named('-8'), __FILE__, __LINE__, failures)
     call assert_true(.not. is_named('-9'), __FILE__, __LINE__, failures)
+    call assert_true(.not. is_named('-'), __FILE__, __LINE__, failures)
 end
 
 ! unrecognized_named_args
@@ -2,30 +2,41 @@
 ! Solves a PDE
 !
 module Equation
+!$ use omp_lib, only: omp_set_num_threads
 use Types, only: dp
 use Constants, only: pi
 use Settings, only: program_settings, read_from_command_line
 use FloatUtils, only: linspace
-use Output, only: write_output
+use ChunkedOutput, only: write_chunked_output
+use Output, only: write_output, open_stream, write_stream_header, &
+                  write_stream_frame, STANDARD_OUTPUT
 use Grid, only: set_grid, allocate_primitive_array
+use Snapshots, only: output_schedule, init_schedule, select_frames, &
+                     select_output_indices
 use InitialConditions, only: set_initial
 use Physics, only: many_state_vectors_to_primitive, &
-                   calculate_fluxes, calculate_eigenvalues
+                   state_vectors_to_primitive_in_place, &
+                   calculate_fluxes, calculate_eigenvalues, &
+                   largest_eigenvalue
 
-use Step, only: step_finite_volume
+use Step, only: step_finite_volume, average_ssp_rk2
 use InterfaceFlux, only : calculate_interface_fluxes
+use Amr, only: solve_and_create_amr_output
+use Split2D, only: solve_and_create_2d_output
 
 implicit none
 private
 public :: solve_equation, solve_and_create_output, &
-          read_settings_solve_and_create_output, remove_ghost_cells, &
-          resize_arrays
+          read_settings_solve_and_create_output, &
+          resize_arrays, solve_and_stream_output
 
 contains
 
 
 !
-! Change the size of the time dimension in state_vectors and t_points arrays
+! Change the size of the time dimension in state_vectors and t_points arrays.
+! Only the first `keep_elements` time levels are copied, the new elements
+! are not initialized since they are overwritten by the solver.
 !
 ! Inputs:
 ! -------
@@ -53,8 +64,7 @@ subroutine resize_arrays(new_size, keep_elements, state_vectors, t_points)
     ! -------
 
     allocate(t_points_buffer(new_size))
-    t_points_buffer = 0
-    t_points_buffer(1:keep_elements) = t_points
+    t_points_buffer(1:keep_elements) = t_points(1:keep_elements)
     deallocate(t_points)
     call move_alloc(t_points_buffer, t_points)
 
@@ -64,39 +74,153 @@ subroutine resize_arrays(new_size, keep_elements, state_vectors, t_points)
     allocate(state_vectors_buffer(size(state_vectors, 1), &
              size(state_vectors, 2), new_size))
 
-    state_vectors_buffer = 0
-    state_vectors_buffer(:, :, 1:keep_elements) = state_vectors
+    state_vectors_buffer(:, :, 1:keep_elements) = &
+        state_vectors(:, :, 1:keep_elements)
+
     deallocate(state_vectors)
     call move_alloc(state_vectors_buffer, state_vectors)
 end subroutine
 
 
 !
-! Removes the ghost cells, which are the values corresponding to
-! the first and last x-values. The ghost cells are temporary cells
-! and are not needed after the state vectors has been calculated.
+! Writes the solution at one time level to the stream
+!
+! Inputs:
+! -------
+!
+! stream_unit : unit number of the stream
+!
+! t : the value of time
+!
+! state_vectors : state vectors at the time level, including
+!                 the two ghost cells
+!
+subroutine stream_frame(stream_unit, t, state_vectors)
+    integer, intent(in) :: stream_unit
+    real(dp), intent(in) :: t
+    real(dp), intent(in) :: state_vectors(:, :)
+    real(dp) :: primitive_vectors(size(state_vectors, 1), &
+                                  size(state_vectors, 2) - 2, 1)
+    integer :: nx
+
+    ! state_vectors contains two ghost points
+    nx = size(state_vectors, 2) - 2
+
+    call many_state_vectors_to_primitive( &
+        state_vectors=reshape(state_vectors(:, 2:nx + 1), &
+                              [size(state_vectors, 1), nx, 1]), &
+        primitive_vectors=primitive_vectors)
+
+    call write_stream_frame(out_unit=stream_unit, t=t, &
+                            primitive_vectors=primitive_vectors(:, :, 1))
+end subroutine
+
+
+!
+! Updates the ghost cells, which contain the values from the other end
+! of the periodic domain
 !
 ! Outputs:
 ! -------
 !
-! state_vectors : array containing the solution
+! state_vectors : state vectors at a time level, including
+!                 the two ghost cells
 !
-subroutine remove_ghost_cells(state_vectors)
-    real(dp), allocatable, intent(inout) :: state_vectors(:, :, :)
-    real(dp), allocatable :: state_vectors_buffer(:, :, :)
+subroutine update_ghost_cells(state_vectors)
+    real(dp), intent(inout) :: state_vectors(:, :)
+    integer :: nx
 
-    allocate(state_vectors_buffer(size(state_vectors, 1), &
-                                  size(state_vectors, 2) - 2, &
-                                  size(state_vectors, 3)))
+    nx = size(state_vectors, 2) - 2  ! state_vectors contains two ghost points
+    state_vectors(:, 1) = state_vectors(:, nx + 1)
+    state_vectors(:, nx + 2) = state_vectors(:, 2)
+end subroutine
 
-    state_vectors_buffer = 0
-    state_vectors_buffer(:, :, : ) = state_vectors(&
-                                    :, 2 : size(state_vectors, 2) - 1, :)
 
-    deallocate(state_vectors)
-    call move_alloc(state_vectors_buffer, state_vectors)
+!
+! Calculates the state vectors at the next time level. If a slope limiter
+! is used, the interface fluxes are calculated from reconstructed states
+! and the time step is made with the two-stage SSP Runge-Kutta method.
+!
+! Inputs:
+! -------
+!
+! options : program options
+!
+! dx : size of space step
+!
+!
+! Outputs:
+! -------
+!
+! levels : state vectors at two time levels. The first level
+!          is the current one, its ghost cells are updated. The second
+!          level is calculated.
+!
+! fluxes : array of flux vectors for the current level
+!
+! eigenvalues : array of eigenvalues for the current level
+!
+! dt : the time step between the levels
+!
+subroutine advance(options, dx, levels, fluxes, eigenvalues, dt)
+    type(program_settings), intent(in) :: options
+    real(dp), intent(in) :: dx
+    real(dp), intent(inout) :: levels(:, :, :)
+    real(dp), intent(inout) :: fluxes(:, :), eigenvalues(:)
+    real(dp), intent(out) :: dt
+    real(dp) :: interface_fluxes(size(levels, 1), size(levels, 2) - 1)
+    real(dp), allocatable :: stage(:, :, :)
+
+    ! Update the ghost cells.
+    call update_ghost_cells(levels(:, :, 1))
+
+    ! Calculate fluxes and eigenvalues for all the cells at current
+    ! time level. The flux/eigenvalues will be used to calculate
+    ! the state vectors for the next time level
+    call calculate_fluxes(state_vectors=levels(:, :, 1), fluxes=fluxes)
+
+    call calculate_eigenvalues(state_vectors=levels(:, :, 1), &
+                               eigenvalues=eigenvalues)
+
+    ! The time step is updated
+    dt = options%courant_factor * dx / largest_eigenvalue(eigenvalues)
+
+    call calculate_interface_fluxes(options=options, &
+                fluxes=fluxes, &
+                eigenvalues=eigenvalues, &
+                state_vectors=levels(:, :, 1), &
+                interface_fluxes=interface_fluxes)
+
+    call step_finite_volume(nt=2, dx=dx, dt=dt, &
+                            state_vectors=levels, &
+                            interface_fluxes=interface_fluxes)
+
+    if (options%limiter == "none") return
+
+    ! Second stage of SSP-RK2: Euler step from the first stage values
+    ! with the same time step, averaged with the values at
+    ! the beginning of the step
+    ! -------
+
+    allocate(stage(size(levels, 1), size(levels, 2), 2))
+    stage(:, :, 1) = levels(:, :, 2)
+    call update_ghost_cells(stage(:, :, 1))
+
+    call calculate_interface_fluxes(options=options, &
+                fluxes=fluxes, &
+                eigenvalues=eigenvalues, &
+                state_vectors=stage(:, :, 1), &
+                interface_fluxes=interface_fluxes)
+
+    call step_finite_volume(nt=2, dx=dx, dt=dt, &
+                            state_vectors=stage, &
+                            interface_fluxes=interface_fluxes)
+
+    call average_ssp_rk2(nt=2, stage_step=stage(:, :, 2), &
+                         state_vectors=levels)
 end subroutine
 
+
 !
 ! Iterate over the time values and solve the equation
 ! for each of them
@@ -136,15 +260,7 @@ subroutine iterate(options,  dx, &
     real(dp), intent(inout) :: fluxes(:, :), eigenvalues(:)
     real(dp), allocatable, intent(inout) :: state_vectors(:, :, :)
     real(dp), allocatable, intent(inout) :: t_points(:)
-
-    real(dp) :: interface_fluxes(size(state_vectors,1), &
-                                size(state_vectors,2) - 1)
-
     real(dp) :: dt
-    integer :: nx
-
-    ! number of x points
-    nx = size(state_vectors, 2) - 2  ! state_vectors contains two ghost points
 
     ! Set initial time values
     tmax = options%t_end
@@ -153,50 +269,30 @@ subroutine iterate(options,  dx, &
 
     ! Calculate state vectors for all time steps
     do while (t_points(nt) < tmax)
-        ! Update the ghost cells.
-        state_vectors(:, 1, nt) = state_vectors(:, nx + 1, nt)
-        state_vectors(:, nx + 2, nt) = state_vectors(:, 2, nt)
-
-        ! Calculate fluxes and eigenvalues for all the cells at current
-        ! time index. The flux/eigenvalues will be used to calculate
-        ! the state vectors for the next time index
-        call calculate_fluxes(state_vectors=state_vectors(:, :, nt), &
-                              fluxes=fluxes)
-
-        call calculate_eigenvalues(state_vectors=state_vectors(:, :, nt), &
-                                   eigenvalues=eigenvalues)
-
-        ! Increment the time value
-        nt = nt + 1
-        ! The time step is updated
-        dt = options%courant_factor * dx / maxval(eigenvalues)
-        t_points(nt) = t_points(nt - 1) + dt
-
         ! Resize the time dimension of the arrays if needed
-        if (nt > nt_allocated / 2) then
+        if (nt + 1 > nt_allocated / 2) then
             nt_allocated = 2 * nt_allocated
 
             call resize_arrays(new_size=nt_allocated, &
-                               keep_elements=size(t_points), &
+                               keep_elements=nt, &
                                state_vectors=state_vectors, t_points=t_points)
         end if
 
-        call calculate_interface_fluxes(options=options, &
-                    fluxes=fluxes, &
-                    eigenvalues=eigenvalues, &
-                    state_vectors=state_vectors(:,:,nt-1), &
-                    interface_fluxes=interface_fluxes)
+        call advance(options=options, dx=dx, &
+                     levels=state_vectors(:, :, nt : nt + 1), &
+                     fluxes=fluxes, eigenvalues=eigenvalues, dt=dt)
 
-        call step_finite_volume(nt=nt, dx=dx, dt=dt, &
-                                state_vectors=state_vectors, &
-                                interface_fluxes=interface_fluxes)
+        ! Increment the time value
+        nt = nt + 1
+        t_points(nt) = t_points(nt - 1) + dt
     end do
 end subroutine
 
 
 !
-! Solve the equation
-!
+! Calculates the state vectors for all time levels. The arrays are
+! the working storage of the solver: they include the ghost cells and
+! the unused time levels after `nt`.
 !
 ! Inputs:
 ! -------
@@ -207,22 +303,26 @@ end subroutine
 ! Outputs:
 ! -------
 !
-! primitive_vectors : array containing the solution.
-!           These are vectors of primitive variables for all
-!           position and time values.
+! state_vectors : array containing the solution
 !
 ! x_points : A 1D array containing the values of the x coordinate
 !
 ! t_points : A 1D array containing the values of the time coordinate
 !
-subroutine solve_equation(options, primitive_vectors, x_points, t_points)
+! nt : the number of calculated time levels
+!
+subroutine calculate_solution(options, state_vectors, x_points, t_points, nt)
     type(program_settings), intent(in) :: options
-    real(dp), allocatable, intent(out) :: primitive_vectors(:, :, :)
+    real(dp), allocatable, intent(out) :: state_vectors(:, :, :)
     real(dp), allocatable, intent(out) :: x_points(:), t_points(:)
-    real(dp), allocatable :: state_vectors(:, :, :)
+    integer, intent(out) :: nt
     real(dp), allocatable :: fluxes(:, :), eigenvalues(:)
     real(dp) :: dx
-    integer :: nt, nt_allocated
+    integer :: nt_allocated
+
+    ! The loops over the cells are divided between the threads
+    ! when the program is compiled with OpenMP
+    !$ call omp_set_num_threads(options%threads)
 
     ! Initialize the arrays
     call set_grid(options=options, state_vectors=state_vectors, &
@@ -244,24 +344,65 @@ subroutine solve_equation(options, primitive_vectors, x_points, t_points)
                  nt=nt, nt_allocated=nt_allocated, &
                  state_vectors=state_vectors, &
                  t_points=t_points, fluxes=fluxes, eigenvalues=eigenvalues)
+end subroutine
 
-    ! Remove unused elements from t dimension of arrays
-    call resize_arrays(new_size=nt, keep_elements=nt, &
-                       state_vectors=state_vectors, t_points=t_points)
 
-    call remove_ghost_cells(state_vectors)
+!
+! Solve the equation
+!
+!
+! Inputs:
+! -------
+!
+! options : program options
+!
+!
+! Outputs:
+! -------
+!
+! primitive_vectors : array containing the solution.
+!           These are vectors of primitive variables for all
+!           position and time values.
+!
+! x_points : A 1D array containing the values of the x coordinate
+!
+! t_points : A 1D array containing the values of the time coordinate
+!
+subroutine solve_equation(options, primitive_vectors, x_points, t_points)
+    type(program_settings), intent(in) :: options
+    real(dp), allocatable, intent(out) :: primitive_vectors(:, :, :)
+    real(dp), allocatable, intent(out) :: x_points(:), t_points(:)
+    real(dp), allocatable :: state_vectors(:, :, :)
+    integer :: nx, nt
+
+    call calculate_solution(options=options, state_vectors=state_vectors, &
+                            x_points=x_points, t_points=t_points, nt=nt)
+
+    nx = size(x_points)
 
-    call allocate_primitive_array(array_shape=shape(state_vectors), &
+    ! Copy the interior cells of the calculated time levels,
+    ! which is the only copy of the solution
+    call allocate_primitive_array( &
+        array_shape=[size(state_vectors, 1), nx, nt], &
         primitive_vectors=primitive_vectors)
 
     call many_state_vectors_to_primitive( &
-        state_vectors=state_vectors, &
+        state_vectors=state_vectors(:, 2:nx + 1, 1:nt), &
         primitive_vectors=primitive_vectors)
+
+    t_points = t_points(1:nt)
 end subroutine
 
 
 !
-! Solves PDE and prints solution containing primitive variables to a file
+! Solves PDE and prints solution containing primitive variables to a file.
+! Only the time levels selected with `output_stride`, `max_frames` or
+! `output_times` settings are printed. The interior cells of the selected
+! levels are written directly from the working storage of the solver.
+! If `amr_levels` is larger than one, the equation is solved with
+! adaptive mesh refinement and the solution is written in the AMR format.
+! If `ny` is positive, the equation is solved in two dimensions and
+! the solution is written in the 2D format.
 !
 ! Inputs:
 ! -------
@@ -270,14 +411,148 @@ end subroutine
 !
 subroutine solve_and_create_output(options)
     type(program_settings), intent(in) :: options
-    real(dp), allocatable :: primitive_vectors(:, :, :)
+    real(dp), allocatable :: state_vectors(:, :, :)
+    real(dp), allocatable :: x_points(:), t_points(:)
+    integer, allocatable :: indices(:)
+    integer :: nx, nt, i
+
+    if (options%amr_levels > 1) then
+        call solve_and_create_amr_output(options=options)
+        return
+    end if
+
+    if (options%ny > 0) then
+        call solve_and_create_2d_output(options=options)
+        return
+    end if
+
+    if (trim(options%output_path) == STANDARD_OUTPUT .or. &
+        options%output_format == "stream") then
+
+        call solve_and_stream_output(options=options, &
+                                     filename=options%output_path)
+        return
+    end if
+
+    call calculate_solution(options=options, state_vectors=state_vectors, &
+                            x_points=x_points, t_points=t_points, nt=nt)
+
+    nx = size(x_points)
+
+    call select_output_indices(options=options, t_points=t_points(1:nt), &
+                               indices=indices)
+
+    ! Convert the selected levels to primitive variables
+    do i = 1, size(indices)
+        call state_vectors_to_primitive_in_place( &
+            vectors=state_vectors(:, 2:nx + 1, indices(i)))
+    end do
+
+    if (options%output_format == "chunked") then
+        call write_chunked_output(filename=options%output_path, &
+            primitive_vectors=state_vectors(:, 2:nx + 1, :), &
+            x_points=x_points, t_points=t_points, &
+            chunk_size=options%chunk_size, &
+            single_precision=options%precision == "single", &
+            compress=options%compression == "zlib", &
+            indices=indices)
+    else
+        call write_output(filename=options%output_path, &
+                          primitive_vectors=state_vectors(:, 2:nx + 1, :), &
+                          x_points=x_points, t_points=t_points, &
+                          indices=indices)
+    end if
+end subroutine
+
+
+!
+! Solves PDE and streams the solution to a file while it is being
+! calculated. The time levels selected with `output_stride`, `max_frames`
+! or `output_times` settings are written as soon as they are calculated,
+! so that the reader can use them before the program finishes.
+!
+! Only the current and the previous time levels are kept in memory,
+! so the memory used does not depend on the number of time steps.
+!
+! Inputs:
+! -------
+!
+! options : program options
+!
+! filename : Name of the file. If "-", the solution is written
+!            to the standard output.
+!
+subroutine solve_and_stream_output(options, filename)
+    type(program_settings), intent(in) :: options
+    character(len=*), intent(in) :: filename
+    real(dp), allocatable :: state_vectors(:, :, :)
     real(dp), allocatable :: x_points(:), t_points(:)
+    real(dp), allocatable :: fluxes(:, :), eigenvalues(:)
+    type(output_schedule) :: schedule
+    real(dp) :: dx, dt, t_previous, t
+    integer :: stream_unit, nt, nt_allocated, frames(2), count, i, level
+
+    ! The loops over the cells are divided between the threads
+    ! when the program is compiled with OpenMP
+    !$ call omp_set_num_threads(options%threads)
+
+    ! Initialize the arrays and keep only two time levels
+    call set_grid(options=options, state_vectors=state_vectors, &
+                  x_points=x_points, t_points=t_points, &
+                  fluxes=fluxes, eigenvalues=eigenvalues, &
+                  nt_allocated=nt_allocated)
+
+    state_vectors = state_vectors(:, :, 1:2)
+
+    call set_initial(type=options%initial_conditions, &
+                     x_points=x_points, state_vectors=state_vectors)
+
+    dx = x_points(2) - x_points(1)
+
+    call open_stream(filename=filename, out_unit=stream_unit)
+
+    call write_stream_header(out_unit=stream_unit, x_points=x_points, &
+        state_vector_dimension=options%state_vector_dimension)
 
-    call solve_equation(options, primitive_vectors, x_points, t_points)
+    call init_schedule(options=options, schedule=schedule)
+    t = options%t_start
+    t_previous = t
+    nt = 1
+
+    do
+        ! Write the selected time levels, they are either
+        ! the current or the previous one
+        call select_frames(t_previous=t_previous, t_current=t, nt=nt, &
+                           is_last=t >= options%t_end, schedule=schedule, &
+                           frames=frames, count=count)
+
+        do i = 1, count
+            if (frames(i) == nt) then
+                level = 2
+                if (nt == 1) level = 1
+
+                call stream_frame(stream_unit=stream_unit, t=t, &
+                                  state_vectors=state_vectors(:, :, level))
+            else
+                call stream_frame(stream_unit=stream_unit, t=t_previous, &
+                                  state_vectors=state_vectors(:, :, 1))
+            end if
+        end do
+
+        if (t >= options%t_end) exit
+
+        ! The current level becomes the previous one
+        if (nt > 1) state_vectors(:, :, 1) = state_vectors(:, :, 2)
 
-    call write_output(filename=options%output_path, &
-                      primitive_vectors=primitive_vectors, &
-                      x_points=x_points, t_points=t_points)
+        call advance(options=options, dx=dx, levels=state_vectors, &
+                     fluxes=fluxes, eigenvalues=eigenvalues, dt=dt)
+
+        nt = nt + 1
+        t_previous = t
+        t = t + dt
+    end do
+
+    close(unit=stream_unit)
 end subroutine
 
 
@@ -305,7 +580,10 @@ subroutine read_settings_solve_and_create_output(silent)
 
     call solve_and_create_output(options=settings)
 
-    if (.not. silent) then
+    ! The standard output contains the solution when streaming
+    if (.not. silent .and. &
+        trim(settings%output_path) /= STANDARD_OUTPUT) then
+
         print "(a, a, a)", "Solution saved to '", &
             trim(settings%output_path), "'"
     end if
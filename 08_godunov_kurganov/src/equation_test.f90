@@ -1,4 +1,5 @@
 module EquationTest
+!$ use omp_lib, only: omp_get_max_threads, omp_set_num_threads
 use Types, only: dp
 use AssertsTest, only: assert_true, assert_approx, assert_equal
 use Constants, only: pi
@@ -6,58 +7,18 @@ use, intrinsic :: ieee_arithmetic, only: ieee_is_nan
 
 use Equation, only: solve_equation, &
     solve_and_create_output, read_settings_solve_and_create_output, &
-    remove_ghost_cells, resize_arrays
+    resize_arrays, solve_and_stream_output
 
 use Settings, only: program_settings
+use Snapshots, only: select_output_indices
 use FileUtils, only: file_exists, delete_file
 implicit none
 private
-public equation_test_all
+public equation_test_all, exact_square_solution
 
 contains
 
 
-subroutine remove_ghost_cells_test(failures)
-    integer, intent(inout) :: failures
-    real(dp), allocatable :: state_vectors(:, :, :)
-
-    allocate(state_vectors(1, 4, 3))
-
-    state_vectors = reshape([1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12], &
-                            shape(state_vectors))
-
-
-
-    call remove_ghost_cells(state_vectors)
-
-
-    ! State vectors size
-    ! --------
-
-    call assert_equal(size(state_vectors, 1), 1, __FILE__, __LINE__, failures)
-    call assert_equal(size(state_vectors, 2), 2, __FILE__, __LINE__, failures)
-    call assert_equal(size(state_vectors, 3), 3, __FILE__, __LINE__, failures)
-
-    call assert_approx(state_vectors(1, 1, 1), 2._dp, 1e-5_dp, __FILE__, &
-        __LINE__, failures)
-
-    call assert_approx(state_vectors(1, 2, 1), 3._dp, 1e-5_dp, __FILE__, &
-        __LINE__, failures)
-
-    call assert_approx(state_vectors(1, 1, 2), 6._dp, 1e-5_dp, __FILE__, &
-        __LINE__, failures)
-
-    call assert_approx(state_vectors(1, 2, 2), 7._dp, 1e-5_dp, __FILE__, &
-        __LINE__, failures)
-
-    call assert_approx(state_vectors(1, 1, 3), 10._dp, 1e-5_dp, __FILE__, &
-        __LINE__, failures)
-
-    call assert_approx(state_vectors(1, 2, 3), 11._dp, 1e-5_dp, __FILE__, &
-        __LINE__, failures)
-end
-
-
 subroutine resize_arrays_test(failures)
     integer, intent(inout) :: failures
     real(dp), allocatable :: state_vectors(:, :, :)
@@ -101,15 +62,42 @@ subroutine resize_arrays_test(failures)
         __LINE__, failures)
 
 
-    ! Ensure the added elements are zero
+    ! t points
     ! ----------
 
-    call assert_true(all(abs(state_vectors(:, :, 4)) < 1.e-10_dp), __FILE__, &
-        __LINE__, failures)
+    call assert_equal(size(t_points), 5, __FILE__, __LINE__, failures)
 
-    call assert_true(all(abs(state_vectors(:, :, 5)) < 1.e-10_dp), __FILE__, &
-        __LINE__, failures)
+    call assert_true(all(abs(t_points(1:3) - [1.1_dp, 1.2_dp, 1.3_dp]) &
+                         < 1e-15_dp), __FILE__, __LINE__, failures)
+end
+
+
+subroutine resize_arrays_test__keep_elements(failures)
+    integer, intent(inout) :: failures
+    real(dp), allocatable :: state_vectors(:, :, :)
+    real(dp), allocatable :: t_points(:)
 
+    allocate(state_vectors(1, 2, 4))
+
+    state_vectors = reshape([1, 2, 3, 4, 5, 6, 7, 8], &
+                            shape(state_vectors))
+
+    allocate(t_points(4))
+    t_points = [1.1_dp, 1.2_dp, 1.3_dp, 1.4_dp]
+
+    ! Only the first two time levels are used
+    call resize_arrays(new_size=8, keep_elements=2, &
+                       state_vectors=state_vectors, t_points=t_points)
+
+    call assert_equal(size(state_vectors, 3), 8, __FILE__, __LINE__, failures)
+    call assert_equal(size(t_points), 8, __FILE__, __LINE__, failures)
+
+    call assert_true(all(abs(state_vectors(1, :, 1:2) &
+                             - reshape([1, 2, 3, 4], [2, 2])) < 1e-15_dp), &
+                     __FILE__, __LINE__, failures)
+
+    call assert_true(all(abs(t_points(1:2) - [1.1_dp, 1.2_dp]) < 1e-15_dp), &
+                     __FILE__, __LINE__, failures)
 end
 
 
@@ -565,6 +553,303 @@ end
 ! read_settings_find_roots_and_print_output_test
 ! ---------
 
+subroutine solve_and_stream_output_test(failures)
+    integer, intent(inout) :: failures
+    type(program_settings) :: options
+    real(dp), allocatable :: primitive_vectors(:, :, :)
+    real(dp), allocatable :: x_points(:), t_points(:)
+    real(dp) :: x_points_read(100), frame(1, 100), t
+    integer :: unit, nx, state_vector_dimension, nt, io_status
+
+    options%method = 'kurganov'
+    options%initial_conditions = 'sine'
+    options%x_start = 0
+    options%x_end = 1
+    options%nx = 100
+    options%t_start = 0
+    options%t_end = 1
+    options%courant_factor = 0.5_dp
+
+    call solve_and_stream_output(options=options, filename="test_stream.dat")
+
+    call solve_equation(options=options, primitive_vectors=primitive_vectors, &
+                        x_points=x_points, t_points=t_points)
+
+    open(newunit=unit, file="test_stream.dat", form='unformatted', &
+        access='stream', status='old', action='read' )
+
+    read (unit) nx
+    call assert_equal(nx, 100, __FILE__, __LINE__, failures)
+
+    read (unit) state_vector_dimension
+    call assert_equal(state_vector_dimension, 1, __FILE__, __LINE__, failures)
+
+    read (unit) x_points_read
+
+    call assert_true(all(abs(x_points_read - x_points) < 1.e-15_dp), &
+                     __FILE__, __LINE__, failures)
+
+    ! The frames are the same as the time slices of the full solution
+    nt = 0
+
+    do
+        read (unit, iostat=io_status) t, frame
+        if (io_status /= 0) exit
+        nt = nt + 1
+
+        call assert_approx(t, t_points(nt), 1e-15_dp, &
+                           __FILE__, __LINE__, failures)
+
+        call assert_true(all(abs(frame - primitive_vectors(:, :, nt)) &
+                             < 1.e-15_dp), &
+                         __FILE__, __LINE__, failures)
+    end do
+
+    call assert_equal(nt, size(t_points), __FILE__, __LINE__, failures)
+
+    close(unit=unit)
+
+    call delete_file("test_stream.dat")
+end
+
+
+subroutine solve_and_create_output_test__stream_format(failures)
+    integer, intent(inout) :: failures
+    type(program_settings) :: options
+    real(dp), allocatable :: primitive_vectors(:, :, :)
+    real(dp), allocatable :: x_points(:), t_points(:)
+    integer, allocatable :: indices(:)
+    real(dp) :: x_points_read(100), frame(1, 100), t
+    integer :: unit, nx, state_vector_dimension, nt, io_status
+
+    options%output_path = "test_stream_format.dat"
+    options%output_format = "stream"
+    options%method = 'godunov'
+    options%initial_conditions = 'sine'
+    options%x_start = 0
+    options%x_end = 1
+    options%nx = 100
+    options%t_start = 0
+    options%t_end = 1
+    options%courant_factor = 0.5_dp
+    options%output_times = [0.9_dp, 0.12_dp, 0.5_dp, 0.13_dp]
+
+    call solve_and_create_output(options)
+
+    call solve_equation(options=options, primitive_vectors=primitive_vectors, &
+                        x_points=x_points, t_points=t_points)
+
+    call select_output_indices(options=options, t_points=t_points, &
+                               indices=indices)
+
+    open(newunit=unit, file="test_stream_format.dat", form='unformatted', &
+        access='stream', status='old', action='read' )
+
+    read (unit) nx, state_vector_dimension, x_points_read
+    call assert_equal(nx, 100, __FILE__, __LINE__, failures)
+
+    ! The frames written with two time levels in memory are the same
+    ! as the frames selected from the full solution
+    nt = 0
+
+    do
+        read (unit, iostat=io_status) t, frame
+        if (io_status /= 0) exit
+        nt = nt + 1
+        if (nt > size(indices)) exit
+
+        call assert_approx(t, t_points(indices(nt)), 1e-15_dp, &
+                           __FILE__, __LINE__, failures)
+
+        call assert_true(all(abs(frame - primitive_vectors(:, :, indices(nt))) &
+                             < 1.e-15_dp), &
+                         __FILE__, __LINE__, failures)
+    end do
+
+    call assert_equal(nt, size(indices), __FILE__, __LINE__, failures)
+
+    close(unit=unit)
+
+    call delete_file("test_stream_format.dat")
+end
+
+
+subroutine solve_and_stream_output_test__threads(failures)
+    integer, intent(inout) :: failures
+    type(program_settings) :: options
+
+    options%method = 'kurganov'
+    options%initial_conditions = 'sine'
+    options%x_start = 0
+    options%x_end = 1
+    options%nx = 100
+    options%t_start = 0
+    options%t_end = 0.1_dp
+    options%courant_factor = 0.5_dp
+    options%threads = 3
+
+    !$ call omp_set_num_threads(1)
+
+    call solve_and_stream_output(options=options, &
+                                 filename="test_stream_threads.dat")
+
+    ! The number of threads is set by the stream output
+    !$ call assert_equal(omp_get_max_threads(), 3, __FILE__, __LINE__, &
+    !$                   failures)
+
+    call delete_file("test_stream_threads.dat")
+end
+
+
+subroutine solve_and_create_output_test__threads(failures)
+    integer, intent(inout) :: failures
+    type(program_settings) :: options
+    character(len=100) :: formats(3)
+    integer :: i
+
+    formats = [character(len=100) :: 'binary', 'chunked', 'stream']
+
+    options%output_path = "test_output_threads.dat"
+    options%method = 'kurganov'
+    options%initial_conditions = 'sine'
+    options%x_start = 0
+    options%x_end = 1
+    options%nx = 100
+    options%t_start = 0
+    options%t_end = 0.1_dp
+    options%courant_factor = 0.5_dp
+
+    do i = 1, size(formats)
+        options%output_format = formats(i)
+        options%threads = i + 1
+
+        !$ call omp_set_num_threads(1)
+
+        call solve_and_create_output(options)
+
+        ! The requested number of threads is used for each output format
+        !$ call assert_equal(omp_get_max_threads(), i + 1, __FILE__, &
+        !$                   __LINE__, failures)
+
+        call delete_file("test_output_threads.dat")
+    end do
+end
+
+
+subroutine solve_equation_test__threads(failures)
+    integer, intent(inout) :: failures
+    type(program_settings) :: options
+    real(dp), allocatable :: primitive_vectors(:, :, :), serial_vectors(:, :, :)
+    real(dp), allocatable :: x_points(:), t_points(:), serial_t_points(:)
+    character(len=100) :: methods(3), limiters(3)
+    integer :: i
+
+    methods = [character(len=100) :: 'godunov', 'kurganov', 'kurganov']
+    limiters = [character(len=100) :: 'none', 'none', 'mc']
+
+    options%initial_conditions = 'sine'
+    options%x_start = 0
+    options%x_end = 1
+    options%nx = 1000
+    options%t_start = 0
+    options%t_end = 0.3_dp
+    options%courant_factor = 0.5_dp
+
+    do i = 1, size(methods)
+        options%method = methods(i)
+        options%limiter = limiters(i)
+        options%threads = 1
+
+        call solve_equation(options=options, &
+                            primitive_vectors=serial_vectors, &
+                            x_points=x_points, t_points=serial_t_points)
+
+        options%threads = 4
+
+        call solve_equation(options=options, &
+                            primitive_vectors=primitive_vectors, &
+                            x_points=x_points, t_points=t_points)
+
+        ! Same results as with one thread, to the last bit
+        call assert_equal(size(t_points), size(serial_t_points), &
+                          __FILE__, __LINE__, failures)
+
+        call assert_true(maxval(abs(t_points - serial_t_points)) &
+                         < tiny(1._dp), __FILE__, __LINE__, failures)
+
+        call assert_true(maxval(abs(primitive_vectors - serial_vectors)) &
+                         < tiny(1._dp), __FILE__, __LINE__, failures)
+    end do
+end
+
+
+!
+! Returns the exact solution for the square initial conditions,
+! valid for t <= 0.5: a rarefaction wave starting at x=0.25
+! and a shock starting at x=0.75
+!
+function exact_square_solution(x, t) result(u)
+    real(dp), intent(in) :: x(:), t
+    real(dp) :: u(size(x))
+
+    u = 0
+    where (x > 0.25_dp .and. x < 0.25_dp + t) u = (x - 0.25_dp) / t
+    where (x >= 0.25_dp + t .and. x < 0.75_dp + t / 2) u = 1
+end function
+
+
+subroutine solve_eqn_kurganov_test__limiters(failures)
+    integer, intent(inout) :: failures
+    type(program_settings) :: options
+    real(dp), allocatable :: primitive_vectors(:, :, :)
+    real(dp), allocatable :: x_points(:), t_points(:)
+    character(len=100) :: limiters(4)
+    real(dp) :: errors(4), dx
+    integer :: i, nt
+
+    limiters = [character(len=100) :: 'none', 'minmod', 'vanleer', 'mc']
+
+    options%method = 'kurganov'
+    options%initial_conditions = 'square'
+    options%x_start = 0
+    options%x_end = 1
+    options%nx = 100
+    options%t_start = 0
+    options%t_end = 0.4_dp
+    options%courant_factor = 0.5_dp
+
+    do i = 1, size(limiters)
+        options%limiter = limiters(i)
+
+        call solve_equation(options=options, &
+                            primitive_vectors=primitive_vectors, &
+                            x_points=x_points, &
+                            t_points=t_points)
+
+        nt = size(t_points)
+        dx = x_points(2) - x_points(1)
+
+        ! No new extrema
+        call assert_true(minval(primitive_vectors) > -1e-12_dp, &
+                         __FILE__, __LINE__, failures)
+
+        call assert_true(maxval(primitive_vectors) < 1 + 1e-12_dp, &
+                         __FILE__, __LINE__, failures)
+
+        ! Conservation
+        call assert_approx(sum(primitive_vectors(1, :, nt)) * dx, 0.5_dp, &
+                           1e-12_dp, __FILE__, __LINE__, failures)
+
+        errors(i) = sum(abs(primitive_vectors(1, :, nt) - &
+            exact_square_solution(x=x_points, t=t_points(nt)))) * dx
+    end do
+
+    ! The limited second-order reconstruction is more accurate
+    call assert_true(all(errors(2:) < 0.5_dp * errors(1)), &
+                     __FILE__, __LINE__, failures)
+end
+
+
 subroutine read_settings_solve_and_create_output_test(failures)
     integer, intent(inout) :: failures
 
@@ -577,15 +862,21 @@ end
 subroutine equation_test_all(failures)
     integer, intent(inout) :: failures
 
-    call remove_ghost_cells_test(failures)
     call resize_arrays_test(failures)
+    call resize_arrays_test__keep_elements(failures)
 
     call solve_eqn_godunovs_test__square(failures)
     call solve_eqn_godunovs_test__sine(failures)
 
     call solve_eqn_kurganov_test__square(failures)
+    call solve_eqn_kurganov_test__limiters(failures)
 
     call solve_and_create_output_test(failures)
+    call solve_and_stream_output_test(failures)
+    call solve_and_create_output_test__stream_format(failures)
+    call solve_and_stream_output_test__threads(failures)
+    call solve_and_create_output_test__threads(failures)
+    call solve_equation_test__threads(failures)
 
     call read_settings_solve_and_create_output_test(failures)
 end
@@ -6,7 +6,7 @@ use Settings, only: program_settings
 use Physics, only: many_primitive_vectors_to_state_vectors
 implicit none
 private
-public :: set_initial, calculate_initial
+public :: set_initial, calculate_initial, calculate_initial_2d
 
 contains
 
@@ -79,4 +79,52 @@ subroutine set_initial(type, x_points, state_vectors)
                            state_vectors=state_vectors(:, :, 1))
 end subroutine
 
+
+!
+! Calculate initial condition in two dimensions. The values are the
+! products of the one-dimensional initial conditions in x and y,
+! for example, the square initial conditions are equal to one
+! inside the square in the middle of the domain.
+!
+! Inputs:
+! -------
+!
+! type : type of initial conditions ("square", "sine")
+!
+! x_points, y_points : 1D arrays containing the values of the x and y
+!                      coordinates
+!
+!
+! Outputs:
+! -------
+!
+! state_vectors : state vector array containing the initial conditions,
+!                 its dimensions are state vector, x and y indices
+!
+subroutine calculate_initial_2d(type, x_points, y_points, state_vectors)
+    character(len=*), intent(in) :: type
+    real(dp), intent(in) :: x_points(:), y_points(:)
+    real(dp), intent(out) :: state_vectors(:, :, :)
+    real(dp) :: x_values(size(state_vectors, 1), size(x_points) + 2)
+    real(dp) :: y_values(size(state_vectors, 1), size(y_points) + 2)
+    real(dp) :: primitive_vectors(size(state_vectors, 1), size(x_points))
+    integer :: iy
+
+    ! The one-dimensional values, including the ghost cells
+    call calculate_initial(type=type, x_points=x_points, &
+                           state_vectors=x_values)
+
+    call calculate_initial(type=type, x_points=y_points, &
+                           state_vectors=y_values)
+
+    do iy = 1, size(y_points)
+        primitive_vectors = x_values(:, 2:size(x_points) + 1) &
+                            * spread(y_values(:, iy + 1), 2, size(x_points))
+
+        call many_primitive_vectors_to_state_vectors( &
+            primitive_vectors=primitive_vectors, &
+            state_vectors=state_vectors(:, :, iy))
+    end do
+end subroutine
+
 end module InitialConditions
\ No newline at end of file
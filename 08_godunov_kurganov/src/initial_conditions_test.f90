@@ -1,7 +1,7 @@
 module InitialConditionsTest
 use Types, only: dp
 use AssertsTest, only: assert_true, assert_approx, assert_equal
-use InitialConditions, only: set_initial
+use InitialConditions, only: set_initial, calculate_initial_2d
 implicit none
 private
 public init_test_all
@@ -108,11 +108,58 @@ subroutine set_initial_test__sine(failures)
 end
 
 
+subroutine calculate_initial_2d_test__square(failures)
+    integer, intent(inout) :: failures
+    real(dp) :: state_vectors(1, 4, 3)
+
+    call calculate_initial_2d(type="square", &
+                              x_points=[0.1_dp, 0.3_dp, 0.5_dp, 0.9_dp], &
+                              y_points=[0.2_dp, 0.5_dp, 0.7_dp], &
+                              state_vectors=state_vectors)
+
+    call assert_true(all(abs(state_vectors(1, :, 1) - 0) < 1e-10_dp), &
+                     __FILE__, __LINE__, failures)
+
+    call assert_true(all(abs(state_vectors(1, :, 2) &
+                             - [0._dp, 1._dp, 1._dp, 0._dp]) < 1e-10_dp), &
+                     __FILE__, __LINE__, failures)
+
+    call assert_true(all(abs(state_vectors(1, :, 3) &
+                             - [0._dp, 1._dp, 1._dp, 0._dp]) < 1e-10_dp), &
+                     __FILE__, __LINE__, failures)
+end
+
+
+subroutine calculate_initial_2d_test__sine(failures)
+    integer, intent(inout) :: failures
+    real(dp) :: state_vectors(1, 2, 2)
+
+    call calculate_initial_2d(type="sine", &
+                              x_points=[0.25_dp, 0.75_dp], &
+                              y_points=[0.25_dp, 0.125_dp], &
+                              state_vectors=state_vectors)
+
+    call assert_approx(state_vectors(1, 1, 1), 1._dp, 1e-10_dp, &
+                       __FILE__, __LINE__, failures)
+
+    call assert_approx(state_vectors(1, 2, 1), -1._dp, 1e-10_dp, &
+                       __FILE__, __LINE__, failures)
+
+    call assert_approx(state_vectors(1, 1, 2), sqrt(0.5_dp), 1e-10_dp, &
+                       __FILE__, __LINE__, failures)
+
+    call assert_approx(state_vectors(1, 2, 2), -sqrt(0.5_dp), 1e-10_dp, &
+                       __FILE__, __LINE__, failures)
+end
+
+
 subroutine init_test_all(failures)
     integer, intent(inout) :: failures
 
     call set_initial_test__square(failures)
     call set_initial_test__sine(failures)
+    call calculate_initial_2d_test__square(failures)
+    call calculate_initial_2d_test__sine(failures)
 end
 
 end module InitialConditionsTest
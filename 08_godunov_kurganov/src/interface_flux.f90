@@ -4,9 +4,11 @@
 module InterfaceFlux
 use Types, only: dp
 use Settings, only: program_settings
+use Physics, only: calculate_fluxes, calculate_eigenvalues
 implicit none
 private
-public :: calculate_interface_fluxes, single_interface_flux, godunov_flux
+public :: calculate_interface_fluxes, single_interface_flux, godunov_flux, &
+          limited_slope, reconstruct_states
 
 contains
 
@@ -112,6 +114,120 @@ subroutine single_interface_flux(options, &
 end subroutine
 
 
+!
+! Returns the limited slope of the solution in a cell, multiplied
+! by the size of the cell
+!
+! Inputs:
+! -------
+!
+! limiter : name of the slope limiter: minmod, vanleer, mc
+!
+! left_difference : difference between the values in the cell and
+!                   the cell on the left
+!
+! right_difference : difference between the values in the cell on
+!                    the right and the cell
+!
+!
+! Returns:
+! -------
+!
+! The slope. It is zero at extrema, where the differences have
+! opposite signs, so no new extrema are created by the reconstruction.
+!
+function limited_slope(limiter, left_difference, right_difference) &
+    result(slope)
+
+    character(len=*), intent(in) :: limiter
+    real(dp), intent(in) :: left_difference, right_difference
+    real(dp) :: slope
+
+    slope = 0
+
+    if (left_difference * right_difference <= 0) return
+
+    select case (limiter)
+    case ("minmod")
+        slope = sign(min(abs(left_difference), abs(right_difference)), &
+                     left_difference)
+
+    case ("vanleer")
+        slope = 2 * left_difference * right_difference &
+                / (left_difference + right_difference)
+
+    case ("mc")
+        slope = sign(min(2 * abs(left_difference), &
+                         0.5_dp * abs(left_difference + right_difference), &
+                         2 * abs(right_difference)), &
+                     left_difference)
+
+    case default
+       print "(a, a)", "ERROR: unknown limiter ", trim(limiter)
+       call exit(41)
+    end select
+end function
+
+
+!
+! Reconstructs the state vectors on both sides of the cell interfaces
+! using piecewise linear functions with limited slopes (MUSCL)
+!
+! Inputs:
+! -------
+!
+! limiter : name of the slope limiter: minmod, vanleer, mc
+!
+! state_vectors : state vectors in the cells, including the two ghost
+!                 cells, which contain the values from the other end
+!                 of the periodic domain
+!
+! Outputs:
+! -------
+!
+! states_left,
+! states_right : state vectors on the left and right sides of the cell
+!                interfaces, for the nx + 1 interfaces
+!
+subroutine reconstruct_states(limiter, state_vectors, states_left, &
+                              states_right)
+
+    character(len=*), intent(in) :: limiter
+    real(dp), intent(in) :: state_vectors(:, :)
+    real(dp), intent(out) :: states_left(:, :), states_right(:, :)
+    real(dp) :: slopes(size(state_vectors, 1), size(state_vectors, 2))
+    integer :: nx, ix, i
+
+    ! Number of x values
+    nx = size(state_vectors, 2) - 2  ! subtract two ghost points
+
+    !$omp parallel do private(i)
+    do ix = 2, nx + 1
+        do i = 1, size(state_vectors, 1)
+            slopes(i, ix) = limited_slope(limiter=limiter, &
+                left_difference=state_vectors(i, ix) &
+                                - state_vectors(i, ix - 1), &
+                right_difference=state_vectors(i, ix + 1) &
+                                 - state_vectors(i, ix))
+        end do
+    end do
+    !$omp end parallel do
+
+    ! The ghost cells are copies of the cells from the other end
+    slopes(:, 1) = slopes(:, nx + 1)
+    slopes(:, nx + 2) = slopes(:, 2)
+
+    !$omp parallel do
+    do ix = 1, nx + 1
+        states_left(:, ix) = state_vectors(:, ix) + 0.5_dp * slopes(:, ix)
+
+        states_right(:, ix) = state_vectors(:, ix + 1) &
+                              - 0.5_dp * slopes(:, ix + 1)
+    end do
+    !$omp end parallel do
+end subroutine
+
+
 !
 ! Calculate fluxes through cell interfaces
 !
@@ -145,6 +261,14 @@ subroutine calculate_interface_fluxes(options, fluxes, &
     ! Number of x values
     nx = size(state_vectors, 2) - 2  ! subtract two ghost points
 
+    if (options%limiter /= "none") then
+        call reconstructed_interface_fluxes(options=options, &
+            state_vectors=state_vectors, interface_fluxes=interface_fluxes)
+
+        return
+    end if
+
+    !$omp parallel do
     do ix = 1, nx + 1
         call single_interface_flux( &
             options=options, &
@@ -156,6 +280,66 @@ subroutine calculate_interface_fluxes(options, fluxes, &
             eigenvalue_right=eigenvalues(ix + 1), &
             flux=interface_fluxes(:, ix))
     end do
+    !$omp end parallel do
+end subroutine
+
+
+!
+! Calculate fluxes through cell interfaces from the state vectors
+! reconstructed with `reconstruct_states`. This gives a second order
+! method in smooth regions of the solution.
+!
+! Inputs:
+! -------
+!
+! options : program options
+!
+! state_vectors : array containing the solution for the equation
+!
+! Outputs:
+! -------
+!
+! interface_fluxes : fluxes through cell interfaces
+!
+subroutine reconstructed_interface_fluxes(options, state_vectors, &
+                                          interface_fluxes)
+
+    type(program_settings), intent(in) :: options
+    real(dp), intent(in) :: state_vectors(:, :)
+    real(dp), intent(out) :: interface_fluxes(:, :)
+    real(dp), dimension(size(state_vectors, 1), size(state_vectors, 2) - 1) :: &
+        states_left, states_right, fluxes_left, fluxes_right
+    real(dp), dimension(size(state_vectors, 2) - 1) :: &
+        eigenvalues_left, eigenvalues_right
+    integer :: ix
+
+    call reconstruct_states(limiter=options%limiter, &
+                            state_vectors=state_vectors, &
+                            states_left=states_left, &
+                            states_right=states_right)
+
+    call calculate_fluxes(state_vectors=states_left, fluxes=fluxes_left)
+    call calculate_fluxes(state_vectors=states_right, fluxes=fluxes_right)
+
+    call calculate_eigenvalues(state_vectors=states_left, &
+                               eigenvalues=eigenvalues_left)
+
+    call calculate_eigenvalues(state_vectors=states_right, &
+                               eigenvalues=eigenvalues_right)
+
+    !$omp parallel do
+    do ix = 1, size(interface_fluxes, 2)
+        call single_interface_flux( &
+            options=options, &
+            state_vector_left=states_left(:, ix), &
+            state_vector_right=states_right(:, ix), &
+            flux_left=fluxes_left(:, ix), &
+            flux_right=fluxes_right(:, ix), &
+            eigenvalue_left=eigenvalues_left(ix), &
+            eigenvalue_right=eigenvalues_right(ix), &
+            flux=interface_fluxes(:, ix))
+    end do
+    !$omp end parallel do
 end subroutine
 
 
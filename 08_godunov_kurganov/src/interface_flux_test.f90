@@ -1,9 +1,10 @@
 module InterfaceFluxTest
 use Types, only: dp
-use AssertsTest, only: assert_approx
+use AssertsTest, only: assert_approx, assert_true
 
 use InterfaceFlux, only: godunov_flux, single_interface_flux, &
-                         calculate_interface_fluxes
+                         calculate_interface_fluxes, limited_slope, &
+                         reconstruct_states
 
 use Settings, only: program_settings
 implicit none
@@ -169,6 +170,96 @@ subroutine calculate_interface_fluxes_test(failures)
 end
 
 
+subroutine limited_slope_test(failures)
+    integer, intent(inout) :: failures
+
+    call assert_approx(limited_slope("minmod", 1._dp, 3._dp), 1._dp, &
+                       1e-13_dp, __FILE__, __LINE__, failures)
+
+    call assert_approx(limited_slope("minmod", -3._dp, -1._dp), -1._dp, &
+                       1e-13_dp, __FILE__, __LINE__, failures)
+
+    call assert_approx(limited_slope("vanleer", 1._dp, 3._dp), 1.5_dp, &
+                       1e-13_dp, __FILE__, __LINE__, failures)
+
+    call assert_approx(limited_slope("mc", 1._dp, 3._dp), 2._dp, &
+                       1e-13_dp, __FILE__, __LINE__, failures)
+
+    call assert_approx(limited_slope("mc", 1._dp, 1.2_dp), 1.1_dp, &
+                       1e-13_dp, __FILE__, __LINE__, failures)
+
+    call assert_approx(limited_slope("mc", -0.1_dp, -3._dp), -0.2_dp, &
+                       1e-13_dp, __FILE__, __LINE__, failures)
+
+    ! Extrema
+    call assert_approx(limited_slope("minmod", 1._dp, -3._dp), 0._dp, &
+                       1e-13_dp, __FILE__, __LINE__, failures)
+
+    call assert_approx(limited_slope("vanleer", -1._dp, 3._dp), 0._dp, &
+                       1e-13_dp, __FILE__, __LINE__, failures)
+
+    call assert_approx(limited_slope("mc", 0._dp, 3._dp), 0._dp, &
+                       1e-13_dp, __FILE__, __LINE__, failures)
+end
+
+
+subroutine reconstruct_states_test(failures)
+    integer, intent(inout) :: failures
+    real(dp) :: state_vectors(1, 6)
+    real(dp) :: states_left(1, 5), states_right(1, 5)
+
+    ! Four cells and two ghost cells from the periodic domain
+    state_vectors(1, :) = [4, 1, 2, 4, 4, 1]
+
+    call reconstruct_states(limiter="minmod", state_vectors=state_vectors, &
+                            states_left=states_left, states_right=states_right)
+
+    ! Slopes of the cells are 0, 1, 0, 0, the first and the last
+    ! cells are extrema
+    call assert_true(all(abs(states_left(1, :) &
+                             - [4._dp, 1._dp, 2.5_dp, 4._dp, 4._dp]) &
+                         < 1e-13_dp), &
+                     __FILE__, __LINE__, failures)
+
+    call assert_true(all(abs(states_right(1, :) &
+                             - [1._dp, 1.5_dp, 4._dp, 4._dp, 1._dp]) &
+                         < 1e-13_dp), &
+                     __FILE__, __LINE__, failures)
+end
+
+
+subroutine calculate_interface_fluxes_test__limiter(failures)
+    integer, intent(inout) :: failures
+    type(program_settings) :: options
+    real(dp) :: eigenvalues(6)
+    real(dp) :: state_vectors(1, 6), fluxes(1, 6)
+    real(dp) :: interface_fluxes(1, 5)
+
+    options%method = 'kurganov'
+    options%limiter = 'minmod'
+    state_vectors(1, :) = [4, 1, 2, 4, 4, 1]
+
+    ! Not used with a limiter, the fluxes are calculated from
+    ! the reconstructed states
+    eigenvalues = -1
+    fluxes = -1
+
+    call calculate_interface_fluxes(options=options, &
+        fluxes=fluxes, &
+        eigenvalues=eigenvalues, &
+        state_vectors=state_vectors, &
+        interface_fluxes=interface_fluxes)
+
+    ! Interface between 1 and 1.5
+    call assert_approx(interface_fluxes(1, 2), 0.4375_dp, 1e-13_dp, &
+                       __FILE__, __LINE__, failures)
+
+    ! Interface between 4 and 4
+    call assert_approx(interface_fluxes(1, 4), 8._dp, 1e-13_dp, &
+                       __FILE__, __LINE__, failures)
+end
+
+
 subroutine interface_flux_test_all(failures)
     integer, intent(inout) :: failures
 
@@ -182,6 +273,10 @@ subroutine interface_flux_test_all(failures)
     call single_interface_flux_test__kurganov(failures)
 
     call calculate_interface_fluxes_test(failures)
+
+    call limited_slope_test(failures)
+    call reconstruct_states_test(failures)
+    call calculate_interface_fluxes_test__limiter(failures)
 end
 
 end module InterfaceFluxTest
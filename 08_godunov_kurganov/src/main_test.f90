@@ -6,11 +6,17 @@ program MainTest
     use FileUtilsTest, only: file_utils_test_all
     use EquationTest, only: equation_test_all
     use OutputTest, only: output_test_all
+    use ChunkedOutputTest, only: chunked_output_test_all
     use GridTest, only: grid_test_all
+    use SnapshotsTest, only: snapshots_test_all
     use InitialConditionsTest, only: init_test_all
     use StepTest, only: step_test_all
     use PhysicsTest, only: physics_test_all
     use InterfaceFluxTest, only: interface_flux_test_all
+    use AmrOutputTest, only: amr_output_test_all
+    use AmrTest, only: amr_test_all
+    use Output2DTest, only: output_2d_test_all
+    use Split2DTest, only: split_2d_test_all
     implicit none
 
     integer :: failures = 0
@@ -24,11 +30,17 @@ program MainTest
     call file_utils_test_all(failures)
     call equation_test_all(failures)
     call output_test_all(failures)
+    call chunked_output_test_all(failures)
     call grid_test_all(failures)
+    call snapshots_test_all(failures)
     call init_test_all(failures)
     call step_test_all(failures)
     call physics_test_all(failures)
     call interface_flux_test_all(failures)
+    call amr_output_test_all(failures)
+    call amr_test_all(failures)
+    call output_2d_test_all(failures)
+    call split_2d_test_all(failures)
 
     if (failures == 0) then
         print *, NEW_LINE('h')//'Tests finished successfully'
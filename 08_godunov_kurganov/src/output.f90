@@ -5,7 +5,11 @@ module Output
 use Types, only: dp
 implicit none
 private
-public :: write_output
+public :: write_output, open_stream, write_stream_header, &
+          write_stream_frame, STANDARD_OUTPUT
+
+! Output path meaning that the solution is streamed to standard output
+character(len=*), parameter :: STANDARD_OUTPUT = "-"
 
 contains
 
@@ -25,23 +29,119 @@ contains
 !
 ! t_points : A 1D array containing the values of t
 !
-subroutine write_output(filename, primitive_vectors, x_points, t_points)
+! indices : (optional) indices of the time levels to be printed.
+!           The time levels are written directly from
+!           `primitive_vectors`, without copying them to another array.
+!           If not present, all time levels are printed.
+!
+subroutine write_output(filename, primitive_vectors, x_points, t_points, &
+                        indices)
+
     character(len=*), intent(in) :: filename
     real(dp), intent(in) :: primitive_vectors(:, :, :)
     real(dp), intent(in) :: x_points(:), t_points(:)
-    integer :: out_unit
+    integer, intent(in), optional :: indices(:)
+    integer, allocatable :: levels(:)
+    integer :: out_unit, i
+
+    if (present(indices)) then
+        allocate(levels(size(indices)))
+        levels(:) = indices
+    else
+        allocate(levels(size(t_points)))
+        levels(:) = [(i, i = 1, size(t_points))]
+    end if
 
     open(newunit=out_unit, file=filename, form="unformatted", action="write", &
         status="replace")
 
     write(out_unit) size(x_points)
-    write(out_unit) size(t_points)
+    write(out_unit) size(levels)
     write(out_unit) size(primitive_vectors, 1)
     write(out_unit) x_points
-    write(out_unit) t_points
-    write(out_unit) primitive_vectors
+    write(out_unit) t_points(levels)
+    write(out_unit) (primitive_vectors(:, :, levels(i)), i = 1, size(levels))
 
     close(unit=out_unit)
 end subroutine
 
+
+!
+! Opens a file for streaming the solution while it is being calculated.
+! See README.md for description of the stream format.
+!
+! Inputs:
+! --------
+!
+! filename : Name of the file. If STANDARD_OUTPUT ("-"), the solution
+!            is written to the standard output.
+!
+! Outputs:
+! --------
+!
+! out_unit : unit number of the opened file
+!
+subroutine open_stream(filename, out_unit)
+    character(len=*), intent(in) :: filename
+    integer, intent(out) :: out_unit
+
+    if (trim(filename) == STANDARD_OUTPUT) then
+        open(newunit=out_unit, file="/dev/stdout", access="stream", &
+            form="unformatted", action="write", status="old")
+    else
+        open(newunit=out_unit, file=filename, access="stream", &
+            form="unformatted", action="write", status="replace")
+    end if
+end subroutine
+
+
+!
+! Writes the header of the stream. It is followed by the frames
+! written with `write_stream_frame`.
+!
+! Inputs:
+! --------
+!
+! out_unit : unit number of the stream, see `open_stream`
+!
+! x_points : A 1D array containing the values of x
+!
+! state_vector_dimension : number of primitive variables at each x
+!
+subroutine write_stream_header(out_unit, x_points, state_vector_dimension)
+    integer, intent(in) :: out_unit
+    real(dp), intent(in) :: x_points(:)
+    integer, intent(in) :: state_vector_dimension
+
+    write(out_unit) size(x_points)
+    write(out_unit) state_vector_dimension
+    write(out_unit) x_points
+    flush(out_unit)
+end subroutine
+
+
+!
+! Writes the solution at one time value to the stream. The frame
+! is flushed, so the reader receives it before the next time step
+! is calculated.
+!
+! Inputs:
+! --------
+!
+! out_unit : unit number of the stream, see `open_stream`
+!
+! t : the value of time
+!
+! primitive_vectors : array containing primitive vectors for all x values
+!
+subroutine write_stream_frame(out_unit, t, primitive_vectors)
+    integer, intent(in) :: out_unit
+    real(dp), intent(in) :: t
+    real(dp), intent(in) :: primitive_vectors(:, :)
+
+    write(out_unit) t
+    write(out_unit) primitive_vectors
+    flush(out_unit)
+end subroutine
+
 end module Output
\ No newline at end of file
@@ -0,0 +1,70 @@
+!
+! Write two-dimensional solution to a file in the 2D format
+!
+module Output2D
+use Types, only: dp
+implicit none
+private
+public :: write_2d_header, write_2d_frame, OUTPUT_2D_MAGIC
+
+! The first bytes of the file identifying the format
+character(len=8), parameter :: OUTPUT_2D_MAGIC = "BURG2D01"
+
+contains
+
+!
+! Writes the header of the 2D file. It is followed by the frames
+! written with `write_2d_frame`. See README.md for description
+! of the file format.
+!
+! Inputs:
+! --------
+!
+! out_unit : unit number of the stream, see `open_stream` in Output module
+!
+! nx, ny : the numbers of cells in x and y directions
+!
+! state_vector_dimension : number of primitive variables in each cell
+!
+! x_start, x_end : the smallest and the largest x values
+!
+! y_start, y_end : the smallest and the largest y values
+!
+subroutine write_2d_header(out_unit, nx, ny, state_vector_dimension, &
+                           x_start, x_end, y_start, y_end)
+
+    integer, intent(in) :: out_unit, nx, ny, state_vector_dimension
+    real(dp), intent(in) :: x_start, x_end, y_start, y_end
+
+    write(out_unit) OUTPUT_2D_MAGIC
+    write(out_unit) nx, ny, state_vector_dimension
+    write(out_unit) x_start, x_end, y_start, y_end
+    flush(out_unit)
+end subroutine
+
+
+!
+! Writes the solution at one time value. The frame is flushed, so
+! the reader receives it before the next time step is calculated.
+!
+! Inputs:
+! --------
+!
+! out_unit : unit number of the stream
+!
+! t : the value of time
+!
+! primitive_vectors : primitive vectors in the cells, the dimensions
+!                     are state vector, x and y indices
+!
+subroutine write_2d_frame(out_unit, t, primitive_vectors)
+    integer, intent(in) :: out_unit
+    real(dp), intent(in) :: t
+    real(dp), intent(in) :: primitive_vectors(:, :, :)
+
+    write(out_unit) t
+    write(out_unit) primitive_vectors
+    flush(out_unit)
+end subroutine
+
+end module Output2D
@@ -0,0 +1,78 @@
+module Output2DTest
+use Types, only: dp
+use Output2D, only: write_2d_header, write_2d_frame, OUTPUT_2D_MAGIC
+use Output, only: open_stream
+use FileUtils, only: delete_file
+use AssertsTest, only: assert_true, assert_approx, assert_equal
+implicit none
+private
+public output_2d_test_all
+
+contains
+
+subroutine write_2d_output_test(failures)
+    integer, intent(inout) :: failures
+    integer :: out_unit, unit, nx, ny, dimension
+    real(dp) :: x_start, x_end, y_start, y_end, t, values(1, 3, 2)
+    character(len=8) :: magic
+
+    call open_stream(filename="test_2d.dat", out_unit=out_unit)
+
+    call write_2d_header(out_unit=out_unit, nx=3, ny=2, &
+                         state_vector_dimension=1, x_start=0._dp, &
+                         x_end=1._dp, y_start=-1._dp, y_end=2._dp)
+
+    call write_2d_frame(out_unit=out_unit, t=0.1_dp, &
+        primitive_vectors=reshape([1._dp, 2._dp, 3._dp, 4._dp, 5._dp, &
+                                   6._dp], [1, 3, 2]))
+
+    close(unit=out_unit)
+
+    open(newunit=unit, file="test_2d.dat", form='unformatted', &
+        access='stream', status='old', action='read' )
+
+    ! Header
+    ! ----------
+
+    read (unit) magic
+    call assert_true(magic == OUTPUT_2D_MAGIC, __FILE__, __LINE__, failures)
+
+    read (unit) nx, ny, dimension
+    call assert_equal(nx, 3, __FILE__, __LINE__, failures)
+    call assert_equal(ny, 2, __FILE__, __LINE__, failures)
+    call assert_equal(dimension, 1, __FILE__, __LINE__, failures)
+
+    read (unit) x_start, x_end, y_start, y_end
+    call assert_approx(x_start, 0._dp, 1e-15_dp, __FILE__, __LINE__, failures)
+    call assert_approx(x_end, 1._dp, 1e-15_dp, __FILE__, __LINE__, failures)
+    call assert_approx(y_start, -1._dp, 1e-15_dp, __FILE__, __LINE__, failures)
+    call assert_approx(y_end, 2._dp, 1e-15_dp, __FILE__, __LINE__, failures)
+
+    ! Frame
+    ! ----------
+
+    read (unit) t, values
+    call assert_approx(t, 0.1_dp, 1e-15_dp, __FILE__, __LINE__, failures)
+
+    ! The x index changes first
+    call assert_true(all(abs(values(1, :, 1) - [1._dp, 2._dp, 3._dp]) &
+                         < 1e-15_dp), &
+                     __FILE__, __LINE__, failures)
+
+    call assert_true(all(abs(values(1, :, 2) - [4._dp, 5._dp, 6._dp]) &
+                         < 1e-15_dp), &
+                     __FILE__, __LINE__, failures)
+
+    close(unit=unit)
+
+    call delete_file("test_2d.dat")
+end
+
+
+subroutine output_2d_test_all(failures)
+    integer, intent(inout) :: failures
+
+    call write_2d_output_test(failures)
+end
+
+end module Output2DTest
@@ -1,6 +1,7 @@
 module OutputTest
 use AssertsTest, only: assert_true
-use Output, only: write_output
+use Output, only: write_output, open_stream, write_stream_header, &
+                  write_stream_frame
 use Types, only: dp
 use FileUtils, only: file_exists, delete_file
 use AssertsTest, only: assert_true, assert_approx, assert_equal
@@ -86,10 +87,125 @@ subroutine write_output_test(failures)
 end
 
 
+subroutine write_output_test__indices(failures)
+    integer, intent(inout) :: failures
+    real(dp) :: state_vectors(1, 4, 4)
+    real(dp) :: primitive_vectors_read(1, 2, 2)
+    real(dp) :: x_points_read(2), t_points_read(2)
+    integer :: unit, nx, nt, state_vector_dimension, i
+
+    state_vectors = reshape([(i, i = 1, 16)], shape(state_vectors))
+
+    ! Write the second and fourth time levels without the ghost cells
+    call write_output(filename="test_output_indices.dat", &
+                      primitive_vectors=state_vectors(:, 2:3, :), &
+                      x_points=[1.1_dp, 1.2_dp], &
+                      t_points=[0.1_dp, 0.2_dp, 0.3_dp, 0.4_dp], &
+                      indices=[2, 4])
+
+    open(newunit=unit, file="test_output_indices.dat", form='unformatted', &
+        status='old', action='read' )
+
+    read (unit) nx
+    call assert_equal(nx, 2, __FILE__, __LINE__, failures)
+
+    read (unit) nt
+    call assert_equal(nt, 2, __FILE__, __LINE__, failures)
+
+    read (unit) state_vector_dimension
+    read (unit) x_points_read
+    read (unit) t_points_read
+
+    call assert_true(all(abs(t_points_read - [0.2_dp, 0.4_dp]) < 1e-15_dp), &
+                     __FILE__, __LINE__, failures)
+
+    read (unit) primitive_vectors_read
+
+    call assert_true(all(abs(primitive_vectors_read(1, :, 1) - [6, 7]) &
+                         < 1e-15_dp), __FILE__, __LINE__, failures)
+
+    call assert_true(all(abs(primitive_vectors_read(1, :, 2) - [14, 15]) &
+                         < 1e-15_dp), __FILE__, __LINE__, failures)
+
+    close(unit=unit)
+
+    call delete_file("test_output_indices.dat")
+end
+
+
+subroutine write_stream_test(failures)
+    integer, intent(inout) :: failures
+    real(dp) :: x_points_read(2), frame_read(1, 2), t
+    integer :: out_unit, unit
+    integer :: nx, state_vector_dimension
+
+    call open_stream(filename="test_stream.dat", out_unit=out_unit)
+
+    call write_stream_header(out_unit=out_unit, &
+                             x_points=[1.1_dp, 1.2_dp], &
+                             state_vector_dimension=1)
+
+    call write_stream_frame(out_unit=out_unit, t=0.1_dp, &
+                            primitive_vectors=reshape([1._dp, 2._dp], [1, 2]))
+
+    call write_stream_frame(out_unit=out_unit, t=0.2_dp, &
+                            primitive_vectors=reshape([3._dp, 4._dp], [1, 2]))
+
+    close(unit=out_unit)
+
+    open(newunit=unit, file="test_stream.dat", form='unformatted', &
+        access='stream', status='old', action='read' )
+
+    ! Header
+    ! ----------
+
+    read (unit) nx
+    call assert_equal(nx, 2, __FILE__, __LINE__, failures)
+
+    read (unit) state_vector_dimension
+    call assert_equal(state_vector_dimension, 1, __FILE__, __LINE__, failures)
+
+    read (unit) x_points_read
+
+    call assert_approx(x_points_read(1), 1.1_dp, 1e-5_dp, &
+                       __FILE__, __LINE__, failures)
+
+    call assert_approx(x_points_read(2), 1.2_dp, 1e-5_dp, &
+                       __FILE__, __LINE__, failures)
+
+    ! Frames
+    ! ----------
+
+    read (unit) t, frame_read
+    call assert_approx(t, 0.1_dp, 1e-5_dp, __FILE__, __LINE__, failures)
+
+    call assert_approx(frame_read(1, 1), 1._dp, 1e-5_dp, &
+                       __FILE__, __LINE__, failures)
+
+    call assert_approx(frame_read(1, 2), 2._dp, 1e-5_dp, &
+                       __FILE__, __LINE__, failures)
+
+    read (unit) t, frame_read
+    call assert_approx(t, 0.2_dp, 1e-5_dp, __FILE__, __LINE__, failures)
+
+    call assert_approx(frame_read(1, 1), 3._dp, 1e-5_dp, &
+                       __FILE__, __LINE__, failures)
+
+    call assert_approx(frame_read(1, 2), 4._dp, 1e-5_dp, &
+                       __FILE__, __LINE__, failures)
+
+    close(unit=unit)
+
+    call delete_file("test_stream.dat")
+end
+
+
 subroutine output_test_all(failures)
     integer, intent(inout) :: failures
 
     call write_output_test(failures)
+    call write_output_test__indices(failures)
+    call write_stream_test(failures)
 end
 
 end module OutputTest
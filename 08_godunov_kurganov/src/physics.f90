@@ -6,8 +6,9 @@ use Types, only: dp
 implicit none
 private
 public :: many_state_vectors_to_primitive, &
+          state_vectors_to_primitive_in_place, &
           many_primitive_vectors_to_state_vectors, &
-          calculate_fluxes, calculate_eigenvalues
+          calculate_fluxes, calculate_eigenvalues, largest_eigenvalue
 
 contains
 
@@ -69,6 +70,27 @@ subroutine many_state_vectors_to_primitive(state_vectors, primitive_vectors)
 end subroutine
 
 
+!
+! Converts state vectors to primitive variables in place, without
+! allocating a separate array for the primitive vectors
+!
+! Inputs/Outputs:
+! -------
+!
+! vectors : on input the state vectors, on output the primitive vectors
+!
+subroutine state_vectors_to_primitive_in_place(vectors)
+    real(dp), intent(inout) :: vectors(:, :)
+
+    ! For Burgers' equation primitive vector is also a state vector,
+    ! so the values do not change
+    if (size(vectors, 1) /= 1) then
+        write (0, *) "Unsupported dimension of state vector"
+        call exit(41)
+    end if
+end subroutine
+
+
 !
 ! Calculates fluxes from state vectors
 !
@@ -88,10 +110,12 @@ subroutine calculate_fluxes(state_vectors, fluxes)
     real(dp), intent(inout) :: fluxes(:, :)
     integer :: i
 
-    forall(i = 1: size(state_vectors, 2))
+    !$omp parallel do
+    do i = 1, size(state_vectors, 2)
         ! Flux for Burgers equation
         fluxes(1, i) = 0.5_dp * state_vectors(1, i)**2
-    end forall
+    end do
+    !$omp end parallel do
 end subroutine
 
 
@@ -114,11 +138,38 @@ subroutine calculate_eigenvalues(state_vectors, eigenvalues)
     real(dp), intent(out) :: eigenvalues(:)
     integer :: i
 
-    forall(i = 1: size(state_vectors, 2))
+    !$omp parallel do
+    do i = 1, size(state_vectors, 2)
         ! Eigenvalue for Burgers equation is velocity
         eigenvalues(i) = abs(state_vectors(1, i))
-    end forall
+    end do
+    !$omp end parallel do
 end subroutine
 
 
+!
+! Returns the largest eigenvalue. The result does not depend on the
+! number of threads, since the maximum does not depend on the order
+! in which the values are compared.
+!
+! Inputs:
+! -------
+!
+! eigenvalues : array of eigenvalues
+!
+function largest_eigenvalue(eigenvalues) result(largest)
+    real(dp), intent(in) :: eigenvalues(:)
+    real(dp) :: largest
+    integer :: i
+
+    largest = -huge(largest)
+
+    !$omp parallel do reduction(max:largest)
+    do i = 1, size(eigenvalues)
+        largest = max(largest, eigenvalues(i))
+    end do
+    !$omp end parallel do
+end function
+
+
 end module Physics
\ No newline at end of file
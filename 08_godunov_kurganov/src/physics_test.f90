@@ -4,7 +4,9 @@ use AssertsTest, only: assert_true, assert_equal, assert_approx
 
 use Physics, only: many_primitive_vectors_to_state_vectors, &
                    many_state_vectors_to_primitive, &
-                   calculate_fluxes, calculate_eigenvalues
+                   state_vectors_to_primitive_in_place, &
+                   calculate_fluxes, calculate_eigenvalues, &
+                   largest_eigenvalue
 
 implicit none
 private
@@ -102,13 +104,42 @@ subroutine calculate_eigenvalues_test(failures)
 end
 
 
+subroutine largest_eigenvalue_test(failures)
+    integer, intent(inout) :: failures
+    real(dp) :: eigenvalues(1000)
+    integer :: i
+
+    eigenvalues = [(modulo(i * 37, 1000) * 0.001_dp, i = 1, 1000)]
+
+    call assert_approx(largest_eigenvalue(eigenvalues), 0.999_dp, 1e-15_dp, &
+                       __FILE__, __LINE__, failures)
+
+    call assert_approx(largest_eigenvalue([2._dp, 1._dp]), 2._dp, 1e-15_dp, &
+                       __FILE__, __LINE__, failures)
+end
+
+
+subroutine state_vectors_to_primitive_in_place_test(failures)
+    integer, intent(inout) :: failures
+    real(dp) :: vectors(1, 3)
+
+    vectors = reshape([1, 2, 3], shape(vectors))
+
+    call state_vectors_to_primitive_in_place(vectors=vectors)
+
+    call assert_true(all(abs(vectors(1, :) - [1, 2, 3]) < 1e-15_dp), &
+                     __FILE__, __LINE__, failures)
+end
+
 subroutine physics_test_all(failures)
     integer, intent(inout) :: failures
 
     call many_primitive_vectors_to_state_vectors_test(failures)
     call many_state_vectors_to_primitive_test(failures)
+    call state_vectors_to_primitive_in_place_test(failures)
     call calculate_fluxes_test(failures)
     call calculate_eigenvalues_test(failures)
+    call largest_eigenvalue_test(failures)
 end
 
 end module PhysicsTest
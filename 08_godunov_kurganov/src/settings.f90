@@ -3,7 +3,7 @@
 !
 module Settings
 use Types, only: dp
-use String, only: string_is_empty
+use String, only: string_is_empty, string_to_number
 use Constants, only: pi
 
 use CommandLineArgs, only: parsed_args, get_positional_value,&
@@ -48,6 +48,53 @@ type, public :: program_settings
     ! Numerical method used: ('square', 'sine')
     character(len=1024) :: initial_conditions
 
+    ! Slope limiter of the second-order reconstruction:
+    ! none, minmod, vanleer, mc. If none, the cell values are
+    ! constant and the method is first order.
+    character(len=1024) :: limiter = "none"
+
+    ! Write every `output_stride`-th time level to the output
+    integer :: output_stride = 1
+
+    ! The maximum number of time levels written to the output,
+    ! zero if all time levels are written
+    integer :: max_frames = 0
+
+    ! Write only the time levels nearest to these times.
+    ! Not allocated if the times are not specified.
+    real(dp), allocatable :: output_times(:)
+
+    ! Format of the output file: binary, chunked, stream
+    character(len=1024) :: output_format = "binary"
+
+    ! The number of time levels in a chunk of the chunked format
+    integer :: chunk_size = 64
+
+    ! Precision of the solution in the chunked format: double, single
+    character(len=1024) :: precision = "double"
+
+    ! Compression of chunks in the chunked format: none, zlib
+    character(len=1024) :: compression = "none"
+
+    ! The number of OpenMP threads used to calculate the solution
+    integer :: threads = 1
+
+    ! The number of levels of adaptive mesh refinement (AMR). Each level
+    ! has cells twice smaller than the previous one. If 1, the grid
+    ! is uniform and AMR is not used.
+    integer :: amr_levels = 1
+
+    ! The cells are refined where the detector value exceeds the threshold
+    real(dp) :: amr_threshold = 0.01_dp
+
+    ! Detector of the cells that need refinement: gradient, shock
+    character(len=1024) :: amr_detector = "gradient"
+
+    ! The number of y points in the grid. If positive, the equation is
+    ! solved in two dimensions with dimensional splitting. The y values
+    ! are in the same range as the x values.
+    integer :: ny = 0
+
     ! Dimension of the state vector
     ! For Burger's equation, state vector has one element: velocity
     integer :: state_vector_dimension = 1
@@ -66,12 +113,26 @@ character(len=HELP_MESSAGE_LENGTH), parameter :: HELP_MESSAGE = &
     &"//NEW_LINE('h')//"&
     & ./build/main OUTPUT [--method=kurganov] [--initial_conditions=square]"&
     //NEW_LINE('h')//"&
-    &       [--x_start=0] [--x_end=1] [--nx=100] [--t_start=0]"&
+    &       [--limiter=none]"&
+    //NEW_LINE('h')//"&
+    &       [--x_start=0] [--x_end=1] [--nx=100] [--ny=0] [--t_start=0]"&
     //NEW_LINE('h')//"&
     &       [--t_end=1] [--courant_factor=0.5]"&
     //NEW_LINE('h')//"&
+    &       [--output_stride=1 | --max_frames=0 | --output_times=LIST]"&
+    //NEW_LINE('h')//"&
+    &       [--format=binary] [--chunk_size=64] [--precision=double]"&
+    //NEW_LINE('h')//"&
+    &       [--compression=none] [--threads=1]"&
+    //NEW_LINE('h')//"&
+    &       [--amr_levels=1] [--amr_threshold=0.01]"&
+    //NEW_LINE('h')//"&
+    &       [--amr_detector=gradient]"&
+    //NEW_LINE('h')//"&
     &"//NEW_LINE('h')//"&
-    &    OUTPUT : path to the output data file"//NEW_LINE('h')//"&
+    &    OUTPUT : path to the output data file. If '-', the solution"&
+    //NEW_LINE('h')//"&
+    &             is streamed to the standard output."//NEW_LINE('h')//"&
     &"//NEW_LINE('h')//"&
     &    --method=NAME : numerical method to use"//NEW_LINE('h')//"&
     &                  (godunov, kurganov)."&
@@ -82,6 +143,14 @@ character(len=HELP_MESSAGE_LENGTH), parameter :: HELP_MESSAGE = &
     //NEW_LINE('h')//"&
     &                  Default: square."//NEW_LINE('h')//"&
     &"//NEW_LINE('h')//"&
+    &    --limiter=NAME : slope limiter of the second-order"&
+    //NEW_LINE('h')//"&
+    &                  reconstruction with SSP-RK2 time steps"&
+    //NEW_LINE('h')//"&
+    &                  (none, minmod, vanleer, mc). If none, the method"&
+    //NEW_LINE('h')//"&
+    &                  is first order. Default: none."//NEW_LINE('h')//"&
+    &"//NEW_LINE('h')//"&
     &    --x_start=NUMBER : the smallest x value,"//NEW_LINE('h')//"&
     &                  Default: 0."//NEW_LINE('h')//"&
     &"//NEW_LINE('h')//"&
@@ -91,6 +160,15 @@ character(len=HELP_MESSAGE_LENGTH), parameter :: HELP_MESSAGE = &
     &    --nx=NUMBER : number of x points in the grid,"//NEW_LINE('h')//"&
     &                  Default: 100."//NEW_LINE('h')//"&
     &"//NEW_LINE('h')//"&
+    &    --ny=NUMBER : number of y points. If positive, solves"&
+    //NEW_LINE('h')//"&
+    &                  u_t + u u_x + u u_y = 0 on the square domain with"&
+    //NEW_LINE('h')//"&
+    &                  the y values in the range of x values, and writes"&
+    //NEW_LINE('h')//"&
+    &                  the solution in the 2D format. Default: 0 (1D)."&
+    //NEW_LINE('h')//"&
+    &"//NEW_LINE('h')//"&
     &    --t_start=NUMBER : the smallest t value,"//NEW_LINE('h')//"&
     &                  Default: 0."//NEW_LINE('h')//"&
     &"//NEW_LINE('h')//"&
@@ -101,6 +179,66 @@ character(len=HELP_MESSAGE_LENGTH), parameter :: HELP_MESSAGE = &
     //NEW_LINE('h')//"&
     &                  Default: 0.5."//NEW_LINE('h')//"&
     &"//NEW_LINE('h')//"&
+    &    --output_stride=NUMBER : write every NUMBER-th time level."&
+    //NEW_LINE('h')//"&
+    &                  The last time level is always written."&
+    //NEW_LINE('h')//"&
+    &                  Default: 1."//NEW_LINE('h')//"&
+    &"//NEW_LINE('h')//"&
+    &    --max_frames=NUMBER : write at most NUMBER time levels, evenly"&
+    //NEW_LINE('h')//"&
+    &                  spaced in time, including the last one."&
+    //NEW_LINE('h')//"&
+    &                  Default: 0 (write all time levels)."&
+    //NEW_LINE('h')//"&
+    &"//NEW_LINE('h')//"&
+    &    --output_times=LIST : comma-separated list of times, for example"&
+    //NEW_LINE('h')//"&
+    &                  0.1,0.5. Write only the time levels nearest"&
+    //NEW_LINE('h')//"&
+    &                  to these times."//NEW_LINE('h')//"&
+    &"//NEW_LINE('h')//"&
+    &    --format=NAME : format of the output file (binary, chunked,"&
+    //NEW_LINE('h')//"&
+    &                  stream). Default: binary."//NEW_LINE('h')//"&
+    &"//NEW_LINE('h')//"&
+    &    --chunk_size=NUMBER : number of time levels in a chunk"&
+    //NEW_LINE('h')//"&
+    &                  of the chunked format. Default: 64."&
+    //NEW_LINE('h')//"&
+    &"//NEW_LINE('h')//"&
+    &    --precision=NAME : precision of the solution in the chunked"&
+    //NEW_LINE('h')//"&
+    &                  format (double, single). Default: double."&
+    //NEW_LINE('h')//"&
+    &"//NEW_LINE('h')//"&
+    &    --compression=NAME : compression of the chunks in the chunked"&
+    //NEW_LINE('h')//"&
+    &                  format (none, zlib). Default: none."&
+    //NEW_LINE('h')//"&
+    &"//NEW_LINE('h')//"&
+    &    --threads=NUMBER : number of threads used to calculate"&
+    //NEW_LINE('h')//"&
+    &                  the solution. Default: 1."&
+    //NEW_LINE('h')//"&
+    &"//NEW_LINE('h')//"&
+    &    --amr_levels=NUMBER : number of levels of adaptive mesh"&
+    //NEW_LINE('h')//"&
+    &                  refinement, each level has twice smaller cells."&
+    //NEW_LINE('h')//"&
+    &                  The solution is written in the AMR format."&
+    //NEW_LINE('h')//"&
+    &                  Default: 1 (uniform grid)."//NEW_LINE('h')//"&
+    &"//NEW_LINE('h')//"&
+    &    --amr_threshold=NUMBER : cells are refined where the detector"&
+    //NEW_LINE('h')//"&
+    &                  value exceeds NUMBER. Default: 0.01."&
+    //NEW_LINE('h')//"&
+    &"//NEW_LINE('h')//"&
+    &    --amr_detector=NAME : detector of cells to refine (gradient,"&
+    //NEW_LINE('h')//"&
+    &                  shock). Default: gradient."//NEW_LINE('h')//"&
+    &"//NEW_LINE('h')//"&
     &    --help  : show this message."//NEW_LINE('h')
 
 ! Default values for the settings
@@ -109,13 +247,35 @@ character(len=HELP_MESSAGE_LENGTH), parameter :: HELP_MESSAGE = &
 real(dp), parameter :: DEFAULT_X_START = 0._dp
 real(dp), parameter :: DEFAULT_X_END = 1._dp
 integer, parameter :: DEFAULT_NX = 100
+integer, parameter :: DEFAULT_NY = 0
 
 real(dp), parameter :: DEFAULT_T_START = 0._dp
 real(dp), parameter :: DEFAULT_T_END = 1._dp
 real(dp), parameter :: DEFAULT_COURANT_FACTOR = 0.5_dp
+integer, parameter :: DEFAULT_OUTPUT_STRIDE = 1
+integer, parameter :: DEFAULT_MAX_FRAMES = 0
+integer, parameter :: DEFAULT_CHUNK_SIZE = 64
+integer, parameter :: DEFAULT_THREADS = 1
+integer, parameter :: DEFAULT_AMR_LEVELS = 1
+real(dp), parameter :: DEFAULT_AMR_THRESHOLD = 0.01_dp
 
 character(len=100), parameter :: DEFAULT_METHOD = "godunov"
 character(len=100), parameter :: DEFAULT_INITIAL_CONDITIONS = "square"
+character(len=100), parameter :: DEFAULT_LIMITER = "none"
+character(len=100), parameter :: DEFAULT_AMR_DETECTOR = "gradient"
+
+character(len=100), parameter :: DEFAULT_OUTPUT_FORMAT = "binary"
+character(len=100), parameter :: DEFAULT_PRECISION = "double"
+character(len=100), parameter :: DEFAULT_COMPRESSION = "none"
+
+character(len=100), parameter :: ALLOWED_OUTPUT_FORMATS(3) = &
+     [character(len=100) :: 'binary', 'chunked', 'stream']
+
+character(len=100), parameter :: ALLOWED_PRECISIONS(2) = &
+     [character(len=100) :: 'double', 'single']
+
+character(len=100), parameter :: ALLOWED_COMPRESSIONS(2) = &
+     [character(len=100) :: 'none', 'zlib']
 
 character(len=100), parameter :: ALLOWED_METHODS(2) = &
      [character(len=100) :: 'godunov', 'kurganov']
@@ -124,6 +284,12 @@ character(len=100), parameter :: ALLOWED_METHODS(2) = &
 character(len=100), parameter :: ALLOWED_INITIAL_CONDITIONS(2) = &
      [character(len=100) :: 'square', 'sine']
 
+character(len=100), parameter :: ALLOWED_LIMITERS(4) = &
+     [character(len=100) :: 'none', 'minmod', 'vanleer', 'mc']
+
+character(len=100), parameter :: ALLOWED_AMR_DETECTORS(2) = &
+     [character(len=100) :: 'gradient', 'shock']
+
 contains
 
 !
@@ -185,6 +351,56 @@ subroutine make_message(text, message)
         "Run with --help for help."
 end subroutine
 
+!
+! Reads a comma-separated list of numbers, for example "0.1,0.5".
+!
+! Inputs:
+! --------
+!
+! text: the list of numbers
+!
+!
+! Outputs:
+! -------
+!
+! numbers : the numbers read from `text`.
+!
+! success : .true. if all the numbers were successfully read.
+!
+subroutine read_list_of_numbers(text, numbers, success)
+    character(len=*), intent(in) :: text
+    real(dp), allocatable, intent(out) :: numbers(:)
+    logical, intent(out) :: success
+    integer :: i, count, start, separator
+
+    count = 1
+
+    do i = 1, len_trim(text)
+        if (text(i:i) == ',') count = count + 1
+    end do
+
+    allocate(numbers(count))
+    start = 1
+
+    do i = 1, count
+        separator = index(text(start:), ',')
+
+        if (separator == 0) then
+            separator = len_trim(text) + 1
+        else
+            separator = start + separator - 1
+        end if
+
+        success = .not. string_is_empty(text(start:separator - 1))
+        if (.not. success) return
+
+        call string_to_number(text(start:separator - 1), numbers(i), success)
+        if (.not. success) return
+
+        start = separator + 1
+    end do
+end subroutine
+
 !
 ! Reads settings from parsed command line arguments.
 !
@@ -207,8 +423,9 @@ subroutine read_from_parsed_command_line(parsed, settings, error_message)
     character(len=*), intent(out) :: error_message
     logical :: success
     character(len=ARGUMENT_MAX_LENGTH), allocatable :: unrecognized(:)
-    integer :: unrecognized_count
-    character(len=ARGUMENT_MAX_LENGTH) :: valid_args(12)
+    integer :: unrecognized_count, output_selections
+    character(len=ARGUMENT_MAX_LENGTH) :: output_times
+    character(len=ARGUMENT_MAX_LENGTH) :: valid_args(24)
 
     error_message = ""
 
@@ -236,6 +453,19 @@ subroutine read_from_parsed_command_line(parsed, settings, error_message)
     valid_args(9) = "initial_conditions"
     valid_args(10) = "h"
     valid_args(11) = "help"
+    valid_args(12) = "output_stride"
+    valid_args(13) = "max_frames"
+    valid_args(14) = "output_times"
+    valid_args(15) = "format"
+    valid_args(16) = "chunk_size"
+    valid_args(17) = "precision"
+    valid_args(18) = "compression"
+    valid_args(19) = "threads"
+    valid_args(20) = "limiter"
+    valid_args(21) = "amr_levels"
+    valid_args(22) = "amr_threshold"
+    valid_args(23) = "amr_detector"
+    valid_args(24) = "ny"
 
     call unrecognized_named_args(valid=valid_args, parsed=parsed, &
         unrecognized=unrecognized, count=unrecognized_count)
@@ -344,6 +574,165 @@ subroutine read_from_parsed_command_line(parsed, settings, error_message)
         return
     end if
 
+    ! output_stride
+    ! --------------
+
+    call get_named_value_or_default(name='output_stride', parsed=parsed, &
+                                    default=DEFAULT_OUTPUT_STRIDE, &
+                                    value=settings%output_stride, &
+                                    success=success)
+
+    if (.not. success) then
+        call make_message("output_stride is not a number", error_message)
+        return
+    end if
+
+    if (settings%output_stride < 1) then
+        call make_message("output_stride must be positive", error_message)
+        return
+    end if
+
+    ! max_frames
+    ! --------------
+
+    call get_named_value_or_default(name='max_frames', parsed=parsed, &
+                                    default=DEFAULT_MAX_FRAMES, &
+                                    value=settings%max_frames, &
+                                    success=success)
+
+    if (.not. success) then
+        call make_message("max_frames is not a number", error_message)
+        return
+    end if
+
+    if (settings%max_frames < 0) then
+        call make_message("max_frames must not be negative", error_message)
+        return
+    end if
+
+    ! output_times
+    ! --------------
+
+    call get_named_value_or_default(name='output_times', parsed=parsed, &
+                                    default="", value=output_times, &
+                                    success=success)
+
+    if (.not. string_is_empty(output_times)) then
+        call read_list_of_numbers(text=output_times, &
+                                  numbers=settings%output_times, &
+                                  success=success)
+
+        if (.not. success) then
+            call make_message("output_times is not a list of numbers", &
+                              error_message)
+            return
+        end if
+    end if
+
+    output_selections = 0
+    if (settings%output_stride /= DEFAULT_OUTPUT_STRIDE) &
+        output_selections = output_selections + 1
+    if (settings%max_frames /= DEFAULT_MAX_FRAMES) &
+        output_selections = output_selections + 1
+    if (allocated(settings%output_times)) &
+        output_selections = output_selections + 1
+
+    if (output_selections > 1) then
+        call make_message("Only one of output_stride, max_frames and &
+                          &output_times can be used", error_message)
+        return
+    end if
+
+    ! format
+    ! --------------
+
+    call get_named_value_or_default(name='format', parsed=parsed, &
+                                    default=DEFAULT_OUTPUT_FORMAT, &
+                                    value=settings%output_format, &
+                                    success=success)
+
+    if (.not. success) then
+        call make_message("Failed to read format", error_message)
+        return
+    end if
+
+    if (.not. any(ALLOWED_OUTPUT_FORMATS == settings%output_format)) then
+        call make_message("Incorrect format", error_message)
+        return
+    end if
+
+    ! chunk_size
+    ! --------------
+
+    call get_named_value_or_default(name='chunk_size', parsed=parsed, &
+                                    default=DEFAULT_CHUNK_SIZE, &
+                                    value=settings%chunk_size, &
+                                    success=success)
+
+    if (.not. success) then
+        call make_message("chunk_size is not a number", error_message)
+        return
+    end if
+
+    if (settings%chunk_size < 1) then
+        call make_message("chunk_size must be positive", error_message)
+        return
+    end if
+
+    ! precision
+    ! --------------
+
+    call get_named_value_or_default(name='precision', parsed=parsed, &
+                                    default=DEFAULT_PRECISION, &
+                                    value=settings%precision, &
+                                    success=success)
+
+    if (.not. success) then
+        call make_message("Failed to read precision", error_message)
+        return
+    end if
+
+    if (.not. any(ALLOWED_PRECISIONS == settings%precision)) then
+        call make_message("Incorrect precision", error_message)
+        return
+    end if
+
+    ! compression
+    ! --------------
+
+    call get_named_value_or_default(name='compression', parsed=parsed, &
+                                    default=DEFAULT_COMPRESSION, &
+                                    value=settings%compression, &
+                                    success=success)
+
+    if (.not. success) then
+        call make_message("Failed to read compression", error_message)
+        return
+    end if
+
+    if (.not. any(ALLOWED_COMPRESSIONS == settings%compression)) then
+        call make_message("Incorrect compression", error_message)
+        return
+    end if
+
+    ! threads
+    ! --------------
+
+    call get_named_value_or_default(name='threads', parsed=parsed, &
+                                    default=DEFAULT_THREADS, &
+                                    value=settings%threads, &
+                                    success=success)
+
+    if (.not. success) then
+        call make_message("threads is not a number", error_message)
+        return
+    end if
+
+    if (settings%threads < 1) then
+        call make_message("threads must be positive", error_message)
+        return
+    end if
+
     ! method
     ! --------------
 
@@ -379,6 +768,128 @@ subroutine read_from_parsed_command_line(parsed, settings, error_message)
         call make_message("Incorrect initial_conditions", error_message)
         return
     end if
+
+    ! limiter
+    ! --------------
+
+    call get_named_value_or_default(name='limiter', parsed=parsed, &
+                                    default=DEFAULT_LIMITER, &
+                                    value=settings%limiter, success=success)
+
+    if (.not. success) then
+        call make_message("Failed to read limiter", error_message)
+        return
+    end if
+
+    if (.not. any(ALLOWED_LIMITERS == settings%limiter)) then
+        call make_message("Incorrect limiter name", error_message)
+        return
+    end if
+
+    ! amr_levels
+    ! --------------
+
+    call get_named_value_or_default(name='amr_levels', parsed=parsed, &
+                                    default=DEFAULT_AMR_LEVELS, &
+                                    value=settings%amr_levels, &
+                                    success=success)
+
+    if (.not. success) then
+        call make_message("amr_levels is not a number", error_message)
+        return
+    end if
+
+    if (settings%amr_levels < 1) then
+        call make_message("amr_levels must be positive", error_message)
+        return
+    end if
+
+    if (settings%amr_levels > 1) then
+        if (settings%limiter /= "none") then
+            call make_message("limiter can not be used with amr_levels", &
+                              error_message)
+            return
+        end if
+
+        if (settings%output_format /= DEFAULT_OUTPUT_FORMAT) then
+            call make_message("format can not be used with amr_levels", &
+                              error_message)
+            return
+        end if
+    end if
+
+    ! amr_threshold
+    ! --------------
+
+    call get_named_value_or_default(name='amr_threshold', parsed=parsed, &
+                                    default=DEFAULT_AMR_THRESHOLD, &
+                                    value=settings%amr_threshold, &
+                                    success=success)
+
+    if (.not. success) then
+        call make_message("amr_threshold is not a number", error_message)
+        return
+    end if
+
+    if (settings%amr_threshold <= 0) then
+        call make_message("amr_threshold must be positive", error_message)
+        return
+    end if
+
+    ! amr_detector
+    ! --------------
+
+    call get_named_value_or_default(name='amr_detector', parsed=parsed, &
+                                    default=DEFAULT_AMR_DETECTOR, &
+                                    value=settings%amr_detector, &
+                                    success=success)
+
+    if (.not. success) then
+        call make_message("Failed to read amr_detector", error_message)
+        return
+    end if
+
+    if (.not. any(ALLOWED_AMR_DETECTORS == settings%amr_detector)) then
+        call make_message("Incorrect amr_detector name", error_message)
+        return
+    end if
+
+    ! ny
+    ! --------------
+
+    call get_named_value_or_default(name='ny', parsed=parsed, &
+                                    default=DEFAULT_NY, &
+                                    value=settings%ny, success=success)
+
+    if (.not. success) then
+        call make_message("ny is not a number", error_message)
+        return
+    end if
+
+    if (settings%ny < 0) then
+        call make_message("ny can not be negative", error_message)
+        return
+    end if
+
+    if (settings%ny > 0) then
+        if (settings%limiter /= "none") then
+            call make_message("limiter can not be used with ny", &
+                              error_message)
+            return
+        end if
+
+        if (settings%amr_levels > 1) then
+            call make_message("amr_levels can not be used with ny", &
+                              error_message)
+            return
+        end if
+
+        if (settings%output_format /= DEFAULT_OUTPUT_FORMAT) then
+            call make_message("format can not be used with ny", &
+                              error_message)
+            return
+        end if
+    end if
 end subroutine
 
 end module Settings
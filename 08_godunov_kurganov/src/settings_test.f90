@@ -57,6 +57,14 @@ subroutine read_from_parsed_command_line_test__no_args(failures)
 
     call assert_equal(settings%initial_conditions, 'square', &
                       __FILE__, __LINE__, failures)
+
+    call assert_equal(settings%limiter, 'none', __FILE__, __LINE__, failures)
+    call assert_equal(settings%amr_levels, 1, __FILE__, __LINE__, failures)
+
+    call assert_equal(settings%amr_detector, 'gradient', &
+                      __FILE__, __LINE__, failures)
+
+    call assert_equal(settings%ny, 0, __FILE__, __LINE__, failures)
 end
 
 subroutine read_from_parsed_command_line_test__named(failures)
@@ -176,6 +184,331 @@ subroutine read_from_parsed_command_line_test__incorrect_method(failures)
 end
 
 
+subroutine read_from_parsed_command_line_test__output_times(failures)
+    integer, intent(inout) :: failures
+    type(parsed_args) :: parsed
+    type(program_settings) :: settings
+    character(len=1024) :: error_message
+
+    call allocate_parsed(size=1, parsed=parsed)
+
+    parsed%positional_count = 1
+    parsed%positional(1) = "data.bin"
+    parsed%named_count = 1
+    parsed%named_name(1) = "output_times"
+    parsed%named_value(1) = "0.5,0.1,2"
+
+    call read_from_parsed_command_line(parsed=parsed, settings=settings, &
+                                       error_message=error_message)
+
+    call assert_true(string_is_empty(error_message), &
+                     __FILE__, __LINE__, failures)
+
+    call assert_equal(size(settings%output_times), 3, &
+                      __FILE__, __LINE__, failures)
+
+    call assert_approx(settings%output_times(1), 0.5_dp, 1e-5_dp, &
+                       __FILE__, __LINE__, failures)
+
+    call assert_approx(settings%output_times(2), 0.1_dp, 1e-5_dp, &
+                       __FILE__, __LINE__, failures)
+
+    call assert_approx(settings%output_times(3), 2._dp, 1e-5_dp, &
+                       __FILE__, __LINE__, failures)
+
+    call assert_equal(settings%output_stride, 1, __FILE__, __LINE__, failures)
+    call assert_equal(settings%max_frames, 0, __FILE__, __LINE__, failures)
+end
+
+
+subroutine read_from_parsed_command_line_test__output_conflict(failures)
+    integer, intent(inout) :: failures
+    type(parsed_args) :: parsed
+    type(program_settings) :: settings
+    character(len=1024) :: error_message
+
+    call allocate_parsed(size=2, parsed=parsed)
+
+    parsed%positional_count = 1
+    parsed%positional(1) = "data.bin"
+    parsed%named_count = 2
+    parsed%named_name(1) = "output_stride"
+    parsed%named_value(1) = "3"
+    parsed%named_name(2) = "max_frames"
+    parsed%named_value(2) = "10"
+
+    call read_from_parsed_command_line(parsed=parsed, settings=settings, &
+                                       error_message=error_message)
+
+    call assert_string_starts_with(error_message, &
+                                   "ERROR: Only one of output_stride", &
+                                   __FILE__, __LINE__, failures)
+end
+
+
+subroutine read_from_parsed_command_line_test__chunked(failures)
+    integer, intent(inout) :: failures
+    type(parsed_args) :: parsed
+    type(program_settings) :: settings
+    character(len=1024) :: error_message
+
+    call allocate_parsed(size=4, parsed=parsed)
+
+    parsed%positional_count = 1
+    parsed%positional(1) = "data.bin"
+    parsed%named_count = 4
+    parsed%named_name(1) = "format"
+    parsed%named_value(1) = "chunked"
+    parsed%named_name(2) = "chunk_size"
+    parsed%named_value(2) = "16"
+    parsed%named_name(3) = "precision"
+    parsed%named_value(3) = "single"
+    parsed%named_name(4) = "compression"
+    parsed%named_value(4) = "zlib"
+
+    call read_from_parsed_command_line(parsed=parsed, settings=settings, &
+                                       error_message=error_message)
+
+    call assert_true(string_is_empty(error_message), &
+                     __FILE__, __LINE__, failures)
+
+    call assert_equal(settings%output_format, "chunked", &
+                      __FILE__, __LINE__, failures)
+
+    call assert_equal(settings%chunk_size, 16, __FILE__, __LINE__, failures)
+
+    call assert_equal(settings%precision, "single", &
+                      __FILE__, __LINE__, failures)
+
+    call assert_equal(settings%compression, "zlib", &
+                      __FILE__, __LINE__, failures)
+end
+
+
+subroutine read_from_parsed_command_line_test__incorrect_format(failures)
+    integer, intent(inout) :: failures
+    type(parsed_args) :: parsed
+    type(program_settings) :: settings
+    character(len=1024) :: error_message
+
+    call allocate_parsed(size=1, parsed=parsed)
+
+    parsed%positional_count = 1
+    parsed%positional(1) = "data.bin"
+    parsed%named_count = 1
+    parsed%named_name(1) = "format"
+    parsed%named_value(1) = "hdf5"
+
+    call read_from_parsed_command_line(parsed=parsed, settings=settings, &
+                                       error_message=error_message)
+
+    call assert_string_starts_with(error_message, &
+                                   "ERROR: Incorrect format", &
+                                   __FILE__, __LINE__, failures)
+end
+
+
+subroutine read_from_parsed_command_line_test__threads(failures)
+    integer, intent(inout) :: failures
+    type(parsed_args) :: parsed
+    type(program_settings) :: settings
+    character(len=1024) :: error_message
+
+    call allocate_parsed(size=1, parsed=parsed)
+
+    parsed%positional_count = 1
+    parsed%positional(1) = "data.bin"
+    parsed%named_count = 1
+    parsed%named_name(1) = "threads"
+    parsed%named_value(1) = "4"
+
+    call read_from_parsed_command_line(parsed=parsed, settings=settings, &
+                                       error_message=error_message)
+
+    call assert_true(string_is_empty(error_message), &
+                     __FILE__, __LINE__, failures)
+
+    call assert_equal(settings%threads, 4, __FILE__, __LINE__, failures)
+
+    parsed%named_value(1) = "0"
+
+    call read_from_parsed_command_line(parsed=parsed, settings=settings, &
+                                       error_message=error_message)
+
+    call assert_string_starts_with(error_message, &
+                                   "ERROR: threads must be positive", &
+                                   __FILE__, __LINE__, failures)
+end
+
+
+subroutine read_from_parsed_command_line_test__limiter(failures)
+    integer, intent(inout) :: failures
+    type(parsed_args) :: parsed
+    type(program_settings) :: settings
+    character(len=1024) :: error_message
+
+    call allocate_parsed(size=1, parsed=parsed)
+
+    parsed%positional_count = 1
+    parsed%positional(1) = "data.bin"
+    parsed%named_count = 1
+    parsed%named_name(1) = "limiter"
+    parsed%named_value(1) = "vanleer"
+
+    call read_from_parsed_command_line(parsed=parsed, settings=settings, &
+                                       error_message=error_message)
+
+    call assert_true(string_is_empty(error_message), &
+                     __FILE__, __LINE__, failures)
+
+    call assert_equal(settings%limiter, 'vanleer', __FILE__, __LINE__, &
+                      failures)
+
+    parsed%named_value(1) = "superbee"
+
+    call read_from_parsed_command_line(parsed=parsed, settings=settings, &
+                                       error_message=error_message)
+
+    call assert_string_starts_with(error_message, &
+                                   "ERROR: Incorrect limiter name", &
+                                   __FILE__, __LINE__, failures)
+end
+
+
+subroutine read_from_parsed_command_line_test__amr(failures)
+    integer, intent(inout) :: failures
+    type(parsed_args) :: parsed
+    type(program_settings) :: settings
+    character(len=1024) :: error_message
+
+    call allocate_parsed(size=3, parsed=parsed)
+
+    parsed%positional_count = 1
+    parsed%positional(1) = "data.bin"
+    parsed%named_count = 3
+    parsed%named_name(1) = "amr_levels"
+    parsed%named_value(1) = "3"
+    parsed%named_name(2) = "amr_threshold"
+    parsed%named_value(2) = "0.2"
+    parsed%named_name(3) = "amr_detector"
+    parsed%named_value(3) = "shock"
+
+    call read_from_parsed_command_line(parsed=parsed, settings=settings, &
+                                       error_message=error_message)
+
+    call assert_true(string_is_empty(error_message), &
+                     __FILE__, __LINE__, failures)
+
+    call assert_equal(settings%amr_levels, 3, __FILE__, __LINE__, failures)
+
+    call assert_approx(settings%amr_threshold, 0.2_dp, 1e-10_dp, &
+                       __FILE__, __LINE__, failures)
+
+    call assert_equal(settings%amr_detector, 'shock', &
+                      __FILE__, __LINE__, failures)
+
+    ! Incorrect detector
+    parsed%named_value(3) = "curvature"
+
+    call read_from_parsed_command_line(parsed=parsed, settings=settings, &
+                                       error_message=error_message)
+
+    call assert_string_starts_with(error_message, &
+                                   "ERROR: Incorrect amr_detector name", &
+                                   __FILE__, __LINE__, failures)
+
+    ! Threshold must be positive
+    parsed%named_value(2) = "0"
+    parsed%named_value(3) = "gradient"
+
+    call read_from_parsed_command_line(parsed=parsed, settings=settings, &
+                                       error_message=error_message)
+
+    call assert_string_starts_with(error_message, &
+                                   "ERROR: amr_threshold must be positive", &
+                                   __FILE__, __LINE__, failures)
+
+    ! The limiter is not supported by AMR
+    parsed%named_name(2) = "limiter"
+    parsed%named_value(2) = "minmod"
+
+    call read_from_parsed_command_line(parsed=parsed, settings=settings, &
+                                       error_message=error_message)
+
+    call assert_string_starts_with(error_message, &
+        "ERROR: limiter can not be used with amr_levels", &
+        __FILE__, __LINE__, failures)
+
+    ! Levels must be positive
+    parsed%named_value(1) = "0"
+
+    call read_from_parsed_command_line(parsed=parsed, settings=settings, &
+                                       error_message=error_message)
+
+    call assert_string_starts_with(error_message, &
+                                   "ERROR: amr_levels must be positive", &
+                                   __FILE__, __LINE__, failures)
+end
+
+
+subroutine read_from_parsed_command_line_test__ny(failures)
+    integer, intent(inout) :: failures
+    type(parsed_args) :: parsed
+    type(program_settings) :: settings
+    character(len=1024) :: error_message
+
+    call allocate_parsed(size=2, parsed=parsed)
+
+    parsed%positional_count = 1
+    parsed%positional(1) = "data.bin"
+    parsed%named_count = 1
+    parsed%named_name(1) = "ny"
+    parsed%named_value(1) = "64"
+
+    call read_from_parsed_command_line(parsed=parsed, settings=settings, &
+                                       error_message=error_message)
+
+    call assert_true(string_is_empty(error_message), &
+                     __FILE__, __LINE__, failures)
+
+    call assert_equal(settings%ny, 64, __FILE__, __LINE__, failures)
+
+    ! The limiter is not supported in two dimensions
+    parsed%named_count = 2
+    parsed%named_name(2) = "limiter"
+    parsed%named_value(2) = "mc"
+
+    call read_from_parsed_command_line(parsed=parsed, settings=settings, &
+                                       error_message=error_message)
+
+    call assert_string_starts_with(error_message, &
+        "ERROR: limiter can not be used with ny", &
+        __FILE__, __LINE__, failures)
+
+    ! AMR is not supported in two dimensions
+    parsed%named_name(2) = "amr_levels"
+    parsed%named_value(2) = "2"
+
+    call read_from_parsed_command_line(parsed=parsed, settings=settings, &
+                                       error_message=error_message)
+
+    call assert_string_starts_with(error_message, &
+        "ERROR: amr_levels can not be used with ny", &
+        __FILE__, __LINE__, failures)
+
+    ! Negative number of points
+    parsed%named_count = 1
+    parsed%named_value(1) = "-1"
+
+    call read_from_parsed_command_line(parsed=parsed, settings=settings, &
+                                       error_message=error_message)
+
+    call assert_string_starts_with(error_message, &
+                                   "ERROR: ny can not be negative", &
+                                   __FILE__, __LINE__, failures)
+end
+
+
 subroutine show_help_test(failures)
     integer, intent(inout) :: failures
     type(parsed_args) :: parsed
@@ -222,6 +555,14 @@ subroutine settings_test_all(failures)
     call read_from_parsed_command_line_test__no_args(failures)
     call read_from_parsed_command_line_test__named(failures)
     call read_from_parsed_command_line_test__incorrect_method(failures)
+    call read_from_parsed_command_line_test__output_times(failures)
+    call read_from_parsed_command_line_test__output_conflict(failures)
+    call read_from_parsed_command_line_test__chunked(failures)
+    call read_from_parsed_command_line_test__incorrect_format(failures)
+    call read_from_parsed_command_line_test__threads(failures)
+    call read_from_parsed_command_line_test__limiter(failures)
+    call read_from_parsed_command_line_test__amr(failures)
+    call read_from_parsed_command_line_test__ny(failures)
     call show_help_test(failures)
     call read_from_command_line_test(failures)
 end
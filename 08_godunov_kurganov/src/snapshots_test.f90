@@ -0,0 +1,137 @@
+module SnapshotsTest
+use Types, only: dp
+use Settings, only: program_settings
+use Snapshots, only: output_schedule, init_schedule, select_frames, &
+                     select_output_indices
+use AssertsTest, only: assert_true, assert_equal
+implicit none
+private
+public snapshots_test_all
+
+contains
+
+subroutine select_output_indices_test__all(failures)
+    integer, intent(inout) :: failures
+    type(program_settings) :: options
+    integer, allocatable :: indices(:)
+
+    call select_output_indices(options=options, &
+                               t_points=[0._dp, 0.1_dp, 0.2_dp, 0.3_dp], &
+                               indices=indices)
+
+    call assert_equal(size(indices), 4, __FILE__, __LINE__, failures)
+    call assert_true(all(indices == [1, 2, 3, 4]), __FILE__, __LINE__, failures)
+end
+
+subroutine select_output_indices_test__stride(failures)
+    integer, intent(inout) :: failures
+    type(program_settings) :: options
+    integer, allocatable :: indices(:)
+
+    options%output_stride = 3
+
+    call select_output_indices(options=options, &
+        t_points=[0._dp, 0.1_dp, 0.2_dp, 0.3_dp, 0.4_dp, 0.5_dp], &
+        indices=indices)
+
+    ! The last time level is always included
+    call assert_equal(size(indices), 3, __FILE__, __LINE__, failures)
+    call assert_true(all(indices == [1, 4, 6]), __FILE__, __LINE__, failures)
+end
+
+subroutine select_output_indices_test__max_frames(failures)
+    integer, intent(inout) :: failures
+    type(program_settings) :: options
+    integer, allocatable :: indices(:)
+
+    options%t_start = 0
+    options%t_end = 1
+    options%max_frames = 3
+
+    call select_output_indices(options=options, &
+        t_points=[0._dp, 0.2_dp, 0.45_dp, 0.6_dp, 0.8_dp, 1.05_dp], &
+        indices=indices)
+
+    ! Times 0, 0.5 and the last time level
+    call assert_equal(size(indices), 3, __FILE__, __LINE__, failures)
+    call assert_true(all(indices == [1, 3, 6]), __FILE__, __LINE__, failures)
+end
+
+subroutine select_output_indices_test__one_frame(failures)
+    integer, intent(inout) :: failures
+    type(program_settings) :: options
+    integer, allocatable :: indices(:)
+
+    options%t_start = 0
+    options%t_end = 1
+    options%max_frames = 1
+
+    call select_output_indices(options=options, &
+        t_points=[0._dp, 0.4_dp, 0.8_dp, 1.2_dp], &
+        indices=indices)
+
+    call assert_equal(size(indices), 1, __FILE__, __LINE__, failures)
+    call assert_equal(indices(1), 4, __FILE__, __LINE__, failures)
+end
+
+subroutine select_output_indices_test__times(failures)
+    integer, intent(inout) :: failures
+    type(program_settings) :: options
+    integer, allocatable :: indices(:)
+
+    ! Unsorted times, two of them are nearest to the same time level,
+    ! and one is after the end
+    options%output_times = [0.68_dp, 2._dp, 0.04_dp, 0.33_dp, 0.29_dp]
+
+    call select_output_indices(options=options, &
+        t_points=[0._dp, 0.1_dp, 0.2_dp, 0.3_dp, 0.4_dp, 0.5_dp, 0.6_dp], &
+        indices=indices)
+
+    call assert_equal(size(indices), 3, __FILE__, __LINE__, failures)
+    call assert_true(all(indices == [1, 4, 7]), __FILE__, __LINE__, failures)
+end
+
+subroutine select_frames_test__previous(failures)
+    integer, intent(inout) :: failures
+    type(program_settings) :: options
+    type(output_schedule) :: schedule
+    integer :: frames(2), count
+
+    options%output_times = [0.12_dp, 0.19_dp]
+    call init_schedule(options=options, schedule=schedule)
+
+    call select_frames(t_previous=0._dp, t_current=0._dp, nt=1, &
+                       is_last=.false., &
+                       schedule=schedule, frames=frames, count=count)
+
+    call assert_equal(count, 0, __FILE__, __LINE__, failures)
+
+    call select_frames(t_previous=0._dp, t_current=0.1_dp, nt=2, &
+                       is_last=.false., &
+                       schedule=schedule, frames=frames, count=count)
+
+    call assert_equal(count, 0, __FILE__, __LINE__, failures)
+
+    ! Time 0.12 is nearer to the previous time level,
+    ! and time 0.19 is nearer to the current one
+    call select_frames(t_previous=0.1_dp, t_current=0.2_dp, nt=3, &
+                       is_last=.false., &
+                       schedule=schedule, frames=frames, count=count)
+
+    call assert_equal(count, 2, __FILE__, __LINE__, failures)
+    call assert_equal(frames(1), 2, __FILE__, __LINE__, failures)
+    call assert_equal(frames(2), 3, __FILE__, __LINE__, failures)
+end
+
+subroutine snapshots_test_all(failures)
+    integer, intent(inout) :: failures
+
+    call select_output_indices_test__all(failures)
+    call select_output_indices_test__stride(failures)
+    call select_output_indices_test__max_frames(failures)
+    call select_output_indices_test__one_frame(failures)
+    call select_output_indices_test__times(failures)
+    call select_frames_test__previous(failures)
+end
+
+end module SnapshotsTest
@@ -0,0 +1,516 @@
+!
+! Solves two-dimensional Burgers' equation
+!
+!   u_t + u u_x + u u_y = 0
+!
+! with Strang dimensional splitting. Each time step consists of
+! one-dimensional steps along the rows (x direction) with half
+! of the time step, along the columns (y direction) with the full time step
+! and along the rows again with half of the time step. The one-dimensional
+! steps use the same fluxes as the one-dimensional solver, with the ghost
+! cells containing the values from the other end of the periodic domain.
+!
+! The rows and the columns are divided between the threads. The loops over
+! the cells of a single row, which are parallel in the one-dimensional
+! solver, run on the thread of the row, since the nested parallel regions
+! are inactive by default.
+!
+module Split2D
+!$ use omp_lib, only: omp_set_num_threads
+use Types, only: dp
+use Settings, only: program_settings
+use FloatUtils, only: linspace
+use Output, only: open_stream
+use Output2D, only: write_2d_header, write_2d_frame
+use Snapshots, only: output_schedule, init_schedule, select_frames
+use InitialConditions, only: calculate_initial_2d
+use Physics, only: many_state_vectors_to_primitive, calculate_fluxes, &
+                   calculate_eigenvalues
+
+use InterfaceFlux, only: calculate_interface_fluxes
+use Step, only: step_finite_volume
+implicit none
+private
+public :: advance_line, sweep_rows, sweep_columns, largest_speed, &
+          strang_step, set_2d_grid, solve_2d_equation, &
+          solve_and_create_2d_output
+
+! The number of columns copied together into contiguous lines. The values
+! of neighbouring columns are next to each other in memory, so copying
+! several columns at once uses all the values of the loaded cache lines.
+integer, parameter :: COLUMN_BLOCK = 16
+
+contains
+
+
+!
+! Makes one-dimensional time step for the cells of a row or a column
+!
+! Inputs:
+! -------
+!
+! options : program options
+!
+! dt : the time step
+!
+! dx : size of the cells along the line
+!
+!
+! Outputs:
+! -------
+!
+! line : state vectors at two time levels, including the two ghost cells.
+!        The first level is the current one, its ghost cells are updated.
+!        The second level is calculated.
+!
+subroutine advance_line(options, dt, dx, line)
+    type(program_settings), intent(in) :: options
+    real(dp), intent(in) :: dt, dx
+    real(dp), intent(inout) :: line(:, :, :)
+    real(dp) :: fluxes(size(line, 1), size(line, 2))
+    real(dp) :: eigenvalues(size(line, 2))
+    real(dp) :: interface_fluxes(size(line, 1), size(line, 2) - 1)
+    integer :: n
+
+    n = size(line, 2) - 2  ! subtract two ghost points
+
+    ! The domain is periodic
+    line(:, 1, 1) = line(:, n + 1, 1)
+    line(:, n + 2, 1) = line(:, 2, 1)
+
+    call calculate_fluxes(state_vectors=line(:, :, 1), fluxes=fluxes)
+
+    call calculate_eigenvalues(state_vectors=line(:, :, 1), &
+                               eigenvalues=eigenvalues)
+
+    call calculate_interface_fluxes(options=options, fluxes=fluxes, &
+                                    eigenvalues=eigenvalues, &
+                                    state_vectors=line(:, :, 1), &
+                                    interface_fluxes=interface_fluxes)
+
+    call step_finite_volume(dx=dx, nt=2, dt=dt, &
+                            interface_fluxes=interface_fluxes, &
+                            state_vectors=line)
+end subroutine
+
+
+!
+! Makes one-dimensional time steps along all rows (x direction)
+!
+! Inputs:
+! -------
+!
+! options : program options
+!
+! dt : the time step
+!
+! dx : size of the cells in x direction
+!
+! source : the state vectors before the step. If not present,
+!          the step is made from the values in `state_vectors`.
+!
+!
+! Outputs:
+! -------
+!
+! state_vectors : the state vectors after the step, the dimensions
+!                 are state vector, x and y indices
+!
+subroutine sweep_rows(options, dt, dx, state_vectors, source)
+    type(program_settings), intent(in) :: options
+    real(dp), intent(in) :: dt, dx
+    real(dp), intent(inout) :: state_vectors(:, :, :)
+    real(dp), intent(in), optional :: source(:, :, :)
+    real(dp), allocatable :: line(:, :, :)
+    integer :: nx, iy
+
+    nx = size(state_vectors, 2)
+
+    !$omp parallel private(line)
+    allocate(line(size(state_vectors, 1), nx + 2, 2))
+
+    !$omp do
+    do iy = 1, size(state_vectors, 3)
+        if (present(source)) then
+            line(:, 2:nx + 1, 1) = source(:, :, iy)
+        else
+            line(:, 2:nx + 1, 1) = state_vectors(:, :, iy)
+        end if
+
+        call advance_line(options=options, dt=dt, dx=dx, line=line)
+        state_vectors(:, :, iy) = line(:, 2:nx + 1, 2)
+    end do
+    !$omp end do
+    !$omp end parallel
+end subroutine
+
+
+!
+! Makes one-dimensional time steps along all columns (y direction).
+! The columns are copied into contiguous lines in blocks of
+! COLUMN_BLOCK columns.
+!
+! Inputs:
+! -------
+!
+! options : program options
+!
+! dt : the time step
+!
+! dy : size of the cells in y direction
+!
+!
+! Outputs:
+! -------
+!
+! state_vectors : on input the state vectors before the step, on output
+!                 the state vectors after the step
+!
+subroutine sweep_columns(options, dt, dy, state_vectors)
+    type(program_settings), intent(in) :: options
+    real(dp), intent(in) :: dt, dy
+    real(dp), intent(inout) :: state_vectors(:, :, :)
+    real(dp), allocatable :: lines(:, :, :, :)
+    integer :: nx, ny, ix_start, columns, iy, i
+
+    nx = size(state_vectors, 2)
+    ny = size(state_vectors, 3)
+
+    !$omp parallel private(lines, columns, iy, i)
+    allocate(lines(size(state_vectors, 1), ny + 2, 2, COLUMN_BLOCK))
+
+    !$omp do
+    do ix_start = 1, nx, COLUMN_BLOCK
+        columns = min(COLUMN_BLOCK, nx - ix_start + 1)
+
+        do iy = 1, ny
+            do i = 1, columns
+                lines(:, iy + 1, 1, i) = state_vectors(:, ix_start + i - 1, iy)
+            end do
+        end do
+
+        do i = 1, columns
+            call advance_line(options=options, dt=dt, dx=dy, &
+                              line=lines(:, :, :, i))
+        end do
+
+        do iy = 1, ny
+            do i = 1, columns
+                state_vectors(:, ix_start + i - 1, iy) = lines(:, iy + 1, 2, i)
+            end do
+        end do
+    end do
+    !$omp end do
+    !$omp end parallel
+end subroutine
+
+
+!
+! Returns the largest eigenvalue in all cells
+!
+! Inputs:
+! -------
+!
+! state_vectors : the state vectors, the dimensions are state vector,
+!                 x and y indices
+!
+function largest_speed(state_vectors) result(largest)
+    real(dp), intent(in) :: state_vectors(:, :, :)
+    real(dp) :: largest
+    real(dp) :: eigenvalues(size(state_vectors, 2))
+    integer :: iy
+
+    largest = -huge(largest)
+
+    !$omp parallel do private(eigenvalues) reduction(max:largest)
+    do iy = 1, size(state_vectors, 3)
+        call calculate_eigenvalues(state_vectors=state_vectors(:, :, iy), &
+                                   eigenvalues=eigenvalues)
+
+        largest = max(largest, maxval(eigenvalues))
+    end do
+    !$omp end parallel do
+end function
+
+
+!
+! Makes one time step with Strang splitting: half of the time step
+! along the rows, the full time step along the columns and half
+! of the time step along the rows.
+!
+! Inputs:
+! -------
+!
+! options : program options
+!
+! dx, dy : sizes of the cells in x and y directions
+!
+! previous : the state vectors at the current time level
+!
+!
+! Outputs:
+! -------
+!
+! current : the state vectors at the next time level
+!
+! dt : the time step
+!
+subroutine strang_step(options, dx, dy, previous, current, dt)
+    type(program_settings), intent(in) :: options
+    real(dp), intent(in) :: dx, dy
+    real(dp), intent(in) :: previous(:, :, :)
+    real(dp), intent(inout) :: current(:, :, :)
+    real(dp), intent(out) :: dt
+
+    dt = options%courant_factor * min(dx, dy) / largest_speed(previous)
+
+    call sweep_rows(options=options, dt=0.5_dp * dt, dx=dx, &
+                    state_vectors=current, source=previous)
+
+    call sweep_columns(options=options, dt=dt, dy=dy, state_vectors=current)
+
+    call sweep_rows(options=options, dt=0.5_dp * dt, dx=dx, &
+                    state_vectors=current)
+end subroutine
+
+
+!
+! Allocates the arrays of the two-dimensional solver and sets the initial
+! conditions
+!
+! Inputs:
+! -------
+!
+! options : program options. The y values are in the range of x values.
+!
+!
+! Outputs:
+! -------
+!
+! x_points, y_points : the values of x and y at the centers of the cells
+!
+! levels : state vectors at two time levels, the dimensions are
+!          state vector, x, y and time level indices. The first level
+!          contains the initial conditions.
+!
+subroutine set_2d_grid(options, x_points, y_points, levels)
+    type(program_settings), intent(in) :: options
+    real(dp), allocatable, intent(out) :: x_points(:), y_points(:)
+    real(dp), allocatable, intent(out) :: levels(:, :, :, :)
+    real(dp) :: dx, dy
+    integer :: iy, allocate_result
+
+    allocate(x_points(options%nx), y_points(options%ny), &
+             stat=allocate_result)
+
+    if (allocate_result /= 0) then
+        write (0, *) "Failed to allocate position arrays"
+        call exit(41)
+    end if
+
+    dx = (options%x_end - options%x_start) / options%nx
+    dy = (options%x_end - options%x_start) / options%ny
+
+    call linspace(options%x_start + dx / 2, options%x_end - dx / 2, &
+                  x_points)
+
+    call linspace(options%x_start + dy / 2, options%x_end - dy / 2, &
+                  y_points)
+
+    allocate(levels(options%state_vector_dimension, options%nx, &
+                    options%ny, 2), &
+             stat=allocate_result)
+
+    if (allocate_result /= 0) then
+        write (0, *) "Failed to allocate state vector array"
+        call exit(41)
+    end if
+
+    ! The rows are first written by the threads that calculate them, so
+    ! on multi-socket machines the memory is placed near these threads
+    !$omp parallel do
+    do iy = 1, options%ny
+        levels(:, :, iy, :) = 0
+    end do
+    !$omp end parallel do
+
+    call calculate_initial_2d(type=options%initial_conditions, &
+                              x_points=x_points, y_points=y_points, &
+                              state_vectors=levels(:, :, :, 1))
+end subroutine
+
+
+!
+! Solves the equation in two dimensions
+!
+! Inputs:
+! -------
+!
+! options : program options
+!
+!
+! Outputs:
+! -------
+!
+! primitive_vectors : the solution at the last time level, the
+!                     dimensions are state vector, x and y indices
+!
+! x_points, y_points : the values of x and y at the centers of the cells
+!
+! t : the time of the solution
+!
+subroutine solve_2d_equation(options, primitive_vectors, x_points, &
+                             y_points, t)
+
+    type(program_settings), intent(in) :: options
+    real(dp), allocatable, intent(out) :: primitive_vectors(:, :, :)
+    real(dp), allocatable, intent(out) :: x_points(:), y_points(:)
+    real(dp), intent(out) :: t
+    real(dp), allocatable :: levels(:, :, :, :)
+    real(dp) :: dx, dy, dt
+    integer :: current, previous
+
+    !$ call omp_set_num_threads(options%threads)
+
+    call set_2d_grid(options=options, x_points=x_points, &
+                     y_points=y_points, levels=levels)
+
+    dx = (options%x_end - options%x_start) / options%nx
+    dy = (options%x_end - options%x_start) / options%ny
+    t = options%t_start
+    current = 1
+
+    do while (t < options%t_end)
+        ! The levels are swapped instead of copied
+        previous = current
+        current = 3 - current
+
+        call strang_step(options=options, dx=dx, dy=dy, &
+                         previous=levels(:, :, :, previous), &
+                         current=levels(:, :, :, current), dt=dt)
+
+        t = t + dt
+    end do
+
+    allocate(primitive_vectors(options%state_vector_dimension, &
+                               options%nx, options%ny))
+
+    call many_state_vectors_to_primitive( &
+        state_vectors=levels(:, :, :, current), &
+        primitive_vectors=primitive_vectors)
+end subroutine
+
+
+!
+! Writes the solution at one time level to the file in the 2D format
+!
+! Inputs:
+! -------
+!
+! out_unit : unit number of the file
+!
+! t : the value of time
+!
+! state_vectors : the state vectors, the dimensions are state vector,
+!                 x and y indices
+!
+! Outputs:
+! -------
+!
+! frame : array used to store the primitive vectors
+!
+subroutine write_frame(out_unit, t, state_vectors, frame)
+    integer, intent(in) :: out_unit
+    real(dp), intent(in) :: t
+    real(dp), intent(in) :: state_vectors(:, :, :)
+    real(dp), intent(inout) :: frame(:, :, :)
+
+    call many_state_vectors_to_primitive(state_vectors=state_vectors, &
+                                         primitive_vectors=frame)
+
+    call write_2d_frame(out_unit=out_unit, t=t, primitive_vectors=frame)
+end subroutine
+
+
+!
+! Solves the equation in two dimensions and writes the solution to
+! the file in the 2D format. Only the time levels selected with
+! `output_stride`, `max_frames` or `output_times` settings are written,
+! as soon as they are calculated. Only two time levels are kept
+! in memory.
+!
+! Inputs:
+! -------
+!
+! options : program options
+!
+subroutine solve_and_create_2d_output(options)
+    type(program_settings), intent(in) :: options
+    real(dp), allocatable :: levels(:, :, :, :), frame(:, :, :)
+    real(dp), allocatable :: x_points(:), y_points(:)
+    type(output_schedule) :: schedule
+    real(dp) :: dx, dy, dt, t_previous, t
+    integer :: out_unit, nt, frames(2), count, i, current, previous
+
+    !$ call omp_set_num_threads(options%threads)
+
+    call set_2d_grid(options=options, x_points=x_points, &
+                     y_points=y_points, levels=levels)
+
+    allocate(frame(options%state_vector_dimension, options%nx, options%ny))
+
+    dx = (options%x_end - options%x_start) / options%nx
+    dy = (options%x_end - options%x_start) / options%ny
+
+    call open_stream(filename=options%output_path, out_unit=out_unit)
+
+    call write_2d_header(out_unit=out_unit, nx=options%nx, ny=options%ny, &
+        state_vector_dimension=options%state_vector_dimension, &
+        x_start=options%x_start, x_end=options%x_end, &
+        y_start=options%x_start, y_end=options%x_end)
+
+    call init_schedule(options=options, schedule=schedule)
+    t = options%t_start
+    t_previous = t
+    nt = 1
+    current = 1
+    previous = 1
+
+    do
+        ! Write the selected time levels, they are either
+        ! the current or the previous one
+        call select_frames(t_previous=t_previous, t_current=t, nt=nt, &
+                           is_last=t >= options%t_end, schedule=schedule, &
+                           frames=frames, count=count)
+
+        do i = 1, count
+            if (frames(i) == nt) then
+                call write_frame(out_unit=out_unit, t=t, &
+                                 state_vectors=levels(:, :, :, current), &
+                                 frame=frame)
+            else
+                call write_frame(out_unit=out_unit, t=t_previous, &
+                                 state_vectors=levels(:, :, :, previous), &
+                                 frame=frame)
+            end if
+        end do
+
+        if (t >= options%t_end) exit
+
+        ! The current level becomes the previous one
+        previous = current
+        current = 3 - current
+
+        call strang_step(options=options, dx=dx, dy=dy, &
+                         previous=levels(:, :, :, previous), &
+                         current=levels(:, :, :, current), dt=dt)
+
+        nt = nt + 1
+        t_previous = t
+        t = t + dt
+    end do
+
+    close(unit=out_unit)
+end subroutine
+
+end module Split2D
@@ -0,0 +1,313 @@
+module Split2DTest
+use Types, only: dp
+use AssertsTest, only: assert_true, assert_approx, assert_equal
+use Settings, only: program_settings
+use Split2D, only: sweep_rows, sweep_columns, largest_speed, &
+                   solve_2d_equation, solve_and_create_2d_output
+use Output2D, only: OUTPUT_2D_MAGIC
+use Equation, only: solve_equation
+use FileUtils, only: file_exists, delete_file
+implicit none
+private
+public split_2d_test_all
+
+contains
+
+!
+! Returns settings for the tests
+!
+function test_options() result(options)
+    type(program_settings) :: options
+
+    options%method = 'kurganov'
+    options%initial_conditions = 'square'
+    options%x_start = 0
+    options%x_end = 1
+    options%nx = 40
+    options%ny = 30
+    options%t_start = 0
+    options%t_end = 0.3_dp
+    options%courant_factor = 0.5_dp
+end function
+
+
+!
+! Calculates the first time step of the one-dimensional solver
+!
+! Inputs:
+! -------
+!
+! method : numerical method
+!
+! nx : number of x points
+!
+!
+! Outputs:
+! -------
+!
+! primitive_vectors : the solution at the first two time levels
+!
+! dt : the time step
+!
+subroutine one_dimensional_step(method, nx, primitive_vectors, dt)
+    character(len=*), intent(in) :: method
+    integer, intent(in) :: nx
+    real(dp), allocatable, intent(out) :: primitive_vectors(:, :, :)
+    real(dp), intent(out) :: dt
+    type(program_settings) :: options
+    real(dp), allocatable :: x_points(:), t_points(:)
+
+    options = test_options()
+    options%method = method
+    options%nx = nx
+    options%ny = 0
+    options%t_end = 1e-6_dp
+
+    call solve_equation(options=options, primitive_vectors=primitive_vectors, &
+                        x_points=x_points, t_points=t_points)
+
+    dt = t_points(2)
+end subroutine
+
+
+subroutine sweep_rows_test(failures)
+    integer, intent(inout) :: failures
+    type(program_settings) :: options
+    real(dp), allocatable :: primitive_vectors(:, :, :)
+    real(dp) :: state_vectors(1, 50, 3), source(1, 50, 3), dt
+    character(len=100) :: methods(2)
+    integer :: i, iy
+
+    methods = [character(len=100) :: 'godunov', 'kurganov']
+
+    do i = 1, 2
+        options = test_options()
+        options%method = methods(i)
+
+        call one_dimensional_step(method=methods(i), nx=50, &
+                                  primitive_vectors=primitive_vectors, dt=dt)
+
+        do iy = 1, 3
+            state_vectors(:, :, iy) = primitive_vectors(:, :, 1)
+        end do
+
+        ! Each row is the same as the one-dimensional solution
+        ! -------
+
+        call sweep_rows(options=options, dt=dt, dx=0.02_dp, &
+                        state_vectors=state_vectors)
+
+        do iy = 1, 3
+            call assert_true(all(abs(state_vectors(1, :, iy) &
+                                     - primitive_vectors(1, :, 2)) &
+                                 < 1e-15_dp), &
+                             __FILE__, __LINE__, failures)
+        end do
+
+        ! Step from the values in another array
+        ! -------
+
+        source = state_vectors
+        state_vectors = 0
+
+        do iy = 1, 3
+            source(:, :, iy) = primitive_vectors(:, :, 1)
+        end do
+
+        call sweep_rows(options=options, dt=dt, dx=0.02_dp, &
+                        state_vectors=state_vectors, source=source)
+
+        call assert_true(all(abs(state_vectors(1, :, 2) &
+                                 - primitive_vectors(1, :, 2)) &
+                             < 1e-15_dp), &
+                         __FILE__, __LINE__, failures)
+
+        ! The source does not change
+        call assert_true(all(abs(source(1, :, 2) &
+                                 - primitive_vectors(1, :, 1)) &
+                             < 1e-15_dp), &
+                         __FILE__, __LINE__, failures)
+    end do
+end
+
+
+subroutine sweep_columns_test(failures)
+    integer, intent(inout) :: failures
+    type(program_settings) :: options
+    real(dp), allocatable :: primitive_vectors(:, :, :)
+    real(dp) :: state_vectors(1, 20, 50), dt
+    integer :: ix
+
+    options = test_options()
+
+    call one_dimensional_step(method='kurganov', nx=50, &
+                              primitive_vectors=primitive_vectors, dt=dt)
+
+    ! There are more columns than in one block
+    do ix = 1, 20
+        state_vectors(1, ix, :) = primitive_vectors(1, :, 1)
+    end do
+
+    call sweep_columns(options=options, dt=dt, dy=0.02_dp, &
+                       state_vectors=state_vectors)
+
+    ! Each column is the same as the one-dimensional solution
+    do ix = 1, 20
+        call assert_true(all(abs(state_vectors(1, ix, :) &
+                                 - primitive_vectors(1, :, 2)) &
+                             < 1e-15_dp), &
+                         __FILE__, __LINE__, failures)
+    end do
+end
+
+
+subroutine largest_speed_test(failures)
+    integer, intent(inout) :: failures
+    real(dp) :: state_vectors(1, 2, 3)
+
+    state_vectors = reshape([0.1_dp, -0.3_dp, 0.2_dp, 0._dp, -1.5_dp, 1._dp], &
+                            [1, 2, 3])
+
+    call assert_approx(largest_speed(state_vectors), 1.5_dp, 1e-15_dp, &
+                       __FILE__, __LINE__, failures)
+end
+
+
+subroutine solve_2d_equation_test__conservation(failures)
+    integer, intent(inout) :: failures
+    type(program_settings) :: options
+    real(dp), allocatable :: primitive_vectors(:, :, :)
+    real(dp), allocatable :: x_points(:), y_points(:)
+    real(dp) :: t
+    character(len=100) :: methods(2)
+    integer :: i
+
+    methods = [character(len=100) :: 'godunov', 'kurganov']
+
+    do i = 1, 2
+        options = test_options()
+        options%method = methods(i)
+
+        call solve_2d_equation(options=options, &
+                               primitive_vectors=primitive_vectors, &
+                               x_points=x_points, y_points=y_points, t=t)
+
+        call assert_equal(size(x_points), 40, __FILE__, __LINE__, failures)
+        call assert_equal(size(y_points), 30, __FILE__, __LINE__, failures)
+
+        call assert_approx(y_points(1), 1._dp / 60, 1e-15_dp, &
+                           __FILE__, __LINE__, failures)
+
+        call assert_true(t >= 0.3_dp, __FILE__, __LINE__, failures)
+
+        ! The integral of the solution does not change
+        call assert_approx(sum(primitive_vectors) / (40 * 30), 0.25_dp, &
+                           1e-13_dp, __FILE__, __LINE__, failures)
+
+        ! No new extrema
+        call assert_true(maxval(primitive_vectors) <= 1 + 1e-13_dp, &
+                         __FILE__, __LINE__, failures)
+
+        call assert_true(minval(primitive_vectors) >= -1e-13_dp, &
+                         __FILE__, __LINE__, failures)
+
+        ! The square moves in the direction of the diagonal
+        call assert_true(primitive_vectors(1, 35, 26) > 0.5_dp, &
+                         __FILE__, __LINE__, failures)
+
+        call assert_true(primitive_vectors(1, 6, 5) < 1e-10_dp, &
+                         __FILE__, __LINE__, failures)
+    end do
+end
+
+
+subroutine solve_2d_equation_test__threads(failures)
+    integer, intent(inout) :: failures
+    type(program_settings) :: options
+    real(dp), allocatable :: one_thread(:, :, :), three_threads(:, :, :)
+    real(dp), allocatable :: x_points(:), y_points(:)
+    real(dp) :: t
+
+    options = test_options()
+    options%initial_conditions = 'sine'
+    options%nx = 35
+
+    call solve_2d_equation(options=options, primitive_vectors=one_thread, &
+                           x_points=x_points, y_points=y_points, t=t)
+
+    options%threads = 3
+
+    call solve_2d_equation(options=options, &
+                           primitive_vectors=three_threads, &
+                           x_points=x_points, y_points=y_points, t=t)
+
+    ! The solutions are identical to the last bit
+    call assert_true(maxval(abs(one_thread - three_threads)) &
+                     < tiny(1._dp), __FILE__, __LINE__, failures)
+end
+
+
+subroutine solve_and_create_2d_output_test(failures)
+    integer, intent(inout) :: failures
+    type(program_settings) :: options
+    integer :: unit, nx, ny, dimension, frame
+    real(dp) :: x_start, x_end, y_start, y_end, t, times(3)
+    real(dp), allocatable :: values(:, :, :)
+    character(len=8) :: magic
+
+    options = test_options()
+    options%output_path = "test_2d_solution.dat"
+    options%max_frames = 3
+
+    call solve_and_create_2d_output(options)
+
+    call assert_true(file_exists("test_2d_solution.dat"), &
+                     __FILE__, __LINE__, failures)
+
+    open(newunit=unit, file="test_2d_solution.dat", form='unformatted', &
+        access='stream', status='old', action='read' )
+
+    read (unit) magic, nx, ny, dimension, x_start, x_end, y_start, y_end
+    call assert_true(magic == OUTPUT_2D_MAGIC, __FILE__, __LINE__, failures)
+    call assert_equal(nx, 40, __FILE__, __LINE__, failures)
+    call assert_equal(ny, 30, __FILE__, __LINE__, failures)
+    call assert_equal(dimension, 1, __FILE__, __LINE__, failures)
+    call assert_approx(y_start, 0._dp, 1e-15_dp, __FILE__, __LINE__, failures)
+    call assert_approx(y_end, 1._dp, 1e-15_dp, __FILE__, __LINE__, failures)
+
+    allocate(values(dimension, nx, ny))
+
+    do frame = 1, 3
+        read (unit) t, values
+        times(frame) = t
+
+        call assert_approx(sum(values) / (nx * ny), 0.25_dp, 1e-13_dp, &
+                           __FILE__, __LINE__, failures)
+    end do
+
+    ! The first frame contains the initial conditions
+    call assert_approx(times(1), 0._dp, 1e-15_dp, &
+                       __FILE__, __LINE__, failures)
+
+    call assert_true(times(2) > 0.1_dp .and. times(2) < 0.2_dp, &
+                     __FILE__, __LINE__, failures)
+
+    call assert_true(times(3) >= 0.3_dp, __FILE__, __LINE__, failures)
+
+    close(unit=unit)
+    call delete_file("test_2d_solution.dat")
+end
+
+
+subroutine split_2d_test_all(failures)
+    integer, intent(inout) :: failures
+
+    call sweep_rows_test(failures)
+    call sweep_columns_test(failures)
+    call largest_speed_test(failures)
+    call solve_2d_equation_test__conservation(failures)
+    call solve_2d_equation_test__threads(failures)
+    call solve_and_create_2d_output_test(failures)
+end
+
+end module Split2DTest
@@ -8,7 +8,7 @@ use InitialConditions, only: calculate_initial
 use InterfaceFlux, only: single_interface_flux
 implicit none
 private
-public :: step_finite_volume
+public :: step_finite_volume, average_ssp_rk2
 
 contains
 
@@ -48,10 +48,50 @@ subroutine step_finite_volume(dx, nt, dt, interface_fluxes, state_vectors)
     ! Number of x values
     nx = size(state_vectors, 2) - 2  ! subtract two ghost points
 
-    forall(i = 2 : nx + 1)
+    !$omp parallel do
+    do i = 2, nx + 1
         state_vectors(:, i, nt) = state_vectors(:, i, nt - 1) &
             - a * (interface_fluxes(:, i) - interface_fluxes(:, i-1))
-    end forall
+    end do
+    !$omp end parallel do
+end subroutine
+
+
+!
+! Calculates the state vectors at the end of the second stage of
+! the two-stage strong stability preserving Runge-Kutta method (SSP-RK2).
+! The result is the average of the state vectors at the beginning of
+! the time step and the Euler step from the first stage values
+! calculated with `step_finite_volume`.
+!
+! Inputs:
+! -------
+!
+! nt : the current time index in solutions array for which the solution needs
+!      to be calcualted. It contains the first stage values.
+!
+! stage_step : state vectors of the Euler step from the first stage values
+!
+! Outputs:
+! -------
+!
+! state_vectors : array containing the solution for the equation
+!
+subroutine average_ssp_rk2(nt, stage_step, state_vectors)
+    integer, intent(in) :: nt
+    real(dp), intent(in) :: stage_step(:, :)
+    real(dp), intent(inout) :: state_vectors(:, :, :)
+    integer :: i, nx
+
+    ! Number of x values
+    nx = size(state_vectors, 2) - 2  ! subtract two ghost points
+
+    !$omp parallel do
+    do i = 2, nx + 1
+        state_vectors(:, i, nt) = 0.5_dp * (state_vectors(:, i, nt - 1) &
+                                            + stage_step(:, i))
+    end do
+    !$omp end parallel do
 end subroutine
 
 end module Step
@@ -1,7 +1,7 @@
 module StepTest
 use Types, only: dp
 use AssertsTest, only: assert_true, assert_approx, assert_equal
-use Step, only: step_finite_volume
+use Step, only: step_finite_volume, average_ssp_rk2
 use Settings, only: program_settings
 implicit none
 private
@@ -71,10 +71,32 @@ subroutine step_finite_volume_test(failures)
 end
 
 
+subroutine average_ssp_rk2_test(failures)
+    integer, intent(inout) :: failures
+    real(dp) :: state_vectors(1, 4, 2)
+    real(dp) :: stage_step(1, 4)
+
+    state_vectors(1, :, 1) = [1._dp, 2._dp, 3._dp, 4._dp]
+    state_vectors(1, :, 2) = -42
+    stage_step(1, :) = [7._dp, 4._dp, -1._dp, 9._dp]
+
+    call average_ssp_rk2(nt=2, stage_step=stage_step, &
+                         state_vectors=state_vectors)
+
+    call assert_true(all(abs(state_vectors(1, 2:3, 2) - [3._dp, 1._dp]) &
+                         < 1e-15_dp), __FILE__, __LINE__, failures)
+
+    ! Ghost cells are untouched
+    call assert_true(all(abs(state_vectors(1, [1, 4], 2) + 42) < 1e-15_dp), &
+                     __FILE__, __LINE__, failures)
+end
+
+
 subroutine step_test_all(failures)
     integer, intent(inout) :: failures
 
     call step_finite_volume_test(failures)
+    call average_ssp_rk2_test(failures)
 end
 
 end module StepTest
@@ -0,0 +1,83 @@
+!
+! Compress data with zlib library (https://zlib.net)
+!
+module Zlib
+use, intrinsic :: iso_c_binding, only: c_int, c_long, c_int8_t, c_ptr
+implicit none
+private
+public :: compress_data
+
+! Compression level, from 1 (fastest) to 9 (smallest output)
+integer(c_int), parameter :: COMPRESSION_LEVEL = 6
+
+! Return code of zlib functions indicating success
+integer(c_int), parameter :: Z_OK = 0
+
+interface
+    ! uLong compressBound(uLong sourceLen)
+    function compressBound(source_len) bind(C, name="compressBound") &
+        result(bound)
+
+        import :: c_long
+        integer(c_long), value :: source_len
+        integer(c_long) :: bound
+    end function
+
+    ! int compress2(Bytef *dest, uLongf *destLen, const Bytef *source,
+    !               uLong sourceLen, int level)
+    function compress2(dest, dest_len, source, source_len, level) &
+        bind(C, name="compress2") result(status)
+
+        import :: c_int, c_long, c_int8_t, c_ptr
+        integer(c_int8_t), intent(out) :: dest(*)
+        integer(c_long), intent(inout) :: dest_len
+        type(c_ptr), value :: source
+        integer(c_long), value :: source_len
+        integer(c_int), value :: level
+        integer(c_int) :: status
+    end function
+end interface
+
+contains
+
+!
+! Compresses data in zlib format
+!
+! Inputs:
+! -------
+!
+! source : address of the data to compress
+!
+! source_size : the size of the data in bytes
+!
+!
+! Outputs:
+! -------
+!
+! compressed : the compressed data
+!
+! compressed_size : the size of the compressed data in bytes
+!
+subroutine compress_data(source, source_size, compressed, compressed_size)
+    type(c_ptr), intent(in) :: source
+    integer, intent(in) :: source_size
+    integer(c_int8_t), allocatable, intent(out) :: compressed(:)
+    integer, intent(out) :: compressed_size
+    integer(c_long) :: length
+    integer(c_int) :: status
+
+    length = compressBound(int(source_size, c_long))
+    allocate(compressed(length))
+
+    status = compress2(compressed, length, source, &
+                       int(source_size, c_long), COMPRESSION_LEVEL)
+
+    if (status /= Z_OK) then
+        write (0, *) "Failed to compress data"
+        call exit(41)
+    end if
+
+    compressed_size = int(length)
+end subroutine
+
+end module Zlib
@@ -0,0 +1,251 @@
+# Calculate many stellar models without making plots.
+#
+# Usage:
+#
+#   python src/batch.py jobs.csv --output=batch --workers=4
+#
+# The job file is a CSV file with the header and one model per row:
+#
+#   n,h,integrator,mass,central_density,mu
+#   3,0.001,runge_kutta,3.978e30,1e5,1.4
+#
+# where
+#   n : polytropic index
+#   h : step size for the scaled radius
+#   integrator : integration method (euler, improved_euler, runge_kutta)
+#   mass : stellar mass [kg]
+#   central_density : density at the center of the star [kg/m^3]
+#   mu : mean molecular weight
+#
+# For each job, the profiles are saved to a directory `job_00000` inside
+# the output directory (see `export` module for the format). The values
+# at the center and the surface for all jobs are saved to `summary.csv`.
+#
+import os
+import csv
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from plot_utils import create_dir
+from export import save_columns, profile_columns, PROFILE_UNITS
+from lane_emden import solve_lane_emden
+from stellar_structure import calculate_stellar_parameters
+
+from integrators import euler_integrator,\
+                        improved_euler_integrator, runge_kutta_integrator
+
+INTEGRATORS = {
+    "euler": euler_integrator,
+    "improved_euler": improved_euler_integrator,
+    "runge_kutta": runge_kutta_integrator
+}
+
+SUMMARY_FILENAME = "summary.csv"
+
+SUMMARY_COLUMNS = [
+    "job", "n", "h", "integrator", "mass", "central_density", "mu",
+    "points", "xi_surface", "dtheta_dxi_surface", "radius_surface",
+    "central_pressure", "central_temperature", "path", "error"
+]
+
+
+def read_jobs(path):
+    """
+    Reads the job file.
+
+    Parameters
+    ----------
+
+    path : str
+        Path to the job CSV file.
+
+    Returns : list of dict
+    -------
+
+    Jobs, each has keys: "n", "h", "integrator", "mass",
+    "central_density" and "mu" (see the top of this file).
+    """
+
+    jobs = []
+
+    with open(path, newline='') as file:
+        for row in csv.DictReader(file):
+            integrator = row["integrator"].strip()
+
+            if integrator not in INTEGRATORS:
+                raise ValueError(f"Incorrect integrator: {integrator}")
+
+            jobs.append({
+                "n": float(row["n"]),
+                "h": float(row["h"]),
+                "integrator": integrator,
+                "mass": float(row["mass"]),
+                "central_density": float(row["central_density"]),
+                "mu": float(row["mu"])
+            })
+
+    return jobs
+
+
+def job_path(index, output_dir):
+    """
+    Returns the path of the output directory for the job.
+
+    Parameters
+    ----------
+
+    index : int
+        Index of the job in the job file, starting from zero.
+
+    output_dir : str
+        Directory where the output of all jobs is saved.
+
+    Returns : str
+    -------
+
+    Directory path.
+    """
+
+    return os.path.join(output_dir, f"job_{index:05d}")
+
+
+def run_job(index, job, output_dir):
+    """
+    Calculates a stellar model and saves its profiles.
+
+    Parameters
+    ----------
+
+    index : int
+        Index of the job in the job file, starting from zero.
+
+    job : dict
+        Job parameters, see `read_jobs`.
+
+    output_dir : str
+        Directory where the output of all jobs is saved.
+
+    Returns : dict
+    -------
+
+    Row of the summary table with keys from `SUMMARY_COLUMNS`.
+    """
+
+    from astropy import units as u
+
+    integrator = INTEGRATORS[job["integrator"]]
+    summary = dict(job, job=index)
+
+    x, y = solve_lane_emden(step_size=job["h"],
+                            polytropic_index=job["n"],
+                            integrator=integrator)
+
+    summary["points"] = len(x)
+    summary["xi_surface"] = x[-1]
+    summary["dtheta_dxi_surface"] = y[-1, 1]
+
+    try:
+        result = calculate_stellar_parameters(
+            step_size=job["h"],
+            polytropic_index=job["n"],
+            stellar_mass=job["mass"] * u.kg,
+            central_density=job["central_density"] * u.kg / u.m**3,
+            mean_molecular_weight=job["mu"],
+            integrator=integrator,
+            solution=(x, y))
+    except (ValueError, ZeroDivisionError) as error:
+        # Stellar model can not be made, for example, for n=0
+        summary["error"] = str(error)
+        return summary
+
+    columns = dict(xi=x, theta=y[:, 0], dtheta_dxi=y[:, 1],
+                   **profile_columns(result))
+
+    path = job_path(index=index, output_dir=output_dir)
+
+    save_columns(columns=columns,
+                 metadata=dict(job, units=PROFILE_UNITS),
+                 path=path)
+
+    summary["radius_surface"] = columns["radii"][-1]
+    summary["central_pressure"] = columns["pressures"][0]
+    summary["central_temperature"] = columns["temperatures"][0]
+    summary["path"] = path
+    return summary
+
+
+def save_summary(rows, output_dir):
+    """
+    Saves the summary table to a CSV file.
+
+    Parameters
+    ----------
+
+    rows : list of dict
+        Rows of the summary table, see `run_job`.
+
+    output_dir : str
+        Directory where the summary file is saved.
+    """
+
+    create_dir(output_dir)
+    path = os.path.join(output_dir, SUMMARY_FILENAME)
+
+    with open(path, "w", newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=SUMMARY_COLUMNS)
+        writer.writeheader()
+
+        for row in rows:
+            writer.writerow(row)
+
+
+def run_batch(jobs, output_dir, workers):
+    """
+    Runs the jobs in parallel and saves the summary.
+
+    Parameters
+    ----------
+
+    jobs : list of dict
+        Job parameters, see `read_jobs`.
+
+    output_dir : str
+        Directory where the output files are saved.
+
+    workers : int
+        Number of worker processes. If 1, the jobs are run
+        in the current process.
+
+    Returns : list of dict
+    -------
+
+    Rows of the summary table, in the same order as the jobs.
+    """
+
+    indices = range(len(jobs))
+    output_dirs = [output_dir] * len(jobs)
+
+    if workers == 1:
+        rows = list(map(run_job, indices, jobs, output_dirs))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            rows = list(executor.map(run_job, indices, jobs, output_dirs))
+
+    save_summary(rows=rows, output_dir=output_dir)
+    return rows
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description="Calculate stellar models listed in a job file.")
+
+    parser.add_argument("jobs", help="path to the job CSV file")
+
+    parser.add_argument("--output", default="batch",
+                        help="directory for the output files")
+
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="number of worker processes")
+
+    args = parser.parse_args()
+    jobs = read_jobs(args.jobs)
+    run_batch(jobs=jobs, output_dir=args.output, workers=args.workers)
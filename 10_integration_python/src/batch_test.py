@@ -0,0 +1,123 @@
+import os
+import csv
+import shutil
+import pytest
+from pytest import approx
+from export import load_columns
+from batch import read_jobs, run_job, run_batch, SUMMARY_FILENAME
+
+
+def write_jobs(data_dir, rows):
+    if not os.path.exists(data_dir):
+        os.makedirs(data_dir)
+
+    path = os.path.join(data_dir, "jobs.csv")
+
+    with open(path, "w") as file:
+        file.write("n,h,integrator,mass,central_density,mu\n")
+
+        for row in rows:
+            file.write(f"{row}\n")
+
+    return path
+
+
+def test_read_jobs():
+    data_dir = "batch_test_read"
+    path = write_jobs(data_dir, ["3,0.1,runge_kutta,3.978e30,1e5,1.4",
+                                 "1, 0.01, euler, 2e30, 1e4, 0.6"])
+
+    result = read_jobs(path)
+
+    assert len(result) == 2
+
+    assert result[0] == {
+        "n": 3, "h": 0.1, "integrator": "runge_kutta",
+        "mass": 3.978e30, "central_density": 1e5, "mu": 1.4
+    }
+
+    assert result[1]["integrator"] == "euler"
+    assert result[1]["h"] == 0.01
+
+    shutil.rmtree(data_dir)
+
+
+def test_read_jobs__incorrect_integrator():
+    data_dir = "batch_test_incorrect"
+    path = write_jobs(data_dir, ["3,0.1,leapfrog,3.978e30,1e5,1.4"])
+
+    with pytest.raises(ValueError):
+        read_jobs(path)
+
+    shutil.rmtree(data_dir)
+
+
+def test_run_job():
+    output_dir = "batch_test_run_job"
+
+    job = {
+        "n": 3, "h": 0.001, "integrator": "runge_kutta",
+        "mass": 3.978e30, "central_density": 1e5, "mu": 1.4
+    }
+
+    result = run_job(index=2, job=job, output_dir=output_dir)
+
+    assert result["job"] == 2
+    assert result["points"] == 6897
+    assert result["xi_surface"] == approx(6.896, rel=1e-10)
+    assert result["radius_surface"] == approx(801161478, rel=1e-3)
+    assert result["path"] == os.path.join(output_dir, "job_00002")
+
+    data, metadata = load_columns(result["path"])
+    assert len(data["radii"]) == 6897
+    assert len(data["xi"]) == 6897
+    assert data["densities"][0] == approx(1e5, rel=1e-15)
+    assert data["temperatures"][0] == result["central_temperature"]
+    assert metadata["integrator"] == "runge_kutta"
+    assert metadata["units"]["radii"] == "m"
+
+    shutil.rmtree(output_dir)
+
+
+def test_run_job__n_zero():
+    job = {
+        "n": 0, "h": 0.1, "integrator": "euler",
+        "mass": 3.978e30, "central_density": 1e5, "mu": 1.4
+    }
+
+    result = run_job(index=0, job=job, output_dir="batch_test_n_zero")
+
+    assert result["xi_surface"] == approx(2.4, rel=1e-10)
+    assert "error" in result
+    assert "path" not in result
+    assert not os.path.exists("batch_test_n_zero")
+
+
+def test_run_batch():
+    output_dir = "batch_test_run_batch"
+
+    jobs = [
+        {
+            "n": 3, "h": 0.1, "integrator": "runge_kutta",
+            "mass": 3.978e30, "central_density": 1e5, "mu": 1.4
+        },
+        {
+            "n": 1, "h": 0.1, "integrator": "improved_euler",
+            "mass": 2e30, "central_density": 1e4, "mu": 0.6
+        }
+    ]
+
+    rows = run_batch(jobs=jobs, output_dir=output_dir, workers=2)
+
+    assert [row["job"] for row in rows] == [0, 1]
+    assert os.path.exists(os.path.join(output_dir, "job_00000"))
+    assert os.path.exists(os.path.join(output_dir, "job_00001"))
+
+    with open(os.path.join(output_dir, SUMMARY_FILENAME)) as file:
+        summary = list(csv.DictReader(file))
+
+    assert len(summary) == 2
+    assert summary[1]["integrator"] == "improved_euler"
+    assert float(summary[1]["xi_surface"]) == approx(3.1, rel=1e-10)
+
+    shutil.rmtree(output_dir)
@@ -0,0 +1,275 @@
+# Skip re-making plots and data files when their inputs have not changed.
+#
+# Each artifact (a plot or a CSV file) is made by calling a function
+# with some parameters. We record a hash of everything that affects
+# the artifact in a manifest file:
+#
+#   * function parameters,
+#   * source code of the function and of all the functions and modules
+#     from this directory it uses,
+#   * versions of Python and the libraries.
+#
+# An artifact is made again only when its hash changes, or when its file
+# is missing.
+#
+import os
+import sys
+import json
+import hashlib
+import inspect
+from importlib import metadata
+
+MANIFEST_FILENAME = ".manifest.json"
+
+# Libraries whose versions can change the content of the artifacts
+LIBRARIES = ["numpy", "pandas", "matplotlib", "astropy"]
+
+# Parameters that do not change the content of the artifacts
+IGNORED_PARAMETERS = ["show"]
+
+SOURCE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def load_manifest(path):
+    """
+    Loads the manifest from a JSON file.
+
+    Parameters
+    ----------
+
+    path : str
+        Path to the manifest file.
+
+    Returns : dict
+    -------
+
+    Input hashes of the artifacts, keyed by artifact file name.
+    Empty dictionary if the manifest file does not exist.
+    """
+
+    if not os.path.exists(path):
+        return {}
+
+    with open(path) as file:
+        return json.load(file)
+
+
+def save_manifest(manifest, path):
+    """
+    Saves the manifest into a JSON file.
+
+    Parameters
+    ----------
+
+    manifest : dict
+        Input hashes of the artifacts, keyed by artifact file name.
+
+    path : str
+        Path to the manifest file.
+    """
+
+    dir = os.path.dirname(path)
+
+    if dir != "" and not os.path.exists(dir):
+        os.makedirs(dir)
+
+    with open(path, "w") as file:
+        json.dump(manifest, file, indent=2, sort_keys=True)
+
+
+def is_local(obj):
+    """
+    Checks if a function or module is defined in this directory.
+
+    Parameters
+    ----------
+
+    obj : function or module
+
+    Returns : bool
+    -------
+
+    True if `obj` is defined in a source file from this directory.
+    """
+
+    try:
+        path = inspect.getsourcefile(obj)
+    except TypeError:
+        # Built-in object
+        return False
+
+    if path is None:
+        return False
+
+    return os.path.dirname(os.path.abspath(path)) == SOURCE_DIR
+
+
+def code_names(code):
+    """
+    Returns the global names used by the compiled code,
+    including the code of nested functions and comprehensions.
+
+    Parameters
+    ----------
+
+    code : code object
+
+    Returns : set of str
+    -------
+
+    Names of the global variables.
+    """
+
+    names = set(code.co_names)
+
+    for constant in code.co_consts:
+        if inspect.iscode(constant):
+            names |= code_names(constant)
+
+    return names
+
+
+def source_code(function):
+    """
+    Returns the source code of the function and of all the functions
+    and modules from this directory it uses, directly or indirectly.
+
+    Parameters
+    ----------
+
+    function : function
+
+    Returns : str
+    -------
+
+    Source code.
+    """
+
+    sources = []
+    visited = set()
+    stack = [function]
+
+    while len(stack) > 0:
+        obj = stack.pop()
+
+        if id(obj) in visited:
+            continue
+
+        visited.add(id(obj))
+        sources.append(inspect.getsource(obj))
+
+        if inspect.ismodule(obj):
+            continue
+
+        for name in sorted(code_names(obj.__code__), reverse=True):
+            value = obj.__globals__.get(name)
+
+            if (inspect.isfunction(value) or inspect.ismodule(value)) \
+                    and is_local(value):
+
+                stack.append(value)
+
+    return "\n".join(sources)
+
+
+def library_versions():
+    """
+    Returns the versions of Python and the libraries.
+
+    Returns : dict
+    -------
+
+    Versions keyed by library name.
+    """
+
+    versions = {"python": sys.version}
+
+    for library in LIBRARIES:
+        try:
+            versions[library] = metadata.version(library)
+        except metadata.PackageNotFoundError:
+            versions[library] = None
+
+    return versions
+
+
+def inputs_hash(function, parameters):
+    """
+    Calculates the hash of all inputs that affect the artifact.
+
+    Parameters
+    ----------
+
+    function : function
+        Function that makes the artifact.
+
+    parameters : dict
+        Keyword arguments passed to the `function`.
+
+    Returns : str
+    -------
+
+    SHA-256 hash as a hex string.
+    """
+
+    parameters = {
+        key: repr(value) for key, value in parameters.items()
+        if key not in IGNORED_PARAMETERS
+    }
+
+    inputs = {
+        "function": function.__name__,
+        "parameters": parameters,
+        "source": source_code(function),
+        "libraries": library_versions()
+    }
+
+    text = json.dumps(inputs, sort_keys=True)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def build_artifact(artifact_dir, filename, function, parameters, force):
+    """
+    Makes the artifact by calling `function(**parameters)`, unless
+    the artifact file exists and its inputs have not changed since
+    it was made last time.
+
+    Parameters
+    ----------
+
+    artifact_dir : str
+        Directory of the artifact file. The manifest file is stored there.
+
+    filename : str
+        Name of the artifact file that the `function` creates.
+
+    function : function
+        Function that makes the artifact.
+
+    parameters : dict
+        Keyword arguments passed to the `function`.
+
+    force : bool
+        If True, make the artifact even if its inputs have not changed.
+
+    Returns : bool
+    -------
+
+    True if the artifact was made, False if it was skipped.
+    """
+
+    manifest_path = os.path.join(artifact_dir, MANIFEST_FILENAME)
+    manifest = load_manifest(manifest_path)
+    current_hash = inputs_hash(function=function, parameters=parameters)
+    artifact_path = os.path.join(artifact_dir, filename)
+
+    if (not force
+            and os.path.exists(artifact_path)
+            and manifest.get(filename) == current_hash):
+
+        return False
+
+    function(**parameters)
+    manifest[filename] = current_hash
+    save_manifest(manifest=manifest, path=manifest_path)
+    return True
@@ -0,0 +1,115 @@
+import os
+import shutil
+from build_manifest import inputs_hash, source_code, build_artifact, \
+                           load_manifest, MANIFEST_FILENAME
+
+
+def helper(text):
+    return text.upper()
+
+
+def make_file(data_dir, filename, text, show):
+    if not os.path.exists(data_dir):
+        os.makedirs(data_dir)
+
+    with open(os.path.join(data_dir, filename), "w") as file:
+        file.write(helper(text))
+
+
+def test_source_code():
+    result = source_code(make_file)
+
+    assert "def make_file(" in result
+    assert "def helper(" in result
+    assert "def test_source_code(" not in result
+
+
+def test_inputs_hash():
+    parameters = {"data_dir": "a", "filename": "b", "text": "c"}
+    result = inputs_hash(function=make_file, parameters=parameters)
+
+    assert len(result) == 64
+
+    # Same inputs
+    assert inputs_hash(function=make_file, parameters=parameters) == result
+
+    # Different parameters
+    changed = dict(parameters, text="d")
+    assert inputs_hash(function=make_file, parameters=changed) != result
+
+    # The `show` parameter is ignored
+    changed = dict(parameters, show=True)
+    assert inputs_hash(function=make_file, parameters=changed) == result
+
+
+def test_build_artifact():
+    data_dir = "build_manifest_test"
+    filename = "artifact.txt"
+    file_path = os.path.join(data_dir, filename)
+
+    if os.path.exists(data_dir):
+        shutil.rmtree(data_dir)
+
+    parameters = {"data_dir": data_dir, "filename": filename,
+                  "text": "hello", "show": False}
+
+    # First build
+    # ---------
+
+    result = build_artifact(artifact_dir=data_dir, filename=filename,
+                            function=make_file, parameters=parameters,
+                            force=False)
+
+    assert result is True
+
+    with open(file_path) as file:
+        assert file.read() == "HELLO"
+
+    manifest = load_manifest(os.path.join(data_dir, MANIFEST_FILENAME))
+    assert filename in manifest
+
+    # Inputs have not changed
+    # ---------
+
+    result = build_artifact(artifact_dir=data_dir, filename=filename,
+                            function=make_file, parameters=parameters,
+                            force=False)
+
+    assert result is False
+
+    # Force
+    # ---------
+
+    result = build_artifact(artifact_dir=data_dir, filename=filename,
+                            function=make_file, parameters=parameters,
+                            force=True)
+
+    assert result is True
+
+    # Parameters have changed
+    # ---------
+
+    parameters["text"] = "bye"
+
+    result = build_artifact(artifact_dir=data_dir, filename=filename,
+                            function=make_file, parameters=parameters,
+                            force=False)
+
+    assert result is True
+
+    with open(file_path) as file:
+        assert file.read() == "BYE"
+
+    # Artifact file is missing
+    # ---------
+
+    os.remove(file_path)
+
+    result = build_artifact(artifact_dir=data_dir, filename=filename,
+                            function=make_file, parameters=parameters,
+                            force=False)
+
+    assert result is True
+    assert os.path.exists(file_path)
+
+    shutil.rmtree(data_dir)
@@ -0,0 +1,32 @@
+# Shared fixtures for unit tests
+import pytest
+from lane_emden import solve_lane_emden
+from integrators import runge_kutta_integrator
+from solution_store import clear_solutions
+
+
+@pytest.fixture(scope="session")
+def lane_emden_solution():
+    """
+    Returns a function that solves Lane-Emden equation using Runge-Kutta
+    method by default. Each solution is calculated once per test session
+    and shared by all tests, using the same store as `solve_lane_emden`.
+
+    Usage:
+
+    ```
+    def test_something(lane_emden_solution):
+        x, y = lane_emden_solution(step_size=0.001, polytropic_index=3)
+    ```
+    """
+
+    clear_solutions()
+
+    def solve(step_size, polytropic_index, integrator=runge_kutta_integrator):
+        return solve_lane_emden(step_size=step_size,
+                                polytropic_index=polytropic_index,
+                                integrator=integrator,
+                                use_store=True)
+
+    yield solve
+    clear_solutions()
@@ -0,0 +1,211 @@
+# Save and load results in a binary columnar format.
+#
+# A data set is stored in a directory, with one NumPy `.npy` file
+# per column and a `metadata.json` file containing the parameters
+# of the run. The columns are memory-mapped when loaded, so loading
+# is fast even for large data sets, and only the values that are used
+# are read from disk.
+#
+import os
+import json
+import numpy as np
+from plot_utils import create_dir
+from build_manifest import library_versions
+
+METADATA_FILENAME = "metadata.json"
+
+# Units of the stellar profiles
+PROFILE_UNITS = {
+    "radii": "m",
+    "densities": "kg / m3",
+    "pressures": "Pa",
+    "temperatures": "K"
+}
+
+SURFACE_COLUMNS = ["h", "method", "x_surface", "density_derivative_surface"]
+
+
+def save_columns(columns, metadata, path):
+    """
+    Saves columns of data and metadata to a directory.
+
+    Parameters
+    ----------
+
+    columns : dict
+        Columns keyed by name. Each column is a list or
+        a 1D numpy array of numbers or strings.
+
+    metadata : dict
+        Parameters of the run. Must be convertible to JSON.
+
+    path : str
+        Path to the data set directory.
+    """
+
+    create_dir(path)
+
+    for name, values in columns.items():
+        values = np.asarray(values)
+
+        if values.dtype == object:
+            # Strings from Panda's data frames
+            values = values.astype(str)
+
+        np.save(os.path.join(path, f"{name}.npy"), values)
+
+    metadata = dict(metadata,
+                    columns=list(columns.keys()),
+                    libraries=library_versions())
+
+    with open(os.path.join(path, METADATA_FILENAME), "w") as file:
+        json.dump(metadata, file, indent=2)
+
+
+def load_columns(path):
+    """
+    Loads columns of data and metadata saved with `save_columns`.
+
+    Parameters
+    ----------
+
+    path : str
+        Path to the data set directory.
+
+    Returns : tuple (columns, metadata)
+    -------
+
+    columns : dict
+        Columns keyed by name. Each column is a read-only
+        memory-mapped numpy array.
+
+    metadata : dict
+        Parameters of the run.
+    """
+
+    with open(os.path.join(path, METADATA_FILENAME)) as file:
+        metadata = json.load(file)
+
+    columns = {
+        name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r")
+        for name in metadata["columns"]
+    }
+
+    return columns, metadata
+
+
+def save_surface_values(df, metadata, path):
+    """
+    Saves values at the surface to a directory.
+
+    Parameters
+    ----------
+
+    df : Panda's dataframe
+        Values at the surface, see `surface.calculate_surface_values`.
+
+    metadata : dict
+        Parameters of the run, for example, {"n": 1}.
+
+    path : str
+        Path to the data set directory.
+    """
+
+    columns = {name: df[name].to_numpy() for name in SURFACE_COLUMNS}
+    save_columns(columns=columns, metadata=metadata, path=path)
+
+
+def load_surface_values(path):
+    """
+    Loads values at the surface saved with `save_surface_values`.
+
+    Parameters
+    ----------
+
+    path : str
+        Path to the data set directory.
+
+    Returns : tuple (columns, metadata)
+    -------
+
+    columns : dict
+        Memory-mapped columns "h", "method", "x_surface" and
+        "density_derivative_surface". Use `pd.DataFrame(columns)`
+        to make a Panda's data frame.
+
+    metadata : dict
+        Parameters of the run.
+    """
+
+    return load_columns(path)
+
+
+def profile_columns(result):
+    """
+    Converts stellar profiles to plain numbers in SI units.
+
+    Parameters
+    ----------
+
+    result : dict
+        Stellar profiles from `stellar_structure.calculate_stellar_parameters`.
+
+    Returns : dict
+    -------
+
+    numpy arrays keyed by "radii", "densities", "pressures" and
+    "temperatures", in units from `PROFILE_UNITS`.
+    """
+
+    return {
+        name: result[name].to(unit).value
+        for name, unit in PROFILE_UNITS.items()
+    }
+
+
+def save_profile(result, metadata, path):
+    """
+    Saves stellar profiles to a directory.
+
+    Parameters
+    ----------
+
+    result : dict
+        Stellar profiles from `stellar_structure.calculate_stellar_parameters`.
+
+    metadata : dict
+        Parameters of the run, for example polytropic index and
+        stellar mass.
+
+    path : str
+        Path to the data set directory.
+    """
+
+    save_columns(columns=profile_columns(result),
+                 metadata=dict(metadata, units=PROFILE_UNITS),
+                 path=path)
+
+
+def load_profile(path):
+    """
+    Loads stellar profiles saved with `save_profile`.
+
+    Parameters
+    ----------
+
+    path : str
+        Path to the data set directory.
+
+    Returns : tuple (columns, metadata)
+    -------
+
+    columns : dict
+        Memory-mapped profiles keyed by "radii", "densities",
+        "pressures" and "temperatures", in units given
+        by `metadata["units"]`.
+
+    metadata : dict
+        Parameters of the run.
+    """
+
+    return load_columns(path)
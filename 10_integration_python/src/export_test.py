@@ -0,0 +1,78 @@
+import shutil
+import numpy as np
+import pytest
+from pytest import approx
+from astropy import constants
+from astropy import units as u
+from surface import calculate_surface_values
+from stellar_structure import calculate_stellar_parameters
+
+from export import save_columns, load_columns, \
+                   save_surface_values, load_surface_values, \
+                   save_profile, load_profile
+
+
+def test_save_columns():
+    path = "export_test_columns"
+
+    save_columns(columns={"x": [1.5, 2.5], "name": ["a", "bc"]},
+                 metadata={"n": 3},
+                 path=path)
+
+    columns, metadata = load_columns(path)
+
+    assert isinstance(columns["x"], np.memmap)
+    assert columns["x"].tolist() == [1.5, 2.5]
+    assert columns["name"].tolist() == ["a", "bc"]
+    assert metadata["n"] == 3
+    assert metadata["columns"] == ["x", "name"]
+    assert "numpy" in metadata["libraries"]
+
+    shutil.rmtree(path)
+
+
+@pytest.mark.slow
+def test_save_surface_values():
+    path = "export_test_surface"
+    df = calculate_surface_values(n=1)
+
+    save_surface_values(df=df, metadata={"n": 1}, path=path)
+
+    columns, metadata = load_surface_values(path)
+
+    assert metadata["n"] == 1
+    assert len(columns["h"]) == 12
+    assert columns["method"][1] == "Improved Euler"
+    assert columns["h"][1] == 0.1
+    assert columns["x_surface"][1] == approx(3.1, rel=1e-15)
+
+    assert columns["density_derivative_surface"][1] == \
+        approx(-0.3259175013015985, rel=1e-15)
+
+    shutil.rmtree(path)
+
+
+def test_save_profile():
+    path = "export_test_profile"
+
+    result = calculate_stellar_parameters(
+        step_size=0.01,
+        polytropic_index=3,
+        stellar_mass=2 * constants.M_sun,
+        central_density=1e5 * u.kg / u.meter**3,
+        mean_molecular_weight=1.4)
+
+    save_profile(result=result, metadata={"n": 3, "h": 0.01}, path=path)
+
+    columns, metadata = load_profile(path)
+
+    assert metadata["h"] == 0.01
+    assert metadata["units"]["pressures"] == "Pa"
+    assert isinstance(columns["radii"], np.memmap)
+    assert len(columns["radii"]) == len(result["radii"])
+
+    for name in ["radii", "densities", "pressures", "temperatures"]:
+        assert columns[name].tolist() == \
+            approx(result[name].si.value.tolist(), rel=1e-15)
+
+    shutil.rmtree(path)
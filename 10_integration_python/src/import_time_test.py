@@ -0,0 +1,71 @@
+# Check that importing the modules that do calculations is fast.
+# Each import is measured in a new Python process, so that modules
+# already imported by other tests do not affect the result.
+import os
+import sys
+import json
+import subprocess
+import pytest
+
+SOURCE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Modules that do calculations and are used without plotting
+COMPUTE_MODULES = ["integrators", "lane_emden", "exact_solution",
+                   "surface", "stellar_structure"]
+
+# Libraries that take long to import and are not needed for calculations
+HEAVY_MODULES = ["matplotlib", "pandas", "astropy"]
+
+# Generous limit: importing numpy alone takes about 0.1 s
+MAX_IMPORT_SECONDS = 1
+
+IMPORT_CODE = """
+import sys
+import json
+import time
+
+start = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - start
+
+heavy = [name for name in {heavy} if name in sys.modules]
+print(json.dumps({{"seconds": seconds, "heavy": heavy}}))
+"""
+
+
+def measure_import(module):
+    """
+    Imports a module in a new Python process.
+
+    Parameters
+    ----------
+
+    module : str
+        Name of the module.
+
+    Returns : dict
+    -------
+
+    {
+        "seconds" : float
+            Time it took to import the module
+
+        "heavy" : list of str
+            Heavy libraries that were imported along with the module
+    }
+    """
+
+    code = IMPORT_CODE.format(module=module, heavy=HEAVY_MODULES)
+
+    output = subprocess.check_output([sys.executable, "-c", code],
+                                     cwd=SOURCE_DIR)
+
+    return json.loads(output)
+
+
+@pytest.mark.parametrize("module", COMPUTE_MODULES)
+def test_import_compute_module(module):
+    result = measure_import(module)
+
+    assert result["heavy"] == []
+    assert result["seconds"] < MAX_IMPORT_SECONDS
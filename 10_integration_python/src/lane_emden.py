@@ -11,6 +11,7 @@
 #
 import numpy as np
 from float_utils import is_zero
+from solution_store import solution_key, find_solution, save_solution
 
 
 def lane_emden_derivatives(x, dependent_variables, data):
@@ -58,7 +59,8 @@ def lane_emden_derivatives(x, dependent_variables, data):
 def solve_lane_emden(step_size,
                      polytropic_index,
                      integrator,
-                     xmax=10):
+                     xmax=10,
+                     use_store=False):
     """
     Solves Lane-Emden equation (Eq. 1) numerically.
 
@@ -78,6 +80,12 @@ def solve_lane_emden(step_size,
     xmax : float
         Maximum value of scaled radius, after which integration is stopped.
 
+    use_store : bool
+        If True, the solution is kept in the store from `solution_store`
+        module and returned from the store when the function is called
+        again with the same parameters. The returned arrays are then
+        read-only, since they are shared by all the callers.
+
 
     Returns : tuple (all_x, all_dependent_variables)
     ---------
@@ -90,6 +98,39 @@ def solve_lane_emden(step_size,
         derivative.
     """
 
+    if not use_store:
+        return integrate_lane_emden(step_size=step_size,
+                                    polytropic_index=polytropic_index,
+                                    integrator=integrator,
+                                    xmax=xmax)
+
+    key = solution_key(step_size=step_size,
+                       polytropic_index=polytropic_index,
+                       integrator=integrator,
+                       xmax=xmax)
+
+    solution = find_solution(key)
+
+    if solution is None:
+        solution = integrate_lane_emden(step_size=step_size,
+                                        polytropic_index=polytropic_index,
+                                        integrator=integrator,
+                                        xmax=xmax)
+
+        solution = save_solution(key=key, arrays=solution)
+
+    return solution
+
+
+def integrate_lane_emden(step_size,
+                         polytropic_index,
+                         integrator,
+                         xmax):
+    """
+    Integrates Lane-Emden equation (Eq. 1). Parameters and returned values
+    are the same as in `solve_lane_emden`, but the solution is never stored.
+    """
+
     # Initial conditions
     # -----------
 
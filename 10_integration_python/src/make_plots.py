@@ -1,18 +1,51 @@
 """Show all plots"""
 
-import matplotlib.pyplot as plt
+import argparse
 from astropy import units as u
 from astropy import constants
-from plot_utils import save_plot
+from build_manifest import build_artifact
+from make_plots_task_1 import plot_lane_emden_task_1
 from make_plots_task_2 import plot_lane_emden_task_2
 from make_plots_task_3 import plot_lane_emden_task_3
 from surface import calculate_surface_values, save_surface_values_to_csv
-from stellar_structure import plot_density, plot_temperature, plot_pressure
-from lane_emden import solve_lane_emden
-from integrators import euler_integrator
+from stellar_structure_plots import plot_density, plot_temperature, \
+                                    plot_pressure
 
 
-def task1(plot_dir, figsize, show):
+def build_plot(plot_dir, filename, function, force, **parameters):
+    """
+    Make a plot by calling `function`, unless the plot file exists
+    and the inputs of the plot have not changed since it was made.
+
+    Parameters
+    ----------
+
+    plot_dir : str
+        Directory where the plot files will be saved
+
+    filename : str
+        Name of the plot file where the plot will be saved
+
+    function : function
+        Function that makes the plot. It is called with
+        `plot_dir`, `filename` and `parameters` arguments.
+
+    force : bool
+        If True, make the plot even if its inputs have not changed.
+
+    parameters : dict
+        Other arguments passed to the `function`.
+    """
+
+    build_artifact(
+        artifact_dir=plot_dir,
+        filename=filename,
+        function=function,
+        parameters=dict(plot_dir=plot_dir, filename=filename, **parameters),
+        force=force)
+
+
+def task1(plot_dir, figsize, show, force):
     """
     Make plots first task
 
@@ -28,36 +61,23 @@ def task1(plot_dir, figsize, show):
     show : bool
         If False the plots are not shown on screen but only saved
         to files (used in unit tests)
-    """
-
-    n = 3
-    h = 0.01
 
-    x, y = solve_lane_emden(step_size=h,
-                            polytropic_index=n,
-                            integrator=euler_integrator)
-
-    plt.figure(figsize=figsize)
-    plt.xlabel(r'Scaled radius, $\xi$')
-    plt.ylabel(r'Scaled density, $\theta$')
-
-    title = (
-        "Task 1\n"
-        f"Solution to Lane-Emden equation\n"
-        f"Euler method, h={h}, n={n}"
-    )
-
-    plt.title(title)
-    plt.plot(x, y[:, 0], label="Density")
-    plt.grid()
-    plt.tight_layout()
-    save_plot(plt=plt, plot_dir=plot_dir, filename="01_lane_emden.pdf")
+    force : bool
+        If True, make the plots even if their inputs have not changed.
+    """
 
-    if show:
-        plt.show()
+    build_plot(
+        plot_dir=plot_dir,
+        filename="01_lane_emden.pdf",
+        function=plot_lane_emden_task_1,
+        force=force,
+        h=0.01,
+        n=3,
+        figsize=figsize,
+        show=show)
 
 
-def task2(plot_dir, figsize, show):
+def task2(plot_dir, figsize, show, force):
     """
     Make plots second task
 
@@ -73,6 +93,9 @@ def task2(plot_dir, figsize, show):
     show : bool
         If False the plots are not shown on screen but only saved
         to files (used in unit tests)
+
+    force : bool
+        If True, make the plots even if their inputs have not changed.
     """
 
     h = 0.1
@@ -83,9 +106,11 @@ def task2(plot_dir, figsize, show):
         f"Euler method, h={h}, n={n}"
     )
 
-    plot_lane_emden_task_2(
+    build_plot(
         plot_dir=plot_dir,
         filename="02a_density_vs_radius_h_0.1.pdf",
+        function=plot_lane_emden_task_2,
+        force=force,
         h=h,
         n=n,
         figsize=figsize,
@@ -99,9 +124,11 @@ def task2(plot_dir, figsize, show):
         f"Euler method, h={h}, n={n}"
     )
 
-    plot_lane_emden_task_2(
+    build_plot(
         plot_dir=plot_dir,
         filename="02b_density_vs_radius_h_0.01.pdf",
+        function=plot_lane_emden_task_2,
+        force=force,
         h=0.01,
         n=3,
         figsize=figsize,
@@ -115,9 +142,11 @@ def task2(plot_dir, figsize, show):
         f"Euler method, h={h}, n={n}"
     )
 
-    plot_lane_emden_task_2(
+    build_plot(
         plot_dir=plot_dir,
         filename="02c_density_vs_radius_h_0.001.pdf",
+        function=plot_lane_emden_task_2,
+        force=force,
         h=0.001,
         n=3,
         figsize=figsize,
@@ -125,7 +154,7 @@ def task2(plot_dir, figsize, show):
         show=show)
 
 
-def task3(plot_dir, figsize, show):
+def task3(plot_dir, figsize, show, force):
     """
     Make plots second task
 
@@ -141,6 +170,9 @@ def task3(plot_dir, figsize, show):
     show : bool
         If False the plots are not shown on screen but only saved
         to files (used in unit tests)
+
+    force : bool
+        If True, make the plots even if their inputs have not changed.
     """
 
     h = 0.1
@@ -151,9 +183,11 @@ def task3(plot_dir, figsize, show):
         f"Euler method, h={h}, n={n}"
     )
 
-    plot_lane_emden_task_3(
+    build_plot(
         plot_dir=plot_dir,
         filename="03a_density_vs_radius_n_0.pdf",
+        function=plot_lane_emden_task_3,
+        force=force,
         h=h,
         n=n,
         figsize=figsize,
@@ -167,9 +201,11 @@ def task3(plot_dir, figsize, show):
         f"Euler method, h={h}, n={n}"
     )
 
-    plot_lane_emden_task_3(
+    build_plot(
         plot_dir=plot_dir,
         filename="03b_density_vs_radius_n_1.pdf",
+        function=plot_lane_emden_task_3,
+        force=force,
         h=h,
         n=n,
         figsize=figsize,
@@ -183,9 +219,11 @@ def task3(plot_dir, figsize, show):
         f"Euler method, h={h}, n={n}"
     )
 
-    plot_lane_emden_task_3(
+    build_plot(
         plot_dir=plot_dir,
         filename="03c_density_vs_radius_n_5.pdf",
+        function=plot_lane_emden_task_3,
+        force=force,
         h=h,
         n=n,
         figsize=figsize,
@@ -193,7 +231,30 @@ def task3(plot_dir, figsize, show):
         show=show)
 
 
-def task6(data_dir, figsize, show):
+def save_surface_values(data_dir, filename, n):
+    """
+    Calculate values at the surface and save them to a CSV file.
+
+    Parameters
+    ----------
+
+    data_dir : str
+        Directory for the data.
+
+    filename : str
+        Name of the CSV file.
+
+    n : int
+        Parameter in the Lane-Emden equation.
+    """
+
+    df = calculate_surface_values(n=n)
+
+    save_surface_values_to_csv(df=df, data_dir=data_dir,
+                               filename=filename)
+
+
+def task6(data_dir, figsize, show, force):
     """
     Make plots second task
 
@@ -209,56 +270,69 @@ def task6(data_dir, figsize, show):
     show : bool
         If False the plots are not shown on screen but only saved
         to files (used in unit tests)
+
+    force : bool
+        If True, make the CSV file even if its inputs have not changed.
     """
 
-    df = calculate_surface_values(n=1)
+    filename = "06_surface_values.csv"
 
-    save_surface_values_to_csv(df=df, data_dir=data_dir,
-                               filename="06_surface_values.csv")
+    build_artifact(
+        artifact_dir=data_dir,
+        filename=filename,
+        function=save_surface_values,
+        parameters=dict(data_dir=data_dir, filename=filename, n=1),
+        force=force)
 
 
-def task7(plot_dir, figsize, show):
+def task7(plot_dir, figsize, show, force):
     stellar_mass = 2 * constants.M_sun
     central_density = 1e5 * u.kg / u.meter**3
     step_size = 0.001
     polytropic_index = 3
     mean_molecular_weight = 1.4
 
-    plot_density(plot_dir=plot_dir,
-                 filename="07a_density.pdf",
-                 figsize=figsize,
-                 stellar_mass=stellar_mass,
-                 central_density=central_density,
-                 step_size=step_size,
-                 polytropic_index=polytropic_index,
-                 mean_molecular_weight=mean_molecular_weight,
-                 title_prefix="Task 7 (a)\n",
-                 show=show)
-
-    plot_temperature(plot_dir=plot_dir,
-                     filename="07b_temperature.pdf",
-                     figsize=figsize,
-                     stellar_mass=stellar_mass,
-                     central_density=central_density,
-                     step_size=step_size,
-                     polytropic_index=polytropic_index,
-                     mean_molecular_weight=mean_molecular_weight,
-                     title_prefix="Task 7 (b)\n",
-                     show=show)
-
-    plot_pressure(plot_dir=plot_dir,
-                  filename="07c_pressure.pdf",
-                  figsize=figsize,
-                  stellar_mass=stellar_mass,
-                  central_density=central_density,
-                  step_size=step_size,
-                  polytropic_index=polytropic_index,
-                  mean_molecular_weight=mean_molecular_weight,
-                  title_prefix="Task 7 (c)\n",
-                  show=show)
-
-
-def make_plots(plot_dir, show):
+    build_plot(plot_dir=plot_dir,
+               filename="07a_density.pdf",
+               function=plot_density,
+               force=force,
+               figsize=figsize,
+               stellar_mass=stellar_mass,
+               central_density=central_density,
+               step_size=step_size,
+               polytropic_index=polytropic_index,
+               mean_molecular_weight=mean_molecular_weight,
+               title_prefix="Task 7 (a)\n",
+               show=show)
+
+    build_plot(plot_dir=plot_dir,
+               filename="07b_temperature.pdf",
+               function=plot_temperature,
+               force=force,
+               figsize=figsize,
+               stellar_mass=stellar_mass,
+               central_density=central_density,
+               step_size=step_size,
+               polytropic_index=polytropic_index,
+               mean_molecular_weight=mean_molecular_weight,
+               title_prefix="Task 7 (b)\n",
+               show=show)
+
+    build_plot(plot_dir=plot_dir,
+               filename="07c_pressure.pdf",
+               function=plot_pressure,
+               force=force,
+               figsize=figsize,
+               stellar_mass=stellar_mass,
+               central_density=central_density,
+               step_size=step_size,
+               polytropic_index=polytropic_index,
+               mean_molecular_weight=mean_molecular_weight,
+               title_prefix="Task 7 (c)\n",
+               show=show)
+
+
+def make_plots(plot_dir, show, force=False):
     """
     Make plots for all the tasks in the lab.
 
@@ -271,16 +345,27 @@ def make_plots(plot_dir, show):
     show : bool
         If False the plots are not shown on screen but only saved
         to files (used in unit tests)
+
+    force : bool
+        If True, make all plots and data files. Otherwise, make only
+        those whose inputs have changed since they were made last time.
     """
 
     figsize = (8, 6)
 
-    task1(plot_dir=plot_dir, figsize=figsize, show=show)
-    task2(plot_dir=plot_dir, figsize=figsize, show=show)
-    task3(plot_dir=plot_dir, figsize=figsize, show=show)
-    task6(data_dir=plot_dir, figsize=figsize, show=show)
-    task7(plot_dir=plot_dir, figsize=figsize, show=show)
+    task1(plot_dir=plot_dir, figsize=figsize, show=show, force=force)
+    task2(plot_dir=plot_dir, figsize=figsize, show=show, force=force)
+    task3(plot_dir=plot_dir, figsize=figsize, show=show, force=force)
+    task6(data_dir=plot_dir, figsize=figsize, show=show, force=force)
+    task7(plot_dir=plot_dir, figsize=figsize, show=show, force=force)
 
 
 if __name__ == '__main__':
-    make_plots(plot_dir="plots", show=True)
+    parser = argparse.ArgumentParser(description="Make plots for the lab.")
+
+    parser.add_argument(
+        "--force", action="store_true",
+        help="make all plots, including those whose inputs have not changed")
+
+    args = parser.parse_args()
+    make_plots(plot_dir="plots", show=True, force=args.force)
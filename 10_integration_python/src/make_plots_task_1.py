@@ -0,0 +1,57 @@
+# Show plot of solution to Lane-Emden equation using Euler method
+from lane_emden import solve_lane_emden
+from integrators import euler_integrator
+from plot_utils import save_plot
+
+
+def plot_lane_emden_task_1(plot_dir, filename, h, n, figsize, show):
+    """
+    Show plot of solution to Lane-Emden equation.
+
+    Parameters
+    -----------
+
+    plot_dir : str
+        Directory where the plot files will be saved
+
+    filename : str
+        Name of the plot file where the plot will be saved
+
+    h : float
+        Step size (radius x variable)
+
+    n : float
+        Parameter in the Lane-Emden equation.
+
+    figsize : tuple
+        Figure size (width, height)
+
+    show : bool
+        If False the plots are not shown on screen but only saved
+        to files (used in unit tests)
+    """
+
+    import matplotlib.pyplot as plt
+
+    x, y = solve_lane_emden(step_size=h,
+                            polytropic_index=n,
+                            integrator=euler_integrator)
+
+    plt.figure(figsize=figsize)
+    plt.xlabel(r'Scaled radius, $\xi$')
+    plt.ylabel(r'Scaled density, $\theta$')
+
+    title = (
+        "Task 1\n"
+        f"Solution to Lane-Emden equation\n"
+        f"Euler method, h={h}, n={n}"
+    )
+
+    plt.title(title)
+    plt.plot(x, y[:, 0], label="Density")
+    plt.grid()
+    plt.tight_layout()
+    save_plot(plt=plt, plot_dir=plot_dir, filename=filename)
+
+    if show:
+        plt.show()
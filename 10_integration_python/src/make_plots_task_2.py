@@ -1,5 +1,4 @@
 # Show plot of solution to Lane-Emden equation
-import matplotlib.pyplot as plt
 from lane_emden import solve_lane_emden
 from integrators import euler_integrator
 from plot_utils import save_plot, get_linestyles_cycler
@@ -41,6 +40,8 @@ def plot_lane_emden_task_2(plot_dir,
         to files (used in unit tests)
     """
 
+    import matplotlib.pyplot as plt
+
     x, y = solve_lane_emden(step_size=h,
                             polytropic_index=n,
                             integrator=euler_integrator)
@@ -1,5 +1,4 @@
 # Show plots of approximate and exact solutions to Lane-Emden equation.
-import matplotlib.pyplot as plt
 from plot_utils import save_plot, get_linestyles_cycler
 from exact_solution import exact, exact_derivative
 from lane_emden import solve_lane_emden
@@ -41,6 +40,8 @@ def plot_lane_emden_task_3(plot_dir, filename,
         to files (used in unit tests)
     """
 
+    import matplotlib.pyplot as plt
+
     x, y = solve_lane_emden(step_size=h,
                             polytropic_index=n,
                             integrator=euler_integrator)
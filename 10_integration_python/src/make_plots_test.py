@@ -1,8 +1,10 @@
 from make_plots import make_plots
 import os
 import shutil
+import pytest
 
 
+@pytest.mark.slow
 def test_plot_solution():
     plot_dir = "test_plots"
     plot_file_name = "01_lane_emden.pdf"
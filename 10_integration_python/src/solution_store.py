@@ -0,0 +1,120 @@
+# Store of solutions of Lane-Emden equation, keyed by the parameters
+# of integration. It is used to avoid solving the equation again
+# with the same parameters, for example, in unit tests. The store is used
+# only when requested with `solve_lane_emden(..., use_store=True)`.
+#
+# The store keeps at most `MAX_SOLUTIONS` solutions, the least recently
+# used ones are removed first. The stored arrays are read-only,
+# because they are shared by all the callers.
+from collections import OrderedDict
+
+MAX_SOLUTIONS = 32
+
+SOLUTIONS = OrderedDict()
+
+
+def solution_key(step_size, polytropic_index, integrator, xmax):
+    """
+    Returns the key of the solution in the store.
+
+    Parameters
+    ----------
+
+    step_size : float
+        Size of the scaled radius step.
+
+    polytropic_index : int
+        Parameter `n` in Lane-Emden equation.
+
+    integrator : function
+        An integration method used (i.e. Euler or Runge-Kutta).
+
+    xmax : float
+        Maximum value of scaled radius.
+
+    Returns : tuple
+    -------
+
+    The key.
+    """
+
+    return (step_size, polytropic_index, integrator, xmax)
+
+
+def find_solution(key, store=SOLUTIONS):
+    """
+    Returns the stored solution.
+
+    Parameters
+    ----------
+
+    key : tuple
+        Key of the solution, see `solution_key`.
+
+    store : collections.OrderedDict
+        The store of solutions.
+
+    Returns : tuple or None
+    -------
+
+    The solution or None if it has not been stored.
+    """
+
+    solution = store.get(key)
+
+    if solution is not None:
+        store.move_to_end(key)
+
+    return solution
+
+
+def save_solution(key, arrays, store=SOLUTIONS, max_solutions=MAX_SOLUTIONS):
+    """
+    Stores the solution. If the store is full, removes the least
+    recently used solution.
+
+    Parameters
+    ----------
+
+    key : tuple
+        Key of the solution, see `solution_key`.
+
+    arrays : tuple of numpy.ndarray
+        The solution. The arrays are made read-only.
+
+    store : collections.OrderedDict
+        The store of solutions.
+
+    max_solutions : int
+        Maximum number of solutions in the store.
+
+    Returns : tuple of numpy.ndarray
+    -------
+
+    The stored solution.
+    """
+
+    for array in arrays:
+        array.flags.writeable = False
+
+    store[key] = arrays
+    store.move_to_end(key)
+
+    while len(store) > max_solutions:
+        store.popitem(last=False)
+
+    return arrays
+
+
+def clear_solutions(store=SOLUTIONS):
+    """
+    Removes all solutions from the store.
+
+    Parameters
+    ----------
+
+    store : collections.OrderedDict
+        The store of solutions.
+    """
+
+    store.clear()
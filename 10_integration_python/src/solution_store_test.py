@@ -0,0 +1,74 @@
+from collections import OrderedDict
+import numpy as np
+import pytest
+from integrators import euler_integrator
+from lane_emden import solve_lane_emden
+
+from solution_store import solution_key, find_solution, save_solution, \
+                           clear_solutions
+
+
+def test_save_solution():
+    store = OrderedDict()
+
+    key = solution_key(step_size=0.5, polytropic_index=2,
+                       integrator=euler_integrator, xmax=3)
+
+    assert find_solution(key, store=store) is None
+
+    arrays = (np.array([1.0, 2.0]), np.array([3.0, 4.0]))
+    save_solution(key=key, arrays=arrays, store=store)
+
+    result = find_solution(key, store=store)
+    assert result is arrays
+
+    with pytest.raises(ValueError):
+        result[0][0] = 5
+
+    clear_solutions(store=store)
+    assert find_solution(key, store=store) is None
+
+
+def test_save_solution__removes_least_recently_used():
+    store = OrderedDict()
+    arrays = (np.array([1.0]), np.array([2.0]))
+
+    save_solution(key=1, arrays=arrays, store=store, max_solutions=2)
+    save_solution(key=2, arrays=arrays, store=store, max_solutions=2)
+
+    # Use the first solution, so the second one is removed next
+    find_solution(1, store=store)
+
+    save_solution(key=3, arrays=arrays, store=store, max_solutions=2)
+
+    assert list(store.keys()) == [1, 3]
+
+
+def test_solve_lane_emden__returns_stored_solution():
+    first = solve_lane_emden(step_size=0.1, polytropic_index=3,
+                             integrator=euler_integrator, use_store=True)
+
+    second = solve_lane_emden(step_size=0.1, polytropic_index=3,
+                              integrator=euler_integrator, use_store=True)
+
+    assert first is second
+
+    other = solve_lane_emden(step_size=0.1, polytropic_index=1,
+                             integrator=euler_integrator, use_store=True)
+
+    assert other is not first
+
+
+def test_solve_lane_emden__without_store():
+    first = solve_lane_emden(step_size=0.1, polytropic_index=3,
+                             integrator=euler_integrator)
+
+    second = solve_lane_emden(step_size=0.1, polytropic_index=3,
+                              integrator=euler_integrator)
+
+    assert first is not second
+    assert np.array_equal(first[0], second[0])
+
+    # The arrays are not shared, so they can be changed
+    first[0][0] = 5
+    assert second[0][0] == 0
@@ -1,9 +1,10 @@
 # Calculate stellar structure parameters using Lane-Emden model.
+#
+# This module does not import plotting libraries and imports astropy only
+# when needed, so it loads quickly. The plots are made in
+# `stellar_structure_plots` module.
 
 import numpy as np
-from astropy import constants
-import matplotlib.pyplot as plt
-from plot_utils import save_plot
 from lane_emden import solve_lane_emden
 from integrators import runge_kutta_integrator
 
@@ -12,7 +13,9 @@ def calculate_stellar_parameters(step_size,
                                  polytropic_index,
                                  stellar_mass,
                                  central_density,
-                                 mean_molecular_weight):
+                                 mean_molecular_weight,
+                                 integrator=runge_kutta_integrator,
+                                 solution=None):
 
     """
     Calculate stellar structure parameters using Lane-Emden model.
@@ -35,6 +38,15 @@ def calculate_stellar_parameters(step_size,
     mean_molecular_weight : float
         Mean molecular weight of the star
 
+    integrator : function
+        An integration method used to solve Lane-Emden equation
+        (i.e. Euler or Runge-Kutta).
+
+    solution : tuple (x, y)
+        Solution of Lane-Emden equation from `solve_lane_emden`, calculated
+        with the same step size, polytropic index and integrator.
+        If None, the equation is solved.
+
     Returns : dict
     -----------
 
@@ -62,7 +74,8 @@ def calculate_stellar_parameters(step_size,
     """
 
     xi, theta, dtheta_dxi = calculate_scaled_parameters(
-        polytropic_index=polytropic_index, step_size=step_size)
+        polytropic_index=polytropic_index, step_size=step_size,
+        integrator=integrator, solution=solution)
 
     xi1 = xi[-1]
     dtheta_dxi_at_xi1 = dtheta_dxi[-1]
@@ -159,6 +172,8 @@ def find_k(alpha, polytropic_index, central_density):
     K parameter from Eq. 6 (doc/lane_emden_equations.png)
     """
 
+    from astropy import constants
+
     n = polytropic_index
     k = (alpha**2) * 4 * np.pi * constants.G
     k = k / (n + 1)
@@ -210,7 +225,9 @@ def find_central_pressure(k, central_density, gamma):
     return k * central_density**gamma
 
 
-def calculate_scaled_parameters(polytropic_index, step_size):
+def calculate_scaled_parameters(polytropic_index, step_size,
+                                integrator=runge_kutta_integrator,
+                                solution=None):
     """
     Calculates scaled stellar parameter.
 
@@ -223,6 +240,14 @@ def calculate_scaled_parameters(polytropic_index, step_size):
     step_size : float
         Size of the radius step used in integration
 
+    integrator : function
+        An integration method used to solve Lane-Emden equation
+        (i.e. Euler or Runge-Kutta).
+
+    solution : tuple (x, y)
+        Solution of Lane-Emden equation from `solve_lane_emden`.
+        If None, the equation is solved.
+
     Returns : tuple (xi, theta, dtheta_dxi)
     -----------
 
@@ -238,10 +263,12 @@ def calculate_scaled_parameters(polytropic_index, step_size):
         Derivative of theta with respect to xi.
     """
 
-    x, y = solve_lane_emden(step_size=step_size,
-                            polytropic_index=polytropic_index,
-                            integrator=runge_kutta_integrator)
+    if solution is None:
+        solution = solve_lane_emden(step_size=step_size,
+                                    polytropic_index=polytropic_index,
+                                    integrator=integrator)
 
+    x, y = solution
     xi = x
     theta = y[:, 0]
     dtheta_dxi = y[:, 1]
@@ -361,315 +388,7 @@ def find_temperature(mean_molecular_weight, pressures, densities):
     Temperature values [K] from the center of the star to the surface.
     """
 
+    from astropy import constants
+
     return pressures * mean_molecular_weight * constants.u / densities \
         / constants.k_B
-
-
-def plot_title(stellar_mass, central_density, density_unit,
-               step_size, polytropic_index, mean_molecular_weight,
-               title_prefix):
-    """
-    Make a plot of pressure vs radius.
-
-    Parameters
-    ----------
-
-    stellar_mass : float
-        Mass of the stellar modal [kg]
-
-    central_density : float
-        Density at the center of the stellar modal [kg / m^3]
-
-    density_unit : str
-        Unit for the density.
-
-    step_size : float
-        Size of the radius step used in the integration
-
-    polytropic_index : int
-        Parameter n used in Lane-Emden equation
-
-    mean_molecular_weight : float
-        Mean molecular weight of the stellar model
-
-    title_prefix : str
-        Text that will be added at the start of the plot title
-
-    Returns : str
-    -------
-
-    Plot title
-    """
-
-    title = (
-        f"{title_prefix}"
-        "Solution of Lane-Emden equation,\n"
-        f"n={polytropic_index}, "
-        f"M={stellar_mass:.2G}, "
-        r"$\rho_c=$"
-        f"{central_density.value:.2G} "
-        f"{density_unit}, "
-        f"h={step_size}, "
-        r"$\mu=$"
-        f"{mean_molecular_weight}"
-    )
-
-    return title
-
-
-def plot_density(plot_dir, filename, figsize,
-                 stellar_mass, central_density,
-                 step_size, polytropic_index,
-                 mean_molecular_weight,
-                 title_prefix,
-                 show):
-    """
-    Make a plot of density vs radius.
-
-    Parameters
-    ----------
-
-    plot_dir : str
-        Directory where the plot files will be saved
-
-    filename : str
-        Name of the plot file where the plot will be saved
-
-    figsize : tuple
-        Figure size (width, height)
-
-    stellar_mass : float
-        Mass of the stellar modal [kg]
-
-    central_density : float
-        Density at the center of the stellar modal [kg / m^3]
-
-    step_size : float
-        Size of the radius step used in the integration
-
-    polytropic_index : int
-        Parameter n used in Lane-Emden equation
-
-    mean_molecular_weight : float
-        Mean molecular weight of the stellar model
-
-    title_prefix : str
-        Text that will be added at the start of the plot title
-
-    show : bool
-        If False, the plot will not be shown on screen, but only
-        save to the file (used in unit tests)
-    """
-
-    result = calculate_stellar_parameters(
-        step_size=step_size,
-        polytropic_index=polytropic_index,
-        stellar_mass=stellar_mass,
-        central_density=central_density,
-        mean_molecular_weight=mean_molecular_weight)
-
-    radii = result["radii"]
-    densities = result["densities"]
-
-    plt.figure(figsize=figsize)
-    plt.plot(radii.value, densities.value)
-    xunit = radii[0].unit.to_string('latex_inline')
-    plt.xlabel(f"Radius R [{xunit}]")
-
-    density_unit = densities[0].unit.to_string('latex_inline')
-
-    ylabel = (
-        r"Density $\rho$ "
-        f"[{density_unit}]"
-    )
-    plt.ylabel(ylabel)
-
-    title = plot_title(stellar_mass=stellar_mass,
-                       central_density=central_density,
-                       density_unit=density_unit,
-                       step_size=step_size,
-                       polytropic_index=polytropic_index,
-                       mean_molecular_weight=mean_molecular_weight,
-                       title_prefix=title_prefix)
-
-    plt.title(title)
-    plt.grid()
-    plt.tight_layout()
-    save_plot(plt=plt, plot_dir=plot_dir, filename=filename)
-
-    if show:
-        plt.show()
-
-
-def plot_temperature(plot_dir, filename, figsize,
-                     stellar_mass, central_density,
-                     step_size, polytropic_index,
-                     mean_molecular_weight,
-                     title_prefix,
-                     show):
-    """
-    Make a plot of temperature vs radius.
-
-    Parameters
-    ----------
-
-    plot_dir : str
-        Directory where the plot files will be saved
-
-    filename : str
-        Name of the plot file where the plot will be saved
-
-    figsize : tuple
-        Figure size (width, height)
-
-    stellar_mass : float
-        Mass of the stellar modal [kg]
-
-    central_density : float
-        Density at the center of the stellar modal [kg / m^3]
-
-    step_size : float
-        Size of the radius step used in the integration
-
-    polytropic_index : int
-        Parameter n used in Lane-Emden equation
-
-    mean_molecular_weight : float
-        Mean molecular weight of the stellar model
-
-    title_prefix : str
-        Text that will be added at the start of the plot title
-
-    show : bool
-        If False, the plot will not be shown on screen, but only
-        save to the file (used in unit tests)
-    """
-
-    result = calculate_stellar_parameters(
-        step_size=step_size,
-        polytropic_index=polytropic_index,
-        stellar_mass=stellar_mass,
-        central_density=central_density,
-        mean_molecular_weight=mean_molecular_weight)
-
-    radii = result["radii"]
-    densities = result["densities"]
-    temperatures = result["temperatures"]
-
-    plt.figure(figsize=figsize)
-    plt.plot(radii.value, temperatures.value)
-    xunit = radii[0].unit.to_string('latex_inline')
-    plt.xlabel(f"Radius R [{xunit}]")
-
-    density_unit = densities[0].unit.to_string('latex_inline')
-    temperature_unit = temperatures[0].unit.decompose()\
-        .to_string('latex_inline')
-
-    ylabel = (
-        r"Temperature T "
-        f"[{temperature_unit}]"
-    )
-    plt.ylabel(ylabel)
-
-    title = plot_title(stellar_mass=stellar_mass,
-                       central_density=central_density,
-                       density_unit=density_unit,
-                       step_size=step_size,
-                       polytropic_index=polytropic_index,
-                       mean_molecular_weight=mean_molecular_weight,
-                       title_prefix=title_prefix)
-
-    plt.title(title)
-    plt.grid()
-    plt.tight_layout()
-    save_plot(plt=plt, plot_dir=plot_dir, filename=filename)
-
-    if show:
-        plt.show()
-
-
-def plot_pressure(plot_dir, filename, figsize,
-                  stellar_mass, central_density,
-                  step_size, polytropic_index,
-                  mean_molecular_weight,
-                  title_prefix,
-                  show):
-
-    """
-    Make a plot of pressure vs radius.
-
-    Parameters
-    ----------
-
-    plot_dir : str
-        Directory where the plot files will be saved
-
-    filename : str
-        Name of the plot file where the plot will be saved
-
-    figsize : tuple
-        Figure size (width, height)
-
-    stellar_mass : float
-        Mass of the stellar modal [kg]
-
-    central_density : float
-        Density at the center of the stellar modal [kg / m^3]
-
-    step_size : float
-        Size of the radius step used in the integration
-
-    polytropic_index : int
-        Parameter n used in Lane-Emden equation
-
-    mean_molecular_weight : float
-        Mean molecular weight of the stellar model
-
-    title_prefix : str
-        Text that will be added at the start of the plot title
-
-    show : bool
-        If False, the plot will not be shown on screen, but only
-        save to the file (used in unit tests)
-    """
-
-    result = calculate_stellar_parameters(
-        step_size=step_size,
-        polytropic_index=polytropic_index,
-        stellar_mass=stellar_mass,
-        central_density=central_density,
-        mean_molecular_weight=mean_molecular_weight)
-
-    radii = result["radii"]
-    densities = result["densities"]
-    pressures = result["pressures"]
-
-    plt.figure(figsize=figsize)
-    plt.plot(radii.value, pressures.value)
-    xunit = radii[0].unit.to_string('latex_inline')
-    plt.xlabel(f"Radius R [{xunit}]")
-
-    density_unit = densities[0].unit.to_string('latex_inline')
-    pressures_unit = pressures[0].unit.compose()[0].to_string('latex_inline')
-
-    ylabel = (
-        r"Pressure P "
-        f"[{pressures_unit}]"
-    )
-    plt.ylabel(ylabel)
-
-    title = plot_title(stellar_mass=stellar_mass,
-                       central_density=central_density,
-                       density_unit=density_unit,
-                       step_size=step_size,
-                       polytropic_index=polytropic_index,
-                       mean_molecular_weight=mean_molecular_weight,
-                       title_prefix=title_prefix)
-
-    plt.title(title)
-    plt.grid()
-    plt.tight_layout()
-    save_plot(plt=plt, plot_dir=plot_dir, filename=filename)
-
-    if show:
-        plt.show()
@@ -0,0 +1,323 @@
+# Plot stellar structure parameters calculated using Lane-Emden model.
+#
+# Matplotlib is imported inside the plotting functions, so that
+# importing this module is fast.
+
+from plot_utils import save_plot
+from stellar_structure import calculate_stellar_parameters
+
+
+def plot_title(stellar_mass, central_density, density_unit,
+               step_size, polytropic_index, mean_molecular_weight,
+               title_prefix):
+    """
+    Make a plot of pressure vs radius.
+
+    Parameters
+    ----------
+
+    stellar_mass : float
+        Mass of the stellar modal [kg]
+
+    central_density : float
+        Density at the center of the stellar modal [kg / m^3]
+
+    density_unit : str
+        Unit for the density.
+
+    step_size : float
+        Size of the radius step used in the integration
+
+    polytropic_index : int
+        Parameter n used in Lane-Emden equation
+
+    mean_molecular_weight : float
+        Mean molecular weight of the stellar model
+
+    title_prefix : str
+        Text that will be added at the start of the plot title
+
+    Returns : str
+    -------
+
+    Plot title
+    """
+
+    title = (
+        f"{title_prefix}"
+        "Solution of Lane-Emden equation,\n"
+        f"n={polytropic_index}, "
+        f"M={stellar_mass:.2G}, "
+        r"$\rho_c=$"
+        f"{central_density.value:.2G} "
+        f"{density_unit}, "
+        f"h={step_size}, "
+        r"$\mu=$"
+        f"{mean_molecular_weight}"
+    )
+
+    return title
+
+
+def plot_density(plot_dir, filename, figsize,
+                 stellar_mass, central_density,
+                 step_size, polytropic_index,
+                 mean_molecular_weight,
+                 title_prefix,
+                 show):
+    """
+    Make a plot of density vs radius.
+
+    Parameters
+    ----------
+
+    plot_dir : str
+        Directory where the plot files will be saved
+
+    filename : str
+        Name of the plot file where the plot will be saved
+
+    figsize : tuple
+        Figure size (width, height)
+
+    stellar_mass : float
+        Mass of the stellar modal [kg]
+
+    central_density : float
+        Density at the center of the stellar modal [kg / m^3]
+
+    step_size : float
+        Size of the radius step used in the integration
+
+    polytropic_index : int
+        Parameter n used in Lane-Emden equation
+
+    mean_molecular_weight : float
+        Mean molecular weight of the stellar model
+
+    title_prefix : str
+        Text that will be added at the start of the plot title
+
+    show : bool
+        If False, the plot will not be shown on screen, but only
+        save to the file (used in unit tests)
+    """
+
+    import matplotlib.pyplot as plt
+
+    result = calculate_stellar_parameters(
+        step_size=step_size,
+        polytropic_index=polytropic_index,
+        stellar_mass=stellar_mass,
+        central_density=central_density,
+        mean_molecular_weight=mean_molecular_weight)
+
+    radii = result["radii"]
+    densities = result["densities"]
+
+    plt.figure(figsize=figsize)
+    plt.plot(radii.value, densities.value)
+    xunit = radii[0].unit.to_string('latex_inline')
+    plt.xlabel(f"Radius R [{xunit}]")
+
+    density_unit = densities[0].unit.to_string('latex_inline')
+
+    ylabel = (
+        r"Density $\rho$ "
+        f"[{density_unit}]"
+    )
+    plt.ylabel(ylabel)
+
+    title = plot_title(stellar_mass=stellar_mass,
+                       central_density=central_density,
+                       density_unit=density_unit,
+                       step_size=step_size,
+                       polytropic_index=polytropic_index,
+                       mean_molecular_weight=mean_molecular_weight,
+                       title_prefix=title_prefix)
+
+    plt.title(title)
+    plt.grid()
+    plt.tight_layout()
+    save_plot(plt=plt, plot_dir=plot_dir, filename=filename)
+
+    if show:
+        plt.show()
+
+
+def plot_temperature(plot_dir, filename, figsize,
+                     stellar_mass, central_density,
+                     step_size, polytropic_index,
+                     mean_molecular_weight,
+                     title_prefix,
+                     show):
+    """
+    Make a plot of temperature vs radius.
+
+    Parameters
+    ----------
+
+    plot_dir : str
+        Directory where the plot files will be saved
+
+    filename : str
+        Name of the plot file where the plot will be saved
+
+    figsize : tuple
+        Figure size (width, height)
+
+    stellar_mass : float
+        Mass of the stellar modal [kg]
+
+    central_density : float
+        Density at the center of the stellar modal [kg / m^3]
+
+    step_size : float
+        Size of the radius step used in the integration
+
+    polytropic_index : int
+        Parameter n used in Lane-Emden equation
+
+    mean_molecular_weight : float
+        Mean molecular weight of the stellar model
+
+    title_prefix : str
+        Text that will be added at the start of the plot title
+
+    show : bool
+        If False, the plot will not be shown on screen, but only
+        save to the file (used in unit tests)
+    """
+
+    import matplotlib.pyplot as plt
+
+    result = calculate_stellar_parameters(
+        step_size=step_size,
+        polytropic_index=polytropic_index,
+        stellar_mass=stellar_mass,
+        central_density=central_density,
+        mean_molecular_weight=mean_molecular_weight)
+
+    radii = result["radii"]
+    densities = result["densities"]
+    temperatures = result["temperatures"]
+
+    plt.figure(figsize=figsize)
+    plt.plot(radii.value, temperatures.value)
+    xunit = radii[0].unit.to_string('latex_inline')
+    plt.xlabel(f"Radius R [{xunit}]")
+
+    density_unit = densities[0].unit.to_string('latex_inline')
+    temperature_unit = temperatures[0].unit.decompose()\
+        .to_string('latex_inline')
+
+    ylabel = (
+        r"Temperature T "
+        f"[{temperature_unit}]"
+    )
+    plt.ylabel(ylabel)
+
+    title = plot_title(stellar_mass=stellar_mass,
+                       central_density=central_density,
+                       density_unit=density_unit,
+                       step_size=step_size,
+                       polytropic_index=polytropic_index,
+                       mean_molecular_weight=mean_molecular_weight,
+                       title_prefix=title_prefix)
+
+    plt.title(title)
+    plt.grid()
+    plt.tight_layout()
+    save_plot(plt=plt, plot_dir=plot_dir, filename=filename)
+
+    if show:
+        plt.show()
+
+
+def plot_pressure(plot_dir, filename, figsize,
+                  stellar_mass, central_density,
+                  step_size, polytropic_index,
+                  mean_molecular_weight,
+                  title_prefix,
+                  show):
+
+    """
+    Make a plot of pressure vs radius.
+
+    Parameters
+    ----------
+
+    plot_dir : str
+        Directory where the plot files will be saved
+
+    filename : str
+        Name of the plot file where the plot will be saved
+
+    figsize : tuple
+        Figure size (width, height)
+
+    stellar_mass : float
+        Mass of the stellar modal [kg]
+
+    central_density : float
+        Density at the center of the stellar modal [kg / m^3]
+
+    step_size : float
+        Size of the radius step used in the integration
+
+    polytropic_index : int
+        Parameter n used in Lane-Emden equation
+
+    mean_molecular_weight : float
+        Mean molecular weight of the stellar model
+
+    title_prefix : str
+        Text that will be added at the start of the plot title
+
+    show : bool
+        If False, the plot will not be shown on screen, but only
+        save to the file (used in unit tests)
+    """
+
+    import matplotlib.pyplot as plt
+
+    result = calculate_stellar_parameters(
+        step_size=step_size,
+        polytropic_index=polytropic_index,
+        stellar_mass=stellar_mass,
+        central_density=central_density,
+        mean_molecular_weight=mean_molecular_weight)
+
+    radii = result["radii"]
+    densities = result["densities"]
+    pressures = result["pressures"]
+
+    plt.figure(figsize=figsize)
+    plt.plot(radii.value, pressures.value)
+    xunit = radii[0].unit.to_string('latex_inline')
+    plt.xlabel(f"Radius R [{xunit}]")
+
+    density_unit = densities[0].unit.to_string('latex_inline')
+    pressures_unit = pressures[0].unit.compose()[0].to_string('latex_inline')
+
+    ylabel = (
+        r"Pressure P "
+        f"[{pressures_unit}]"
+    )
+    plt.ylabel(ylabel)
+
+    title = plot_title(stellar_mass=stellar_mass,
+                       central_density=central_density,
+                       density_unit=density_unit,
+                       step_size=step_size,
+                       polytropic_index=polytropic_index,
+                       mean_molecular_weight=mean_molecular_weight,
+                       title_prefix=title_prefix)
+
+    plt.title(title)
+    plt.grid()
+    plt.tight_layout()
+    save_plot(plt=plt, plot_dir=plot_dir, filename=filename)
+
+    if show:
+        plt.show()
@@ -1,3 +1,4 @@
+import numpy as np
 from astropy import constants
 from astropy import units as u
 from pytest import approx
@@ -142,12 +143,24 @@ def test_calculate_scaled_parameters():
     assert dtheta_dxi[-1] == approx(-0.3184299609685312, rel=1e-15)
 
 
-def test_find_pressure():
+def test_calculate_scaled_parameters__solution():
+    x = np.array([0, 0.5, 1])
+    y = np.array([[1, 0], [0.9, -0.2], [0.6, -0.4]])
+
+    xi, theta, dtheta_dxi = calculate_scaled_parameters(
+        polytropic_index=1, step_size=0.5, solution=(x, y))
+
+    assert xi is x
+    assert theta.tolist() == [1, 0.9, 0.6]
+    assert dtheta_dxi.tolist() == [0, -0.2, -0.4]
+
+
+def test_find_pressure(lane_emden_solution):
     central_pressure = 2.8300029869833104e16 * u.pascal
     polytropic_index = 3
 
-    xi, theta, dtheta_dxi = calculate_scaled_parameters(
-        polytropic_index=3, step_size=0.001)
+    xi, y = lane_emden_solution(step_size=0.001, polytropic_index=3)
+    theta = y[:, 0]
 
     result = find_pressure(polytropic_index=polytropic_index,
                            central_pressure=central_pressure,
@@ -160,12 +173,12 @@ def test_find_pressure():
     assert result[-1].value == approx(0.04759224978521558, rel=1e-15)
 
 
-def test_find_density():
+def test_find_density(lane_emden_solution):
     central_density = 1e5 * u.kg / u.meter**3
     polytropic_index = 3
 
-    xi, theta, dtheta_dxi = calculate_scaled_parameters(
-        polytropic_index=3, step_size=0.001)
+    xi, y = lane_emden_solution(step_size=0.001, polytropic_index=3)
+    theta = y[:, 0]
 
     result = find_density(polytropic_index=polytropic_index,
                           central_density=central_density,
@@ -178,11 +191,11 @@ def test_find_density():
     assert result[-1].value == approx(4.669947584135971e-9, rel=1e-15)
 
 
-def test_find_radius():
+def test_find_radius(lane_emden_solution):
     alpha = 116177708.60712494 * u.meter
 
-    xi, theta, dtheta_dxi = calculate_scaled_parameters(
-        polytropic_index=3, step_size=0.001)
+    xi, y = lane_emden_solution(step_size=0.001, polytropic_index=3)
+    theta = y[:, 0]
 
     result = find_radius(alpha=alpha, xi=xi)
 
@@ -193,14 +206,14 @@ def test_find_radius():
     assert result[-1].value == approx(801161478.5548077, rel=1e-15)
 
 
-def test_find_temperature():
+def test_find_temperature(lane_emden_solution):
     mean_molecular_weight = 1.4
     central_pressure = 2.8300029869833104e16 * u.pascal
     central_density = 1e5 * u.kg / u.meter**3
     polytropic_index = 3
 
-    xi, theta, dtheta_dxi = calculate_scaled_parameters(
-        polytropic_index=3, step_size=0.001)
+    xi, y = lane_emden_solution(step_size=0.001, polytropic_index=3)
+    theta = y[:, 0]
 
     pressures = find_pressure(
         polytropic_index=polytropic_index,
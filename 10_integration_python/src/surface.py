@@ -1,6 +1,8 @@
 # Calculate parameters at the surface
+#
+# Pandas is imported only when a data frame is made,
+# so that importing this module is fast.
 import numpy as np
-import pandas as pd
 import os
 from exact_solution import exact, exact_derivative
 from plot_utils import find_nearest_index, create_dir
@@ -84,7 +86,7 @@ def surface_values_single_method(integrator, h, n):
     return item
 
 
-def calculate_surface_values(n):
+def calculate_surface_value_items(n):
     """
     Calculates values of radius and derivative of density at the surface
     for different methods of integration, as well as exact estimates.
@@ -95,10 +97,10 @@ def calculate_surface_values(n):
     n : int
         Parameter in the Lane-Emden equation.
 
-    Returns : Panda's DataFrame
+    Returns : list of dict
     -------
 
-    A dataframe with following columns:
+    Each item in the list has following keys:
 
     "h" : float
         Size of the step in radius.
@@ -145,7 +147,30 @@ def calculate_surface_values(n):
         item["h"] = h
         items.append(item)
 
-    return pd.DataFrame(items)
+    return items
+
+
+def calculate_surface_values(n):
+    """
+    Calculates values of radius and derivative of density at the surface
+    for different methods of integration, as well as exact estimates.
+
+    Parameters
+    -----------
+
+    n : int
+        Parameter in the Lane-Emden equation.
+
+    Returns : Panda's DataFrame
+    -------
+
+    A dataframe with columns described in
+    `calculate_surface_value_items` function.
+    """
+
+    import pandas as pd
+
+    return pd.DataFrame(calculate_surface_value_items(n=n))
 
 
 def save_surface_values_to_csv(df, data_dir, filename):
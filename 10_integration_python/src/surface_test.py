@@ -1,5 +1,6 @@
 import os
 import shutil
+import pytest
 from pytest import approx
 import pandas as pd
 from integrators import improved_euler_integrator
@@ -9,6 +10,7 @@ from surface import calculate_exact_values_at_surface, \
                     surface_values_single_method
 
 
+@pytest.mark.slow
 def test_save_surface_values_to_csv():
 
     filename = "surface_test.csv"
@@ -63,6 +65,7 @@ def test_surface_values_single_method():
         approx(-0.31862568823046306, rel=1e-15)
 
 
+@pytest.mark.slow
 def test_calculate_surface_values():
     df = calculate_surface_values(n=1)
 